@@ -5,7 +5,7 @@ Main API router that includes all endpoint routers.
 """
 
 from fastapi import APIRouter
-from .endpoints import auth, users, jobs, applications, companies, analytics, ai, files, websocket, ai_enhanced
+from .endpoints import auth, users, jobs, applications, companies, analytics, ai, files, websocket, ai_enhanced, admin
 
 api_router = APIRouter()
 
@@ -68,4 +68,10 @@ api_router.include_router(
     ai_enhanced.router,
     prefix="/ai-enhanced",
     tags=["Advanced AI Features"]
+)
+
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["Administration"]
 )
\ No newline at end of file
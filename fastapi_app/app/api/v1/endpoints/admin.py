@@ -0,0 +1,128 @@
+"""
+Admin API Endpoints
+
+Operational endpoints for administrators.
+"""
+
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from ....core.config import settings
+from ....core.security import require_admin, Principal
+from ....services.llm_cache import llm_cache
+from ....services.llm_gateway import llm_gateway
+from ....services.semantic_search import semantic_search
+from ....utils.background_tasks import schedule_file_catalog_backfill, schedule_semantic_index_rebuild
+from ....utils.profiler import sampling_profiler
+
+router = APIRouter()
+
+
+@router.post("/profile")
+async def profile_event_loop(
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILER_MAX_SECONDS, description="Seconds to sample"),
+    interval_ms: float = Query(settings.PROFILER_INTERVAL_MS, ge=1, le=100, description="Milliseconds between samples"),
+    top: int = Query(20, ge=1, le=200, description="Number of tasks to report"),
+    format: str = Query("json", pattern="^(json|collapsed)$", description="Response format"),
+    current_user: Principal = Depends(require_admin)
+):
+    """
+    Profile the event loop of this worker
+
+    Samples the event-loop thread's stack for the requested time while the
+    server keeps serving traffic. Returns collapsed stacks for flamegraph
+    tools and the async tasks seen during the run ranked by wall time.
+    With format=collapsed only the stacks are returned, as plain text.
+    """
+    if sampling_profiler.running:
+        raise HTTPException(status_code=409, detail="A profile is already running on this worker")
+
+    result: Dict[str, Any] = await sampling_profiler.profile(
+        seconds, interval=interval_ms / 1000, top_tasks=top
+    )
+
+    if format == "collapsed":
+        return PlainTextResponse(result["collapsed"] + "\n")
+    return result
+
+
+@router.get("/llm-cache")
+async def get_llm_cache_stats(
+    current_user: Principal = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Get LLM response cache statistics
+
+    Returns hit, near-duplicate hit and miss counts for this worker since startup.
+    """
+    return {
+        "enabled": llm_cache.enabled,
+        "near_duplicates": llm_cache.near_duplicates,
+        "max_entries": llm_cache.max_entries,
+        "ttl": llm_cache.ttl,
+        **llm_cache.stats()
+    }
+
+
+@router.delete("/llm-cache")
+async def clear_llm_cache(
+    current_user: Principal = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Clear the LLM response cache
+    """
+    await llm_cache.clear()
+    return {"message": "LLM response cache cleared"}
+
+
+@router.get("/llm-gateway")
+async def get_llm_gateway_stats(
+    current_user: Principal = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Get LLM gateway statistics
+
+    Returns call, coalescing, retry and failure counts and current load for this worker.
+    """
+    return llm_gateway.stats()
+
+
+@router.get("/embeddings")
+async def get_semantic_index_stats(
+    current_user: Principal = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Get semantic search index statistics
+
+    Returns the current index version, its vector dimension, storage type and document counts.
+    """
+    return semantic_search.stats()
+
+
+@router.post("/embeddings/rebuild")
+async def rebuild_semantic_index(
+    current_user: Principal = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Rebuild the semantic search indexes
+
+    Refits the embedding model and re-embeds all candidate profiles and active jobs
+    in background. Queries keep using the current indexes until the build finishes.
+    """
+    task_id = await schedule_semantic_index_rebuild()
+    return {"message": "Semantic index rebuild scheduled", "task_id": task_id}
+
+
+@router.post("/files/catalog")
+async def catalog_existing_files(
+    current_user: Principal = Depends(require_admin)
+) -> Dict[str, Any]:
+    """
+    Catalog existing uploaded files
+
+    Adds files uploaded before the file catalog existed to it and recomputes every
+    user's storage usage, in background. Files already catalogued are left as they are.
+    """
+    task_id = await schedule_file_catalog_backfill()
+    return {"message": "File catalog backfill scheduled", "task_id": task_id}
@@ -6,13 +6,17 @@ AI-powered recruitment features including resume parsing, job matching, and inte
 
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....core.database import get_db
+from ....core.database import get_db, get_read_db
 from ....core.security import get_current_user
-from ....models.user import User
+from ....models.job import Job, JobStatus
+from ....models.user import User, CandidateProfile
 from ....services.ai_service import ai_service
+from ....services.semantic_search import semantic_search
 from ....utils.file_handler import file_handler
+from ....utils.skill_taxonomy import CATEGORIES, skill_taxonomy
 from ....utils.background_tasks import schedule_resume_processing, schedule_job_recommendations
 
 router = APIRouter()
@@ -40,7 +44,8 @@ async def parse_resume(
             file, 
             file_type="document", 
             user_id=current_user.id,
-            subfolder="resumes"
+            subfolder="resumes",
+            db=db
         )
         
         if not file_info.get('text_content'):
@@ -124,7 +129,7 @@ async def calculate_job_match(
 async def get_job_recommendations(
     limit: int = Query(10, ge=1, le=50, description="Number of recommendations to return"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get AI-powered job recommendations for the current user
@@ -151,6 +156,56 @@ async def get_job_recommendations(
         raise HTTPException(status_code=500, detail=f"Failed to get job recommendations: {str(e)}")
 
 
+@router.get("/semantic-search")
+async def semantic_search_endpoint(
+    q: str = Query(..., min_length=2, description="Free-text query, e.g. skills or a job description"),
+    kind: str = Query("jobs", pattern="^(jobs|candidates)$", description="Search jobs or candidates"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results to return"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> Dict[str, Any]:
+    """
+    Search jobs or candidates by meaning rather than exact keywords
+    
+    Ranks active jobs or candidate profiles by embedding similarity to the query,
+    so spelling variants and related wording match. Candidate search is limited
+    to recruiters and admins.
+    """
+    if kind == "candidates" and current_user.user_type not in ['recruiter', 'admin']:
+        raise HTTPException(status_code=403, detail="Only recruiters can search candidates")
+    
+    hits = await semantic_search.search(kind, q, limit)
+    if hits is None:
+        raise HTTPException(status_code=503, detail="Semantic search index has not been built yet")
+    
+    ids = [doc_id for doc_id, _ in hits]
+    if kind == "candidates":
+        rows = (await db.execute(
+            select(CandidateProfile.id, CandidateProfile.current_title, CandidateProfile.location)
+            .where(CandidateProfile.id.in_(ids))
+        )).all()
+        details = {row.id: {"candidate_id": row.id, "current_title": row.current_title, "location": row.location} for row in rows}
+    else:
+        rows = (await db.execute(
+            select(Job.id, Job.title, Job.location, Job.company_id)
+            .where(Job.id.in_(ids), Job.status == JobStatus.ACTIVE)
+        )).all()
+        details = {row.id: {"job_id": row.id, "title": row.title, "location": row.location, "company_id": row.company_id} for row in rows}
+    
+    # Documents deleted or closed since the last index build are left out
+    results = [
+        {**details[doc_id], "similarity": round(score, 4)}
+        for doc_id, score in hits if doc_id in details
+    ]
+    
+    return {
+        "query": q,
+        "kind": kind,
+        "results": results,
+        "count": len(results)
+    }
+
+
 @router.post("/analyze-application")
 async def analyze_application_quality(
     application_id: int = Form(..., description="Application ID to analyze"),
@@ -332,18 +387,14 @@ async def extract_skills_from_text(
     try:
         # Use the AI service to extract skills
         skills = ai_service._extract_skills(text)
+        grouped = skill_taxonomy.group_by_category(skills)
         
         return {
             "text_length": len(text),
             "extracted_skills": skills,
             "skill_count": len(skills),
             "skill_categories": {
-                "programming": [s for s in skills if s in ai_service.skills_database.get('programming', [])],
-                "web_development": [s for s in skills if s in ai_service.skills_database.get('web_development', [])],
-                "databases": [s for s in skills if s in ai_service.skills_database.get('databases', [])],
-                "cloud": [s for s in skills if s in ai_service.skills_database.get('cloud', [])],
-                "data_science": [s for s in skills if s in ai_service.skills_database.get('data_science', [])],
-                "soft_skills": [s for s in skills if s in ai_service.skills_database.get('soft_skills', [])]
+                category: grouped.get(category, []) for category in CATEGORIES
             }
         }
         
@@ -459,7 +510,7 @@ async def start_mock_interview(
 async def verify_background_info(
     candidate_id: int = Query(..., description="Candidate ID to verify"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Initiate AI-powered background verification
@@ -4,20 +4,52 @@ Enhanced AI API Endpoints
 Advanced AI-powered features using OpenAI integration for superior recruitment capabilities.
 """
 
+import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....core.security import get_current_user
+from ....core.database import get_read_db
+from ....core.security import get_current_user, get_current_principal, Principal
+from ....models.job import Job
 from ....models.user import User
 from ....services.openai_service import openai_service
+from ....services.llm_gateway import set_llm_tenant
 from ....services.ai_service import ai_service
 from ....utils.file_handler import file_handler
 
-router = APIRouter()
+
+async def bind_llm_tenant(current_user: Principal = Depends(get_current_principal)) -> Principal:
+    """Limit the request's LLM calls by the user's company, or by the user without one"""
+    if current_user.company_id:
+        set_llm_tenant(("company", current_user.company_id))
+    else:
+        set_llm_tenant(("user", current_user.id))
+    return current_user
+
+
+router = APIRouter(dependencies=[Depends(bind_llm_tenant)])
 logger = logging.getLogger(__name__)
 
+# Keep proxies from caching or buffering the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _event_stream(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[str]:
+    """Serialize generation events, opening with a start event so headers go out immediately"""
+    yield _sse("start", {"ai_powered": openai_service.client is not None})
+    async for event, data in events:
+        yield _sse(event, data)
+
 
 class JobDescriptionRequest(BaseModel):
     """Request model for job description generation"""
@@ -97,6 +129,33 @@ async def generate_job_description(
         raise HTTPException(status_code=500, detail="Failed to generate job description")
 
 
+@router.post("/generate-job-description/stream")
+async def stream_job_description(
+    request: JobDescriptionRequest,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Generate a job description using AI, streamed as Server-Sent Events
+    
+    Emits a start event at once, token events as text is generated, a section
+    event as each section of the description completes, and a final done event
+    carrying the same data as /generate-job-description.
+    """
+    if current_user.user_type not in ["recruiter", "admin"]:
+        raise HTTPException(
+            status_code=403,
+            detail="Only recruiters and admins can generate job descriptions"
+        )
+    
+    events = openai_service.stream_job_description(
+        job_title=request.job_title,
+        company_info=request.company_info,
+        requirements=request.requirements,
+        benefits=request.benefits
+    )
+    return StreamingResponse(_event_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post("/analyze-resume-advanced")
 async def analyze_resume_advanced(
     request: ResumeAnalysisRequest,
@@ -220,6 +279,32 @@ async def generate_interview_questions_advanced(
         raise HTTPException(status_code=500, detail="Failed to generate interview questions")
 
 
+@router.post("/generate-interview-questions-advanced/stream")
+async def stream_interview_questions_advanced(
+    request: InterviewQuestionsRequest,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Generate interview questions using AI, streamed as Server-Sent Events
+    
+    Emits a start event at once, token events as text is generated and a final
+    done event carrying the same data as /generate-interview-questions-advanced.
+    """
+    if current_user.user_type not in ["recruiter", "admin"]:
+        raise HTTPException(
+            status_code=403,
+            detail="Only recruiters and admins can generate interview questions"
+        )
+    
+    events = openai_service.stream_interview_questions_advanced(
+        job_description=request.job_description,
+        candidate_resume=request.candidate_resume,
+        interview_type=request.interview_type,
+        difficulty_level=request.difficulty_level
+    )
+    return StreamingResponse(_event_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post("/screen-candidate-advanced")
 async def screen_candidate_advanced(
     request: CandidateScreeningRequest,
@@ -256,6 +341,110 @@ async def screen_candidate_advanced(
         raise HTTPException(status_code=500, detail="Failed to screen candidate")
 
 
+@router.post("/screen-job-applicants/{job_id}")
+async def screen_job_applicants(
+    job_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Screen all applicants of a job in the background
+    
+    Applicants are ranked with the local skill matcher and only the best
+    share is screened by AI, several candidates per request. Results are
+    written to the applications' internal ratings and the job's candidate
+    rankings. Poll the returned task for progress.
+    """
+    if current_user.user_type not in ["recruiter", "admin"]:
+        raise HTTPException(status_code=403, detail="Only recruiters and admins can screen applicants")
+    
+    company_id = (await db.execute(select(Job.company_id).where(Job.id == job_id))).scalar_one_or_none()
+    if company_id is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if current_user.user_type == "recruiter" and current_user.company_id != company_id:
+        raise HTTPException(status_code=403, detail="Not authorized to screen applicants for this job")
+    
+    from ....utils.background_tasks import schedule_bulk_screening
+    task_id = await schedule_bulk_screening(job_id, company_id)
+    
+    return {
+        "success": True,
+        "message": "Applicant screening started",
+        "task_id": task_id,
+        "job_id": job_id,
+        "status": "queued"
+    }
+
+
+@router.post("/talent-pool-matches/{job_id}")
+async def match_job_to_talent_pool(
+    job_id: int,
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Match a job against the talent pool in the background
+
+    Every pool candidate with auto matching enabled is scored and the best
+    matches are saved as pending job matches. Poll the returned task with
+    the screening task status endpoint.
+    """
+    if current_user.user_type not in ["recruiter", "admin"]:
+        raise HTTPException(status_code=403, detail="Only recruiters and admins can match jobs")
+
+    company_id = (await db.execute(select(Job.company_id).where(Job.id == job_id))).scalar_one_or_none()
+    if company_id is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if current_user.user_type == "recruiter" and current_user.company_id != company_id:
+        raise HTTPException(status_code=403, detail="Not authorized to match this job")
+
+    from ....utils.background_tasks import schedule_talent_pool_matching
+    task_id = await schedule_talent_pool_matching(job_id, company_id)
+
+    return {
+        "success": True,
+        "message": "Talent pool matching started",
+        "task_id": task_id,
+        "job_id": job_id,
+        "status": "queued"
+    }
+
+
+@router.get("/screen-job-applicants/tasks/{task_id}")
+async def get_screening_status(
+    task_id: str,
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Get the status and progress of an applicant screening task
+
+    Recruiters can only see tasks for their own company's jobs.
+    """
+    if current_user.user_type not in ["recruiter", "admin"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    from ....utils.background_tasks import task_manager
+    task_status = task_manager.get_task_status(task_id)
+    if not task_status:
+        raise HTTPException(status_code=404, detail="Task not found")
+    owner = task_status.get("owner", {})
+    if current_user.user_type == "recruiter" and (
+        owner.get("company_id") is None or owner["company_id"] != current_user.company_id
+    ):
+        raise HTTPException(status_code=403, detail="Not authorized to view this task")
+    
+    return {
+        "task_id": task_id,
+        "job_id": owner.get("job_id"),
+        "status": task_status["status"],
+        "progress": task_status.get("progress"),
+        "created_at": task_status["created_at"].isoformat(),
+        "completed_at": task_status["completed_at"].isoformat() if task_status.get("completed_at") else None,
+        "result": task_status.get("result"),
+        "error": task_status.get("error")
+    }
+
+
 @router.post("/job-recommendations-personalized")
 async def get_personalized_job_recommendations(
     request: JobRecommendationRequest,
@@ -8,9 +8,8 @@ from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ....core.database import get_db
-from ....core.security import get_current_user
-from ....models.user import User
+from ....core.database import get_db, get_read_db
+from ....core.security import get_current_principal, Principal
 from ....services.analytics_service import analytics_service
 
 router = APIRouter()
@@ -18,8 +17,8 @@ router = APIRouter()
 
 @router.get("/dashboard")
 async def get_dashboard_analytics(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get dashboard analytics based on user type
@@ -43,8 +42,8 @@ async def get_dashboard_analytics(
 @router.get("/jobs/{job_id}")
 async def get_job_analytics(
     job_id: int,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get detailed analytics for a specific job
@@ -71,8 +70,8 @@ async def get_job_analytics(
 @router.get("/applications")
 async def get_application_analytics(
     company_id: Optional[int] = Query(None, description="Filter by company ID"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get application analytics
@@ -86,8 +85,8 @@ async def get_application_analytics(
     try:
         # For recruiters, use their company ID
         if current_user.user_type == 'recruiter':
-            if current_user.recruiter_profile:
-                company_id = current_user.recruiter_profile.get('company_id')
+            if current_user.recruiter_profile_id:
+                company_id = current_user.company_id
             else:
                 raise HTTPException(status_code=400, detail="Recruiter profile not found")
         
@@ -107,8 +106,8 @@ async def get_application_analytics(
 @router.get("/trends/applications")
 async def get_application_trends(
     days: int = Query(30, ge=7, le=365, description="Number of days to analyze"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get application trends over time
@@ -131,8 +130,8 @@ async def get_application_trends(
 @router.get("/performance/jobs")
 async def get_job_performance(
     limit: int = Query(10, ge=1, le=50, description="Number of top jobs to return"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get top performing jobs by application count
@@ -146,8 +145,8 @@ async def get_job_performance(
         # Get company ID for recruiters
         company_id = None
         if current_user.user_type == 'recruiter':
-            if current_user.recruiter_profile:
-                company_id = current_user.recruiter_profile.get('company_id')
+            if current_user.recruiter_profile_id:
+                company_id = current_user.company_id
             else:
                 raise HTTPException(status_code=400, detail="Recruiter profile not found")
         
@@ -167,8 +166,8 @@ async def get_job_performance(
 
 @router.get("/conversion-rates")
 async def get_conversion_rates(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get conversion rates for the recruitment funnel
@@ -182,8 +181,8 @@ async def get_conversion_rates(
         # Get company ID for recruiters
         company_id = None
         if current_user.user_type == 'recruiter':
-            if current_user.recruiter_profile:
-                company_id = current_user.recruiter_profile.get('company_id')
+            if current_user.recruiter_profile_id:
+                company_id = current_user.company_id
         
         # This would be implemented in the analytics service
         return {
@@ -203,8 +202,8 @@ async def get_conversion_rates(
 
 @router.get("/time-to-hire")
 async def get_time_to_hire_metrics(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get time-to-hire metrics
@@ -218,8 +217,8 @@ async def get_time_to_hire_metrics(
         # Get company ID for recruiters
         company_id = None
         if current_user.user_type == 'recruiter':
-            if current_user.recruiter_profile:
-                company_id = current_user.recruiter_profile.get('company_id')
+            if current_user.recruiter_profile_id:
+                company_id = current_user.company_id
         
         # This would be implemented in the analytics service
         return {
@@ -236,8 +235,8 @@ async def get_time_to_hire_metrics(
 
 @router.get("/candidate-sources")
 async def get_candidate_sources(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get candidate source analytics
@@ -265,8 +264,8 @@ async def get_candidate_sources(
 
 @router.get("/skills-demand")
 async def get_skills_demand_analytics(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get skills demand analytics
@@ -293,7 +292,7 @@ async def get_skills_demand_analytics(
 @router.post("/reports/generate")
 async def generate_analytics_report(
     report_type: str = Query(..., regex="^(monthly|quarterly|annual|custom)$"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
@@ -310,8 +309,8 @@ async def generate_analytics_report(
         # Get company ID for recruiters
         company_id = None
         if current_user.user_type == 'recruiter':
-            if current_user.recruiter_profile:
-                company_id = current_user.recruiter_profile.get('company_id')
+            if current_user.recruiter_profile_id:
+                company_id = current_user.company_id
         
         # Schedule report generation
         task_id = await task_manager.add_task(
@@ -334,7 +333,7 @@ async def generate_analytics_report(
 @router.get("/reports/{task_id}/status")
 async def get_report_status(
     task_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Dict[str, Any]:
     """
     Get the status of a report generation task
@@ -9,12 +9,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_candidate, require_recruiter
+from app.core.database import get_db, get_read_db
+from app.core.security import get_current_principal, require_candidate, require_recruiter, Principal
 from app.core.exceptions import NotFoundException, ValidationException, AuthorizationException
 from app.models.application import Application
 from app.models.job import Job
-from app.models.user import User
 
 router = APIRouter()
 
@@ -24,8 +23,8 @@ async def list_applications(
     skip: int = Query(0, ge=0, description="Number of applications to skip"),
     limit: int = Query(20, ge=1, le=100, description="Number of applications to return"),
     status_filter: Optional[str] = Query(None, description="Filter by application status"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List applications
@@ -37,13 +36,13 @@ async def list_applications(
     if current_user.user_type == "candidate":
         # Candidate sees their own applications
         query = select(Application).where(
-            Application.candidate_id == current_user.candidate_profile.id
+            Application.candidate_id == current_user.candidate_profile_id
         )
     
     elif current_user.user_type == "recruiter":
         # Recruiter sees applications for their jobs
         query = select(Application).join(Job).where(
-            Job.recruiter_id == current_user.recruiter_profile.id
+            Job.recruiter_id == current_user.recruiter_profile_id
         )
     
     else:
@@ -69,7 +68,7 @@ async def list_applications(
 @router.get("/{application_id}")
 async def get_application(
     application_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -90,7 +89,7 @@ async def get_application(
     
     if current_user.user_type == "candidate":
         # Candidate can only see their own applications
-        has_access = application.candidate_id == current_user.candidate_profile.id
+        has_access = application.candidate_id == current_user.candidate_profile_id
     
     elif current_user.user_type == "recruiter":
         # Recruiter can see applications for their jobs
@@ -98,7 +97,7 @@ async def get_application(
             select(Job).where(Job.id == application.job_id)
         )
         job = job_result.scalar_one_or_none()
-        has_access = job and job.recruiter_id == current_user.recruiter_profile.id
+        has_access = job and job.recruiter_id == current_user.recruiter_profile_id
     
     if not has_access:
         raise AuthorizationException("Access denied")
@@ -116,7 +115,7 @@ async def get_application(
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_application(
     application_data: dict,  # Simplified for now
-    current_user: User = Depends(require_candidate),
+    current_user: Principal = Depends(require_candidate),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -146,7 +145,7 @@ async def create_application(
         select(Application).where(
             and_(
                 Application.job_id == job_id,
-                Application.candidate_id == current_user.candidate_profile.id
+                Application.candidate_id == current_user.candidate_profile_id
             )
         )
     )
@@ -160,7 +159,7 @@ async def create_application(
     
     application = Application(
         job_id=job_id,
-        candidate_id=current_user.candidate_profile.id,
+        candidate_id=current_user.candidate_profile_id,
         cover_letter=application_data.get("cover_letter"),
         form_responses=application_data.get("form_responses", {}),
         status="submitted",
@@ -182,7 +181,7 @@ async def create_application(
 async def update_application_status(
     application_id: int,
     status_data: dict,
-    current_user: User = Depends(require_recruiter),
+    current_user: Principal = Depends(require_recruiter),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -211,7 +210,7 @@ async def update_application_status(
     )
     job = job_result.scalar_one_or_none()
     
-    if not job or job.recruiter_id != current_user.recruiter_profile.id:
+    if not job or job.recruiter_id != current_user.recruiter_profile_id:
         raise AuthorizationException("Access denied")
     
     # Update application
@@ -228,7 +227,7 @@ async def update_application_status(
 @router.delete("/{application_id}")
 async def withdraw_application(
     application_id: int,
-    current_user: User = Depends(require_candidate),
+    current_user: Principal = Depends(require_candidate),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -245,7 +244,7 @@ async def withdraw_application(
         raise NotFoundException("Application not found")
     
     # Check if candidate owns the application
-    if application.candidate_id != current_user.candidate_profile.id:
+    if application.candidate_id != current_user.candidate_profile_id:
         raise AuthorizationException("Access denied")
     
     # Check if application can be withdrawn
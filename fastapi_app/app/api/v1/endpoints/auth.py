@@ -6,7 +6,7 @@ Handles user authentication, registration, password reset, and email verificatio
 
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -15,13 +15,15 @@ from app.core.security import (
     authenticate_user,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
+    get_password_hash_async,
     verify_password_reset_token,
     create_password_reset_token,
     verify_email_verification_token,
     create_email_verification_token,
     get_current_user,
-    verify_token
+    verify_token,
+    revoke_token,
+    revoke_user_tokens
 )
 from app.core.config import settings
 from app.core.exceptions import (
@@ -79,7 +81,7 @@ async def register(
             raise ConflictException("Username already taken")
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     db_user = User(
         email=user_data.email,
@@ -274,12 +276,15 @@ async def confirm_password_reset(
         raise NotFoundException("User not found")
     
     # Update password
-    user.hashed_password = get_password_hash(reset_data.new_password)
+    user.hashed_password = await get_password_hash_async(reset_data.new_password)
     user.reset_token = None
     user.reset_token_expires = None
     
     await db.commit()
     
+    # Sign out existing sessions
+    revoke_user_tokens(user.id)
+    
     return {"message": "Password reset successfully"}
 
 
@@ -345,14 +350,16 @@ async def resend_verification_email(
 
 @router.post("/logout")
 async def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user: User = Depends(get_current_user)
 ):
     """
     User logout
     
-    In a stateless JWT system, logout is handled client-side by discarding tokens.
-    This endpoint exists for consistency and future token blacklisting.
+    Revokes the access token used for this request until it expires.
+    Clients should also discard their refresh token.
     """
+    revoke_token(credentials.credentials)
     return {"message": "Logged out successfully"}
 
 
@@ -9,11 +9,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_recruiter
+from app.core.database import get_db, get_read_db
+from app.core.security import require_recruiter, Principal
 from app.core.exceptions import NotFoundException, ValidationException
 from app.models.company import Company
-from app.models.user import User
+from app.models.user import RecruiterProfile
 
 router = APIRouter()
 
@@ -25,7 +25,7 @@ async def list_companies(
     search: Optional[str] = Query(None, description="Search term for company name"),
     industry: Optional[str] = Query(None, description="Industry filter"),
     company_size: Optional[str] = Query(None, description="Company size filter"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     List companies with filtering and pagination
@@ -72,7 +72,7 @@ async def list_companies(
 @router.get("/{company_id}")
 async def get_company(
     company_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get company details by ID
@@ -96,7 +96,7 @@ async def get_company(
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_company(
     company_data: dict,  # Simplified for now
-    current_user: User = Depends(require_recruiter),
+    current_user: Principal = Depends(require_recruiter),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -155,9 +155,11 @@ async def create_company(
     await db.refresh(company)
     
     # Associate recruiter with company
-    if current_user.recruiter_profile:
-        current_user.recruiter_profile.company_id = company.id
-        await db.commit()
+    if current_user.recruiter_profile_id:
+        recruiter_profile = await db.get(RecruiterProfile, current_user.recruiter_profile_id)
+        if recruiter_profile:
+            recruiter_profile.company_id = company.id
+            await db.commit()
     
     return company
 
@@ -166,7 +168,7 @@ async def create_company(
 async def update_company(
     company_id: int,
     company_data: dict,
-    current_user: User = Depends(require_recruiter),
+    current_user: Principal = Depends(require_recruiter),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -183,7 +185,7 @@ async def update_company(
         raise NotFoundException("Company not found")
     
     # Check if user has permission to update this company
-    if (current_user.recruiter_profile.company_id != company_id and 
+    if (current_user.company_id != company_id and 
         not current_user.is_superuser):
         raise ValidationException("You don't have permission to update this company")
     
@@ -208,7 +210,7 @@ async def get_company_jobs(
     company_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get jobs for a specific company
@@ -11,8 +11,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import os
 from pathlib import Path
 
-from ....core.database import get_db
-from ....core.security import get_current_user
+from ....core.database import get_db, get_read_db
+from ....core.security import get_current_user, get_current_principal, Principal
 from ....models.user import User
 from ....utils.file_handler import file_handler
 
@@ -24,7 +24,8 @@ async def upload_file(
     file: UploadFile = File(..., description="File to upload"),
     file_type: str = Form("document", regex="^(image|document|video)$", description="Type of file"),
     subfolder: Optional[str] = Form(None, description="Optional subfolder for organization"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Upload a file to the server
@@ -37,7 +38,8 @@ async def upload_file(
             file,
             file_type=file_type,
             user_id=current_user.id,
-            subfolder=subfolder
+            subfolder=subfolder,
+            db=db
         )
         
         return {
@@ -56,7 +58,8 @@ async def upload_multiple_files(
     files: List[UploadFile] = File(..., description="Files to upload"),
     file_type: str = Form("document", regex="^(image|document|video)$", description="Type of files"),
     subfolder: Optional[str] = Form(None, description="Optional subfolder for organization"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Upload multiple files to the server
@@ -76,7 +79,8 @@ async def upload_multiple_files(
                     file,
                     file_type=file_type,
                     user_id=current_user.id,
-                    subfolder=subfolder
+                    subfolder=subfolder,
+                    db=db
                 )
                 uploaded_files.append(file_info)
             except Exception as e:
@@ -114,7 +118,8 @@ async def upload_profile_picture(
             file,
             file_type="image",
             user_id=current_user.id,
-            subfolder="profile_pictures"
+            subfolder="profile_pictures",
+            db=db
         )
         
         # Update user profile with new picture URL
@@ -163,7 +168,8 @@ async def upload_resume(
             file,
             file_type="document",
             user_id=current_user.id,
-            subfolder="resumes"
+            subfolder="resumes",
+            db=db
         )
         
         # Update user profile with resume URL
@@ -241,7 +247,8 @@ async def download_file(
 @router.delete("/delete")
 async def delete_file(
     file_path: str = Query(..., description="Path of file to delete"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Delete a file
@@ -255,7 +262,7 @@ async def delete_file(
            current_user.user_type != 'admin':
             raise HTTPException(status_code=403, detail="Access denied")
         
-        success = await file_handler.delete_file(file_path)
+        success = await file_handler.delete_file(file_path, db=db)
         
         if not success:
             raise HTTPException(status_code=404, detail="File not found or could not be deleted")
@@ -307,46 +314,34 @@ async def get_file_info(
 async def list_user_files(
     file_type: Optional[str] = Query(None, regex="^(image|document|video)$", description="Filter by file type"),
     subfolder: Optional[str] = Query(None, description="Filter by subfolder"),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of files to return"),
+    offset: int = Query(0, ge=0, description="Number of files to skip"),
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     List files uploaded by the current user
     
-    Returns a list of files uploaded by the user with optional filtering.
+    Returns a list of files uploaded by the user with optional filtering,
+    newest first.
     """
     try:
-        user_upload_dir = Path(f"media/uploads")
-        files = []
-        
-        # Search in user's directories
-        search_dirs = []
-        if file_type:
-            search_dirs.append(user_upload_dir / file_type / str(current_user.id))
-        else:
-            for ft in ['image', 'document', 'video']:
-                search_dirs.append(user_upload_dir / ft / str(current_user.id))
-        
-        for search_dir in search_dirs:
-            if search_dir.exists():
-                if subfolder:
-                    search_dir = search_dir / subfolder
-                    if not search_dir.exists():
-                        continue
-                
-                for file_path in search_dir.rglob('*'):
-                    if file_path.is_file() and not file_path.name.startswith('.'):
-                        file_info = await file_handler.get_file_info(str(file_path))
-                        if file_info:
-                            files.append(file_info)
-        
-        # Sort by modification time (newest first)
-        files.sort(key=lambda x: x.get('modified_at', 0), reverse=True)
+        files, total_files = await file_handler.list_files(
+            current_user.id,
+            file_type=file_type,
+            subfolder=subfolder,
+            limit=limit,
+            offset=offset,
+            db=db
+        )
         
         return {
             "files": files,
-            "total_files": len(files),
+            "total_files": total_files,
             "file_type_filter": file_type,
-            "subfolder_filter": subfolder
+            "subfolder_filter": subfolder,
+            "limit": limit,
+            "offset": offset
         }
         
     except Exception as e:
@@ -393,7 +388,8 @@ async def create_file_archive(
 
 @router.get("/storage-usage")
 async def get_storage_usage(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
 ) -> Dict[str, Any]:
     """
     Get storage usage statistics for the current user
@@ -401,20 +397,8 @@ async def get_storage_usage(
     Returns information about file storage usage and limits.
     """
     try:
-        user_upload_dir = Path(f"media/uploads")
-        total_size = 0
-        file_count = 0
-        file_types = {"image": 0, "document": 0, "video": 0}
-        
-        # Calculate storage usage
-        for file_type in ['image', 'document', 'video']:
-            type_dir = user_upload_dir / file_type / str(current_user.id)
-            if type_dir.exists():
-                for file_path in type_dir.rglob('*'):
-                    if file_path.is_file():
-                        total_size += file_path.stat().st_size
-                        file_count += 1
-                        file_types[file_type] += 1
+        usage = await file_handler.get_storage_usage(current_user.id, db=db)
+        total_size = usage["total_bytes"]
         
         # Storage limits (in bytes)
         storage_limit = 1024 * 1024 * 1024  # 1GB default limit
@@ -426,8 +410,8 @@ async def get_storage_usage(
         return {
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
-            "total_files": file_count,
-            "file_types": file_types,
+            "total_files": usage["total_files"],
+            "file_types": usage["file_types"],
             "storage_limit_bytes": storage_limit,
             "storage_limit_mb": round(storage_limit / (1024 * 1024), 2),
             "usage_percentage": round(usage_percentage, 2),
@@ -442,7 +426,8 @@ async def get_storage_usage(
 @router.post("/cleanup")
 async def cleanup_old_files(
     days_old: int = Form(30, ge=1, le=365, description="Delete files older than this many days"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Clean up old files for the current user
@@ -450,28 +435,9 @@ async def cleanup_old_files(
     Removes files older than the specified number of days.
     """
     try:
-        import time
-        from pathlib import Path
-        
-        user_upload_dir = Path(f"media/uploads")
-        cutoff_time = time.time() - (days_old * 24 * 60 * 60)
-        deleted_count = 0
-        deleted_size = 0
-        
-        # Clean up user's files
-        for file_type in ['image', 'document', 'video']:
-            type_dir = user_upload_dir / file_type / str(current_user.id)
-            if type_dir.exists():
-                for file_path in type_dir.rglob('*'):
-                    if file_path.is_file() and file_path.stat().st_mtime < cutoff_time:
-                        try:
-                            file_size = file_path.stat().st_size
-                            file_path.unlink()
-                            deleted_count += 1
-                            deleted_size += file_size
-                        except Exception as e:
-                            # Log error but continue cleanup
-                            pass
+        result = await file_handler.remove_old_files(days_old, owner_id=current_user.id, db=db)
+        deleted_count = result["deleted_files"]
+        deleted_size = result["deleted_bytes"]
         
         return {
             "message": f"Cleaned up {deleted_count} old files",
@@ -9,8 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
 
-from app.core.database import get_db
-from app.core.security import get_current_user, require_candidate, require_recruiter
+from app.core.database import get_db, get_read_db
+from app.core.security import get_current_user, require_candidate, require_recruiter, Principal
 from app.core.exceptions import NotFoundException, ValidationException
 from app.models.user import User, CandidateProfile, RecruiterProfile
 from app.schemas.user import (
@@ -30,7 +30,7 @@ router = APIRouter()
 @router.get("/me", response_model=UserWithProfileResponse)
 async def get_current_user_profile(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get current user with profile information
@@ -66,7 +66,7 @@ async def get_current_user_profile(
 @router.put("/candidate-profile", response_model=CandidateProfileResponse)
 async def update_candidate_profile(
     profile_data: CandidateProfileUpdate,
-    current_user: User = Depends(require_candidate),
+    current_user: Principal = Depends(require_candidate),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -100,7 +100,7 @@ async def update_candidate_profile(
 @router.put("/recruiter-profile", response_model=RecruiterProfileResponse)
 async def update_recruiter_profile(
     profile_data: RecruiterProfileUpdate,
-    current_user: User = Depends(require_recruiter),
+    current_user: Principal = Depends(require_recruiter),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -142,16 +142,20 @@ async def change_password(
     
     Changes the current user's password after verifying the current password.
     """
-    from app.core.security import verify_password, get_password_hash
+    from app.core.security import verify_password_async, get_password_hash_async, revoke_user_tokens
     
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise ValidationException("Current password is incorrect")
     
-    # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    # Update password (current_user belongs to the read session)
+    user = await db.get(User, current_user.id)
+    user.hashed_password = await get_password_hash_async(password_data.new_password)
     await db.commit()
     
+    # Sign out existing sessions
+    revoke_user_tokens(current_user.id)
+    
     return {"message": "Password changed successfully"}
 
 
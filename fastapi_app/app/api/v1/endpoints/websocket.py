@@ -10,9 +10,9 @@ from typing import Dict, Any, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query
 from fastapi.security import HTTPBearer
 
-from ....core.security import get_current_user_websocket, get_current_user
-from ....services.websocket_service import websocket_service, MessageType, NotificationPriority
-from ....models.user import User
+from ....core.security import get_current_user_websocket, get_current_principal, verify_token, Principal
+from ....services.websocket_service import websocket_service, MessageType, NotificationPriority, MessageCodec
+from ....services.notification_store import notification_store
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,7 +23,9 @@ security = HTTPBearer()
 async def websocket_endpoint(
     websocket: WebSocket, 
     user_id: int,
-    token: Optional[str] = Query(None)
+    token: Optional[str] = Query(None),
+    encoding: Optional[str] = Query(None),
+    last_seq: Optional[int] = Query(None, ge=0)
 ):
     """
     WebSocket endpoint for real-time communication
@@ -32,6 +34,14 @@ async def websocket_endpoint(
         websocket: WebSocket connection
         user_id: User ID for the connection
         token: Optional JWT token for authentication
+        encoding: Optional wire encoding (json, compact, msgpack or auto).
+            Can also be negotiated with the hirequick.json, hirequick.compact
+            or hirequick.msgpack subprotocols. Defaults to json. Clients
+            that negotiate nothing keep the original user_status and
+            per-user typing_indicator frames; the others get batched
+            presence_update frames and one typing_indicator per room change.
+        last_seq: Last notification sequence number the client has seen.
+            Missed notifications are replayed after connecting (requires token).
     """
     try:
         # Authenticate user (simplified for WebSocket)
@@ -41,7 +51,8 @@ async def websocket_endpoint(
                 user_data = {
                     "user_id": user_id,
                     "name": f"User {user_id}",
-                    "user_type": "candidate"  # This would come from token validation
+                    "user_type": "candidate",  # This would come from token validation
+                    "can_replay": _token_matches_user(token, user_id)
                 }
             except Exception as e:
                 await websocket.close(code=4001, reason="Authentication failed")
@@ -49,14 +60,35 @@ async def websocket_endpoint(
         else:
             user_data = {"user_id": user_id, "name": f"User {user_id}", "user_type": "guest"}
         
+        # Negotiate wire encoding (plain JSON unless the client asks otherwise)
+        message_encoding, subprotocol = MessageCodec.negotiate(
+            requested=encoding,
+            subprotocols=websocket.scope.get("subprotocols", []),
+            extensions=websocket.headers.get("sec-websocket-extensions", "")
+        )
+        
         # Accept connection
-        await websocket_service.manager.connect(websocket, user_id, user_data)
+        await websocket_service.manager.connect(
+            websocket, user_id, user_data,
+            encoding=message_encoding,
+            subprotocol=subprotocol,
+            legacy=encoding is None and subprotocol is None,
+            can_replay=user_data.get("can_replay", False)
+        )
+        
+        # Catch up on notifications sent while the client was away
+        if last_seq is not None and websocket_service.manager.can_replay(websocket):
+            await websocket_service.replay_missed(websocket, user_id, last_seq)
         
         try:
             while True:
-                # Receive message from client
-                data = await websocket.receive_text()
-                message = json.loads(data)
+                # Receive message from client (text or binary frame)
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", 1000))
+                
+                data = frame.get("bytes") if frame.get("text") is None else frame["text"]
+                message = websocket_service.manager.decode_message(websocket, data)
                 
                 # Handle different message types
                 await handle_websocket_message(websocket, user_id, message)
@@ -79,10 +111,10 @@ async def handle_websocket_message(websocket: WebSocket, user_id: int, message:
     try:
         if message_type == "ping":
             # Respond to ping with pong
-            await websocket.send_text(json.dumps({
+            await websocket_service.manager.send_to_socket(websocket, {
                 "type": "pong",
                 "timestamp": message.get("timestamp")
-            }))
+            })
             
         elif message_type == "join_room":
             room_id = message.get("room_id")
@@ -112,23 +144,88 @@ async def handle_websocket_message(websocket: WebSocket, user_id: int, message:
             if room_id:
                 await websocket_service.handle_typing_indicator(user_id, room_id, is_typing)
                 
+        elif message_type == "subscribe_presence":
+            user_ids = message.get("user_ids") or []
+            websocket_service.manager.subscribe_presence(user_id, [int(uid) for uid in user_ids])
+            
+        elif message_type == "unsubscribe_presence":
+            user_ids = message.get("user_ids")
+            websocket_service.manager.unsubscribe_presence(
+                user_id,
+                [int(uid) for uid in user_ids] if user_ids is not None else None
+            )
+            
+        elif message_type == "replay":
+            if websocket_service.manager.can_replay(websocket):
+                await websocket_service.replay_missed(websocket, user_id, int(message.get("last_seq", 0)))
+            else:
+                await websocket_service.manager.send_to_socket(websocket, {
+                    "type": "error",
+                    "message": "Replay requires an authenticated connection"
+                })
+            
         elif message_type == "get_online_users":
-            online_users = websocket_service.manager.get_online_users()
-            await websocket.send_text(json.dumps({
+            skip = max(int(message.get("skip", 0)), 0)
+            limit = message.get("limit")
+            online_users = websocket_service.manager.get_online_users(
+                skip=skip,
+                limit=int(limit) if limit is not None else None
+            )
+            await websocket_service.manager.send_to_socket(websocket, {
                 "type": "online_users",
-                "users": online_users
-            }))
+                "users": online_users,
+                "total": websocket_service.manager.get_online_count()
+            })
             
         else:
             logger.warning(f"Unknown message type: {message_type}")
             
     except Exception as e:
         logger.error(f"Error handling WebSocket message: {e}")
-        await websocket.send_text(json.dumps({
+        await websocket_service.manager.send_to_socket(websocket, {
             "type": "error",
             "message": "Failed to process message",
             "error": str(e)
-        }))
+        })
+
+
+def _token_matches_user(token: str, user_id: int) -> bool:
+    """Check that a token is a valid access token for the given user"""
+    payload = verify_token(token)
+    return bool(
+        payload
+        and payload.get("type") != "refresh"
+        and payload.get("sub") == str(user_id)
+    )
+
+
+@router.get("/notifications/replay")
+async def replay_notifications(
+    last_seq: int = Query(0, ge=0, description="Last notification sequence number seen"),
+    limit: int = Query(200, ge=1, le=1000, description="Number of notifications to return"),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Get notifications logged after a sequence number
+    
+    Args:
+        last_seq: Last notification sequence number seen by the client
+        limit: Number of notifications to return
+        current_user: Current authenticated user
+    """
+    try:
+        messages = await notification_store.replay(current_user.id, last_seq, limit=limit)
+        
+        return {
+            "success": True,
+            "messages": messages,
+            "last_seq": messages[-1]["seq"] if messages else last_seq,
+            "has_more": len(messages) == limit
+        }
+        
+    except Exception as e:
+        logger.error(f"Error replaying notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to replay notifications")
 
 
 @router.post("/notifications/send")
@@ -138,7 +235,7 @@ async def send_notification(
     message: str,
     priority: NotificationPriority = NotificationPriority.MEDIUM,
     data: Optional[Dict[str, Any]] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Send a notification to a specific user
@@ -175,7 +272,7 @@ async def send_notification(
 async def broadcast_system_message(
     message: str,
     priority: NotificationPriority = NotificationPriority.MEDIUM,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Broadcast a system message to all connected users
@@ -209,7 +306,7 @@ async def notify_application_update(
     candidate_id: int,
     status: str,
     message: Optional[str] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Send application status update notification
@@ -248,7 +345,7 @@ async def notify_job_update(
     update_type: str,
     message: str,
     affected_users: Optional[list[int]] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Send job update notification
@@ -286,7 +383,7 @@ async def send_interview_reminder(
     user_id: int,
     interview_data: Dict[str, Any],
     reminder_time: str,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Send interview reminder notification
@@ -317,7 +414,7 @@ async def send_interview_reminder(
 
 
 @router.get("/stats")
-async def get_websocket_stats(current_user: User = Depends(get_current_user)):
+async def get_websocket_stats(current_user: Principal = Depends(get_current_principal)):
     """
     Get WebSocket connection statistics
     
@@ -338,20 +435,30 @@ async def get_websocket_stats(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/online-users")
-async def get_online_users(current_user: User = Depends(get_current_user)):
+async def get_online_users(
+    skip: int = Query(0, ge=0, description="Number of online users to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of online users to return"),
+    current_user: Principal = Depends(get_current_principal)
+):
     """
     Get list of currently online users
     
     Args:
+        skip: Number of online users to skip
+        limit: Number of online users to return
         current_user: Current authenticated user
     """
     try:
-        online_users = websocket_service.manager.get_online_users()
+        online_users = websocket_service.manager.get_online_users(skip=skip, limit=limit)
+        total = websocket_service.manager.get_online_count()
         
         return {
             "success": True,
             "online_users": online_users,
-            "count": len(online_users)
+            "count": total,
+            "skip": skip,
+            "limit": limit,
+            "has_more": skip + limit < total
         }
         
     except Exception as e:
@@ -363,7 +470,7 @@ async def get_online_users(current_user: User = Depends(get_current_user)):
 async def join_room(
     room_id: str,
     user_id: Optional[int] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Join a WebSocket room
@@ -394,7 +501,7 @@ async def join_room(
 async def leave_room(
     room_id: str,
     user_id: Optional[int] = None,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Leave a WebSocket room
@@ -424,7 +531,7 @@ async def leave_room(
 @router.get("/rooms/{room_id}/users")
 async def get_room_users(
     room_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get users in a specific room
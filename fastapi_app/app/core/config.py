@@ -37,7 +37,61 @@ class Settings(BaseSettings):
         default=False,
         description="Enable SQLAlchemy query logging"
     )
-    
+    DATABASE_POOL_SIZE: int = Field(
+        default=10,
+        description="Connections kept open per engine (server databases and the SQLite read pool)"
+    )
+    DATABASE_MAX_OVERFLOW: int = Field(
+        default=20,
+        description="Extra connections allowed beyond the pool size under load"
+    )
+    DATABASE_POOL_TIMEOUT: float = Field(
+        default=30.0,
+        description="Seconds to wait for a pooled connection before failing"
+    )
+    DATABASE_POOL_RECYCLE: int = Field(
+        default=1800,
+        description="Seconds after which pooled connections are replaced (-1 disables)"
+    )
+    DATABASE_POOL_PRE_PING: bool = Field(
+        default=True,
+        description="Check pooled server connections are alive before use"
+    )
+    DATABASE_REPLICA_URLS: str = Field(
+        default="",
+        description="Read replica connection URLs (comma-separated); reads rotate over them"
+    )
+    DATABASE_REPLICA_LAG_TOLERANCE: float = Field(
+        default=5.0,
+        description="Seconds a client's reads stay on the primary after it writes (0 disables)"
+    )
+
+    # SQLite tuning
+    SQLITE_JOURNAL_MODE: str = Field(
+        default="WAL",
+        description="SQLite journal mode; WAL lets readers run alongside the writer"
+    )
+    SQLITE_SYNCHRONOUS: str = Field(
+        default="NORMAL",
+        description="SQLite synchronous level (NORMAL is durable across app crashes in WAL mode)"
+    )
+    SQLITE_MMAP_SIZE: int = Field(
+        default=256 * 1024 * 1024,  # 256MB
+        description="Bytes of the database file memory-mapped per connection (0 disables)"
+    )
+    SQLITE_CACHE_SIZE: int = Field(
+        default=-64000,
+        description="SQLite page cache per connection (negative values are KiB)"
+    )
+    SQLITE_BUSY_TIMEOUT: int = Field(
+        default=5000,
+        description="Milliseconds to wait on a locked SQLite database before failing"
+    )
+    SQLITE_WRITER_POOL_SIZE: int = Field(
+        default=1,
+        description="Connections in the SQLite write pool (1 serializes writes in-process)"
+    )
+
     # Security
     SECRET_KEY: str = Field(
         default="your-secret-key-change-in-production",
@@ -62,6 +116,28 @@ class Settings(BaseSettings):
         default="auto",
         description="Deprecated password schemes"
     )
+    PWD_BCRYPT_ROUNDS: int = Field(
+        default=12,
+        description="bcrypt cost factor; hashes with a different cost are upgraded on login"
+    )
+    PWD_HASH_WORKERS: Optional[int] = Field(
+        default=None,
+        description="Threads for password hashing (defaults to the number of CPU cores)"
+    )
+    
+    # Authenticated principal cache
+    AUTH_PRINCIPAL_CACHE_TTL: float = Field(
+        default=30.0,
+        description="Seconds an authenticated user snapshot is cached (0 disables)"
+    )
+    AUTH_PRINCIPAL_CACHE_SIZE: int = Field(
+        default=10000,
+        description="Maximum number of cached authenticated user snapshots"
+    )
+    JWT_CACHE_SIZE: int = Field(
+        default=10000,
+        description="Maximum number of verified tokens cached until expiry (0 disables)"
+    )
     
     # File Upload
     MAX_FILE_SIZE: int = Field(
@@ -103,7 +179,107 @@ class Settings(BaseSettings):
         default=False,
         description="Enable AI features"
     )
+    OPENAI_BASE_URL: Optional[str] = Field(
+        default=None,
+        description="Base URL of an OpenAI-compatible API (defaults to the OpenAI API)"
+    )
+    OPENAI_RESUME_ANALYSIS_TEMPERATURE: float = Field(
+        default=0.3,
+        description="Sampling temperature for resume analysis (0 makes it cacheable by near-duplicate resume)"
+    )
     
+    # LLM gateway
+    LLM_MAX_CONCURRENCY: int = Field(
+        default=8,
+        description="Maximum concurrent LLM API calls per worker"
+    )
+    LLM_TENANT_MAX_CONCURRENCY: int = Field(
+        default=4,
+        description="Maximum concurrent LLM API calls per company (or user without a company)"
+    )
+    LLM_REQUESTS_PER_MINUTE: float = Field(
+        default=500,
+        description="LLM API requests allowed per minute per worker (0 disables)"
+    )
+    LLM_TOKENS_PER_MINUTE: float = Field(
+        default=90000,
+        description="Estimated LLM tokens (prompt plus max completion) allowed per minute per worker (0 disables)"
+    )
+    LLM_MAX_RETRIES: int = Field(
+        default=4,
+        description="Retries of LLM calls failing with 429, 5xx or connection errors"
+    )
+    LLM_RETRY_BACKOFF: float = Field(
+        default=0.5,
+        description="Initial retry backoff in seconds; doubles per attempt, with jitter"
+    )
+    
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache OpenAI responses by model, normalized prompt and temperature"
+    )
+    LLM_CACHE_PATH: str = Field(
+        default="cache/llm_responses.db",
+        description="SQLite file holding cached LLM responses"
+    )
+    LLM_CACHE_TTL: int = Field(
+        default=7 * 24 * 3600,  # 7 days
+        description="Seconds a cached LLM response stays valid"
+    )
+    LLM_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        description="Maximum cached LLM responses; least recently used are evicted"
+    )
+    LLM_CACHE_PRUNE_INTERVAL: float = Field(
+        default=60.0,
+        description="Seconds between removals of expired and least recently used LLM responses"
+    )
+    LLM_CACHE_NEAR_DUPLICATES: bool = Field(
+        default=False,
+        description="Reuse temperature-0 resume analyses for near-identical resume text"
+    )
+    LLM_CACHE_NEAR_DUPLICATE_DISTANCE: int = Field(
+        default=3,
+        description="Maximum differing SimHash bits (of 64) for resumes to count as near duplicates"
+    )
+
+    # Bulk candidate screening
+    BULK_SCREENING_LLM_SHARE: float = Field(
+        default=0.2,
+        description="Share of a job's applicants, best local matches first, sent to the LLM"
+    )
+    BULK_SCREENING_MAX_LLM_CANDIDATES: int = Field(
+        default=100,
+        description="Maximum applicants per job sent to the LLM"
+    )
+    BULK_SCREENING_BATCH_SIZE: int = Field(
+        default=8,
+        description="Maximum candidates packed into one screening prompt"
+    )
+    BULK_SCREENING_PROMPT_TOKENS: int = Field(
+        default=3000,
+        description="Estimated token budget for the candidate summaries in one screening prompt"
+    )
+
+    # Semantic search
+    EMBEDDING_INDEX_DIR: str = Field(
+        default="cache/embeddings",
+        description="Directory holding the embedding model and memory-mapped vector indexes"
+    )
+    EMBEDDING_DIM: int = Field(
+        default=128,
+        description="Dimension of job and resume embeddings"
+    )
+    EMBEDDING_INDEX_DTYPE: str = Field(
+        default="float32",
+        description="Vector index storage: float32, or int8 for a quarter of the size"
+    )
+    EMBEDDING_FIT_SAMPLE: int = Field(
+        default=50000,
+        description="Maximum documents per kind sampled to fit the embedding model"
+    )
+
     # Background Tasks
     CELERY_BROKER_URL: Optional[str] = Field(
         default=None,
@@ -150,12 +326,52 @@ class Settings(BaseSettings):
         default=True,
         description="Enable WebSocket support"
     )
+    WEBSOCKET_PRESENCE_FLUSH_INTERVAL: float = Field(
+        default=1.0,
+        description="Interval in seconds for batching presence and typing updates"
+    )
+    WEBSOCKET_TYPING_TTL: float = Field(
+        default=5.0,
+        description="Seconds before a typing indicator expires without a refresh"
+    )
+    NOTIFICATION_LOG_TTL_HOURS: int = Field(
+        default=72,
+        description="Hours notifications are kept for reconnect replay"
+    )
+    NOTIFICATION_REPLAY_BATCH_SIZE: int = Field(
+        default=200,
+        description="Maximum notifications per replay frame"
+    )
     
     # Monitoring
     SENTRY_DSN: Optional[str] = Field(
         default=None,
         description="Sentry DSN for error tracking"
     )
+    METRICS_ENABLED: bool = Field(
+        default=True,
+        description="Time requests and expose Prometheus metrics at /metrics"
+    )
+    METRICS_SAMPLE_RATE: float = Field(
+        default=1.0,
+        description="Fraction of requests timed (0.0-1.0); unsampled requests skip instrumentation"
+    )
+    METRICS_ALLOWED_IPS: str = Field(
+        default="127.0.0.1,::1",
+        description="Comma-separated client addresses or networks that may read /metrics without an admin token"
+    )
+    METRICS_SERVER_TIMING: bool = Field(
+        default=True,
+        description="Add Server-Timing headers with database and external call time to sampled responses"
+    )
+    PROFILER_INTERVAL_MS: float = Field(
+        default=5.0,
+        description="Default milliseconds between stack samples of the on-demand profiler"
+    )
+    PROFILER_MAX_SECONDS: float = Field(
+        default=60.0,
+        description="Longest profile an admin can request"
+    )
     
     def get_allowed_hosts(self) -> List[str]:
         """Get allowed hosts as a list"""
@@ -163,6 +379,14 @@ class Settings(BaseSettings):
             return ["*"]
         return [host.strip() for host in self.ALLOWED_HOSTS.split(",")]
     
+    def get_metrics_allowed_ips(self) -> List[str]:
+        """Get the addresses and networks allowed to scrape /metrics as a list"""
+        return [ip.strip() for ip in self.METRICS_ALLOWED_IPS.split(",") if ip.strip()]
+
+    def get_replica_urls(self) -> List[str]:
+        """Get read replica URLs as a list"""
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     @validator("AI_ENABLED", pre=True, always=True)
     def set_ai_enabled(cls, v, values):
         """Enable AI features if OpenAI API key is provided"""
@@ -2,35 +2,297 @@
 Database Configuration and Setup
 
 SQLAlchemy async database setup with SQLite support.
-Includes database initialization and session management.
+Includes database initialization, connection pooling and session management.
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
 from sqlalchemy.engine import Engine
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, List, Optional
+import itertools
 import sqlite3
+import threading
+import time
 import logging
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://"),
-    echo=settings.DATABASE_ECHO,
-    future=True,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+def _async_url(url: str) -> str:
+    """Use the async SQLite driver for plain sqlite:// URLs"""
+    return url.replace("sqlite://", "sqlite+aiosqlite://")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    """Check whether a URL points at an in-memory SQLite database"""
+    return url.startswith("sqlite") and (":memory:" in url or url.endswith("://"))
+
+
+DATABASE_URL = _async_url(settings.DATABASE_URL)
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = _is_sqlite_memory(DATABASE_URL)
+
+
+def _engine_options(url: str, pool_size: int, max_overflow: int) -> dict:
+    """Build engine keyword arguments with explicit pool sizing"""
+    options = {
+        "echo": settings.DATABASE_ECHO,
+        "future": True,
+    }
+
+    if url.startswith("sqlite"):
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT / 1000
+        }
+        if _is_sqlite_memory(url):
+            # In-memory databases live in a single connection
+            return options
+    else:
+        options["pool_recycle"] = settings.DATABASE_POOL_RECYCLE
+        options["pool_pre_ping"] = settings.DATABASE_POOL_PRE_PING
+
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT
+    )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, in_memory: bool = False, read_only: bool = False):
+    """Apply performance pragmas to a new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+        if not in_memory:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int, read_only: bool = False) -> AsyncEngine:
+    """Create an async engine, tuning SQLite connections as they open"""
+    async_engine = create_async_engine(url, **_engine_options(url, pool_size, max_overflow))
+
+    if url.startswith("sqlite"):
+        in_memory = _is_sqlite_memory(url)
+
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def set_sqlite_tuning_pragmas(dbapi_connection, connection_record):
+            """Tune SQLite connections (read-only ones reject writes)"""
+            _apply_sqlite_pragmas(dbapi_connection, in_memory=in_memory, read_only=read_only)
+
+    return async_engine
+
+
+# Create async engines
+# With SQLite, writes go through a small dedicated pool (one connection by
+# default, so writers queue in-process instead of contending for the file
+# lock) while reads fan out over a separate read-only pool; WAL mode lets
+# those readers run alongside the writer. Server databases share one pool.
+# Configured replicas replace the local read pool.
+# Request sessions read through the local read pool too and only take the
+# write connection from their first write until they commit. Code running
+# inside a request must still write through the request's session rather
+# than open its own: while the request's session holds the only write
+# connection, a second write session would wait for it until the pool
+# times out.
+engine = _create_engine(
+    DATABASE_URL,
+    settings.SQLITE_WRITER_POOL_SIZE if IS_SQLITE else settings.DATABASE_POOL_SIZE,
+    0 if IS_SQLITE else settings.DATABASE_MAX_OVERFLOW
+)
+
+read_engines: List[AsyncEngine] = [
+    _create_engine(
+        _async_url(url), settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW, read_only=True
+    )
+    for url in settings.get_replica_urls()
+]
+if not read_engines:
+    if IS_SQLITE and not IS_SQLITE_MEMORY:
+        read_engines.append(_create_engine(
+            DATABASE_URL, settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW, read_only=True
+        ))
+    else:
+        read_engines.append(engine)
+
+read_engine = read_engines[0]
+
+# Reads that must see the primary's current data without holding the writer:
+# the local read pool on SQLite, the primary itself elsewhere
+if IS_SQLITE and not IS_SQLITE_MEMORY:
+    local_read_engine = read_engine if not settings.get_replica_urls() else _create_engine(
+        DATABASE_URL, settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW, read_only=True
+    )
+else:
+    local_read_engine = engine
+
+
+class ReplicaRouter:
+    """
+    Chooses the engine for read queries
+    
+    Reads rotate over the read engines. A client that wrote recently reads
+    from the primary until the replica lag tolerance has passed, so it sees
+    its own writes. Clients are identified by a consistency key (the
+    authenticated user ID) set for the current request.
+    """
+    
+    def __init__(self, primary: AsyncEngine, replicas: List[AsyncEngine],
+                 lag_tolerance: float = 5.0, max_tracked: int = 100000):
+        self.primary = primary
+        self.replicas = replicas
+        self.lag_tolerance = lag_tolerance
+        self.max_tracked = max_tracked
+        self._next = itertools.cycle(range(len(replicas)))
+        self._last_write: "OrderedDict[Any, float]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def record_write(self, key: Any):
+        """Remember that a client just committed a write on the primary"""
+        if key is None or self.lag_tolerance <= 0:
+            return
+        with self._lock:
+            self._last_write[key] = time.monotonic()
+            self._last_write.move_to_end(key)
+            while len(self._last_write) > self.max_tracked:
+                self._last_write.popitem(last=False)
+    
+    def requires_primary(self, key: Any) -> bool:
+        """Check whether a client's reads must still go to the primary"""
+        if key is None:
+            return False
+        with self._lock:
+            written_at = self._last_write.get(key)
+            if written_at is None:
+                return False
+            if time.monotonic() - written_at < self.lag_tolerance:
+                return True
+            del self._last_write[key]
+            return False
+    
+    def choose(self, key: Any = None) -> AsyncEngine:
+        """Get the engine to read from"""
+        if self.requires_primary(key):
+            return self.primary
+        return self.replicas[next(self._next)]
+
+
+# The local SQLite read pool reads the primary's own file, so it never lags
+# and a client that wrote keeps reading from it instead of taking the writer
+replica_router = ReplicaRouter(
+    engine,
+    read_engines,
+    settings.DATABASE_REPLICA_LAG_TOLERANCE if settings.get_replica_urls() else 0
 )
 
-# Create async session factory
+# Consistency key of the current request (the authenticated user ID)
+_consistency_key: ContextVar[Optional[Any]] = ContextVar("consistency_key", default=None)
+
+
+def set_consistency_key(key: Any):
+    """Identify the client of the current request for read-your-writes routing"""
+    _consistency_key.set(key)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica and everything else to the primary
+    
+    The read engine is chosen on the session's first read and kept for the
+    rest of the transaction, so all its reads see one replica's snapshot.
+    Once a session flushes it stays on the primary until it commits or rolls
+    back, so later reads in the same unit of work see its changes. Sessions
+    created with info={"local_reads": True} never read from a replica.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self._flushing
+            or self.info.get("use_primary")
+            or (clause is not None and getattr(clause, "is_dml", False))
+        ):
+            self.info["use_primary"] = True
+            return replica_router.primary.sync_engine
+        read_engine = self.info.get("read_engine")
+        if read_engine is None:
+            if self.info.get("local_reads"):
+                read_engine = local_read_engine
+            else:
+                read_engine = replica_router.choose(_consistency_key.get())
+            self.info["read_engine"] = read_engine
+        return read_engine.sync_engine
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_session_written(session, flush_context):
+    """Remember that the session has pending writes"""
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_written(orm_execute_state):
+    """Remember writes made with insert/update/delete statements, which never flush"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_session_write(session):
+    """Route the writer's reads to the primary until replicas catch up"""
+    if session.info.pop("has_writes", False):
+        replica_router.record_write(_consistency_key.get())
+    _release_primary(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_session_writes(session):
+    """Forget writes that were rolled back"""
+    session.info.pop("has_writes", None)
+    _release_primary(session)
+
+
+def _release_primary(session):
+    """Let a routing session's next transaction read from a read engine again"""
+    session.info.pop("use_primary", None)
+    session.info.pop("read_engine", None)
+
+
+# Create async session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False
+)
+
+# Request sessions: reads see the primary's data but do not hold the writer
+RequestSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    info={"local_reads": True}
+)
+
 # Create declarative base
 Base = declarative_base()
 
@@ -49,10 +311,53 @@ async def get_db() -> AsyncSession:
     """
     Dependency to get database session
     
+    Reads go to the local read pool; the write connection is taken on the
+    first write and given back when the session commits or rolls back.
+    
     Yields:
         AsyncSession: Database session
     """
-    async with AsyncSessionLocal() as session:
+    async with RequestSessionLocal() as session:
+        try:
+            yield session
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Database session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def session_scope(db: Optional[AsyncSession] = None):
+    """
+    Use the caller's session, or open one when there is none
+    
+    Services take an optional session so that, inside a request, they write
+    through the request's session instead of waiting on the write pool.
+    
+    Yields:
+        AsyncSession: The given session or a new one
+    """
+    if db is not None:
+        yield db
+    else:
+        async with AsyncSessionLocal() as session:
+            yield session
+
+
+async def get_read_db() -> AsyncSession:
+    """
+    Dependency to get a read-routed database session
+    
+    Use for endpoints that mostly query data. Reads go to a replica (or the
+    local read pool) and never wait for the writer; writes and reads by a
+    client that wrote recently go to the primary.
+    
+    Yields:
+        AsyncSession: Routing database session
+    """
+    async with ReadSessionLocal() as session:
         try:
             yield session
         except Exception as e:
@@ -63,6 +368,49 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+def _create_missing_indexes(connection) -> List[str]:
+    """
+    Create model indexes that do not exist yet
+    
+    create_all skips tables that already exist, including their indexes, so
+    indexes added to models later are created here.
+    
+    Returns:
+        Names of the indexes created
+    """
+    existing_tables = set(inspect(connection).get_table_names())
+    created = []
+    
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                created.append(index.name)
+    
+    if created:
+        logger.info(f"Created indexes: {', '.join(created)}")
+    return created
+
+
+async def create_indexes() -> List[str]:
+    """
+    Create missing model indexes on an existing database
+    
+    Returns:
+        Names of the indexes created
+    """
+    from app.models import (
+        user, company, job, application,
+        talent_pool, background_verification, notification, file
+    )
+    
+    async with engine.begin() as conn:
+        return await conn.run_sync(_create_missing_indexes)
+
+
 async def init_db():
     """
     Initialize database tables
@@ -73,12 +421,14 @@ async def init_db():
         # Import all models to ensure they are registered
         from app.models import (
             user, company, job, application, 
-            talent_pool, background_verification
+            talent_pool, background_verification, notification, file
         )
         
         async with engine.begin() as conn:
             # Create all tables
             await conn.run_sync(Base.metadata.create_all)
+            # Add indexes introduced since existing tables were created
+            await conn.run_sync(_create_missing_indexes)
             
         logger.info("Database tables created successfully")
         
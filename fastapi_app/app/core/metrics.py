@@ -0,0 +1,311 @@
+"""
+Request Metrics
+
+In-process performance instrumentation: per-route latency histograms,
+SQL statement counts and database time per request, time spent in
+external services (OpenAI, SMTP), Server-Timing response headers and a
+Prometheus text exposition for the /metrics endpoint.
+
+Only sampled requests are timed; unsampled requests pass straight
+through the middleware.
+"""
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+EXTERNAL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (seconds) as milliseconds, for benchmark reports"""
+    if not samples:
+        return {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50": round(pick(0.50), 2),
+        "p95": round(pick(0.95), 2),
+        "p99": round(pick(0.99), 2),
+        "max": round(ordered[-1] * 1000, 2),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 2),
+    }
+
+
+class RequestTimings:
+    """Timings collected while serving one sampled request"""
+
+    __slots__ = ("started", "db_queries", "db_time", "external")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.external: Dict[str, float] = {}
+
+    def server_timing(self, total: float) -> str:
+        """Format the timings as a Server-Timing header value"""
+        entries = [f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries"']
+        for service, elapsed in self.external.items():
+            entries.append(f"{service};dur={elapsed * 1000:.2f}")
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Get the timings of the request being served, if it is sampled"""
+    return _request_timings.get()
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, keyed by label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        """Record a value; bucket counts are made cumulative when rendered"""
+        series = self._series.get(labels)
+        if series is None:
+            # One count per bucket, then +Inf, sum and count
+            series = self._series.setdefault(labels, [0.0] * (len(self.buckets) + 3))
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> List[str]:
+        """Render the histogram in Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            label_text = _format_labels(self.label_names, labels)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{label_text},le="{le}"}} {cumulative:g}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{label_text}}} {series[-1]:g}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1.0):
+        """Increase the counter for a label set"""
+        self._series[labels] = self._series.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        """Render the counter in Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{{{_format_labels(self.label_names, labels)}}} {value:g}")
+        return lines
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    """Format label pairs, escaping values as the text format requires"""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return ",".join(pairs)
+
+
+class MetricsRegistry:
+    """Process-wide request, database and external service metrics"""
+
+    def __init__(self, sample_rate: float = 1.0, server_timing: bool = True):
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+        self._lock = threading.Lock()
+
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "HTTP request latency by route",
+            ("method", "route"), LATENCY_BUCKETS
+        )
+        self.requests = Counter(
+            "http_requests_total", "HTTP requests by route and status",
+            ("method", "route", "status")
+        )
+        self.db_queries = Counter(
+            "http_request_db_queries_total", "SQL statements executed while serving requests",
+            ("method", "route")
+        )
+        self.db_time = Counter(
+            "http_request_db_seconds_total", "Time spent executing SQL while serving requests",
+            ("method", "route")
+        )
+        self.external_duration = Histogram(
+            "external_call_duration_seconds", "Latency of calls to external services",
+            ("service", "outcome"), EXTERNAL_BUCKETS
+        )
+
+    def should_sample(self) -> bool:
+        """Decide whether to time the next request"""
+        rate = self.sample_rate
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def record_request(self, method: str, route: str, status: int, elapsed: float, timings: RequestTimings):
+        """Record a finished sampled request"""
+        labels = (method, route)
+        with self._lock:
+            self.request_duration.observe(labels, elapsed)
+            self.requests.inc((method, route, str(status)))
+            self.db_queries.inc(labels, timings.db_queries)
+            self.db_time.inc(labels, timings.db_time)
+
+    def record_external(self, service: str, outcome: str, elapsed: float):
+        """Record a finished external service call"""
+        with self._lock:
+            self.external_duration.observe((service, outcome), elapsed)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format"""
+        with self._lock:
+            lines = []
+            for metric in (self.request_duration, self.requests, self.db_queries, self.db_time,
+                           self.external_duration):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class ExternalClock:
+    """Running time of an external call, less the time spent paused"""
+
+    __slots__ = ("paused_time",)
+
+    def __init__(self):
+        self.paused_time = 0.0
+
+    @contextmanager
+    def paused(self):
+        """Stop counting while the caller does its own work, e.g. yields a streamed chunk"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.paused_time += time.perf_counter() - started
+
+
+@asynccontextmanager
+async def track_external(service: str):
+    """
+    Time a call to an external service
+
+    Yields an ExternalClock; code inside the block that is not waiting on
+    the service (such as a consumer handling each chunk of a stream) can
+    run under clock.paused() so it is not counted.
+
+    Args:
+        service: Service name used as the metric label and Server-Timing entry
+    """
+    started = time.perf_counter()
+    clock = ExternalClock()
+    outcome = "error"
+    try:
+        yield clock
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - started - clock.paused_time
+        metrics.record_external(service, outcome, elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.external[service] = timings.external.get(service, 0.0) + elapsed
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Note when a statement starts if the current request is sampled"""
+    if _request_timings.get() is not None:
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Add a finished statement to the current request's database time"""
+    timings = _request_timings.get()
+    started = conn.info.get("metrics_query_started")
+    if timings is not None and started:
+        timings.db_queries += 1
+        timings.db_time += time.perf_counter() - started.pop()
+
+
+def _route_template(scope) -> str:
+    """Get the matched route's path template, keeping metric labels bounded"""
+    # Routes of included routers carry their prefixed path in the route context
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware that times sampled HTTP requests"""
+
+    def __init__(self, app, registry: "MetricsRegistry" = None):
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.should_sample():
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.registry.server_timing:
+                    total = time.perf_counter() - timings.started
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timings.server_timing(total).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            self.registry.record_request(
+                scope["method"], _route_template(scope), status_code,
+                time.perf_counter() - timings.started, timings
+            )
+
+
+# Global metrics registry
+metrics = MetricsRegistry(
+    sample_rate=settings.METRICS_SAMPLE_RATE,
+    server_timing=settings.METRICS_SERVER_TIMING
+)
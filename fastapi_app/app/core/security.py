@@ -4,26 +4,322 @@ Security utilities for authentication and authorization
 Includes JWT token handling, password hashing, and security dependencies.
 """
 
+import asyncio
+import hashlib
+import ipaddress
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Tuple, Union, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from .config import settings
-from .database import get_db
+from .database import get_read_db, set_consistency_key
 from .exceptions import AuthenticationException, AuthorizationException
-from ..models.user import User, UserType
+from ..models.user import User, UserType, CandidateProfile, RecruiterProfile
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=settings.PWD_CONTEXT_SCHEMES,
+    deprecated=settings.PWD_CONTEXT_DEPRECATED,
+    bcrypt__rounds=settings.PWD_BCRYPT_ROUNDS
+)
+
+# Dedicated bounded pool so hashing never blocks the event loop or starves
+# the default executor used for other blocking work
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PWD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash"
+)
 
 # JWT token security
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    Immutable snapshot of an authenticated user
+    
+    Holds what authorization checks and most endpoints need, so they can
+    run without loading the full User row or its profile relationships.
+    """
+    id: int
+    email: str
+    user_type: str
+    is_active: bool
+    is_verified: bool
+    is_superuser: bool
+    candidate_profile_id: Optional[int] = None
+    recruiter_profile_id: Optional[int] = None
+    company_id: Optional[int] = None
+
+
+class PrincipalCache:
+    """
+    Short-TTL, size-bounded LRU cache of principals
+    
+    Entries are keyed by user ID and a per-user version. Invalidating a user
+    bumps the version, so a lookup that started before the invalidation can
+    never store a stale snapshot under the current key.
+    
+    Versions come from one counter. Only the max_size most recently
+    invalidated users keep their own version; the others share a floor
+    version that is raised to each pruned user's version, so pruning never
+    moves a user back to a version an in-flight lookup may have read.
+    """
+    
+    def __init__(self, ttl: float = 30.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[float, Principal]]" = OrderedDict()
+        self._versions: "OrderedDict[int, int]" = OrderedDict()
+        self._clock = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def version(self, user_id: int) -> int:
+        """Get the current cache version for a user"""
+        with self._lock:
+            return self._versions.get(user_id, self._floor)
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        """Get a cached principal if present and fresh"""
+        key = (user_id, self.version(user_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def set(self, principal: Principal, version: int):
+        """Cache a principal loaded at the given version"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if version != self._versions.get(principal.id, self._floor):
+                return
+            self._entries[(principal.id, version)] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end((principal.id, version))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        """Drop a user's cached principal"""
+        with self._lock:
+            self._entries.pop((user_id, self._versions.get(user_id, self._floor)), None)
+            self._clock += 1
+            self._versions[user_id] = self._clock
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.max_size:
+                _, pruned = self._versions.popitem(last=False)
+                self._floor = max(self._floor, pruned)
+
+    def clear(self):
+        """Drop all cached principals"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._floor = self._clock
+
+
+principal_cache = PrincipalCache(
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+    max_size=settings.AUTH_PRINCIPAL_CACHE_SIZE
+)
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified JWT claims keyed by token hash
+    
+    Claims are kept until the token's ``exp``, so repeated requests with the
+    same bearer token skip signature verification and JSON parsing. Also
+    tracks revocations: individual tokens (logout) until they expire, and
+    all tokens issued to a user up to a point in time (password reset).
+    Tokens carry ``iat`` with sub-second precision so that a token issued
+    in the same second as, but before, a revocation is revoked with it.
+    """
+    
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._revoked_tokens: Dict[bytes, float] = {}
+        self._revoked_before: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Decode and verify a token, using cached claims when available
+        
+        Raises:
+            JWTError: If the token is invalid, expired or revoked
+        """
+        key = self.key(token)
+        now = time.time()
+        claims = None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    claims = entry[1]
+                else:
+                    del self._entries[key]
+        
+        if claims is None:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            exp = claims.get("exp")
+            if self.max_size > 0 and exp is not None:
+                with self._lock:
+                    self._entries[key] = (float(exp), claims)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+        
+        if self._is_revoked(key, claims):
+            raise JWTError("Token has been revoked")
+        
+        return dict(claims)
+
+    def revoke(self, token: str):
+        """Revoke a single token until it expires"""
+        key = self.key(token)
+        try:
+            exp = float(jwt.get_unverified_claims(token).get("exp", 0))
+        except JWTError:
+            return
+        
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked_tokens[key] = exp
+            self._prune_revoked(time.time())
+
+    def revoke_subject(self, subject: Union[str, Any]):
+        """Revoke every token issued to a subject up to now"""
+        with self._lock:
+            self._revoked_before[str(subject)] = time.time()
+
+    def clear(self):
+        """Drop all cached claims (revocations are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def _is_revoked(self, key: bytes, claims: Dict[str, Any]) -> bool:
+        if key in self._revoked_tokens:
+            return True
+        
+        revoked_before = self._revoked_before.get(str(claims.get("sub")))
+        if revoked_before is None:
+            return False
+        return claims.get("iat", 0) <= revoked_before
+
+    def _prune_revoked(self, now: float):
+        expired = [key for key, exp in self._revoked_tokens.items() if exp <= now]
+        for key in expired:
+            del self._revoked_tokens[key]
+
+
+token_cache = TokenCache(max_size=settings.JWT_CACHE_SIZE)
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """
+    Decode and verify a JWT token through the verified-token cache
+    
+    Args:
+        token: JWT token
+        
+    Returns:
+        Dict[str, Any]: Token claims
+        
+    Raises:
+        JWTError: If the token is invalid, expired or revoked
+    """
+    return token_cache.decode(token)
+
+
+def revoke_token(token: str):
+    """
+    Revoke a token (e.g. on logout) until it expires
+    
+    Args:
+        token: JWT token
+    """
+    token_cache.revoke(token)
+
+
+def revoke_user_tokens(user_id: int):
+    """
+    Revoke all tokens issued to a user so far (e.g. on password change)
+    
+    Args:
+        user_id: User ID
+    """
+    token_cache.revoke_subject(user_id)
+    invalidate_principal(user_id)
+
+
+def invalidate_principal(user_id: int):
+    """
+    Invalidate the cached principal for a user
+    
+    Called automatically when a session commits changes to a User,
+    CandidateProfile or RecruiterProfile row made through the ORM. Call it
+    explicitly after committing bulk UPDATE statements that bypass the ORM.
+    """
+    principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_changes(session, flush_context):
+    """Remember the users whose principal the flushed changes affect"""
+    changed = session.info.setdefault("principal_user_ids", set())
+    for target in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(target, User):
+            changed.add(target.id)
+        elif isinstance(target, (CandidateProfile, RecruiterProfile)) and target.user_id is not None:
+            changed.add(target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    """
+    Invalidate principals once their changes are committed
+    
+    Invalidating at flush time would let a concurrent lookup read the old
+    committed row after the version bump and cache it under the new version.
+    """
+    for user_id in session.info.pop("principal_user_ids", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_changes(session):
+    """Forget principal changes that were rolled back"""
+    session.info.pop("principal_user_ids", None)
+
+
 def create_access_token(
     subject: Union[str, Any], 
     expires_delta: Optional[timedelta] = None
@@ -45,7 +341,7 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "iat": time.time(), "sub": str(subject)}
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.SECRET_KEY, 
@@ -75,7 +371,7 @@ def create_refresh_token(
             days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
     
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    to_encode = {"exp": expire, "iat": time.time(), "sub": str(subject), "type": "refresh"}
     encoded_jwt = jwt.encode(
         to_encode,
         settings.SECRET_KEY,
@@ -111,6 +407,60 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash without blocking the event loop
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+        
+    Returns:
+        bool: True if password matches
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password without blocking the event loop
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        str: Hashed password
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, password)
+
+
+async def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and compute a replacement hash if it is outdated
+    
+    A new hash is returned when the stored hash uses a deprecated scheme or
+    different cost parameters than the current password context.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+        
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and the new hash if one is needed
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """
     Get user by email
@@ -157,6 +507,8 @@ async def authenticate_user(
     """
     Authenticate user with email and password
     
+    Outdated password hashes are upgraded in place; the caller commits.
+    
     Args:
         db: Database session
         email: User email
@@ -168,34 +520,76 @@ async def authenticate_user(
     user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    
+    verified, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return None
+    
+    if new_hash:
+        user.hashed_password = new_hash
     return user
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+async def get_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
     """
-    Get current authenticated user from JWT token
+    Get the principal for a user, from cache or a single query
     
     Args:
-        credentials: HTTP authorization credentials
         db: Database session
+        user_id: User ID
         
     Returns:
-        User: Current authenticated user
-        
+        Optional[Principal]: Principal if the user exists
+    """
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    
+    version = principal_cache.version(user_id)
+    result = await db.execute(
+        select(
+            User.id,
+            User.email,
+            User.user_type,
+            User.is_active,
+            User.is_verified,
+            User.is_superuser,
+            CandidateProfile.id,
+            RecruiterProfile.id,
+            RecruiterProfile.company_id
+        )
+        .outerjoin(CandidateProfile, CandidateProfile.user_id == User.id)
+        .outerjoin(RecruiterProfile, RecruiterProfile.user_id == User.id)
+        .where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    
+    principal = Principal(
+        id=row[0],
+        email=row[1],
+        user_type=row[2],
+        is_active=bool(row[3]),
+        is_verified=bool(row[4]),
+        is_superuser=bool(row[5]),
+        candidate_profile_id=row[6],
+        recruiter_profile_id=row[7],
+        company_id=row[8]
+    )
+    principal_cache.set(principal, version)
+    return principal
+
+
+def _authenticated_user_id(token: str) -> int:
+    """
+    Get the user ID from an access token and route the request's reads by it
+    
     Raises:
-        AuthenticationException: If token is invalid or user not found
+        AuthenticationException: If the token is invalid or a refresh token
     """
     try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise AuthenticationException("Invalid token")
@@ -208,8 +602,67 @@ async def get_current_user(
     except JWTError:
         raise AuthenticationException("Invalid token")
     
-    user = await get_user_by_id(db, int(user_id))
+    # Reads after this user's own writes are routed to the primary
+    set_consistency_key(int(user_id))
+    return int(user_id)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db)
+) -> Principal:
+    """
+    Get the current authenticated principal from JWT token
+    
+    Unlike get_current_user this does not load the User row; the snapshot
+    is served from the principal cache when possible.
+    
+    Args:
+        credentials: HTTP authorization credentials
+        db: Database session
+        
+    Returns:
+        Principal: Current authenticated principal
+        
+    Raises:
+        AuthenticationException: If token is invalid or user not found
+    """
+    principal = await get_principal(db, _authenticated_user_id(credentials.credentials))
+    if principal is None:
+        raise AuthenticationException("User not found")
+    
+    if not principal.is_active:
+        raise AuthenticationException("User account is disabled")
+    
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """
+    Get current authenticated user from JWT token
+    
+    Loads the full User row in a read session, so authenticating never
+    takes the write connection. Endpoints that change the user must load
+    it again in their get_db session. Prefer get_current_principal when
+    only the identity, user type or profile IDs are needed.
+    
+    Args:
+        credentials: HTTP authorization credentials
+        db: Database session
+        
+    Returns:
+        User: Current authenticated user
+        
+    Raises:
+        AuthenticationException: If token is invalid or user not found
+    """
+    user_id = _authenticated_user_id(credentials.credentials)
+    user = await get_user_by_id(db, user_id)
     if user is None:
+        invalidate_principal(user_id)
         raise AuthenticationException("User not found")
     
     if not user.is_active:
@@ -219,16 +672,16 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_principal)
+) -> Principal:
     """
     Get current active user
     
     Args:
-        current_user: Current user from token
+        current_user: Current principal from token
         
     Returns:
-        User: Current active user
+        Principal: Current active principal
         
     Raises:
         AuthenticationException: If user is not active
@@ -239,16 +692,16 @@ async def get_current_active_user(
 
 
 async def get_current_verified_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """
     Get current verified user
     
     Args:
-        current_user: Current active user
+        current_user: Current active principal
         
     Returns:
-        User: Current verified user
+        Principal: Current verified principal
         
     Raises:
         AuthenticationException: If user is not verified
@@ -269,8 +722,8 @@ def require_user_type(allowed_types: list[UserType]):
         Dependency function
     """
     async def check_user_type(
-        current_user: User = Depends(get_current_verified_user)
-    ) -> User:
+        current_user: Principal = Depends(get_current_verified_user)
+    ) -> Principal:
         if current_user.user_type not in allowed_types:
             raise AuthorizationException(
                 f"Access denied. Required user types: {', '.join(allowed_types)}"
@@ -287,17 +740,56 @@ require_admin = require_user_type([UserType.ADMIN])
 require_recruiter_or_admin = require_user_type([UserType.RECRUITER, UserType.ADMIN])
 
 
+def _metrics_client_allowed(host: Optional[str]) -> bool:
+    """Check a client address against METRICS_ALLOWED_IPS"""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network, strict=False)
+        for network in settings.get_metrics_allowed_ips()
+    )
+
+
+async def require_metrics_access(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db: AsyncSession = Depends(get_read_db)
+) -> Optional[Principal]:
+    """
+    Allow /metrics to allowlisted scrapers and to admins
+    
+    Clients whose address is in METRICS_ALLOWED_IPS need no token; anyone
+    else must present an admin's bearer token. Behind a reverse proxy the
+    address is the proxy's, so allowlist it only if the proxy restricts
+    the path itself.
+    
+    Raises:
+        AuthenticationException: If a client outside the allowlist sends no valid token
+        AuthorizationException: If the token is not an admin's
+    """
+    if request.client is not None and _metrics_client_allowed(request.client.host):
+        return None
+    if credentials is None:
+        raise AuthenticationException("Not authenticated")
+    
+    principal = await get_current_principal(credentials, db)
+    principal = await get_current_verified_user(await get_current_active_user(principal))
+    return await require_admin(principal)
+
+
 async def get_current_superuser(
-    current_user: User = Depends(get_current_verified_user)
-) -> User:
+    current_user: Principal = Depends(get_current_verified_user)
+) -> Principal:
     """
     Get current superuser
     
     Args:
-        current_user: Current verified user
+        current_user: Current verified principal
         
     Returns:
-        User: Current superuser
+        Principal: Current superuser
         
     Raises:
         AuthorizationException: If user is not a superuser
@@ -318,12 +810,7 @@ def verify_token(token: str) -> Optional[dict]:
         Optional[dict]: Token payload if valid
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        return payload
+        return decode_token(token)
     except JWTError:
         return None
 
@@ -438,11 +925,7 @@ async def get_current_user_websocket(token: str, db: AsyncSession) -> Optional[U
         Optional[User]: User if authenticated
     """
     try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
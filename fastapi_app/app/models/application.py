@@ -8,7 +8,7 @@ SQLAlchemy models for application management including:
 - Interview (interview scheduling)
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -58,6 +58,14 @@ class Application(Base):
     Job application model
     """
     __tablename__ = "applications"
+    __table_args__ = (
+        # Recruiter pipeline and job analytics (reached through jobs.id)
+        Index("ix_applications_job_status", "job_id", "status"),
+        Index("ix_applications_job_created", "job_id", "created_at"),
+        # Candidate dashboards and application lists
+        Index("ix_applications_candidate_status", "candidate_id", "status"),
+        Index("ix_applications_candidate_created", "candidate_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
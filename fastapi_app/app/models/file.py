@@ -0,0 +1,75 @@
+"""
+File Models
+
+SQLAlchemy models for the catalog of uploaded files:
+- StoredFile (one row per file in the upload directory)
+- StorageUsage (running storage totals per user and file type)
+"""
+
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class StoredFile(Base):
+    """
+    Catalog entry of an uploaded file
+
+    Written by FileHandler.upload_file and removed by delete_file, so
+    listing, storage usage and age-based cleanup are queries instead of
+    walks over the upload directory.
+    """
+    __tablename__ = "stored_files"
+    __table_args__ = (
+        # A user's files, newest first, optionally of one type
+        Index("ix_stored_files_owner_created", "owner_id", "created_at"),
+        Index("ix_stored_files_owner_type_created", "owner_id", "file_type", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    # Location
+    file_type = Column(String(20), nullable=False)  # image, document, video
+    subfolder = Column(String(200), nullable=True)
+    file_path = Column(String(500), nullable=False, unique=True)
+    thumbnail_path = Column(String(500), nullable=True)
+
+    # Content
+    original_filename = Column(String(255), nullable=True)
+    file_size = Column(BigInteger, nullable=False, default=0)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256
+    mime_type = Column(String(100), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    owner = relationship("User")
+
+    def __repr__(self):
+        return f"<StoredFile(id={self.id}, owner_id={self.owner_id}, path='{self.file_path}')>"
+
+
+class StorageUsage(Base):
+    """
+    Running storage total of a user's files of one type
+
+    Kept up to date in the same transaction as the catalog rows, so storage
+    usage is read from at most three rows per user.
+    """
+    __tablename__ = "storage_usage"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    file_type = Column(String(20), primary_key=True)
+
+    file_count = Column(Integer, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<StorageUsage(owner_id={self.owner_id}, file_type='{self.file_type}', bytes={self.total_bytes})>"
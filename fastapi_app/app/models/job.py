@@ -7,7 +7,7 @@ SQLAlchemy models for job management including:
 - SavedJob (saved jobs by candidates)
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -55,6 +55,14 @@ class Job(Base):
     Job posting model
     """
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Public listing: active jobs, newest first
+        Index("ix_jobs_status_created", "status", "created_at"),
+        # Company pages and company analytics
+        Index("ix_jobs_company_status_created", "company_id", "status", "created_at"),
+        # Recruiter pipeline
+        Index("ix_jobs_recruiter_status", "recruiter_id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
@@ -202,6 +210,9 @@ class SavedJob(Base):
     Jobs saved by candidates
     """
     __tablename__ = "saved_jobs"
+    __table_args__ = (
+        Index("ix_saved_jobs_candidate_job", "candidate_id", "job_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidate_profiles.id"), nullable=False)
@@ -226,6 +237,9 @@ class JobView(Base):
     Track job views for analytics
     """
     __tablename__ = "job_views"
+    __table_args__ = (
+        Index("ix_job_views_job_viewed", "job_id", "viewed_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
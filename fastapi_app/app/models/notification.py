@@ -0,0 +1,40 @@
+"""
+Notification Models
+
+SQLAlchemy models for real-time notification delivery including:
+- NotificationLog (append-only per-user log used for reconnect replay)
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class NotificationLog(Base):
+    """
+    Append-only log of WebSocket notifications per user
+
+    The primary key doubles as the sequence number: it increases
+    monotonically, so clients replay everything after their last seen id.
+    """
+    __tablename__ = "notification_log"
+    __table_args__ = (
+        Index("ix_notification_log_user_seq", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Message
+    message_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    # Relationships
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<NotificationLog(id={self.id}, user_id={self.user_id}, type='{self.message_type}')>"
@@ -4,7 +4,7 @@ Talent Pool Models
 SQLAlchemy models for talent pool and matching functionality.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -72,6 +72,11 @@ class JobMatch(Base):
     AI-generated job matches for candidates
     """
     __tablename__ = "job_matches"
+    __table_args__ = (
+        # Best matches for a job, and for a talent pool entry
+        Index("ix_job_matches_job_score", "job_id", "overall_score"),
+        Index("ix_job_matches_entry_score", "talent_entry_id", "overall_score"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     talent_entry_id = Column(Integer, ForeignKey("talent_pool_entries.id"), nullable=False)
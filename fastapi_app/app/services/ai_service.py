@@ -13,9 +13,13 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from ..models.user import User
-from ..models.job import Job
+from ..models.user import CandidateProfile
+from ..models.job import Job, JobStatus
+from ..models.company import Company
 from ..models.application import Application
+from ..utils.embeddings import skill_matcher
+from ..utils.skill_taxonomy import skill_taxonomy
+from ..utils.topk import TopK
 
 logger = logging.getLogger(__name__)
 
@@ -24,34 +28,6 @@ class AIService:
     """AI-powered recruitment features"""
     
     def __init__(self):
-        # Skills database - in production, this would be a more comprehensive database
-        self.skills_database = {
-            'programming': [
-                'python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'php', 'ruby',
-                'typescript', 'kotlin', 'swift', 'scala', 'r', 'matlab', 'sql'
-            ],
-            'web_development': [
-                'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express', 'django',
-                'flask', 'fastapi', 'spring', 'laravel', 'rails', 'asp.net'
-            ],
-            'databases': [
-                'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'cassandra',
-                'oracle', 'sqlite', 'dynamodb', 'neo4j'
-            ],
-            'cloud': [
-                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible',
-                'jenkins', 'gitlab ci', 'github actions'
-            ],
-            'data_science': [
-                'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras',
-                'matplotlib', 'seaborn', 'jupyter', 'spark', 'hadoop'
-            ],
-            'soft_skills': [
-                'leadership', 'communication', 'teamwork', 'problem solving', 'creativity',
-                'adaptability', 'time management', 'critical thinking', 'collaboration'
-            ]
-        }
-        
         # Experience level keywords
         self.experience_keywords = {
             'entry': ['entry', 'junior', 'graduate', 'intern', 'trainee', 'associate'],
@@ -133,18 +109,7 @@ class AIService:
 
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text"""
-        text_lower = text.lower()
-        found_skills = set()
-        
-        # Check all skill categories
-        for category, skills in self.skills_database.items():
-            for skill in skills:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.add(skill)
-        
-        return list(found_skills)
+        return skill_taxonomy.extract_names(text)
 
     def _extract_experience(self, text: str) -> List[Dict[str, str]]:
         """Extract work experience from resume"""
@@ -321,13 +286,14 @@ class AIService:
             candidate_skills_lower = [skill.lower() for skill in candidate_skills]
             job_skills_lower = [skill.lower() for skill in job_skills]
             
-            # Calculate skill match percentage
-            matching_skills = set(candidate_skills_lower) & set(job_skills_lower)
+            # Calculate skill match percentage (spelling variants such as
+            # Postgres and PostgreSQL count as the same skill)
+            matching_skills, _ = skill_matcher.match(candidate_skills_lower, job_skills_lower)
             skill_match_score = (len(matching_skills) / len(job_skills_lower)) * 100
             
             # Bonus for having more skills than required
-            bonus_skills = len(set(candidate_skills_lower) - set(job_skills_lower))
-            bonus_score = min(bonus_skills * 2, 20)  # Max 20 bonus points
+            _, bonus_skills = skill_matcher.match(job_skills_lower, sorted(set(candidate_skills_lower)))
+            bonus_score = min(len(bonus_skills) * 2, 20)  # Max 20 bonus points
             
             # Calculate requirements match (simple keyword matching)
             requirements_lower = job_requirements.lower()
@@ -340,7 +306,7 @@ class AIService:
             
             total_score = min(skill_match_score + bonus_score + requirements_score, 100)
             
-            logger.info(f"Job match calculated: {total_score:.1f}% (skills: {skill_match_score:.1f}, bonus: {bonus_score}, req: {requirements_score:.1f})")
+            logger.debug(f"Job match calculated: {total_score:.1f}% (skills: {skill_match_score:.1f}, bonus: {bonus_score}, req: {requirements_score:.1f})")
             return round(total_score, 1)
             
         except Exception as e:
@@ -360,49 +326,52 @@ class AIService:
             List of recommended jobs with match scores
         """
         try:
-            # Get user profile and skills
-            user_query = select(User).where(User.id == user_id)
-            result = await db.execute(user_query)
-            user = result.scalar_one_or_none()
-            
-            if not user or not user.candidate_profile:
-                return []
-            
-            candidate_skills = user.candidate_profile.get('skills', [])
+            # Get the candidate's skills
+            result = await db.execute(
+                select(CandidateProfile.skills).where(CandidateProfile.user_id == user_id)
+            )
+            candidate_skills = result.scalar_one_or_none()
             if not candidate_skills:
                 return []
             
-            # Get active jobs
-            jobs_query = select(Job).where(Job.status == 'published').limit(50)
-            result = await db.execute(jobs_query)
-            jobs = result.scalars().all()
-            
-            recommendations = []
+            # Stream active jobs and keep only the best `limit` of them
+            jobs_query = (
+                select(Job.id, Job.title, Job.description, Job.requirements, Job.location, Job.job_type,
+                       Job.salary_min, Job.salary_max, Job.salary_currency, Company.name.label('company_name'))
+                .outerjoin(Company, Company.id == Job.company_id)
+                .where(Job.status == JobStatus.ACTIVE)
+                .execution_options(yield_per=500)
+            )
+            selector = TopK(limit, max_score=100.0)
             
-            for job in jobs:
+            result = await db.stream(jobs_query)
+            async for job in result:
                 # Calculate match score
                 match_score = await self.calculate_job_match_score(
                     candidate_skills,
-                    job.requirements,
-                    job.skills_required
+                    job.description or '',
+                    job.requirements or []
                 )
                 
                 if match_score > 30:  # Only recommend jobs with >30% match
-                    recommendations.append({
-                        'job_id': job.id,
-                        'job_title': job.title,
-                        'company_name': job.company.name if job.company else 'Unknown',
-                        'match_score': match_score,
-                        'matching_skills': list(set(candidate_skills) & set(job.skills_required)),
-                        'location': job.location,
-                        'job_type': job.job_type,
-                        'salary_range': f"{job.salary_min}-{job.salary_max} {job.currency}" if job.salary_min else None
-                    })
-            
-            # Sort by match score
-            recommendations.sort(key=lambda x: x['match_score'], reverse=True)
-            
-            return recommendations[:limit]
+                    selector.push(job, match_score)
+                    if selector.saturated:
+                        break
+            await result.close()
+            
+            return [
+                {
+                    'job_id': job.id,
+                    'job_title': job.title,
+                    'company_name': job.company_name or 'Unknown',
+                    'match_score': match_score,
+                    'matching_skills': skill_matcher.match(candidate_skills, job.requirements or [])[0],
+                    'location': job.location,
+                    'job_type': job.job_type,
+                    'salary_range': f"{job.salary_min}-{job.salary_max} {job.salary_currency}" if job.salary_min else None
+                }
+                for job, match_score in selector.results()
+            ]
             
         except Exception as e:
             logger.error(f"Error getting job recommendations: {e}")
@@ -0,0 +1,290 @@
+"""
+Bulk Candidate Screening
+
+Screens a job's whole applicant list while keeping LLM calls to the
+applicants where they can change a decision:
+
+1. every applicant is scored locally with the skill matcher
+2. the best-scoring share of applicants goes to the LLM, with several
+   short candidate summaries packed into each prompt within a token budget
+3. LLM scores are written to Application.internal_rating and the job's
+   CandidateRanking rows are rebuilt for every applicant
+
+Database sessions are closed while the LLM calls run, so a long screening
+holds no connection.
+"""
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal, ReadSessionLocal
+from ..models.application import Application, ApplicationStatus
+from ..models.job import Job
+from ..models.talent_pool import CandidateRanking
+from ..models.user import CandidateProfile
+from .ai_service import ai_service
+from .llm_gateway import set_llm_tenant
+from .openai_service import openai_service
+
+logger = logging.getLogger(__name__)
+
+# Applications that are not (or no longer) in the running
+EXCLUDED_STATUSES = (ApplicationStatus.DRAFT, ApplicationStatus.WITHDRAWN)
+
+
+@dataclass
+class _Applicant:
+    """An application being screened"""
+    application_id: int
+    candidate_id: int
+    summary: str
+    skill_score: float
+    experience_score: float
+    screening: Optional[Dict[str, Any]] = field(default=None)
+
+    @property
+    def local_score(self) -> float:
+        """Local match score (0-1)"""
+        return self.skill_score * self.experience_score
+
+    @property
+    def score(self) -> float:
+        """Final score (0-1): the LLM's when screened, otherwise the local one"""
+        if self.screening is not None:
+            return self.screening["screening_score"] / 100
+        return self.local_score
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to a character limit on a word boundary"""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token estimate: 4 characters per token"""
+    return len(text) // 4 + 1
+
+
+class BulkScreeningService:
+    """Screens all applicants of a job with local prefiltering and packed LLM prompts"""
+
+    def __init__(
+        self,
+        llm_share: float = 0.2,
+        max_llm_candidates: int = 100,
+        batch_size: int = 8,
+        prompt_tokens: int = 3000
+    ):
+        self.llm_share = llm_share
+        self.max_llm_candidates = max_llm_candidates
+        self.batch_size = batch_size
+        self.prompt_tokens = prompt_tokens
+
+    async def screen_job(
+        self,
+        job_id: int,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Screen every active applicant of a job
+
+        Args:
+            job_id: Job to screen applicants for
+            progress: Called with a progress dict as the screening advances
+
+        Returns:
+            Summary of the screening run
+        """
+        report = progress or (lambda _: None)
+
+        report({"stage": "scoring"})
+        job, applicants = await self._load(job_id)
+        set_llm_tenant(("company", job["company_id"]))
+
+        # Best local matches first; they are the ones worth an LLM call (none without a client)
+        applicants.sort(key=lambda applicant: applicant.local_score, reverse=True)
+        shortlist = applicants[:self._llm_count(len(applicants))] if openai_service.client else []
+        batches = self._pack(shortlist)
+
+        screened = 0
+        report({
+            "stage": "screening", "applicants": len(applicants), "shortlisted": len(shortlist),
+            "batches_total": len(batches), "batches_done": 0, "screened": 0
+        })
+        for done, batch_result in enumerate(asyncio.as_completed(
+            [self._screen_batch(job["requirements_text"], batch) for batch in batches]
+        ), start=1):
+            screened += await batch_result
+            report({
+                "stage": "screening", "applicants": len(applicants), "shortlisted": len(shortlist),
+                "batches_total": len(batches), "batches_done": done, "screened": screened
+            })
+
+        report({"stage": "saving"})
+        await self._save(job_id, applicants)
+
+        logger.info(
+            f"Screened job {job_id}: {len(applicants)} applicants, {len(shortlist)} shortlisted, "
+            f"{screened} screened in {len(batches)} LLM calls"
+        )
+        return {
+            "job_id": job_id,
+            "applicants": len(applicants),
+            "shortlisted": len(shortlist),
+            "screened": screened,
+            "llm_calls": len(batches),
+            "top_candidates": [
+                {
+                    "application_id": applicant.application_id,
+                    "candidate_id": applicant.candidate_id,
+                    "score": round(applicant.score, 4),
+                    "recommendation": (applicant.screening or {}).get("recommendation")
+                }
+                for applicant in sorted(applicants, key=self._rank_key)[:10]
+            ]
+        }
+
+    def _llm_count(self, applicants: int) -> int:
+        """Number of applicants to send to the LLM"""
+        return min(self.max_llm_candidates, math.ceil(applicants * self.llm_share))
+
+    def _pack(self, applicants: List[_Applicant]) -> List[List[_Applicant]]:
+        """Group applicants into prompts of at most batch_size summaries within the token budget"""
+        batches, batch, tokens = [], [], 0
+        for applicant in applicants:
+            cost = _estimate_tokens(applicant.summary)
+            if batch and (len(batch) >= self.batch_size or tokens + cost > self.prompt_tokens):
+                batches.append(batch)
+                batch, tokens = [], 0
+            batch.append(applicant)
+            tokens += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _screen_batch(self, requirements_text: str, batch: List[_Applicant]) -> int:
+        """Screen one packed prompt's applicants, returning how many got a result"""
+        refs = {f"C{index}": applicant for index, applicant in enumerate(batch, start=1)}
+        results = await openai_service.screen_candidate_batch(
+            requirements_text, {ref: applicant.summary for ref, applicant in refs.items()}
+        )
+        for ref, screening in results.items():
+            refs[ref].screening = screening
+        return len(results)
+
+    async def _load(self, job_id: int):
+        """Load the job and score its applicants locally"""
+        async with ReadSessionLocal() as session:
+            job = (await session.execute(
+                select(Job.company_id, Job.title, Job.description, Job.requirements,
+                       Job.preferred_qualifications, Job.min_experience_years)
+                .where(Job.id == job_id)
+            )).one_or_none()
+            if job is None:
+                raise ValueError(f"Job {job_id} not found")
+
+            rows = (await session.execute(
+                select(
+                    Application.id, Application.candidate_id, Application.cover_letter,
+                    CandidateProfile.current_title, CandidateProfile.summary,
+                    CandidateProfile.skills, CandidateProfile.experience_years,
+                    CandidateProfile.location
+                )
+                .join(CandidateProfile, CandidateProfile.id == Application.candidate_id)
+                .where(Application.job_id == job_id, Application.status.not_in(EXCLUDED_STATUSES))
+            )).all()
+
+        requirements = list(job.requirements or [])
+        job_skills = requirements + list(job.preferred_qualifications or [])
+        requirements_text = "\n".join(filter(None, [
+            job.title, job.description, "Requirements: " + ", ".join(requirements) if requirements else None,
+            f"Minimum experience: {job.min_experience_years} years" if job.min_experience_years else None
+        ]))
+
+        applicants = []
+        for row in rows:
+            skills = row.skills or []
+            skill_score = await ai_service.calculate_job_match_score(skills, requirements_text, job_skills) / 100
+            years = row.experience_years or 0
+            min_years = job.min_experience_years or 0
+            experience_score = 1.0 if years >= min_years else (years + 1) / (min_years + 1)
+            applicants.append(_Applicant(
+                application_id=row.id,
+                candidate_id=row.candidate_id,
+                summary=self._summarize(row),
+                skill_score=skill_score,
+                experience_score=experience_score
+            ))
+
+        return {"company_id": job.company_id, "requirements_text": requirements_text}, applicants
+
+    @staticmethod
+    def _summarize(row) -> str:
+        """Short candidate summary for a packed prompt (names are left out)"""
+        lines = [
+            f"Title: {row.current_title or 'Not specified'}",
+            f"Experience: {row.experience_years or 0} years",
+            f"Skills: {', '.join((row.skills or [])[:20]) or 'Not listed'}"
+        ]
+        if row.location:
+            lines.append(f"Location: {row.location}")
+        if row.summary:
+            lines.append(f"Summary: {_truncate(row.summary, 400)}")
+        if row.cover_letter:
+            lines.append(f"Cover letter: {_truncate(row.cover_letter, 400)}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _rank_key(applicant: _Applicant):
+        """Screened applicants rank above the rest, each group by score"""
+        return (applicant.screening is None, -applicant.score)
+
+    async def _save(self, job_id: int, applicants: List[_Applicant]):
+        """Write ratings for screened applicants and rebuild the job's rankings"""
+        ranked = sorted(applicants, key=self._rank_key)
+        ratings = [
+            {"id": applicant.application_id, "internal_rating": round(1 + 4 * applicant.score, 1)}
+            for applicant in ranked if applicant.screening is not None
+        ]
+        rankings = [
+            {
+                "job_id": job_id,
+                "candidate_id": applicant.candidate_id,
+                "rank": rank,
+                "score": round(applicant.score, 4),
+                "skill_match_score": round(applicant.skill_score, 4),
+                "experience_score": round(applicant.experience_score, 4),
+                "strengths": (applicant.screening or {}).get("strengths", []),
+                "weaknesses": (applicant.screening or {}).get("concerns", []),
+                "recommendations": [applicant.screening["recommendation"]]
+                if applicant.screening and applicant.screening.get("recommendation") else [],
+                "is_active": True
+            }
+            for rank, applicant in enumerate(ranked, start=1)
+        ]
+
+        async with AsyncSessionLocal() as session:
+            if ratings:
+                await session.execute(update(Application), ratings)
+            await session.execute(delete(CandidateRanking).where(CandidateRanking.job_id == job_id))
+            if rankings:
+                await session.execute(insert(CandidateRanking), rankings)
+            await session.commit()
+
+
+# Global bulk screening service instance
+bulk_screening_service = BulkScreeningService(
+    llm_share=settings.BULK_SCREENING_LLM_SHARE,
+    max_llm_candidates=settings.BULK_SCREENING_MAX_LLM_CANDIDATES,
+    batch_size=settings.BULK_SCREENING_BATCH_SIZE,
+    prompt_tokens=settings.BULK_SCREENING_PROMPT_TOKENS
+)
@@ -17,6 +17,7 @@ import aiosmtplib
 from jinja2 import Environment, FileSystemLoader
 
 from ..core.config import settings
+from ..core.metrics import track_external
 
 logger = logging.getLogger(__name__)
 
@@ -282,14 +283,15 @@ class EmailService:
                     self._add_attachment(message, attachment)
             
             # Send email using aiosmtplib for async support
-            await aiosmtplib.send(
-                message,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                username=self.smtp_user,
-                password=self.smtp_password,
-                use_tls=True
-            )
+            async with track_external("smtp"):
+                await aiosmtplib.send(
+                    message,
+                    hostname=self.smtp_host,
+                    port=self.smtp_port,
+                    username=self.smtp_user,
+                    password=self.smtp_password,
+                    use_tls=True
+                )
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
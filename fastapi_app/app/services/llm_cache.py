@@ -0,0 +1,273 @@
+"""
+LLM Response Cache
+
+Persistent cache of chat completion responses, so the same prompt sent
+again (the same resume and job description analyzed by several
+recruiters, say) is answered from disk in milliseconds instead of by the
+API. Entries are keyed by a hash of the model, the normalized prompt and
+the temperature, expire after a TTL and are evicted least recently used
+beyond a size bound. Expired entries are never served; removing them and
+evicting happens at most once per prune interval rather than on every
+store, so the bound can be exceeded by the entries stored in between.
+
+Deterministic (temperature 0) calls can also opt in to near-duplicate
+lookup: a SimHash of the normalized document text (e.g. a resume) is
+stored with each entry and a miss falls back to an entry for the same
+context whose document differs by only a few bits.
+
+The cache lives in its own SQLite file so cache writes never queue behind
+the application's database writer.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"[a-z0-9+#.]+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    temperature REAL NOT NULL,
+    response TEXT NOT NULL,
+    context_key TEXT,
+    simhash INTEGER,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_llm_responses_last_used ON llm_responses (last_used);
+CREATE INDEX IF NOT EXISTS ix_llm_responses_created_at ON llm_responses (created_at);
+CREATE INDEX IF NOT EXISTS ix_llm_responses_context ON llm_responses (context_key);
+"""
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so indentation and line wrapping do not change the key"""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def normalize_document(text: str) -> List[str]:
+    """Lowercase word tokens of a document, ignoring punctuation and layout"""
+    return _WORD.findall(text.lower())
+
+
+def simhash(tokens: List[str], shingle_size: int = 3) -> int:
+    """64-bit SimHash over word shingles; similar documents differ in few bits"""
+    if len(tokens) < shingle_size:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin((a ^ b) & 0xFFFFFFFFFFFFFFFF).count("1")
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL, LRU eviction and near-duplicate lookup"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+        near_duplicates: bool = False,
+        near_duplicate_distance: int = 3,
+        enabled: bool = True,
+        prune_interval: float = 60.0
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval
+        self.near_duplicates = near_duplicates
+        self.near_duplicate_distance = near_duplicate_distance
+        self.enabled = enabled
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+        self._stats = {"hits": 0, "near_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+        """Hash the model, normalized prompt and temperature into a cache key"""
+        prompt = [[message["role"], normalize_prompt(message["content"])] for message in messages]
+        payload = json.dumps([model, prompt, round(float(temperature), 4)], separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def make_context_key(model: str, temperature: float, context: str) -> str:
+        """Hash everything but the document for near-duplicate lookup"""
+        payload = json.dumps([model, round(float(temperature), 4), normalize_prompt(context)])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached response by exact key"""
+        if not self.enabled:
+            return None
+        try:
+            response = await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            response = None
+        self._stats["hits" if response is not None else "misses"] += 1
+        return response
+
+    async def get_near_duplicate(self, context_key: str, document: str) -> Optional[str]:
+        """Get a cached response for the same context and a near-identical document"""
+        if not (self.enabled and self.near_duplicates):
+            return None
+        try:
+            response = await asyncio.to_thread(
+                self._get_near_duplicate, context_key, simhash(normalize_document(document))
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache near-duplicate lookup failed: {e}")
+            return None
+        if response is not None:
+            # The exact lookup already counted this call as a miss
+            self._stats["misses"] -= 1
+            self._stats["near_hits"] += 1
+        return response
+
+    async def set(self, key: str, model: str, temperature: float, response: str,
+                  context_key: Optional[str] = None, document: Optional[str] = None):
+        """Store a response, pruning expired and least recently used entries when due"""
+        if not self.enabled:
+            return
+        fingerprint = None
+        if self.near_duplicates and document is not None:
+            fingerprint = simhash(normalize_document(document))
+        try:
+            await asyncio.to_thread(self._set, key, model, temperature, response, context_key, fingerprint)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache store failed: {e}")
+            return
+        self._stats["stores"] += 1
+
+    async def clear(self):
+        """Remove every cached response"""
+        await asyncio.to_thread(self._execute, "DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit and miss counts since startup"""
+        lookups = self._stats["hits"] + self._stats["near_hits"] + self._stats["misses"]
+        hit_rate = (self._stats["hits"] + self._stats["near_hits"]) / lookups if lookups else 0.0
+        return {**self._stats, "lookups": lookups, "hit_rate": round(hit_rate, 4)}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use"""
+        if self._connection is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _execute(self, statement: str, parameters=()):
+        with self._lock:
+            return self._connect().execute(statement, parameters).fetchall()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            connection.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _get_near_duplicate(self, context_key: str, fingerprint: int) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT key, simhash, response FROM llm_responses "
+                "WHERE context_key = ? AND simhash IS NOT NULL AND created_at >= ?",
+                (context_key, now - self.ttl)
+            ).fetchall()
+
+            best = None
+            for key, candidate, response in rows:
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= self.near_duplicate_distance and (best is None or distance < best[0]):
+                    best = (distance, key, response)
+
+            if best is None:
+                return None
+            connection.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, best[1]))
+            return best[2]
+
+    def _set(self, key: str, model: str, temperature: float, response: str,
+             context_key: Optional[str], fingerprint: Optional[int]):
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, temperature, response, context_key, simhash, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, temperature, response, context_key, fingerprint, now, now)
+            )
+            if now < self._next_prune:
+                return
+            self._next_prune = now + self.prune_interval
+
+            expired = connection.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl,)
+            ).rowcount
+            evicted = connection.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._stats["evictions"] += expired + evicted
+
+
+# Global LLM response cache instance
+llm_cache = LLMResponseCache(
+    path=settings.LLM_CACHE_PATH,
+    ttl=settings.LLM_CACHE_TTL,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    near_duplicates=settings.LLM_CACHE_NEAR_DUPLICATES,
+    near_duplicate_distance=settings.LLM_CACHE_NEAR_DUPLICATE_DISTANCE,
+    enabled=settings.LLM_CACHE_ENABLED,
+    prune_interval=settings.LLM_CACHE_PRUNE_INTERVAL
+)
@@ -0,0 +1,264 @@
+"""
+LLM Gateway
+
+Admission control for outbound LLM API calls. Every call passes through:
+
+- single-flight coalescing: identical prompts already in flight share
+  the one API call instead of sending another
+- a per-tenant semaphore, so one company screening hundreds of
+  applicants cannot take every slot
+- a global semaphore bounding concurrent calls from this worker
+- token buckets on requests and estimated tokens per minute, matching
+  how the provider meters usage
+- retries with exponential backoff and jitter on 429 and 5xx responses
+  and connection errors, honouring Retry-After
+
+The tenant is taken from a context variable that request handlers set
+with set_llm_tenant().
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from ..core.config import settings
+
+try:
+    import openai
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_llm_tenant: ContextVar[Optional[Any]] = ContextVar("llm_tenant", default=None)
+
+
+def set_llm_tenant(tenant: Any):
+    """Identify the tenant (company or user) making LLM calls in the current request"""
+    _llm_tenant.set(tenant)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self._tokens = per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until the amount is available and take it; waiters are served in order"""
+        if self.rate <= 0:
+            return
+        amount = min(amount, self.capacity)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class LLMGateway:
+    """Concurrency limits, rate limits, coalescing and retries for LLM calls"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        tenant_concurrency: int = 4,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 90000,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0
+    ):
+        self.tenant_concurrency = tenant_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._tenants: Dict[Any, list] = {}
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {"calls": 0, "coalesced": 0, "retries": 0, "failures": 0, "active": 0}
+
+    async def call(
+        self,
+        key: str,
+        request: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        tenant: Optional[Any] = None
+    ) -> T:
+        """
+        Run an LLM request under the gateway's limits
+
+        Args:
+            key: Identity of the prompt; concurrent calls with the same key share one request
+            request: Factory making the API call (called again on each retry)
+            estimated_tokens: Prompt plus completion token estimate for rate limiting
+            tenant: Tenant to limit by (defaults to the tenant set for the request)
+
+        Returns:
+            The request's result
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        if tenant is None:
+            tenant = _llm_tenant.get()
+
+        task = asyncio.ensure_future(self._execute(request, estimated_tokens, tenant))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so a cancelled caller does not cancel the call other callers share
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get gateway counters for this worker"""
+        return {**self._stats, "inflight": len(self._inflight), "tenants": len(self._tenants)}
+
+    async def _execute(self, request: Callable[[], Awaitable[T]], estimated_tokens: int, tenant: Any) -> T:
+        """Make the request with limits and retries"""
+        self._stats["calls"] += 1
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._admit(tenant, estimated_tokens):
+                    return await request()
+            except Exception as e:
+                await self._backoff(e, attempt)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        request: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        tenant: Optional[Any] = None
+    ) -> AsyncIterator[T]:
+        """
+        Open a streaming LLM request under the gateway's limits
+
+        Opening the stream is retried like any call; the concurrency slot is
+        held until the caller has consumed the stream. Streams are not
+        coalesced.
+
+        Args:
+            request: Factory opening the stream
+            estimated_tokens: Prompt plus completion token estimate for rate limiting
+            tenant: Tenant to limit by (defaults to the tenant set for the request)
+        """
+        if tenant is None:
+            tenant = _llm_tenant.get()
+        self._stats["calls"] += 1
+
+        for attempt in range(self.max_retries + 1):
+            async with self._admit(tenant, estimated_tokens):
+                try:
+                    response = await request()
+                except Exception as e:
+                    error = e
+                else:
+                    yield response
+                    return
+            await self._backoff(error, attempt)
+
+    @asynccontextmanager
+    async def _admit(self, tenant: Any, estimated_tokens: int):
+        """Hold a tenant and a global slot and take from the rate limit buckets"""
+        async with _TenantSlot(self, tenant), self._global:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+            self._stats["active"] += 1
+            try:
+                yield
+            finally:
+                self._stats["active"] -= 1
+
+    async def _backoff(self, exc: Exception, attempt: int):
+        """Re-raise a failure that should not be retried, otherwise wait before the next attempt"""
+        if attempt >= self.max_retries or not self._is_retryable(exc):
+            self._stats["failures"] += 1
+            raise exc
+        delay = self._retry_delay(exc, attempt)
+        self._stats["retries"] += 1
+        logger.warning(f"LLM call failed ({exc.__class__.__name__}), retrying in {delay:.2f}s")
+        # Wait outside the semaphores so the slot serves other calls meanwhile
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(exc: Exception) -> bool:
+        """Rate limits, server errors and connection failures are worth retrying"""
+        status_code = getattr(exc, "status_code", None)
+        if status_code is not None:
+            return status_code == 429 or status_code >= 500
+        if OPENAI_AVAILABLE and isinstance(exc, openai.APIConnectionError):
+            return True
+        return isinstance(exc, (ConnectionError, asyncio.TimeoutError))
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> float:
+        """Backoff delay, using the server's Retry-After when given"""
+        response = getattr(exc, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay * (0.5 + random.random() / 2)
+
+
+class _TenantSlot:
+    """Per-tenant semaphore, dropped once the tenant has no calls"""
+
+    def __init__(self, gateway: LLMGateway, tenant: Any):
+        self.gateway = gateway
+        self.tenant = tenant
+
+    async def __aenter__(self):
+        entry = self.gateway._tenants.get(self.tenant)
+        if entry is None:
+            entry = self.gateway._tenants[self.tenant] = [asyncio.Semaphore(self.gateway.tenant_concurrency), 0]
+        entry[1] += 1
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._leave(entry)
+            raise
+
+    async def __aexit__(self, exc_type, exc, tb):
+        entry = self.gateway._tenants[self.tenant]
+        entry[0].release()
+        self._leave(entry)
+
+    def _leave(self, entry: list):
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self.gateway._tenants[self.tenant]
+
+
+# Global LLM gateway instance
+llm_gateway = LLMGateway(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    tenant_concurrency=settings.LLM_TENANT_MAX_CONCURRENCY,
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    max_retries=settings.LLM_MAX_RETRIES,
+    backoff_base=settings.LLM_RETRY_BACKOFF
+)
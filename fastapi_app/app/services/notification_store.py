@@ -0,0 +1,125 @@
+"""
+Notification Store
+
+Persistent per-user notification log so WebSocket clients can reconnect
+with their last sequence number and catch up instead of polling.
+"""
+
+import logging
+import time
+from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal, session_scope
+from ..models.notification import NotificationLog
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationStore:
+    """Append-only notification log with sequence-based replay and TTL compaction"""
+
+    def __init__(self, ttl_hours: int = 72, batch_size: int = 200, compact_interval: int = 3600):
+        self.ttl_hours = ttl_hours
+        self.batch_size = batch_size
+        self.compact_interval = compact_interval
+        self._last_compacted = time.monotonic()
+
+    async def append(
+        self,
+        user_ids: List[int],
+        message: Dict[str, Any],
+        db: Optional[AsyncSession] = None
+    ) -> Dict[int, int]:
+        """
+        Append a message to the log of each user
+
+        Args:
+            user_ids: Recipients of the message
+            message: Message payload
+            db: Session to log with; pass the request's session when calling
+                from a request that holds one. It is only flushed, so the
+                entries commit with the caller's changes. Without it the
+                entries are written and committed in a session of their own.
+
+        Returns:
+            Mapping of user ID to the assigned sequence number
+        """
+        if not user_ids:
+            return {}
+
+        message_type = str(getattr(message.get("type"), "value", message.get("type")))
+
+        async with session_scope(db) as session:
+            entries = [
+                NotificationLog(user_id=user_id, message_type=message_type, payload=message)
+                for user_id in user_ids
+            ]
+            session.add_all(entries)
+            if db is None:
+                await session.commit()
+            else:
+                await session.flush()
+            sequences = {entry.user_id: entry.id for entry in entries}
+
+        if time.monotonic() - self._last_compacted > self.compact_interval:
+            self._last_compacted = time.monotonic()
+            await self.compact()
+
+        return sequences
+
+    async def replay(self, user_id: int, last_seq: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get messages logged for a user after a sequence number
+
+        Args:
+            user_id: User ID
+            last_seq: Last sequence number the client has seen
+            limit: Maximum number of messages to return
+
+        Returns:
+            Messages in sequence order, each including its ``seq``
+        """
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(NotificationLog.id, NotificationLog.payload)
+                .where(NotificationLog.user_id == user_id, NotificationLog.id > last_seq)
+                .order_by(NotificationLog.id)
+                .limit(limit or self.batch_size)
+            )
+            return [{**payload, "seq": seq} for seq, payload in result.all()]
+
+    async def compact(self, ttl_hours: Optional[int] = None) -> int:
+        """
+        Delete log entries older than the TTL
+
+        Returns:
+            Number of entries deleted
+        """
+        if ttl_hours is None:
+            ttl_hours = self.ttl_hours
+        cutoff = datetime.utcnow() - timedelta(hours=ttl_hours)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    delete(NotificationLog).where(NotificationLog.created_at < cutoff)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Error compacting notification log: {e}")
+            return 0
+
+        if result.rowcount:
+            logger.info(f"Compacted {result.rowcount} notification log entries")
+        return result.rowcount
+
+
+# Global notification store instance
+notification_store = NotificationStore(
+    ttl_hours=settings.NOTIFICATION_LOG_TTL_HOURS,
+    batch_size=settings.NOTIFICATION_REPLAY_BATCH_SIZE
+)
@@ -7,7 +7,7 @@ Enhanced AI features using OpenAI GPT models for advanced recruitment capabiliti
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 
 try:
@@ -18,9 +18,81 @@ except ImportError:
     OPENAI_AVAILABLE = False
 
 from ..core.config import settings
+from ..core.metrics import track_external
+from .llm_cache import llm_cache
+from .llm_gateway import llm_gateway
 
 logger = logging.getLogger(__name__)
 
+JSONType = Union[type, Tuple[type, ...]]
+
+
+def _parses_as(content: str, expect: JSONType) -> bool:
+    """Check that completion text is JSON of the expected type"""
+    try:
+        return isinstance(json.loads(content), expect)
+    except json.JSONDecodeError:
+        return False
+
+
+class JobDescriptionSectionParser:
+    """
+    Incremental parser splitting job description text into sections
+    
+    Text can be fed in chunks of any size as it streams in; each section is
+    reported as soon as the heading of the next one arrives.
+    """
+    
+    SECTION_KEYWORDS = ('company overview', 'role summary', 'responsibilities', 'qualifications', 'benefits')
+    
+    def __init__(self):
+        self.sections: Dict[str, str] = {}
+        self._buffer = ""
+        self._current_section: Optional[str] = None
+        self._current_content: List[str] = []
+    
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Add text to the parser
+        
+        Returns:
+            (section, content) pairs for the sections the text completed
+        """
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        return [section for section in map(self._feed_line, lines) if section]
+    
+    def close(self) -> List[Tuple[str, str]]:
+        """
+        Finish parsing at the end of the text
+        
+        Returns:
+            (section, content) pairs for the remaining sections
+        """
+        completed = [section for section in [self._feed_line(self._buffer)] if section]
+        self._buffer = ""
+        if self._current_section:
+            completed.append(self._finish_section())
+            self._current_section = None
+        return completed
+    
+    def _feed_line(self, line: str) -> Optional[Tuple[str, str]]:
+        """Process one complete line, returning the section a new heading finished"""
+        line = line.strip()
+        if any(keyword in line.lower() for keyword in self.SECTION_KEYWORDS):
+            finished = self._finish_section() if self._current_section else None
+            self._current_section = line.lower().replace(':', '').replace(' ', '_')
+            self._current_content = []
+            return finished
+        elif line:
+            self._current_content.append(line)
+        return None
+    
+    def _finish_section(self) -> Tuple[str, str]:
+        content = '\n'.join(self._current_content)
+        self.sections[self._current_section] = content
+        return self._current_section, content
+
 
 class OpenAIService:
     """OpenAI-powered recruitment features"""
@@ -32,13 +104,127 @@ class OpenAIService:
         
         if OPENAI_AVAILABLE and settings.OPENAI_API_KEY:
             try:
-                self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+                self.client = AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    base_url=settings.OPENAI_BASE_URL,
+                    max_retries=0  # Retries are handled by the LLM gateway
+                )
                 logger.info("OpenAI client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {e}")
         else:
             logger.warning("OpenAI not available - API key missing or package not installed")
 
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        document: Optional[str] = None,
+        context: Optional[str] = None,
+        expect: Optional[JSONType] = None
+    ) -> str:
+        """
+        Get the completion text for a prompt, answering repeats from the response cache
+        
+        Calls that miss the cache go through the LLM gateway, which limits
+        concurrency and rate, coalesces identical in-flight prompts and
+        retries rate-limited or failed calls.
+        
+        Args:
+            messages: Chat messages to send
+            temperature: Sampling temperature
+            document: Part of the prompt that may differ slightly between equivalent calls (e.g. a resume)
+            context: The rest of the prompt; with a document, allows near-duplicate hits at temperature 0
+            expect: JSON type the caller parses the response as; other responses are returned but not cached
+            
+        Returns:
+            The completion text
+        """
+        key = llm_cache.make_key(self.model, messages, temperature)
+        content = await llm_cache.get(key)
+        if content is not None:
+            return content
+        
+        context_key = None
+        if document is not None and context is not None and temperature == 0:
+            context_key = llm_cache.make_context_key(self.model, temperature, context)
+            content = await llm_cache.get_near_duplicate(context_key, document)
+            if content is not None:
+                return content
+        
+        async def request() -> str:
+            async with track_external("openai"):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=temperature
+                )
+            content = response.choices[0].message.content
+            if content and (expect is None or _parses_as(content, expect)):
+                await llm_cache.set(key, self.model, temperature, content, context_key, document)
+            return content
+        
+        return await llm_gateway.call(key, request, self._estimate_tokens(messages))
+
+    async def _stream_complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        expect: Optional[JSONType] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the completion text for a prompt as it is generated
+        
+        A cached response is replayed as one chunk; a streamed response is
+        cached once complete. Streams go through the LLM gateway's limits
+        but are not coalesced. Only waits on the upstream count as OpenAI
+        time, not the time the consumer spends on each chunk.
+        
+        Args:
+            messages: Chat messages to send
+            temperature: Sampling temperature
+            expect: JSON type the caller parses the response as; other responses are not cached
+            
+        Yields:
+            Chunks of completion text
+        """
+        key = llm_cache.make_key(self.model, messages, temperature)
+        content = await llm_cache.get(key)
+        if content is not None:
+            yield content
+            return
+        
+        async def request():
+            return await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=self.max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+        
+        parts = []
+        async with track_external("openai") as clock:
+            async with llm_gateway.stream(request, self._estimate_tokens(messages)) as stream:
+                try:
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            parts.append(delta)
+                            with clock.paused():
+                                yield delta
+                finally:
+                    await stream.close()
+        
+        content = "".join(parts)
+        if content and (expect is None or _parses_as(content, expect)):
+            await llm_cache.set(key, self.model, temperature, content)
+
+    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Rough token estimate for rate limiting: 4 characters per token, plus the completion budget"""
+        return sum(len(message["content"]) for message in messages) // 4 + self.max_tokens
+
     async def generate_job_description(
         self, 
         job_title: str, 
@@ -62,54 +248,12 @@ class OpenAIService:
             return self._fallback_job_description(job_title, requirements)
         
         try:
-            prompt = f"""
-            Create a compelling and professional job description for the following position:
-
-            Job Title: {job_title}
-            Company: {company_info.get('name', 'Our Company')}
-            Industry: {company_info.get('industry', 'Technology')}
-            Company Size: {company_info.get('size', 'Growing startup')}
-
-            Requirements:
-            {chr(10).join(f'- {req}' for req in requirements)}
-
-            {f"Benefits: {chr(10).join(f'- {benefit}' for benefit in benefits)}" if benefits else ""}
-
-            Please create a job description with the following sections:
-            1. Company Overview (2-3 sentences)
-            2. Role Summary (2-3 sentences)
-            3. Key Responsibilities (5-7 bullet points)
-            4. Required Qualifications (based on provided requirements)
-            5. Preferred Qualifications (additional nice-to-have skills)
-            6. What We Offer (benefits and perks)
-            7. Call to Action (encouraging application)
-
-            Make it engaging, professional, and likely to attract top talent.
-            """
-
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR professional and copywriter specializing in creating compelling job descriptions that attract top talent."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
+            content = await self._complete(
+                messages=self._job_description_messages(job_title, company_info, requirements, benefits),
                 temperature=0.7
             )
-
-            content = response.choices[0].message.content
-            
-            # Parse the response into sections
-            sections = self._parse_job_description(content)
             
-            return {
-                "job_title": job_title,
-                "generated_description": content,
-                "sections": sections,
-                "word_count": len(content.split()),
-                "generated_at": datetime.utcnow().isoformat(),
-                "model_used": self.model
-            }
+            return self._job_description_result(job_title, content)
             
         except Exception as e:
             logger.error(f"Error generating job description: {e}")
@@ -156,17 +300,16 @@ class OpenAIService:
             }}
             """
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            content = await self._complete(
                 messages=[
                     {"role": "system", "content": "You are an expert HR professional and resume analyst with 15+ years of experience in talent acquisition and candidate assessment."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=self.max_tokens,
-                temperature=0.3
+                temperature=settings.OPENAI_RESUME_ANALYSIS_TEMPERATURE,
+                document=resume_text,
+                context=f"analyze_resume_advanced\n{job_description or ''}",
+                expect=dict
             )
-
-            content = response.choices[0].message.content
             
             # Try to parse JSON response
             try:
@@ -207,71 +350,15 @@ class OpenAIService:
             return self._fallback_interview_questions(job_description)
         
         try:
-            prompt = f"""
-            Generate comprehensive interview questions for the following scenario:
-
-            JOB DESCRIPTION:
-            {job_description}
-
-            {f"CANDIDATE RESUME: {candidate_resume}" if candidate_resume else ""}
-
-            Interview Type: {interview_type}
-            Difficulty Level: {difficulty_level}
-
-            Please generate questions in the following categories:
-            1. Technical Questions (if applicable)
-            2. Behavioral Questions (STAR method)
-            3. Situational Questions
-            4. Cultural Fit Questions
-            5. Role-Specific Questions
-
-            For each question, provide:
-            - The main question
-            - 2-3 follow-up questions
-            - What to look for in the answer
-            - Red flags to watch out for
-
-            Format as JSON:
-            {{
-                "interview_type": "{interview_type}",
-                "difficulty_level": "{difficulty_level}",
-                "estimated_duration": "<minutes>",
-                "questions": [
-                    {{
-                        "category": "<category>",
-                        "main_question": "<question>",
-                        "follow_ups": [<follow-up questions>],
-                        "evaluation_criteria": [<what to look for>],
-                        "red_flags": [<warning signs>],
-                        "ideal_answer_outline": "<brief outline>"
-                    }}
-                ],
-                "interview_tips": [<tips for interviewer>],
-                "closing_questions": [<questions for candidate to ask>]
-            }}
-            """
-
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert interview coach and HR professional with extensive experience in conducting effective interviews across various industries and roles."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=0.6
+            content = await self._complete(
+                messages=self._interview_questions_messages(
+                    job_description, candidate_resume, interview_type, difficulty_level
+                ),
+                temperature=0.6,
+                expect=dict
             )
-
-            content = response.choices[0].message.content
-            
-            try:
-                questions = json.loads(content)
-            except json.JSONDecodeError:
-                questions = self._parse_interview_questions_text(content)
-            
-            questions["generated_at"] = datetime.utcnow().isoformat()
-            questions["model_used"] = self.model
             
-            return questions
+            return self._interview_questions_result(content)
             
         except Exception as e:
             logger.error(f"Error generating interview questions: {e}")
@@ -324,17 +411,14 @@ class OpenAIService:
             }}
             """
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            content = await self._complete(
                 messages=[
                     {"role": "system", "content": "You are an expert talent acquisition specialist with the ability to quickly and accurately assess candidate fit for positions."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=self.max_tokens,
-                temperature=0.4
+                temperature=0.4,
+                expect=dict
             )
-
-            content = response.choices[0].message.content
             
             try:
                 screening = json.loads(content)
@@ -350,6 +434,79 @@ class OpenAIService:
             logger.error(f"Error screening candidate: {e}")
             return self._fallback_screening(candidate_data)
 
+    async def screen_candidate_batch(
+        self,
+        job_requirements: str,
+        candidates: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Screen several candidates against the same job in one call
+
+        Args:
+            job_requirements: Job requirements and description
+            candidates: Short candidate summaries keyed by a reference to return results under
+
+        Returns:
+            Screening results keyed by candidate reference; candidates the
+            model gave no valid result for are left out
+        """
+        if not self.client or not candidates:
+            return {}
+
+        candidate_text = "\n\n".join(f"[{ref}]\n{summary}" for ref, summary in candidates.items())
+        prompt = f"""
+            Screen each of these candidates against the job requirements:
+
+            JOB REQUIREMENTS:
+            {job_requirements}
+
+            CANDIDATES:
+            {candidate_text}
+
+            Provide screening results as a JSON array with one object per candidate:
+            [
+                {{
+                    "ref": "<candidate reference, without brackets>",
+                    "screening_score": <0-100>,
+                    "recommendation": "<reject/maybe/interview/strong_candidate>",
+                    "strengths": [<up to 3 candidate strengths>],
+                    "concerns": [<up to 3 areas of concern>]
+                }}
+            ]
+            """
+
+        try:
+            content = await self._complete(
+                messages=[
+                    {"role": "system", "content": "You are an expert talent acquisition specialist who screens candidates consistently against the same bar."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2,
+                expect=(list, dict)
+            )
+            results = json.loads(content)
+        except json.JSONDecodeError:
+            logger.warning("Batch screening returned unparseable results")
+            return {}
+        except Exception as e:
+            logger.error(f"Error screening candidate batch: {e}")
+            return {}
+
+        if isinstance(results, dict):
+            results = results.get("candidates", [])
+
+        screened = {}
+        for result in results if isinstance(results, list) else []:
+            if not isinstance(result, dict) or result.get("ref") not in candidates:
+                continue
+            try:
+                result["screening_score"] = max(0.0, min(100.0, float(result["screening_score"])))
+            except (KeyError, TypeError, ValueError):
+                continue
+            screened[result.pop("ref")] = result
+
+        return screened
+
     async def generate_personalized_job_recommendations(
         self, 
         candidate_profile: Dict[str, Any], 
@@ -405,17 +562,14 @@ class OpenAIService:
             }}
             """
 
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            content = await self._complete(
                 messages=[
                     {"role": "system", "content": "You are an expert career counselor and job matching specialist with deep knowledge of various industries and career paths."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=self.max_tokens,
-                temperature=0.5
+                temperature=0.5,
+                expect=dict
             )
-
-            content = response.choices[0].message.content
             
             try:
                 recommendations = json.loads(content)
@@ -431,6 +585,217 @@ class OpenAIService:
             logger.error(f"Error generating job recommendations: {e}")
             return self._fallback_job_recommendations(candidate_profile, available_jobs)
 
+    # Streaming variants
+    async def stream_job_description(
+        self,
+        job_title: str,
+        company_info: Dict[str, Any],
+        requirements: List[str],
+        benefits: Optional[List[str]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate a job description, streaming it as it is written
+        
+        Args:
+            job_title: The job title
+            company_info: Company information
+            requirements: List of job requirements
+            benefits: Optional list of benefits
+            
+        Yields:
+            ("token", text) for each chunk, ("section", {"name", "content"}) as
+            each section completes, then ("done", result) with the result
+            generate_job_description would return
+        """
+        if not self.client:
+            yield "done", self._fallback_job_description(job_title, requirements)
+            return
+        
+        parser = JobDescriptionSectionParser()
+        parts = []
+        try:
+            messages = self._job_description_messages(job_title, company_info, requirements, benefits)
+            async for delta in self._stream_complete(messages, temperature=0.7):
+                parts.append(delta)
+                yield "token", delta
+                for name, content in parser.feed(delta):
+                    yield "section", {"name": name, "content": content}
+        except Exception as e:
+            logger.error(f"Error streaming job description: {e}")
+            if parts:
+                yield "error", {"message": "Job description generation was interrupted"}
+            else:
+                yield "done", self._fallback_job_description(job_title, requirements)
+            return
+        
+        for name, content in parser.close():
+            yield "section", {"name": name, "content": content}
+        yield "done", self._job_description_result(job_title, "".join(parts))
+
+    async def stream_interview_questions_advanced(
+        self,
+        job_description: str,
+        candidate_resume: str = None,
+        interview_type: str = "general",
+        difficulty_level: str = "medium"
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate interview questions, streaming the text as it is written
+        
+        Args:
+            job_description: The job description
+            candidate_resume: Optional candidate resume for personalization
+            interview_type: Type of interview (technical, behavioral, cultural, etc.)
+            difficulty_level: easy, medium, hard
+            
+        Yields:
+            ("token", text) for each chunk, then ("done", result) with the
+            result generate_interview_questions_advanced would return
+        """
+        if not self.client:
+            yield "done", self._fallback_interview_questions(job_description)
+            return
+        
+        parts = []
+        try:
+            messages = self._interview_questions_messages(
+                job_description, candidate_resume, interview_type, difficulty_level
+            )
+            async for delta in self._stream_complete(messages, temperature=0.6, expect=dict):
+                parts.append(delta)
+                yield "token", delta
+        except Exception as e:
+            logger.error(f"Error streaming interview questions: {e}")
+            if parts:
+                yield "error", {"message": "Interview question generation was interrupted"}
+            else:
+                yield "done", self._fallback_interview_questions(job_description)
+            return
+        
+        yield "done", self._interview_questions_result("".join(parts))
+
+    # Prompt builders and result shaping shared by the blocking and streaming variants
+    def _job_description_messages(
+        self,
+        job_title: str,
+        company_info: Dict[str, Any],
+        requirements: List[str],
+        benefits: Optional[List[str]] = None
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for job description generation"""
+        prompt = f"""
+            Create a compelling and professional job description for the following position:
+
+            Job Title: {job_title}
+            Company: {company_info.get('name', 'Our Company')}
+            Industry: {company_info.get('industry', 'Technology')}
+            Company Size: {company_info.get('size', 'Growing startup')}
+
+            Requirements:
+            {chr(10).join(f'- {req}' for req in requirements)}
+
+            {f"Benefits: {chr(10).join(f'- {benefit}' for benefit in benefits)}" if benefits else ""}
+
+            Please create a job description with the following sections:
+            1. Company Overview (2-3 sentences)
+            2. Role Summary (2-3 sentences)
+            3. Key Responsibilities (5-7 bullet points)
+            4. Required Qualifications (based on provided requirements)
+            5. Preferred Qualifications (additional nice-to-have skills)
+            6. What We Offer (benefits and perks)
+            7. Call to Action (encouraging application)
+
+            Make it engaging, professional, and likely to attract top talent.
+            """
+
+        return [
+            {"role": "system", "content": "You are an expert HR professional and copywriter specializing in creating compelling job descriptions that attract top talent."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _job_description_result(self, job_title: str, content: str) -> Dict[str, Any]:
+        """Shape generated job description text into the response format"""
+        # Parse the response into sections
+        sections = self._parse_job_description(content)
+        
+        return {
+            "job_title": job_title,
+            "generated_description": content,
+            "sections": sections,
+            "word_count": len(content.split()),
+            "generated_at": datetime.utcnow().isoformat(),
+            "model_used": self.model
+        }
+
+    def _interview_questions_messages(
+        self,
+        job_description: str,
+        candidate_resume: Optional[str],
+        interview_type: str,
+        difficulty_level: str
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages for interview question generation"""
+        prompt = f"""
+            Generate comprehensive interview questions for the following scenario:
+
+            JOB DESCRIPTION:
+            {job_description}
+
+            {f"CANDIDATE RESUME: {candidate_resume}" if candidate_resume else ""}
+
+            Interview Type: {interview_type}
+            Difficulty Level: {difficulty_level}
+
+            Please generate questions in the following categories:
+            1. Technical Questions (if applicable)
+            2. Behavioral Questions (STAR method)
+            3. Situational Questions
+            4. Cultural Fit Questions
+            5. Role-Specific Questions
+
+            For each question, provide:
+            - The main question
+            - 2-3 follow-up questions
+            - What to look for in the answer
+            - Red flags to watch out for
+
+            Format as JSON:
+            {{
+                "interview_type": "{interview_type}",
+                "difficulty_level": "{difficulty_level}",
+                "estimated_duration": "<minutes>",
+                "questions": [
+                    {{
+                        "category": "<category>",
+                        "main_question": "<question>",
+                        "follow_ups": [<follow-up questions>],
+                        "evaluation_criteria": [<what to look for>],
+                        "red_flags": [<warning signs>],
+                        "ideal_answer_outline": "<brief outline>"
+                    }}
+                ],
+                "interview_tips": [<tips for interviewer>],
+                "closing_questions": [<questions for candidate to ask>]
+            }}
+            """
+
+        return [
+            {"role": "system", "content": "You are an expert interview coach and HR professional with extensive experience in conducting effective interviews across various industries and roles."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _interview_questions_result(self, content: str) -> Dict[str, Any]:
+        """Shape generated interview question text into the response format"""
+        try:
+            questions = json.loads(content)
+        except json.JSONDecodeError:
+            questions = self._parse_interview_questions_text(content)
+        
+        questions["generated_at"] = datetime.utcnow().isoformat()
+        questions["model_used"] = self.model
+        
+        return questions
+
     # Fallback methods for when OpenAI is not available
     def _fallback_job_description(self, job_title: str, requirements: List[str]) -> Dict[str, Any]:
         """Fallback job description generation"""
@@ -501,24 +866,10 @@ class OpenAIService:
     # Helper methods for parsing AI responses
     def _parse_job_description(self, content: str) -> Dict[str, Any]:
         """Parse job description content into sections"""
-        sections = {}
-        current_section = None
-        current_content = []
-        
-        for line in content.split('\n'):
-            line = line.strip()
-            if any(keyword in line.lower() for keyword in ['company overview', 'role summary', 'responsibilities', 'qualifications', 'benefits']):
-                if current_section:
-                    sections[current_section] = '\n'.join(current_content)
-                current_section = line.lower().replace(':', '').replace(' ', '_')
-                current_content = []
-            elif line:
-                current_content.append(line)
-        
-        if current_section:
-            sections[current_section] = '\n'.join(current_content)
-        
-        return sections
+        parser = JobDescriptionSectionParser()
+        parser.feed(content)
+        parser.close()
+        return parser.sections
 
     def _parse_resume_analysis_text(self, content: str) -> Dict[str, Any]:
         """Parse resume analysis from text format"""
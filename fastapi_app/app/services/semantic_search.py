@@ -0,0 +1,230 @@
+"""
+Semantic Search
+
+Embeds candidate profiles and active job postings with a local TF-IDF/SVD
+model and answers free-text queries from memory-mapped vector indexes, so
+"backend engineer, Postgres" finds PostgreSQL developers without an LLM call.
+
+An index build is versioned: the model and one index per kind are written
+under new names and meta.json, replaced atomically last, switches readers
+to them. Every worker notices the new meta.json on its next query. The
+previous version is kept so queries already under way can finish.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from ..core.config import settings
+from ..core.database import ReadSessionLocal
+from ..models.job import Job, JobStatus
+from ..models.user import CandidateProfile, User
+from ..utils.embeddings import TextEmbedder, VectorIndex, VectorIndexWriter
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("candidates", "jobs")
+
+
+@dataclass
+class _LoadedIndex:
+    """A built index version opened by this worker"""
+    mtime: int
+    meta: Dict[str, Any]
+    embedder: TextEmbedder
+    indexes: Dict[str, VectorIndex]
+
+
+def _candidate_text(row) -> str:
+    """Text embedded for a candidate profile"""
+    return "\n".join(filter(None, [row.current_title, ", ".join(row.skills or []), row.summary]))
+
+
+def _job_text(row) -> str:
+    """Text embedded for a job posting"""
+    return "\n".join(filter(None, [
+        row.title, ", ".join(row.requirements or []), ", ".join(row.preferred_qualifications or []),
+        row.summary, row.description
+    ]))
+
+
+class SemanticSearchService:
+    """Builds and queries the candidate and job embedding indexes"""
+
+    def __init__(
+        self,
+        index_dir: str = "cache/embeddings",
+        dim: int = 128,
+        dtype: str = "float32",
+        fit_sample: int = 50000,
+        batch_size: int = 2000
+    ):
+        self.index_dir = Path(index_dir)
+        self.dim = dim
+        self.dtype = dtype
+        self.fit_sample = fit_sample
+        self.batch_size = batch_size
+        self._loaded: Optional[_LoadedIndex] = None
+        self._lock = threading.Lock()
+        self._build_lock = asyncio.Lock()
+
+    @staticmethod
+    def _query(kind: str):
+        """Rows to index for a kind"""
+        if kind == "candidates":
+            return (
+                select(CandidateProfile.id, CandidateProfile.current_title,
+                       CandidateProfile.summary, CandidateProfile.skills)
+                .join(User, User.id == CandidateProfile.user_id)
+                .where(User.is_active.is_(True))
+            )
+        return (
+            select(Job.id, Job.title, Job.summary, Job.description,
+                   Job.requirements, Job.preferred_qualifications)
+            .where(Job.status == JobStatus.ACTIVE)
+        )
+
+    @staticmethod
+    def _text(kind: str, row) -> str:
+        return _candidate_text(row) if kind == "candidates" else _job_text(row)
+
+    async def rebuild(self, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Fit the embedding model and rebuild both indexes
+
+        Args:
+            progress: Called with a progress dict as the build advances
+
+        Returns:
+            Metadata of the new index version
+        """
+        report = progress or (lambda _: None)
+
+        async with self._build_lock:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            version = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+
+            report({"stage": "fitting"})
+            texts = await self._sample()
+            embedder = await asyncio.to_thread(TextEmbedder(self.dim).fit, texts or [""])
+            await asyncio.to_thread(embedder.save, str(self.index_dir / f"model-{version}.pkl"))
+
+            counts = {}
+            for kind in KINDS:
+                counts[kind] = await self._build_index(kind, version, embedder, report)
+
+            meta = {
+                "version": version,
+                "dim": embedder.output_dim,
+                "dtype": self.dtype,
+                "counts": counts,
+                "built_at": datetime.utcnow().isoformat()
+            }
+            temp_path = self.index_dir / "meta.json.tmp"
+            temp_path.write_text(json.dumps(meta))
+            os.replace(temp_path, self.index_dir / "meta.json")
+
+            self._remove_stale(keep=2)
+            logger.info(f"Built semantic index {version}: {counts}")
+            return meta
+
+    async def _sample(self) -> List[str]:
+        """Random sample of documents of every kind for fitting the model"""
+        texts = []
+        async with ReadSessionLocal() as session:
+            for kind in KINDS:
+                rows = (await session.execute(
+                    self._query(kind).order_by(func.random()).limit(self.fit_sample)
+                )).all()
+                texts.extend(self._text(kind, row) for row in rows)
+        return texts
+
+    async def _build_index(self, kind: str, version: str, embedder: TextEmbedder, report) -> int:
+        """Stream a kind's rows through the model into a new index"""
+        writer = VectorIndexWriter(str(self.index_dir / f"{kind}-{version}"), embedder.output_dim, self.dtype)
+        async with ReadSessionLocal() as session:
+            result = await session.stream(
+                self._query(kind).execution_options(yield_per=self.batch_size)
+            )
+            async for rows in result.partitions():
+                vectors = await asyncio.to_thread(embedder.transform, [self._text(kind, row) for row in rows])
+                await asyncio.to_thread(writer.add, [row.id for row in rows], vectors)
+                report({"stage": "indexing", "kind": kind, "indexed": writer.count})
+        await asyncio.to_thread(writer.close)
+        return writer.count
+
+    def _remove_stale(self, keep: int):
+        """Delete all but the newest index versions"""
+        versions = sorted(
+            (path.stem.split("-", 1)[1] for path in self.index_dir.glob("model-*.pkl")), reverse=True
+        )
+        for version in versions[keep:]:
+            (self.index_dir / f"model-{version}.pkl").unlink(missing_ok=True)
+            for kind in KINDS:
+                shutil.rmtree(self.index_dir / f"{kind}-{version}", ignore_errors=True)
+
+    def _load(self) -> Optional[_LoadedIndex]:
+        """Open the current index version, reopening it after a rebuild"""
+        try:
+            mtime = (self.index_dir / "meta.json").stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            if self._loaded is None or self._loaded.mtime != mtime:
+                meta = json.loads((self.index_dir / "meta.json").read_text())
+                version = meta["version"]
+                self._loaded = _LoadedIndex(
+                    mtime=mtime,
+                    meta=meta,
+                    embedder=TextEmbedder.load(str(self.index_dir / f"model-{version}.pkl")),
+                    indexes={kind: VectorIndex(str(self.index_dir / f"{kind}-{version}")) for kind in KINDS}
+                )
+            return self._loaded
+
+    def _search(self, kind: str, query: str, k: int) -> Optional[List[Tuple[int, float]]]:
+        loaded = self._load()
+        if loaded is None:
+            return None
+        return loaded.indexes[kind].search(loaded.embedder.transform([query])[0], k)
+
+    async def search(self, kind: str, query: str, k: int = 20) -> Optional[List[Tuple[int, float]]]:
+        """
+        Find the candidate profiles or jobs closest to a free-text query
+
+        Args:
+            kind: "candidates" or "jobs"
+            query: Free-text query
+            k: Number of results
+
+        Returns:
+            (id, similarity) pairs, best first, or None when no index is built
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown index kind: {kind}")
+        return await asyncio.to_thread(self._search, kind, query, k)
+
+    def stats(self) -> Dict[str, Any]:
+        """Metadata of the current index version"""
+        loaded = self._load()
+        if loaded is None:
+            return {"built": False}
+        return {"built": True, **loaded.meta}
+
+
+# Global semantic search instance
+semantic_search = SemanticSearchService(
+    index_dir=settings.EMBEDDING_INDEX_DIR,
+    dim=settings.EMBEDDING_DIM,
+    dtype=settings.EMBEDDING_INDEX_DTYPE,
+    fit_sample=settings.EMBEDDING_FIT_SAMPLE
+)
@@ -0,0 +1,248 @@
+"""
+Talent Pool Matching
+
+Matches a job against every candidate in the talent pool who has auto
+matching enabled and saves the best matches as JobMatch rows. Candidates
+below their own match score threshold, and those whose match for the job
+was already acted on, are skipped before ranking, so they never take a
+place in the top matches.
+
+The pool can hold millions of candidates, so it is never loaded at once:
+stream_pool_candidates reads the few columns scoring needs through a
+server-side cursor, in chunks of plain row tuples rather than ORM objects,
+and scoring keeps only the current top matches. Memory stays flat however
+large the pool is.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import Row, delete, insert, select
+
+from ..core.database import AsyncSessionLocal, ReadSessionLocal
+from ..models.job import Job, RemoteType
+from ..models.talent_pool import JobMatch, MatchStatus, TalentPoolEntry
+from ..models.user import CandidateProfile
+from ..utils.embeddings import skill_matcher
+from ..utils.topk import TopK
+
+logger = logging.getLogger(__name__)
+
+# Weights of the component scores in the overall score
+SCORE_WEIGHTS = {
+    "skills": 0.5,
+    "experience": 0.2,
+    "location": 0.15,
+    "salary": 0.15
+}
+
+
+async def stream_pool_candidates(session, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the candidates of the talent pool that have auto matching enabled
+
+    Rows are read through a server-side cursor batch_size at a time and are
+    plain tuples, so they skip the ORM identity map and are freed as soon as
+    the caller moves on to the next chunk.
+
+    Args:
+        session: Database session to read with
+        batch_size: Rows per chunk
+
+    Yields:
+        Chunks of (id, entry_id, match_score_threshold, skills,
+        experience_years, location, salary_expectation) rows, where id is
+        the candidate profile id and entry_id the talent pool entry id
+    """
+    result = await session.stream(
+        select(
+            CandidateProfile.id, TalentPoolEntry.id.label("entry_id"), TalentPoolEntry.match_score_threshold,
+            CandidateProfile.skills, CandidateProfile.experience_years,
+            CandidateProfile.location, CandidateProfile.salary_expectation
+        )
+        .join(TalentPoolEntry, TalentPoolEntry.candidate_id == CandidateProfile.id)
+        .where(TalentPoolEntry.auto_matching_enabled.is_(True), TalentPoolEntry.is_active.is_(True))
+        .execution_options(yield_per=batch_size)
+    )
+    try:
+        async for rows in result.partitions():
+            yield rows
+    finally:
+        await result.close()
+
+
+def _weighted_score(skill_score: float, experience_score: float, location_score: float, salary_score: float) -> float:
+    """Weighted overall score of the component scores"""
+    return (
+        skill_score * SCORE_WEIGHTS["skills"] +
+        experience_score * SCORE_WEIGHTS["experience"] +
+        location_score * SCORE_WEIGHTS["location"] +
+        salary_score * SCORE_WEIGHTS["salary"]
+    )
+
+
+class TalentMatchingService:
+    """Matches jobs against the talent pool"""
+
+    def __init__(self, top_n: int = 200, batch_size: int = 1000):
+        self.top_n = top_n
+        self.batch_size = batch_size
+
+    async def match_job(
+        self,
+        job_id: int,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Match a job against the talent pool and save the best matches
+
+        Args:
+            job_id: Job to match
+            progress: Called with a progress dict as matching advances
+
+        Returns:
+            Summary of the matching run
+        """
+        report = progress or (lambda _: None)
+
+        async with ReadSessionLocal() as session:
+            job = (await session.execute(
+                select(Job.requirements, Job.preferred_qualifications, Job.min_experience_years,
+                       Job.location, Job.remote_type, Job.is_remote_ok, Job.salary_max)
+                .where(Job.id == job_id)
+            )).one_or_none()
+            if job is None:
+                raise ValueError(f"Job {job_id} not found")
+            acted_on = await self._acted_on(session, job_id)
+
+            selector = TopK(self.top_n, max_score=_weighted_score(1.0, 1.0, 1.0, 1.0))
+            scanned = 0
+            async for rows in stream_pool_candidates(session, self.batch_size):
+                await asyncio.to_thread(self._score_batch, job, rows, acted_on, selector)
+                scanned += len(rows)
+                report({"stage": "scoring", "scanned": scanned})
+                if selector.saturated:
+                    break
+
+        report({"stage": "saving"})
+        saved = await self._save(job_id, job, selector.results())
+
+        logger.info(f"Matched job {job_id} against {scanned} pool candidates: {saved} matches saved")
+        return {"job_id": job_id, "scanned": scanned, "matches": saved}
+
+    @staticmethod
+    async def _acted_on(session, job_id: int) -> Set[int]:
+        """Talent pool entries whose match for the job a candidate or recruiter has acted on"""
+        return set((await session.execute(
+            select(JobMatch.talent_entry_id)
+            .where(JobMatch.job_id == job_id, JobMatch.status != MatchStatus.PENDING)
+        )).scalars())
+
+    def _score_batch(self, job: Row, rows: Sequence[Row], acted_on: Set[int], selector: TopK):
+        """
+        Score a chunk of pool candidates
+
+        Candidates already acted on, and those whose skills alone cannot
+        reach the top or their own threshold, are skipped without the
+        remaining component scores.
+        """
+        required_bits, preferred_bits, free_bits = skill_matcher.job_bitsets(
+            job.requirements or [], job.preferred_qualifications or []
+        )
+        for row in rows:
+            if row.entry_id in acted_on:
+                continue
+            threshold = row.match_score_threshold or 0
+            skill_score = self._skill_score(
+                skill_matcher.candidate_bitset(row.skills or [], free_bits), required_bits, preferred_bits
+            )
+            best_case = _weighted_score(skill_score, 1.0, 1.0, 1.0)
+            if best_case < threshold or not selector.admits(best_case):
+                continue
+            experience_score = self._experience_score(row.experience_years, job.min_experience_years)
+            location_score = self._location_score(row.location, job)
+            salary_score = self._salary_score(row.salary_expectation, job.salary_max)
+            scores = {
+                "skill_score": skill_score,
+                "experience_score": experience_score,
+                "location_score": location_score,
+                "salary_score": salary_score
+            }
+            overall = _weighted_score(skill_score, experience_score, location_score, salary_score)
+            if overall < threshold:
+                continue
+            selector.push((row.entry_id, row.skills or [], scores), overall)
+            if selector.saturated:
+                break
+
+    @staticmethod
+    def _skill_score(candidate_bits: int, required_bits: int, preferred_bits: int) -> float:
+        """Share of required skills (and preferred ones, at a lower weight) the candidate has"""
+        if not required_bits:
+            return 0.5  # Neutral if no requirements
+        required = (candidate_bits & required_bits).bit_count() / required_bits.bit_count()
+        if not preferred_bits:
+            return required
+        return 0.8 * required + 0.2 * (candidate_bits & preferred_bits).bit_count() / preferred_bits.bit_count()
+
+    @staticmethod
+    def _experience_score(years: Optional[int], min_years: Optional[int]) -> float:
+        """1.0 with enough experience, less the further short of the minimum"""
+        years, min_years = years or 0, min_years or 0
+        return 1.0 if years >= min_years else (years + 1) / (min_years + 1)
+
+    @staticmethod
+    def _location_score(location: Optional[str], job: Row) -> float:
+        """Location compatibility"""
+        if job.remote_type == RemoteType.REMOTE or job.is_remote_ok:
+            return 1.0
+        if not location or not job.location:
+            return 0.5  # Neutral if location not specified
+        location, job_location = location.lower(), job.location.lower()
+        if location == job_location:
+            return 1.0
+        if location.rsplit(",", 1)[-1].strip() == job_location.rsplit(",", 1)[-1].strip():
+            return 0.7  # Same state or country
+        return 0.3
+
+    @staticmethod
+    def _salary_score(expectation: Optional[int], salary_max: Optional[int]) -> float:
+        """1.0 when the job can pay the candidate's expectation"""
+        if not expectation or not salary_max or expectation <= salary_max:
+            return 1.0
+        return salary_max / expectation
+
+    async def _save(self, job_id: int, job: Row, matches: List) -> int:
+        """Replace the job's pending matches with the new ones"""
+        async with AsyncSessionLocal() as session:
+            # Matches acted on while scoring ran are kept as they are too
+            acted_on = await self._acted_on(session, job_id)
+
+            rows = []
+            for (entry_id, skills, scores), overall in matches:
+                if entry_id in acted_on:
+                    continue
+                matched_skills, missing_skills = skill_matcher.match(skills, job.requirements or [])
+                rows.append({
+                    "talent_entry_id": entry_id,
+                    "job_id": job_id,
+                    "overall_score": round(overall, 4),
+                    **{name: round(score, 4) for name, score in scores.items()},
+                    "matched_skills": matched_skills,
+                    "missing_skills": missing_skills,
+                    "status": MatchStatus.PENDING
+                })
+
+            await session.execute(
+                delete(JobMatch).where(JobMatch.job_id == job_id, JobMatch.status == MatchStatus.PENDING)
+            )
+            if rows:
+                await session.execute(insert(JobMatch), rows)
+            await session.commit()
+
+        return len(rows)
+
+
+# Global talent matching instance
+talent_matching_service = TalentMatchingService()
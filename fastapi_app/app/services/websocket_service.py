@@ -7,11 +7,22 @@ Real-time communication service for notifications, chat, and live updates.
 import json
 import asyncio
 import logging
-from typing import Dict, List, Set, Any, Optional
-from datetime import datetime
+from itertools import islice
+from typing import Dict, List, Set, Any, Optional, Tuple, Union
+from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession
 from enum import Enum
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+from ..core.config import settings
+from .notification_store import notification_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +36,8 @@ class MessageType(str, Enum):
     SYSTEM_MESSAGE = "system_message"
     TYPING_INDICATOR = "typing_indicator"
     USER_STATUS = "user_status"
+    PRESENCE_UPDATE = "presence_update"
+    NOTIFICATION_REPLAY = "notification_replay"
 
 
 class NotificationPriority(str, Enum):
@@ -35,6 +48,419 @@ class NotificationPriority(str, Enum):
     URGENT = "urgent"
 
 
+class MessageEncoding(str, Enum):
+    """Wire encodings negotiated per connection"""
+    JSON = "json"
+    COMPACT = "compact"
+    MSGPACK = "msgpack"
+
+
+class MessageCodec:
+    """
+    Encodes and decodes WebSocket frames for a negotiated encoding
+    
+    ``json`` is the original verbose format. ``compact`` is JSON with short keys,
+    integer type codes and epoch-millisecond timestamps. ``msgpack`` applies the
+    same compaction and packs the result into binary frames.
+    """
+    
+    SUBPROTOCOLS = {
+        "hirequick.json": MessageEncoding.JSON,
+        "hirequick.compact": MessageEncoding.COMPACT,
+        "hirequick.msgpack": MessageEncoding.MSGPACK,
+    }
+    
+    TYPE_CODES = {
+        MessageType.NOTIFICATION.value: 1,
+        MessageType.CHAT_MESSAGE.value: 2,
+        MessageType.APPLICATION_UPDATE.value: 3,
+        MessageType.JOB_UPDATE.value: 4,
+        MessageType.INTERVIEW_REMINDER.value: 5,
+        MessageType.SYSTEM_MESSAGE.value: 6,
+        MessageType.TYPING_INDICATOR.value: 7,
+        MessageType.USER_STATUS.value: 8,
+        MessageType.PRESENCE_UPDATE.value: 9,
+        MessageType.NOTIFICATION_REPLAY.value: 10,
+        "ping": 20,
+        "pong": 21,
+        "error": 22,
+        "online_users": 23,
+        "join_room": 24,
+        "leave_room": 25,
+        "get_online_users": 26,
+        "subscribe_presence": 27,
+        "unsubscribe_presence": 28,
+        "replay": 29,
+    }
+    TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+    
+    KEY_ALIASES = {
+        "type": "t",
+        "timestamp": "ts",
+        "message": "m",
+        "user_id": "u",
+        "user_ids": "uu",
+        "room_id": "r",
+        "title": "ti",
+        "priority": "p",
+        "data": "d",
+        "id": "i",
+        "status": "s",
+        "application_id": "a",
+        "job_id": "j",
+        "update_type": "ut",
+        "from_user_id": "f",
+        "to_user_id": "to",
+        "message_type": "mt",
+        "metadata": "md",
+        "user_name": "un",
+        "name": "n",
+        "user_type": "ty",
+        "typing_users": "tu",
+        "is_typing": "it",
+        "changes": "c",
+        "users": "us",
+        "total": "tt",
+        "interview_data": "iv",
+        "reminder_time": "rt",
+        "connection_count": "cc",
+        "last_seen": "ls",
+        "error": "e",
+        "skip": "sk",
+        "limit": "l",
+        "seq": "q",
+        "last_seq": "lq",
+        "messages": "ms",
+        "has_more": "hm",
+    }
+    KEY_NAMES = {alias: key for key, alias in KEY_ALIASES.items()}
+    
+    # Caller-supplied payloads are passed through untouched
+    OPAQUE_KEYS = {"data", "metadata", "interview_data"}
+    TIMESTAMP_KEYS = {"timestamp", "last_seen"}
+
+    @classmethod
+    def negotiate(
+        cls,
+        requested: Optional[str] = None,
+        subprotocols: Optional[List[str]] = None,
+        extensions: str = ""
+    ) -> Tuple[MessageEncoding, Optional[str]]:
+        """
+        Pick an encoding from the query parameter or offered subprotocols
+        
+        Args:
+            requested: Value of the ``encoding`` query parameter (json, compact, msgpack, auto)
+            subprotocols: Subprotocols offered by the client
+            extensions: Raw ``Sec-WebSocket-Extensions`` header
+            
+        Returns:
+            The chosen encoding and the subprotocol to accept (if any)
+        """
+        for subprotocol in subprotocols or []:
+            if subprotocol in cls.SUBPROTOCOLS:
+                return cls._available(cls.SUBPROTOCOLS[subprotocol]), subprotocol
+        
+        if not requested:
+            return MessageEncoding.JSON, None
+        
+        requested = requested.lower()
+        if requested == "auto":
+            # Deflate already shrinks repeated JSON keys; binary frames compress poorly
+            if "permessage-deflate" in (extensions or "").lower():
+                return MessageEncoding.COMPACT, None
+            return cls._available(MessageEncoding.MSGPACK), None
+        
+        try:
+            return cls._available(MessageEncoding(requested)), None
+        except ValueError:
+            return MessageEncoding.JSON, None
+
+    @staticmethod
+    def _available(encoding: MessageEncoding) -> MessageEncoding:
+        if encoding == MessageEncoding.MSGPACK and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed - falling back to compact JSON encoding")
+            return MessageEncoding.COMPACT
+        return encoding
+
+    @classmethod
+    def encode(cls, message: Dict[str, Any], encoding: MessageEncoding):
+        """Encode a message into a text (str) or binary (bytes) frame"""
+        if encoding == MessageEncoding.JSON:
+            return json.dumps(message)
+        
+        compacted = cls._compact(message)
+        if encoding == MessageEncoding.MSGPACK:
+            return msgpack.packb(compacted, use_bin_type=True)
+        return json.dumps(compacted, separators=(",", ":"))
+
+    @classmethod
+    def decode(cls, frame, encoding: MessageEncoding) -> Dict[str, Any]:
+        """Decode an incoming text or binary frame into a verbose message"""
+        if isinstance(frame, (bytes, bytearray)):
+            if MSGPACK_AVAILABLE and encoding == MessageEncoding.MSGPACK:
+                message = msgpack.unpackb(frame, raw=False)
+            else:
+                message = json.loads(frame)
+        else:
+            message = json.loads(frame)
+        
+        if encoding == MessageEncoding.JSON or not isinstance(message, dict):
+            return message
+        return cls._expand(message)
+
+    @classmethod
+    def _compact(cls, value):
+        if isinstance(value, dict):
+            compacted = {}
+            for key, item in value.items():
+                if key == "type":
+                    type_name = item.value if isinstance(item, Enum) else item
+                    item = cls.TYPE_CODES.get(type_name, type_name)
+                elif key in cls.TIMESTAMP_KEYS and isinstance(item, str):
+                    item = cls._timestamp_ms(item)
+                elif key not in cls.OPAQUE_KEYS:
+                    item = cls._compact(item)
+                compacted[cls.KEY_ALIASES.get(key, key)] = item
+            return compacted
+        if isinstance(value, list):
+            return [cls._compact(item) for item in value]
+        if isinstance(value, Enum):
+            return value.value
+        return value
+
+    @classmethod
+    def _expand(cls, value):
+        if isinstance(value, dict):
+            expanded = {}
+            for alias, item in value.items():
+                key = cls.KEY_NAMES.get(alias, alias)
+                if key == "type":
+                    item = cls.TYPE_NAMES.get(item, item)
+                elif key not in cls.OPAQUE_KEYS:
+                    item = cls._expand(item)
+                expanded[key] = item
+            return expanded
+        if isinstance(value, list):
+            return [cls._expand(item) for item in value]
+        return value
+
+    @staticmethod
+    def _timestamp_ms(value: str):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp() * 1000)
+
+
+class OutboundMessage:
+    """A message that caches its encoded frame per encoding while it fans out"""
+    
+    __slots__ = ("message", "_frames")
+    
+    def __init__(self, message: Dict[str, Any]):
+        self.message = message
+        self._frames: Dict[MessageEncoding, Any] = {}
+
+    def frame(self, encoding: MessageEncoding):
+        if encoding not in self._frames:
+            self._frames[encoding] = MessageCodec.encode(self.message, encoding)
+        return self._frames[encoding]
+
+
+class PresenceAggregator:
+    """
+    Coalesces presence and typing events into periodic delta frames
+    
+    Status changes are debounced per user and delivered in one batched frame per
+    recipient, only to users interested in them (room peers and presence
+    subscribers). Typing state expires after a TTL, so explicit stop messages are
+    optional and repeated keystroke events only refresh the expiry.
+    
+    Connections that negotiated no encoding are legacy clients: they keep the
+    original frames, a user_status frame per status change sent to the same
+    interested users and a typing_indicator frame per user that starts or
+    stops typing, carrying user_id and is_typing. Flaps and repeated
+    keystrokes are still dropped.
+    """
+    
+    def __init__(self, manager: "ConnectionManager", flush_interval: float = 1.0, typing_ttl: float = 5.0):
+        self.manager = manager
+        self.flush_interval = flush_interval
+        self.typing_ttl = typing_ttl
+        # Latest pending status change per user and the users interested in it
+        self.pending_status: Dict[int, Dict[str, Any]] = {}
+        self.pending_audience: Dict[int, Set[int]] = {}
+        # Last status delivered per user (absent means offline)
+        self.published_status: Dict[int, str] = {}
+        # Typing state per room: user_id -> expiry on the event loop clock
+        self.typing: Dict[str, Dict[int, float]] = {}
+        self.typing_published: Dict[str, List[int]] = {}
+        self.dirty_rooms: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def queue_status(self, user_id: int, status: str, audience: Set[int]):
+        """Record a status change for delivery in the next flush"""
+        user_data = self.manager.user_metadata.get(user_id, {})
+        self.pending_status[user_id] = {
+            "user_id": user_id,
+            "status": status,
+            "user_name": user_data.get("name", f"User {user_id}"),
+            "user_type": user_data.get("user_type", "unknown"),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        self.pending_audience.setdefault(user_id, set()).update(audience)
+        self._schedule_flush()
+
+    def set_typing(self, user_id: int, room_id: str, is_typing: bool):
+        """Update typing state; only transitions mark the room for delivery"""
+        now = asyncio.get_running_loop().time()
+        room_typing = self.typing.setdefault(room_id, {})
+        
+        if is_typing:
+            expires_at = room_typing.get(user_id)
+            if expires_at is None or expires_at <= now:
+                self.dirty_rooms.add(room_id)
+            room_typing[user_id] = now + self.typing_ttl
+        elif room_typing.pop(user_id, None) is not None:
+            self.dirty_rooms.add(room_id)
+        
+        if not room_typing:
+            del self.typing[room_id]
+        
+        if self.dirty_rooms:
+            self._schedule_flush()
+
+    def get_typing_users(self, room_id: str) -> List[int]:
+        """Get users currently typing in a room"""
+        now = asyncio.get_running_loop().time()
+        return sorted(
+            user_id for user_id, expires_at in self.typing.get(room_id, {}).items()
+            if expires_at > now
+        )
+
+    def drop_room(self, room_id: str):
+        """Forget typing state for a room that no longer exists"""
+        self.typing.pop(room_id, None)
+        self.typing_published.pop(room_id, None)
+        self.dirty_rooms.discard(room_id)
+
+    async def flush(self):
+        """Deliver pending presence deltas and typing changes"""
+        await self._flush_presence()
+        await self._flush_typing()
+
+    async def stop(self):
+        """Cancel any scheduled flush"""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+
+    def _schedule_flush(self):
+        """Schedule a single trailing flush if none is pending"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing presence updates: {e}")
+        
+        # Keep ticking while typing state is pending expiry
+        if self.typing or self.pending_status:
+            self._schedule_flush()
+
+    async def _flush_presence(self):
+        if not self.pending_status:
+            return
+        
+        pending, audiences = self.pending_status, self.pending_audience
+        self.pending_status, self.pending_audience = {}, {}
+        
+        deltas: Dict[int, List[Dict[str, Any]]] = {}
+        for user_id, change in pending.items():
+            # Skip flaps such as a quick reconnect that ends in the published state
+            if change["status"] == self.published_status.get(user_id, "offline"):
+                continue
+            
+            if change["status"] == "offline":
+                self.published_status.pop(user_id, None)
+            else:
+                self.published_status[user_id] = change["status"]
+            
+            for recipient_id in audiences.get(user_id, ()):
+                if recipient_id != user_id and recipient_id in self.manager.active_connections:
+                    deltas.setdefault(recipient_id, []).append(change)
+        
+        timestamp = datetime.utcnow().isoformat()
+        for recipient_id, changes in deltas.items():
+            await self.manager.send_personal_message({
+                "type": MessageType.PRESENCE_UPDATE,
+                "changes": changes,
+                "timestamp": timestamp
+            }, recipient_id, legacy=False)
+            
+            if self.manager.legacy_connections:
+                for change in changes:
+                    await self.manager.send_personal_message(
+                        {"type": MessageType.USER_STATUS, **change}, recipient_id, legacy=True
+                    )
+
+    async def _flush_typing(self):
+        now = asyncio.get_running_loop().time()
+        
+        # Expire stale typing entries
+        for room_id in list(self.typing):
+            room_typing = self.typing[room_id]
+            expired = [user_id for user_id, expires_at in room_typing.items() if expires_at <= now]
+            for user_id in expired:
+                del room_typing[user_id]
+            if expired:
+                self.dirty_rooms.add(room_id)
+            if not room_typing:
+                del self.typing[room_id]
+        
+        dirty_rooms, self.dirty_rooms = self.dirty_rooms, set()
+        timestamp = datetime.utcnow().isoformat()
+        
+        for room_id in dirty_rooms:
+            typing_users = sorted(self.typing.get(room_id, {}))
+            previous = self.typing_published.get(room_id, [])
+            if typing_users == previous:
+                continue
+            
+            if typing_users:
+                self.typing_published[room_id] = typing_users
+            else:
+                self.typing_published.pop(room_id, None)
+            
+            await self.manager.send_to_room({
+                "type": MessageType.TYPING_INDICATOR,
+                "room_id": room_id,
+                "typing_users": typing_users,
+                "timestamp": timestamp
+            }, room_id, legacy=False)
+            
+            if self.manager.legacy_connections:
+                changed = [(user_id, False) for user_id in previous if user_id not in typing_users]
+                changed += [(user_id, True) for user_id in typing_users if user_id not in previous]
+                for user_id, is_typing in changed:
+                    await self.manager.send_to_room({
+                        "type": MessageType.TYPING_INDICATOR,
+                        "room_id": room_id,
+                        "user_id": user_id,
+                        "is_typing": is_typing,
+                        "typing_users": typing_users,
+                        "timestamp": timestamp
+                    }, room_id, legacy=True)
+
+
 class ConnectionManager:
     """Manages WebSocket connections"""
     
@@ -45,22 +471,59 @@ class ConnectionManager:
         self.user_metadata: Dict[int, Dict[str, Any]] = {}
         # Store room memberships (for chat rooms, company channels, etc.)
         self.rooms: Dict[str, Set[int]] = {}
-        # Store typing indicators
-        self.typing_users: Dict[str, Set[int]] = {}
+        # Reverse index of room memberships so leave/disconnect only touch the user's rooms
+        self.user_rooms: Dict[int, Set[str]] = {}
+        # Online user snapshots, maintained incrementally on connect/disconnect
+        self.online_users: Dict[int, Dict[str, Any]] = {}
+        # Negotiated wire encoding and permessage-deflate state per connection
+        self.connection_encodings: Dict[WebSocket, MessageEncoding] = {}
+        self.compressed_connections: Set[WebSocket] = set()
+        # Connections that negotiated nothing and get the original presence frames
+        self.legacy_connections: Set[WebSocket] = set()
+        # Connections authenticated with a token for their user, which may replay notifications
+        self.replay_connections: Set[WebSocket] = set()
+        # Presence subscriptions: target user -> watchers, and watcher -> targets
+        self.presence_subscribers: Dict[int, Set[int]] = {}
+        self.presence_subscriptions: Dict[int, Set[int]] = {}
+        # Coalesced presence and typing delivery
+        self.presence = PresenceAggregator(
+            self,
+            flush_interval=settings.WEBSOCKET_PRESENCE_FLUSH_INTERVAL,
+            typing_ttl=settings.WEBSOCKET_TYPING_TTL
+        )
 
-    async def connect(self, websocket: WebSocket, user_id: int, user_data: Dict[str, Any] = None):
-        """Accept a new WebSocket connection"""
-        await websocket.accept()
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        user_data: Dict[str, Any] = None,
+        encoding: MessageEncoding = MessageEncoding.JSON,
+        subprotocol: Optional[str] = None,
+        legacy: bool = False,
+        can_replay: bool = False
+    ):
+        """Accept a new WebSocket connection (legacy ones keep user_status and per-user typing frames)"""
+        await websocket.accept(subprotocol=subprotocol)
         
         if user_id not in self.active_connections:
             self.active_connections[user_id] = set()
         
         self.active_connections[user_id].add(websocket)
+        self.connection_encodings[websocket] = encoding
+        
+        if "permessage-deflate" in websocket.headers.get("sec-websocket-extensions", "").lower():
+            self.compressed_connections.add(websocket)
+        if legacy:
+            self.legacy_connections.add(websocket)
+        if can_replay:
+            self.replay_connections.add(websocket)
         
         # Store user metadata
         if user_data:
             self.user_metadata[user_id] = user_data
         
+        self._update_online_user(user_id)
+        
         logger.info(f"User {user_id} connected via WebSocket")
         
         # Send welcome message
@@ -74,37 +537,55 @@ class ConnectionManager:
         # Notify others about user status
         await self.broadcast_user_status(user_id, "online")
 
+    def can_replay(self, websocket: WebSocket) -> bool:
+        """Check whether a connection was authenticated for replaying notifications"""
+        return websocket in self.replay_connections
+
     async def disconnect(self, websocket: WebSocket, user_id: int):
         """Handle WebSocket disconnection"""
+        self.connection_encodings.pop(websocket, None)
+        self.compressed_connections.discard(websocket)
+        self.legacy_connections.discard(websocket)
+        self.replay_connections.discard(websocket)
+        
         if user_id in self.active_connections:
             self.active_connections[user_id].discard(websocket)
             
             # Remove user if no more connections
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
-                if user_id in self.user_metadata:
-                    del self.user_metadata[user_id]
-                
-                # Remove from all rooms
-                for room_id in list(self.rooms.keys()):
-                    self.rooms[room_id].discard(user_id)
-                    if not self.rooms[room_id]:
-                        del self.rooms[room_id]
+                self.online_users.pop(user_id, None)
                 
-                # Notify others about user status
+                # Notify interested users while room memberships are still known
                 await self.broadcast_user_status(user_id, "offline")
+                
+                # Remove from the rooms this user belongs to
+                for room_id in self.user_rooms.pop(user_id, set()):
+                    self._discard_room_member(room_id, user_id)
+                
+                self.unsubscribe_presence(user_id)
+                self.user_metadata.pop(user_id, None)
+            else:
+                self._update_online_user(user_id)
         
         logger.info(f"User {user_id} disconnected from WebSocket")
 
-    async def send_personal_message(self, message: Dict[str, Any], user_id: int):
-        """Send message to a specific user"""
+    async def send_personal_message(
+        self,
+        message: Union[Dict[str, Any], OutboundMessage],
+        user_id: int,
+        legacy: Optional[bool] = None
+    ):
+        """Send message to a specific user (only to their legacy or other connections, if legacy is given)"""
         if user_id in self.active_connections:
-            message_json = json.dumps(message)
+            outbound = message if isinstance(message, OutboundMessage) else OutboundMessage(message)
             disconnected_sockets = set()
             
-            for websocket in self.active_connections[user_id]:
+            for websocket in list(self.active_connections[user_id]):
+                if legacy is not None and (websocket in self.legacy_connections) != legacy:
+                    continue
                 try:
-                    await websocket.send_text(message_json)
+                    await self._send_frame(websocket, outbound)
                 except Exception as e:
                     logger.error(f"Error sending message to user {user_id}: {e}")
                     disconnected_sockets.add(websocket)
@@ -113,16 +594,34 @@ class ConnectionManager:
             for websocket in disconnected_sockets:
                 await self.disconnect(websocket, user_id)
 
-    async def send_to_room(self, message: Dict[str, Any], room_id: str):
+    async def send_to_socket(self, websocket: WebSocket, message: Dict[str, Any]):
+        """Send message to a single connection using its negotiated encoding"""
+        await self._send_frame(websocket, OutboundMessage(message))
+
+    async def send_to_room(self, message: Dict[str, Any], room_id: str, legacy: Optional[bool] = None):
         """Send message to all users in a room"""
         if room_id in self.rooms:
-            for user_id in self.rooms[room_id]:
-                await self.send_personal_message(message, user_id)
+            outbound = OutboundMessage(message)
+            for user_id in list(self.rooms[room_id]):
+                await self.send_personal_message(outbound, user_id, legacy)
 
-    async def broadcast_to_all(self, message: Dict[str, Any]):
+    async def broadcast_to_all(self, message: Dict[str, Any], legacy: Optional[bool] = None):
         """Broadcast message to all connected users"""
+        outbound = OutboundMessage(message)
         for user_id in list(self.active_connections.keys()):
-            await self.send_personal_message(message, user_id)
+            await self.send_personal_message(outbound, user_id, legacy)
+
+    def decode_message(self, websocket: WebSocket, frame) -> Dict[str, Any]:
+        """Decode an incoming frame using the connection's negotiated encoding"""
+        encoding = self.connection_encodings.get(websocket, MessageEncoding.JSON)
+        return MessageCodec.decode(frame, encoding)
+
+    async def _send_frame(self, websocket: WebSocket, outbound: OutboundMessage):
+        frame = outbound.frame(self.connection_encodings.get(websocket, MessageEncoding.JSON))
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
 
     async def join_room(self, user_id: int, room_id: str):
         """Add user to a room"""
@@ -130,6 +629,7 @@ class ConnectionManager:
             self.rooms[room_id] = set()
         
         self.rooms[room_id].add(user_id)
+        self.user_rooms.setdefault(user_id, set()).add(room_id)
         
         # Notify room about new member
         await self.send_to_room({
@@ -143,11 +643,13 @@ class ConnectionManager:
     async def leave_room(self, user_id: int, room_id: str):
         """Remove user from a room"""
         if room_id in self.rooms:
-            self.rooms[room_id].discard(user_id)
+            user_rooms = self.user_rooms.get(user_id)
+            if user_rooms is not None:
+                user_rooms.discard(room_id)
+                if not user_rooms:
+                    del self.user_rooms[user_id]
             
-            if not self.rooms[room_id]:
-                del self.rooms[room_id]
-            else:
+            if not self._discard_room_member(room_id, user_id):
                 # Notify room about member leaving
                 await self.send_to_room({
                     "type": MessageType.SYSTEM_MESSAGE,
@@ -158,41 +660,83 @@ class ConnectionManager:
                 }, room_id)
 
     async def broadcast_user_status(self, user_id: int, status: str):
-        """Broadcast user status change"""
-        user_data = self.user_metadata.get(user_id, {})
+        """Queue a user status change for batched delivery to interested users"""
+        self.presence.queue_status(user_id, status, self.get_presence_audience(user_id))
+
+    def get_presence_audience(self, user_id: int) -> Set[int]:
+        """Get users interested in a user's presence (room peers and subscribers)"""
+        audience = set(self.presence_subscribers.get(user_id, set()))
+        for room_id in self.user_rooms.get(user_id, set()):
+            audience.update(self.rooms.get(room_id, set()))
+        audience.discard(user_id)
+        return audience
+
+    def subscribe_presence(self, watcher_id: int, user_ids: List[int]):
+        """Subscribe a user to presence changes of other users (e.g. contacts)"""
+        subscriptions = self.presence_subscriptions.setdefault(watcher_id, set())
+        for user_id in user_ids:
+            if user_id == watcher_id:
+                continue
+            subscriptions.add(user_id)
+            self.presence_subscribers.setdefault(user_id, set()).add(watcher_id)
+
+    def unsubscribe_presence(self, watcher_id: int, user_ids: Optional[List[int]] = None):
+        """Remove presence subscriptions for a user (all of them by default)"""
+        subscriptions = self.presence_subscriptions.get(watcher_id, set())
+        targets = list(subscriptions) if user_ids is None else user_ids
         
-        message = {
-            "type": MessageType.USER_STATUS,
-            "user_id": user_id,
-            "status": status,
-            "user_name": user_data.get("name", f"User {user_id}"),
-            "user_type": user_data.get("user_type", "unknown"),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        for user_id in targets:
+            subscriptions.discard(user_id)
+            watchers = self.presence_subscribers.get(user_id)
+            if watchers is not None:
+                watchers.discard(watcher_id)
+                if not watchers:
+                    del self.presence_subscribers[user_id]
         
-        # Send to all connected users (could be optimized to send only to relevant users)
-        await self.broadcast_to_all(message)
+        if not subscriptions:
+            self.presence_subscriptions.pop(watcher_id, None)
 
-    def get_online_users(self) -> List[Dict[str, Any]]:
-        """Get list of online users"""
-        online_users = []
-        for user_id, connections in self.active_connections.items():
-            if connections:  # User has active connections
-                user_data = self.user_metadata.get(user_id, {})
-                online_users.append({
-                    "user_id": user_id,
-                    "name": user_data.get("name", f"User {user_id}"),
-                    "user_type": user_data.get("user_type", "unknown"),
-                    "connection_count": len(connections),
-                    "last_seen": datetime.utcnow().isoformat()
-                })
-        
-        return online_users
+    def get_online_users(self, skip: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get a page of online users from the incrementally maintained snapshot"""
+        stop = skip + limit if limit is not None else None
+        return [dict(entry) for entry in islice(self.online_users.values(), skip, stop)]
+
+    def get_online_count(self) -> int:
+        """Get number of online users"""
+        return len(self.online_users)
 
     def get_room_users(self, room_id: str) -> List[int]:
         """Get users in a specific room"""
         return list(self.rooms.get(room_id, set()))
 
+    def get_user_rooms(self, user_id: int) -> List[str]:
+        """Get rooms a specific user belongs to"""
+        return list(self.user_rooms.get(user_id, set()))
+
+    def _update_online_user(self, user_id: int):
+        """Refresh the online snapshot entry for a connected user"""
+        user_data = self.user_metadata.get(user_id, {})
+        self.online_users[user_id] = {
+            "user_id": user_id,
+            "name": user_data.get("name", f"User {user_id}"),
+            "user_type": user_data.get("user_type", "unknown"),
+            "connection_count": len(self.active_connections.get(user_id, ())),
+            "last_seen": datetime.utcnow().isoformat()
+        }
+
+    def _discard_room_member(self, room_id: str, user_id: int) -> bool:
+        """Remove a user from a room, deleting the room when empty. Returns True if the room was deleted."""
+        members = self.rooms.get(room_id)
+        if members is None:
+            return True
+        
+        members.discard(user_id)
+        if not members:
+            del self.rooms[room_id]
+            self.presence.drop_room(room_id)
+            return True
+        return False
+
 
 class WebSocketService:
     """WebSocket service for real-time features"""
@@ -206,9 +750,10 @@ class WebSocketService:
         title: str, 
         message: str, 
         priority: NotificationPriority = NotificationPriority.MEDIUM,
-        data: Dict[str, Any] = None
+        data: Dict[str, Any] = None,
+        db: Optional[AsyncSession] = None
     ):
-        """Send a notification to a user"""
+        """Send a notification to a user (logged for replay through db, if given)"""
         notification = {
             "type": MessageType.NOTIFICATION,
             "title": title,
@@ -219,7 +764,7 @@ class WebSocketService:
             "id": f"notif_{user_id}_{int(datetime.utcnow().timestamp())}"
         }
         
-        await self.manager.send_personal_message(notification, user_id)
+        await self._deliver(notification, [user_id], db)
         logger.info(f"Notification sent to user {user_id}: {title}")
 
     async def send_application_update(
@@ -227,9 +772,10 @@ class WebSocketService:
         candidate_id: int, 
         application_id: int, 
         status: str, 
-        message: str = None
+        message: str = None,
+        db: Optional[AsyncSession] = None
     ):
-        """Send application status update"""
+        """Send application status update (logged for replay through db, if given)"""
         update = {
             "type": MessageType.APPLICATION_UPDATE,
             "application_id": application_id,
@@ -238,7 +784,7 @@ class WebSocketService:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        await self.manager.send_personal_message(update, candidate_id)
+        await self._deliver(update, [candidate_id], db)
         logger.info(f"Application update sent to candidate {candidate_id}: {status}")
 
     async def send_job_update(
@@ -246,9 +792,10 @@ class WebSocketService:
         job_id: int, 
         update_type: str, 
         message: str,
-        affected_users: List[int] = None
+        affected_users: List[int] = None,
+        db: Optional[AsyncSession] = None
     ):
-        """Send job-related updates"""
+        """Send job-related updates (logged for replay through db, if given)"""
         update = {
             "type": MessageType.JOB_UPDATE,
             "job_id": job_id,
@@ -258,8 +805,7 @@ class WebSocketService:
         }
         
         if affected_users:
-            for user_id in affected_users:
-                await self.manager.send_personal_message(update, user_id)
+            await self._deliver(update, affected_users, db)
         else:
             await self.manager.broadcast_to_all(update)
         
@@ -269,9 +815,10 @@ class WebSocketService:
         self, 
         user_id: int, 
         interview_data: Dict[str, Any],
-        reminder_time: str
+        reminder_time: str,
+        db: Optional[AsyncSession] = None
     ):
-        """Send interview reminder"""
+        """Send interview reminder (logged for replay through db, if given)"""
         reminder = {
             "type": MessageType.INTERVIEW_REMINDER,
             "interview_data": interview_data,
@@ -280,7 +827,7 @@ class WebSocketService:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        await self.manager.send_personal_message(reminder, user_id)
+        await self._deliver(reminder, [user_id], db)
         logger.info(f"Interview reminder sent to user {user_id}")
 
     async def send_chat_message(
@@ -304,8 +851,7 @@ class WebSocketService:
         }
         
         # Send to both sender and recipient
-        await self.manager.send_personal_message(chat_message, from_user_id)
-        await self.manager.send_personal_message(chat_message, to_user_id)
+        await self._deliver(chat_message, list(dict.fromkeys([from_user_id, to_user_id])))
         
         logger.info(f"Chat message sent from {from_user_id} to {to_user_id}")
 
@@ -321,35 +867,77 @@ class WebSocketService:
         await self.manager.broadcast_to_all(system_message)
         logger.info(f"System message broadcasted: {message}")
 
-    async def handle_typing_indicator(self, user_id: int, room_id: str, is_typing: bool):
-        """Handle typing indicators"""
-        if room_id not in self.manager.typing_users:
-            self.manager.typing_users[room_id] = set()
+    async def replay_missed(self, websocket: WebSocket, user_id: int, last_seq: int) -> int:
+        """
+        Replay logged notifications after ``last_seq`` to a single connection
         
-        if is_typing:
-            self.manager.typing_users[room_id].add(user_id)
-        else:
-            self.manager.typing_users[room_id].discard(user_id)
+        Messages are sent in batched notification_replay frames.
         
-        # Broadcast typing indicator to room
-        typing_message = {
-            "type": MessageType.TYPING_INDICATOR,
-            "room_id": room_id,
-            "user_id": user_id,
-            "is_typing": is_typing,
-            "typing_users": list(self.manager.typing_users[room_id]),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        Returns:
+            Number of messages replayed
+        """
+        replayed = 0
+        batch_size = notification_store.batch_size
         
-        await self.manager.send_to_room(typing_message, room_id)
+        while True:
+            messages = await notification_store.replay(user_id, last_seq, limit=batch_size)
+            if not messages:
+                break
+            
+            last_seq = messages[-1]["seq"]
+            replayed += len(messages)
+            has_more = len(messages) == batch_size
+            
+            await self.manager.send_to_socket(websocket, {
+                "type": MessageType.NOTIFICATION_REPLAY,
+                "messages": messages,
+                "last_seq": last_seq,
+                "has_more": has_more,
+                "timestamp": datetime.utcnow().isoformat()
+            })
+            
+            if not has_more:
+                break
+        
+        return replayed
+
+    async def _deliver(self, message: Dict[str, Any], user_ids: List[int], db: Optional[AsyncSession] = None):
+        """
+        Log a message for replay, then deliver it to recipients that are connected
+        
+        Callers that hold the request's write session pass it as db, so the log
+        entry is written through it instead of waiting for the write connection;
+        it commits when the caller commits that session.
+        """
+        try:
+            sequences = await notification_store.append(user_ids, message, db)
+        except Exception as e:
+            logger.error(f"Error logging notification for replay: {e}")
+            sequences = {}
+        
+        for user_id in user_ids:
+            seq = sequences.get(user_id)
+            await self.manager.send_personal_message(
+                {**message, "seq": seq} if seq is not None else message,
+                user_id
+            )
+
+    async def handle_typing_indicator(self, user_id: int, room_id: str, is_typing: bool):
+        """Handle typing indicators (coalesced and delivered on the next presence flush)"""
+        self.manager.presence.set_typing(user_id, room_id, is_typing)
 
     def get_connection_stats(self) -> Dict[str, Any]:
         """Get WebSocket connection statistics"""
         total_connections = sum(len(connections) for connections in self.manager.active_connections.values())
+        encodings: Dict[str, int] = {}
+        for encoding in self.manager.connection_encodings.values():
+            encodings[encoding.value] = encodings.get(encoding.value, 0) + 1
         
         return {
-            "total_users": len(self.manager.active_connections),
+            "total_users": self.manager.get_online_count(),
             "total_connections": total_connections,
+            "encodings": encodings,
+            "compressed_connections": len(self.manager.compressed_connections),
             "active_rooms": len(self.manager.rooms),
             "online_users": self.manager.get_online_users(),
             "rooms": {room_id: len(users) for room_id, users in self.manager.rooms.items()},
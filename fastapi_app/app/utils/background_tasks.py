@@ -5,6 +5,7 @@ Background task utilities for async processing.
 """
 
 import asyncio
+from contextvars import ContextVar
 from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
@@ -16,6 +17,9 @@ from ..services.ai_service import ai_service
 
 logger = logging.getLogger(__name__)
 
+# ID of the task a worker is running, for progress reports
+_current_task_id: ContextVar[Optional[str]] = ContextVar("current_task_id", default=None)
+
 
 class BackgroundTaskManager:
     """Background task manager for handling async operations"""
@@ -71,10 +75,16 @@ class BackgroundTaskManager:
                 
                 logger.info(f"Worker {worker_name} processing task {task_id}")
                 
+                if task_id in self.running_tasks:
+                    self.running_tasks[task_id]['status'] = 'running'
+                    self.running_tasks[task_id]['started_at'] = datetime.utcnow()
+                _current_task_id.set(task_id)
+                
                 try:
-                    # Execute task
+                    # Execute task in its own asyncio task, so context it sets
+                    # (such as the LLM tenant) does not leak into later tasks
                     if asyncio.iscoroutinefunction(task_func):
-                        result = await task_func(*task_args, **task_kwargs)
+                        result = await asyncio.create_task(task_func(*task_args, **task_kwargs))
                     else:
                         result = task_func(*task_args, **task_kwargs)
                     
@@ -109,9 +119,10 @@ class BackgroundTaskManager:
         task_func: Callable,
         *args,
         task_id: Optional[str] = None,
+        owner: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> str:
-        """Add a task to the background queue"""
+        """Add a task to the background queue, recording who it belongs to (e.g. a job and company) if given"""
         import uuid
         
         if task_id is None:
@@ -130,7 +141,9 @@ class BackgroundTaskManager:
             'status': 'queued',
             'created_at': datetime.utcnow(),
             'result': None,
-            'error': None
+            'error': None,
+            'progress': None,
+            'owner': owner or {}
         }
         
         # Add to queue
@@ -143,6 +156,12 @@ class BackgroundTaskManager:
         """Get status of a background task"""
         return self.running_tasks.get(task_id)
 
+    def report_progress(self, progress: Dict[str, Any]):
+        """Record progress of the task the calling worker is running"""
+        task_info = self.running_tasks.get(_current_task_id.get())
+        if task_info is not None:
+            task_info['progress'] = progress
+
     async def cleanup_completed_tasks(self, max_age_hours: int = 24):
         """Clean up old completed tasks"""
         cutoff_time = datetime.utcnow() - timedelta(hours=max_age_hours)
@@ -270,6 +289,17 @@ async def cleanup_old_files_task(days_old: int = 30):
         raise
 
 
+async def compact_notification_log_task(ttl_hours: Optional[int] = None):
+    """Background task to compact the notification replay log"""
+    try:
+        from ..services.notification_store import notification_store
+        deleted_count = await notification_store.compact(ttl_hours)
+        return {'deleted_notifications': deleted_count}
+    except Exception as e:
+        logger.error(f"Failed to compact notification log: {e}")
+        raise
+
+
 async def generate_analytics_report_task(company_id: Optional[int] = None, report_type: str = "monthly"):
     """Background task to generate analytics report"""
     try:
@@ -294,6 +324,47 @@ async def generate_analytics_report_task(company_id: Optional[int] = None, repor
         raise
 
 
+async def bulk_screen_job_task(job_id: int):
+    """Background task to screen all applicants of a job"""
+    try:
+        from ..services.bulk_screening import bulk_screening_service
+        return await bulk_screening_service.screen_job(job_id, progress=task_manager.report_progress)
+    except Exception as e:
+        logger.error(f"Failed to screen applicants for job {job_id}: {e}")
+        raise
+
+
+async def match_talent_pool_task(job_id: int):
+    """Background task to match a job against the talent pool"""
+    try:
+        from ..services.talent_matching import talent_matching_service
+        return await talent_matching_service.match_job(job_id, progress=task_manager.report_progress)
+    except Exception as e:
+        logger.error(f"Failed to match job {job_id} against the talent pool: {e}")
+        raise
+
+
+async def rebuild_semantic_index_task():
+    """Background task to rebuild the semantic search indexes"""
+    try:
+        from ..services.semantic_search import semantic_search
+        return await semantic_search.rebuild(progress=task_manager.report_progress)
+    except Exception as e:
+        logger.error(f"Failed to rebuild semantic index: {e}")
+        raise
+
+
+async def catalog_existing_files_task():
+    """Background task to add files uploaded before the file catalog existed to it"""
+    try:
+        from ..utils.file_handler import file_handler
+        added = await file_handler.catalog_existing_files()
+        return {'catalogued_files': added}
+    except Exception as e:
+        logger.error(f"Failed to catalog existing files: {e}")
+        raise
+
+
 # Convenience functions for common tasks
 async def schedule_welcome_email(user_data: Dict[str, Any]) -> str:
     """Schedule welcome email to be sent in background"""
@@ -326,6 +397,30 @@ async def schedule_application_analysis(application_data: Dict[str, Any]) -> str
     return await task_manager.add_task(analyze_application_quality_task, application_data)
 
 
+async def schedule_bulk_screening(job_id: int, company_id: int) -> str:
+    """Schedule screening of all applicants of a job in background"""
+    return await task_manager.add_task(
+        bulk_screen_job_task, job_id, owner={"job_id": job_id, "company_id": company_id}
+    )
+
+
+async def schedule_talent_pool_matching(job_id: int, company_id: int) -> str:
+    """Schedule matching of a job against the talent pool in background"""
+    return await task_manager.add_task(
+        match_talent_pool_task, job_id, owner={"job_id": job_id, "company_id": company_id}
+    )
+
+
+async def schedule_semantic_index_rebuild() -> str:
+    """Schedule a rebuild of the semantic search indexes in background"""
+    return await task_manager.add_task(rebuild_semantic_index_task)
+
+
+async def schedule_file_catalog_backfill() -> str:
+    """Schedule cataloguing of existing uploaded files in background"""
+    return await task_manager.add_task(catalog_existing_files_task)
+
+
 # Startup and shutdown functions
 async def startup_background_tasks():
     """Start background task workers on application startup"""
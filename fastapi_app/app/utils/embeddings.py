@@ -0,0 +1,457 @@
+"""
+Embeddings
+
+Local, CPU-only vector representations for matching and search:
+
+- SkillMatcher resolves skill names to taxonomy ids, so aliases such as
+  "Postgres" and "PostgreSQL" or "Node" and "Node.js" match, mapping
+  versions and misspellings of taxonomy names ("Python 3", "Kubernets")
+  to them, while different skills such as "Java" and "JavaScript", or
+  "Java" and "Java EE", never match
+- TextEmbedder turns job descriptions and resumes into dense unit vectors
+  with TF-IDF over character n-grams reduced by truncated SVD (LSA)
+- VectorIndex keeps unit vectors in a memory-mapped file, as float32 or
+  as int8 with per-vector scales, and answers exact top-k inner product
+  queries by scanning it in blocks
+
+Only NumPy and scikit-learn are needed and nothing here reads the
+application settings, so the standalone matching scripts use it too.
+"""
+
+import json
+import math
+import pickle
+import re
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+
+from .skill_taxonomy import skill_key, skill_taxonomy
+
+_SKILL_SEPARATORS = re.compile(r"[\s._/\-]+")
+# Parenthesised notes and trailing versions that do not change a skill: "Kubernetes (k8s)", "Python 3.11", "JS ES6"
+_QUALIFIERS = re.compile(r"\([^)]*\)|(?:\s+(?:v|es)?\d+(?:\.\d+)*)+\s*$", re.IGNORECASE)
+
+# Cosine similarity above which a taxonomy spelling is a candidate for a name
+SKILL_MATCH_THRESHOLD = 0.75
+# Similarity of compact spellings above which a name is a typo of a taxonomy spelling
+SKILL_SPELLING_RATIO = 0.85
+
+# Taxonomy id of a skill, or the compact spelling of a skill outside the taxonomy
+SkillKey = Union[int, str]
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase a skill name and turn separators into single spaces"""
+    return _SKILL_SEPARATORS.sub(" ", skill.lower()).strip()
+
+
+class SkillMatcher:
+    """
+    Skill matching on taxonomy ids and bitsets
+
+    Every skill name resolves to a key. Taxonomy names and aliases use the
+    taxonomy's id; a name outside the taxonomy takes the id of a taxonomy
+    spelling it differs from only by a version or a typo, and otherwise
+    keys on its own compact spelling. Resolution depends on the name
+    alone, never on the names seen before it, and nothing is added to the
+    taxonomy. Matching two skill lists is then a bitset intersection.
+    """
+
+    def __init__(self, threshold: float = SKILL_MATCH_THRESHOLD, n_features: int = 2 ** 18, cache_size: int = 10000):
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=(2, 4),
+            n_features=n_features,
+            alternate_sign=False,
+            norm="l2"
+        )
+        self._lock = threading.Lock()
+        self._encoded: "OrderedDict[Tuple[str, ...], Tuple[Tuple[SkillKey, ...], int, Tuple[str, ...]]]" = OrderedDict()
+        self._jobs: "OrderedDict[Tuple[Tuple[str, ...], Tuple[str, ...]], Tuple[int, int, Dict[str, int]]]" = OrderedDict()
+        self._resolve = lru_cache(maxsize=cache_size)(self._closest_skill)
+
+        # Taxonomy spellings compared with names outside the taxonomy, by compact key and by length
+        self._spelling_ids = [skill_id for _, skill_id in skill_taxonomy.spellings]
+        self._spellings = self._vectorize([spelling for spelling, _ in skill_taxonomy.spellings])
+        self._spelling_rows: Dict[str, int] = {}
+        self._keys_by_length: Dict[int, List[str]] = {}
+        for row, (spelling, _) in enumerate(skill_taxonomy.spellings):
+            key = skill_key(spelling)
+            if key and key not in self._spelling_rows:
+                self._spelling_rows[key] = row
+                self._keys_by_length.setdefault(len(key), []).append(key)
+
+    def _vectorize(self, skills: Sequence[str]) -> sparse.csr_matrix:
+        return self._vectorizer.transform([normalize_skill(skill) for skill in skills])
+
+    def _closest_skill(self, skill: str) -> Optional[int]:
+        """Taxonomy id of a name without its qualifiers, or of a spelling it is a typo of"""
+        name = _QUALIFIERS.sub("", skill).strip()
+        key = skill_key(name)
+        if not key:
+            return None
+        skill_id = skill_taxonomy.lookup(name)
+        if skill_id is not None:
+            return skill_id
+
+        # Spelled nearly the same and close by n-grams: "Kubernets", not "Node-RED" or "Java EE"
+        matcher = SequenceMatcher(None, b=key)
+        best, best_ratio = None, SKILL_SPELLING_RATIO
+        shortest = math.ceil(len(key) * SKILL_SPELLING_RATIO / (2 - SKILL_SPELLING_RATIO))
+        longest = math.floor(len(key) * (2 - SKILL_SPELLING_RATIO) / SKILL_SPELLING_RATIO)
+        for length in range(shortest, longest + 1):
+            for spelling in self._keys_by_length.get(length, ()):
+                matcher.set_seq1(spelling)
+                if matcher.quick_ratio() >= best_ratio:
+                    ratio = matcher.ratio()
+                    if ratio >= best_ratio:
+                        best, best_ratio = spelling, ratio
+        if best is None:
+            return None
+
+        row = self._spelling_rows[best]
+        if (self._spellings[row] @ self._vectorize([name]).T).toarray()[0, 0] < self.threshold:
+            return None
+        return self._spelling_ids[row]
+
+    def resolve(self, skill: str) -> Optional[int]:
+        """Taxonomy id of a skill name, or None for a skill outside the taxonomy"""
+        skill_id = skill_taxonomy.lookup(skill)
+        return skill_id if skill_id is not None else self._resolve(skill)
+
+    def key(self, skill: str) -> SkillKey:
+        """Taxonomy id of a skill name, or its compact spelling without qualifiers outside the taxonomy"""
+        skill_id = self.resolve(skill)
+        if skill_id is not None:
+            return skill_id
+        return skill_key(_QUALIFIERS.sub("", skill)) or skill.strip().lower()
+
+    def _encoding(self, skills: Sequence[str]) -> Tuple[Tuple[SkillKey, ...], int, Tuple[str, ...]]:
+        """Cached keys, taxonomy bitset and distinct free-text keys of a skill list"""
+        key = tuple(skills)
+        encoded = self._encoded.get(key)
+        if encoded is not None:
+            try:
+                self._encoded.move_to_end(key)
+            except KeyError:  # evicted by another thread since the lookup
+                pass
+            return encoded
+
+        keys = tuple(self.key(skill) for skill in key)
+        encoded = (
+            keys,
+            skill_taxonomy.bitset(skill_id for skill_id in keys if isinstance(skill_id, int)),
+            tuple(dict.fromkeys(skill_id for skill_id in keys if isinstance(skill_id, str)))
+        )
+        with self._lock:
+            self._encoded[key] = encoded
+            if len(self._encoded) > self.cache_size:
+                self._encoded.popitem(last=False)
+        return encoded
+
+    def encode(self, skills: Sequence[str]) -> Tuple[Tuple[SkillKey, ...], int]:
+        """
+        Keys of a skill list, one per name, and the bitset of its taxonomy skills
+
+        Results are cached per distinct list (least recently used first
+        out), so a profile's skills are resolved once however many jobs it
+        is compared with.
+        """
+        keys, bits, _ = self._encoding(skills)
+        return keys, bits
+
+    def bitset(self, skills: Sequence[str]) -> int:
+        """Bitset of the taxonomy skills of a skill list"""
+        return self._encoding(skills)[1]
+
+    def job_bitsets(self, required: Sequence[str], preferred: Sequence[str]) -> Tuple[int, int, Dict[str, int]]:
+        """
+        Bitsets of a job's required and preferred skills, cached per job
+
+        Free-text skills of the job get bits after the taxonomy's, numbered
+        for this job; the returned mapping of their keys to bits is passed
+        to candidate_bitset so candidates' free-text skills line up.
+
+        Returns:
+            (required bits, preferred bits, free-text key -> bit)
+        """
+        key = (tuple(required), tuple(preferred))
+        encoded = self._jobs.get(key)
+        if encoded is not None:
+            try:
+                self._jobs.move_to_end(key)
+            except KeyError:  # evicted by another thread since the lookup
+                pass
+            return encoded
+
+        _, required_bits, required_free = self._encoding(key[0])
+        _, preferred_bits, preferred_free = self._encoding(key[1])
+        free_bits = {
+            skill: 1 << (skill_taxonomy.canonical_count + number)
+            for number, skill in enumerate(dict.fromkeys(required_free + preferred_free))
+        }
+        encoded = (
+            required_bits | sum(free_bits[skill] for skill in required_free),
+            preferred_bits | sum(free_bits[skill] for skill in preferred_free),
+            free_bits
+        )
+        with self._lock:
+            self._jobs[key] = encoded
+            if len(self._jobs) > self.cache_size:
+                self._jobs.popitem(last=False)
+        return encoded
+
+    def candidate_bitset(self, skills: Sequence[str], free_bits: Dict[str, int]) -> int:
+        """Bitset of a candidate's skills to compare with the job whose free-text bits are given"""
+        _, bits, free = self._encoding(skills)
+        if free and free_bits:
+            for skill in free:
+                bits |= free_bits.get(skill, 0)
+        return bits
+
+    def bitsets(self, *skill_lists: Sequence[str]) -> Tuple[int, ...]:
+        """
+        Bitsets of skill lists that are compared with each other
+
+        Names outside the taxonomy get bits after the taxonomy's, numbered
+        for this call only, so the same free-text skill in two of the lists
+        overlaps. Bitsets from different calls must not be mixed. To score
+        many candidates against one job, use job_bitsets and
+        candidate_bitset, which are cached.
+        """
+        encoded = [self._encoding(skills) for skills in skill_lists]
+        numbered: Dict[str, int] = {}
+        for _, _, free in encoded:
+            for key in free:
+                if key not in numbered:
+                    numbered[key] = 1 << (skill_taxonomy.canonical_count + len(numbered))
+        if not numbered:
+            return tuple(bits for _, bits, _ in encoded)
+        return tuple(bits | sum(numbered[key] for key in free) for _, bits, free in encoded)
+
+    def similarity_matrix(self, skills_a: Sequence[str], skills_b: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of every skill in skills_a to every skill in skills_b"""
+        normalized_a = [normalize_skill(skill) for skill in skills_a]
+        normalized_b = [normalize_skill(skill) for skill in skills_b]
+        similarity = (
+            self._vectorizer.transform(normalized_a) @ self._vectorizer.transform(normalized_b).T
+        ).toarray()
+
+        # Names differing only in separators ("nodejs", "Node.js") are the same skill
+        compact_b = {}
+        for column, skill in enumerate(normalized_b):
+            compact_b.setdefault(skill.replace(" ", ""), []).append(column)
+        for row, skill in enumerate(normalized_a):
+            columns = compact_b.get(skill.replace(" ", ""))
+            if skill and columns:
+                similarity[row, columns] = 1.0
+
+        return similarity
+
+    def similarity(self, skill_a: str, skill_b: str) -> float:
+        """Cosine similarity of two skill names"""
+        return float(self.similarity_matrix([skill_a], [skill_b])[0, 0])
+
+    def match(self, candidate_skills: Sequence[str], required_skills: Sequence[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split required skills into those a candidate has and those missing
+
+        Args:
+            candidate_skills: Skills the candidate lists
+            required_skills: Skills to look for
+
+        Returns:
+            (matched, missing) required skills, in their given order
+        """
+        if not required_skills:
+            return [], []
+        if not candidate_skills:
+            return [], list(required_skills)
+
+        candidate_keys = set(self._encoding(candidate_skills)[0])
+        required_keys = self._encoding(required_skills)[0]
+        matched = [skill for skill, key in zip(required_skills, required_keys) if key in candidate_keys]
+        missing = [skill for skill, key in zip(required_skills, required_keys) if key not in candidate_keys]
+        return matched, missing
+
+
+class TextEmbedder:
+    """TF-IDF over character n-grams reduced to dense unit vectors with truncated SVD"""
+
+    def __init__(self, dim: int = 128, max_features: int = 2 ** 18, random_state: int = 42):
+        self.dim = dim
+        self.max_features = max_features
+        self.random_state = random_state
+        self._tfidf: Optional[TfidfVectorizer] = None
+        self._svd: Optional[TruncatedSVD] = None
+
+    @property
+    def fitted(self) -> bool:
+        return self._svd is not None
+
+    @property
+    def output_dim(self) -> int:
+        """Dimension of the vectors produced (at most dim, less for a tiny corpus)"""
+        return self._svd.n_components if self._svd is not None else self.dim
+
+    def fit(self, texts: Sequence[str]) -> "TextEmbedder":
+        """Learn the vocabulary and the projection from a sample of documents"""
+        self._tfidf = TfidfVectorizer(
+            analyzer="char_wb",
+            ngram_range=(3, 5),
+            max_features=self.max_features,
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+        matrix = self._tfidf.fit_transform(texts)
+        components = max(1, min(self.dim, matrix.shape[0] - 1, matrix.shape[1] - 1))
+        self._svd = TruncatedSVD(n_components=components, random_state=self.random_state)
+        self._svd.fit(matrix)
+        return self
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed documents as float32 unit vectors, one row per document"""
+        if not self.fitted:
+            raise RuntimeError("TextEmbedder must be fitted before use")
+        vectors = self._svd.transform(self._tfidf.transform(texts)).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def save(self, path: str):
+        """Write the fitted model to a file"""
+        with open(path, "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path: str) -> "TextEmbedder":
+        """Read a model written by save()"""
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+
+class VectorIndex:
+    """
+    Exact top-k search over unit vectors in a memory-mapped file
+
+    An index is a directory holding the raw vectors, their IDs and, for
+    int8 indexes, per-vector scales. The vectors are scanned in blocks, so
+    queries touch the file sequentially and memory stays bounded; the OS
+    page cache keeps hot indexes in memory.
+    """
+
+    BLOCK_ROWS = 65536
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path / "meta.json") as file:
+            meta = json.load(file)
+        self.count = meta["count"]
+        self.dim = meta["dim"]
+        self.dtype = meta["dtype"]
+        self.ids = np.load(self.path / "ids.npy", mmap_mode="r")
+        self.vectors = np.memmap(
+            self.path / "vectors.bin", dtype=self.dtype, mode="r", shape=(self.count, self.dim)
+        ) if self.count else np.empty((0, self.dim), dtype=self.dtype)
+        self.scales = np.load(self.path / "scales.npy", mmap_mode="r") if self.dtype == "int8" else None
+
+    @classmethod
+    def build(cls, path: str, ids: Sequence[int], vectors: np.ndarray, dtype: str = "float32") -> "VectorIndex":
+        """Write an index from in-memory vectors"""
+        writer = VectorIndexWriter(path, vectors.shape[1], dtype)
+        writer.add(ids, vectors)
+        return writer.close()
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Find the vectors with the highest inner product with a query
+
+        Args:
+            query: Query unit vector
+            k: Number of results
+
+        Returns:
+            (id, score) pairs, best first
+        """
+        if self.count == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, self.count, self.BLOCK_ROWS):
+            block = self.vectors[start:start + self.BLOCK_ROWS]
+            if self.scales is not None:
+                scores = (block.astype(np.float32) @ query) * self.scales[start:start + self.BLOCK_ROWS]
+            else:
+                scores = block @ query
+
+            top = np.argpartition(scores, -k)[-k:] if len(scores) > k else np.arange(len(scores))
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores, kind="stable")
+        return [(int(self.ids[best_rows[i]]), float(best_scores[i])) for i in order]
+
+
+class VectorIndexWriter:
+    """Streams vectors into a new VectorIndex directory"""
+
+    def __init__(self, path: str, dim: int, dtype: str = "float32"):
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        self.path = Path(path)
+        self.dim = dim
+        self.dtype = dtype
+        self.count = 0
+        self._ids: List[np.ndarray] = []
+        self._scales: List[np.ndarray] = []
+        self.path.mkdir(parents=True, exist_ok=False)
+        self._file = open(self.path / "vectors.bin", "wb")
+
+    def add(self, ids: Iterable[int], vectors: np.ndarray):
+        """Append vectors (one row per ID) to the index"""
+        ids = np.asarray(list(ids), dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected {len(ids)} vectors of dimension {self.dim}, got {vectors.shape}")
+
+        if self.dtype == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            self._scales.append(scales.astype(np.float32))
+            vectors = np.round(vectors / scales[:, None]).astype(np.int8)
+
+        self._file.write(np.ascontiguousarray(vectors).tobytes())
+        self._ids.append(ids)
+        self.count += len(ids)
+
+    def close(self) -> VectorIndex:
+        """Finish writing and open the index"""
+        self._file.close()
+        ids = np.concatenate(self._ids) if self._ids else np.empty(0, dtype=np.int64)
+        np.save(self.path / "ids.npy", ids)
+        if self.dtype == "int8":
+            scales = np.concatenate(self._scales) if self._scales else np.empty(0, dtype=np.float32)
+            np.save(self.path / "scales.npy", scales)
+        with open(self.path / "meta.json", "w") as file:
+            json.dump({"count": self.count, "dim": self.dim, "dtype": self.dtype}, file)
+        return VectorIndex(str(self.path))
+
+
+# Global skill matcher instance
+skill_matcher = SkillMatcher()
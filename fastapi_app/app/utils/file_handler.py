@@ -2,11 +2,21 @@
 File Handler Utilities
 
 File upload, processing, and management utilities.
+
+Every uploaded file is recorded in the stored_files catalog together with
+a running per-user storage total, so listing a user's files, storage
+usage and age-based cleanup are indexed queries rather than walks over
+the upload directory. Catalog methods take the request's database session
+when called from an endpoint, since that session holds the SQLite write
+connection; without one they open their own.
 """
 
 import os
 import uuid
+import asyncio
+import hashlib
 import mimetypes
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 import aiofiles
@@ -16,9 +26,49 @@ from PIL import Image
 import PyPDF2
 import docx
 import magic
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.database import AsyncSessionLocal, session_scope
+from ..models.file import StorageUsage, StoredFile
 
 logger = logging.getLogger(__name__)
 
+FILE_TYPES = ('image', 'document', 'video')
+
+
+async def _add_usage(session, owner_id: Optional[int], file_type: str, files: int, size: int):
+    """Add files and bytes (negative to subtract) to a user's running storage total"""
+    if owner_id is None:
+        return
+    
+    for _ in range(2):
+        result = await session.execute(
+            update(StorageUsage)
+            .where(StorageUsage.owner_id == owner_id, StorageUsage.file_type == file_type)
+            .values(file_count=StorageUsage.file_count + files, total_bytes=StorageUsage.total_bytes + size)
+        )
+        if result.rowcount:
+            return
+        try:
+            async with session.begin_nested():
+                await session.execute(insert(StorageUsage).values(
+                    owner_id=owner_id, file_type=file_type, file_count=files, total_bytes=size
+                ))
+            return
+        except IntegrityError:
+            continue  # Another upload created the row first; add to it
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    """Unix timestamp of a catalog datetime (stored in UTC)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
 
 class FileHandler:
     """File handling utilities"""
@@ -50,7 +100,8 @@ class FileHandler:
         file: UploadFile,
         file_type: str = "document",
         user_id: Optional[int] = None,
-        subfolder: Optional[str] = None
+        subfolder: Optional[str] = None,
+        db: Optional[AsyncSession] = None
     ) -> Dict[str, Any]:
         """
         Upload a file and return file information
@@ -60,6 +111,7 @@ class FileHandler:
             file_type: Type of file (image, document, video)
             user_id: User ID for organizing files
             subfolder: Additional subfolder for organization
+            db: Session to catalog the file with (committed)
             
         Returns:
             File information dictionary
@@ -107,6 +159,15 @@ class FileHandler:
             elif file_type == 'document':
                 file_info.update(await self._process_document(file_path))
             
+            # Record the file in the catalog; a file the catalog does not know is removed
+            try:
+                file_info['file_id'] = await self._catalog_file(
+                    file_info, user_id, subfolder, hashlib.sha256(content).hexdigest(), db
+                )
+            except Exception:
+                self._remove_from_disk(file_path)
+                raise
+            
             logger.info(f"File uploaded successfully: {unique_filename}")
             return file_info
             
@@ -114,6 +175,34 @@ class FileHandler:
             logger.error(f"Error uploading file: {e}")
             raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
 
+    async def _catalog_file(
+        self,
+        file_info: Dict[str, Any],
+        owner_id: Optional[int],
+        subfolder: Optional[str],
+        content_hash: str,
+        db: Optional[AsyncSession] = None
+    ) -> int:
+        """Add an uploaded file to the catalog and its owner's storage total"""
+        file_path = Path(file_info['file_path'])
+        
+        async with session_scope(db) as session:
+            entry = StoredFile(
+                owner_id=owner_id,
+                file_type=file_info['file_type'],
+                subfolder=subfolder,
+                file_path=str(file_path),
+                thumbnail_path=str(file_path.parent / f"thumb_{file_path.name}") if file_info.get('has_thumbnail') else None,
+                original_filename=file_info['original_filename'],
+                file_size=file_info['file_size'],
+                content_hash=content_hash,
+                mime_type=file_info['mime_type']
+            )
+            session.add(entry)
+            await _add_usage(session, owner_id, entry.file_type, 1, entry.file_size)
+            await session.commit()
+            return entry.id
+
     async def _validate_file(self, file: UploadFile, file_type: str) -> Dict[str, Any]:
         """Validate uploaded file"""
         try:
@@ -280,21 +369,22 @@ class FileHandler:
             logger.error(f"Error extracting text content: {e}")
             return {'text_content': '', 'page_count': 0}
 
-    async def delete_file(self, file_path: str) -> bool:
-        """Delete a file"""
+    async def delete_file(self, file_path: str, db: Optional[AsyncSession] = None) -> bool:
+        """Delete a file, its thumbnail and its catalog entry (committing db if given)"""
         try:
             path = Path(file_path)
-            if path.exists():
-                path.unlink()
-                
-                # Also delete thumbnail if it exists
-                if path.name.startswith('thumb_'):
-                    pass  # It's already a thumbnail
-                else:
-                    thumbnail_path = path.parent / f"thumb_{path.name}"
-                    if thumbnail_path.exists():
-                        thumbnail_path.unlink()
-                
+            
+            async with session_scope(db) as session:
+                entry = (await session.execute(
+                    select(StoredFile).where(StoredFile.file_path == str(path))
+                )).scalar_one_or_none()
+                if entry is not None:
+                    await session.delete(entry)
+                    await _add_usage(session, entry.owner_id, entry.file_type, -1, -entry.file_size)
+                    await session.commit()
+            
+            removed = self._remove_from_disk(path)
+            if entry is not None or removed:
                 logger.info(f"File deleted: {file_path}")
                 return True
             
@@ -304,6 +394,21 @@ class FileHandler:
             logger.error(f"Error deleting file: {e}")
             return False
 
+    def _remove_from_disk(self, path: Path) -> bool:
+        """Remove a file and its thumbnail from disk"""
+        if not path.exists():
+            return False
+        
+        path.unlink()
+        
+        # Also delete thumbnail if it exists
+        if not path.name.startswith('thumb_'):
+            thumbnail_path = path.parent / f"thumb_{path.name}"
+            if thumbnail_path.exists():
+                thumbnail_path.unlink()
+        
+        return True
+
     async def get_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
         """Get information about a file"""
         try:
@@ -354,21 +459,154 @@ class FileHandler:
         relative_path = path.relative_to(self.upload_dir.parent)
         return f"{base_url}/{relative_path}"
 
+    async def list_files(
+        self,
+        owner_id: int,
+        file_type: Optional[str] = None,
+        subfolder: Optional[str] = None,
+        limit: int = 1000,
+        offset: int = 0,
+        db: Optional[AsyncSession] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List a user's files from the catalog, newest first
+        
+        Args:
+            owner_id: User whose files to list
+            file_type: Only files of this type
+            subfolder: Only files in this subfolder (or below it)
+            limit: Maximum number of files to return
+            offset: Number of files to skip
+            db: Session to query with
+            
+        Returns:
+            The page of files and the total number of matching files
+        """
+        conditions = [StoredFile.owner_id == owner_id]
+        if file_type:
+            conditions.append(StoredFile.file_type == file_type)
+        if subfolder:
+            conditions.append(or_(StoredFile.subfolder == subfolder, StoredFile.subfolder.startswith(f"{subfolder}/")))
+        
+        async with session_scope(db) as session:
+            total = (await session.execute(select(func.count()).select_from(StoredFile).where(*conditions))).scalar()
+            entries = (await session.execute(
+                select(StoredFile).where(*conditions)
+                .order_by(StoredFile.created_at.desc(), StoredFile.id.desc())
+                .limit(limit).offset(offset)
+            )).scalars().all()
+        
+        files = [
+            {
+                'file_id': entry.id,
+                'filename': Path(entry.file_path).name,
+                'original_filename': entry.original_filename,
+                'file_path': entry.file_path,
+                'file_type': entry.file_type,
+                'subfolder': entry.subfolder,
+                'file_size': entry.file_size,
+                'mime_type': entry.mime_type,
+                'content_hash': entry.content_hash,
+                'created_at': _epoch(entry.created_at),
+                'modified_at': _epoch(entry.updated_at or entry.created_at)
+            }
+            for entry in entries
+        ]
+        return files, total
+
+    async def get_storage_usage(self, owner_id: int, db: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """
+        Get a user's storage totals from the running per-type counters
+        
+        Returns:
+            Total bytes and files, and the number of files of each type
+        """
+        async with session_scope(db) as session:
+            rows = (await session.execute(
+                select(StorageUsage.file_type, StorageUsage.file_count, StorageUsage.total_bytes)
+                .where(StorageUsage.owner_id == owner_id)
+            )).all()
+        
+        file_types = {file_type: 0 for file_type in FILE_TYPES}
+        file_types.update({row.file_type: row.file_count for row in rows})
+        return {
+            'total_bytes': sum(row.total_bytes for row in rows),
+            'total_files': sum(row.file_count for row in rows),
+            'file_types': file_types
+        }
+
+    async def remove_old_files(
+        self,
+        days_old: int = 30,
+        owner_id: Optional[int] = None,
+        batch_size: int = 500,
+        db: Optional[AsyncSession] = None
+    ) -> Dict[str, int]:
+        """
+        Delete catalogued files uploaded more than days_old days ago
+        
+        Args:
+            days_old: Age in days above which files are deleted
+            owner_id: Only delete this user's files
+            batch_size: Files deleted per transaction
+            db: Session to delete with (committed after each batch)
+            
+        Returns:
+            Number of files and bytes deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days_old)
+        deleted_files = 0
+        deleted_bytes = 0
+        
+        while True:
+            async with session_scope(db) as session:
+                query = select(StoredFile).where(StoredFile.created_at < cutoff)
+                if owner_id is not None:
+                    query = query.where(StoredFile.owner_id == owner_id)
+                entries = (await session.execute(
+                    query.order_by(StoredFile.created_at).limit(batch_size)
+                )).scalars().all()
+                if not entries:
+                    break
+                
+                usage = {}
+                for entry in entries:
+                    files, size = usage.get((entry.owner_id, entry.file_type), (0, 0))
+                    usage[(entry.owner_id, entry.file_type)] = (files + 1, size + entry.file_size)
+                
+                await session.execute(delete(StoredFile).where(StoredFile.id.in_([entry.id for entry in entries])))
+                for (entry_owner, file_type), (files, size) in usage.items():
+                    await _add_usage(session, entry_owner, file_type, -files, -size)
+                await session.commit()
+            
+            await asyncio.to_thread(self._remove_all_from_disk, [Path(entry.file_path) for entry in entries])
+            deleted_files += len(entries)
+            deleted_bytes += sum(entry.file_size for entry in entries)
+        
+        return {'deleted_files': deleted_files, 'deleted_bytes': deleted_bytes}
+
+    def _remove_all_from_disk(self, paths: List[Path]):
+        """Remove files and their thumbnails from disk, logging failures"""
+        for path in paths:
+            try:
+                self._remove_from_disk(path)
+            except Exception as e:
+                logger.error(f"Error deleting old file {path}: {e}")
+
     async def cleanup_old_files(self, days_old: int = 30) -> int:
         """Clean up files older than specified days"""
         try:
-            import time
-            
-            cutoff_time = time.time() - (days_old * 24 * 60 * 60)
-            deleted_count = 0
-            
-            for file_path in self.upload_dir.rglob('*'):
-                if file_path.is_file() and file_path.stat().st_mtime < cutoff_time:
-                    try:
+            result = await self.remove_old_files(days_old)
+            deleted_count = result['deleted_files']
+            
+            # Archives are not catalogued; their directory is small enough to walk
+            cutoff_time = datetime.utcnow().timestamp() - (days_old * 24 * 60 * 60)
+            archive_dir = self.upload_dir / "archives"
+            if archive_dir.exists():
+                for file_path in archive_dir.iterdir():
+                    if file_path.is_file() and file_path.stat().st_mtime < cutoff_time:
                         file_path.unlink()
                         deleted_count += 1
-                    except Exception as e:
-                        logger.error(f"Error deleting old file {file_path}: {e}")
             
             logger.info(f"Cleaned up {deleted_count} old files")
             return deleted_count
@@ -377,6 +615,74 @@ class FileHandler:
             logger.error(f"Error during cleanup: {e}")
             return 0
 
+    async def catalog_existing_files(self, batch_size: int = 500) -> int:
+        """
+        Add files uploaded before the catalog existed to it
+        
+        Walks the upload directory once, catalogs every file that is missing
+        (owner and subfolder are read from its path, its upload time from its
+        modification time) and recomputes every user's storage totals.
+        
+        Returns:
+            Number of files added
+        """
+        def discover():
+            for file_type in FILE_TYPES:
+                for path in sorted((self.upload_dir / file_type).rglob('*')):
+                    if path.is_file() and not path.name.startswith(('thumb_', '.')):
+                        yield file_type, path
+        
+        def describe(file_type: str, path: Path) -> Dict[str, Any]:
+            parts = path.relative_to(self.upload_dir / file_type).parts[:-1]
+            owner_id = int(parts[0]) if parts and parts[0].isdigit() else None
+            folders = parts[1:] if owner_id is not None else parts
+            stat = path.stat()
+            thumbnail_path = path.parent / f"thumb_{path.name}"
+            return {
+                'owner_id': owner_id,
+                'file_type': file_type,
+                'subfolder': "/".join(folders) or None,
+                'file_path': str(path),
+                'thumbnail_path': str(thumbnail_path) if thumbnail_path.exists() else None,
+                'original_filename': path.name,
+                'file_size': stat.st_size,
+                'content_hash': hashlib.sha256(path.read_bytes()).hexdigest(),
+                'mime_type': mimetypes.guess_type(str(path))[0],
+                'created_at': datetime.utcfromtimestamp(stat.st_mtime)
+            }
+        
+        added = 0
+        found = discover()
+        while True:
+            batch = await asyncio.to_thread(lambda: [pair for pair, _ in zip(found, range(batch_size))])
+            if not batch:
+                break
+            async with AsyncSessionLocal() as session:
+                known = set((await session.execute(
+                    select(StoredFile.file_path).where(StoredFile.file_path.in_([str(path) for _, path in batch]))
+                )).scalars())
+                rows = await asyncio.to_thread(
+                    lambda: [describe(file_type, path) for file_type, path in batch if str(path) not in known]
+                )
+                if rows:
+                    await session.execute(insert(StoredFile), rows)
+                    await session.commit()
+            added += len(rows)
+        
+        # Recompute the running totals from the catalog
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(StorageUsage))
+            await session.execute(insert(StorageUsage).from_select(
+                ['owner_id', 'file_type', 'file_count', 'total_bytes'],
+                select(StoredFile.owner_id, StoredFile.file_type, func.count(), func.sum(StoredFile.file_size))
+                .where(StoredFile.owner_id.is_not(None))
+                .group_by(StoredFile.owner_id, StoredFile.file_type)
+            ))
+            await session.commit()
+        
+        logger.info(f"Catalogued {added} existing files")
+        return added
+
 
 # Global file handler instance
 file_handler = FileHandler()
\ No newline at end of file
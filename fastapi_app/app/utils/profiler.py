@@ -0,0 +1,301 @@
+"""
+Sampling Profiler
+
+On-demand stack sampling of the event-loop thread. A helper thread reads
+the loop thread's current frame at a fixed interval, so the profiled code
+runs unmodified and the server does not need restarting. Results are
+collapsed stacks (the input format of flamegraph.pl and speedscope) and
+the asyncio tasks seen during the run, ranked by wall time.
+
+The helper thread only reads frames. Task lists are snapshotted by a
+callback scheduled on the loop itself, and a sample is attributed to the
+task whose root coroutine frame is on the sampled stack.
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+
+IDLE_FUNCTIONS = {"select", "poll", "epoll", "kqueue", "control"}
+
+# Code flags of frames that belong to a coroutine chain rather than the loop driving it
+COROUTINE_FLAGS = (
+    inspect.CO_COROUTINE | inspect.CO_ITERABLE_COROUTINE | inspect.CO_ASYNC_GENERATOR | inspect.CO_GENERATOR
+)
+
+
+class _TaskStats:
+    """What was observed about one asyncio task during a profile"""
+
+    __slots__ = ("ref", "name", "coroutine", "first_seen", "last_seen", "running_samples", "location", "done")
+
+    def __init__(self, task: asyncio.Task, now: float):
+        self.ref = weakref.ref(task)
+        self.name = task.get_name()
+        coro = task.get_coro()
+        self.coroutine = getattr(coro, "__qualname__", repr(coro))
+        self.first_seen = now
+        self.last_seen = now
+        self.running_samples = 0
+        self.location = None
+        self.done = False
+
+
+class SamplingProfiler:
+    """Stack-sampling profiler for the thread running the event loop"""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128,
+                 task_scan_interval: float = 0.05, max_tasks: int = 10000, max_labels: int = 50000):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.task_scan_interval = task_scan_interval
+        self.max_tasks = max_tasks
+        self.max_labels = max_labels
+        self._lock = asyncio.Lock()
+        self._labels: Dict[Any, str] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether a profile is in progress"""
+        return self._lock.locked()
+
+    async def profile(self, duration: float, interval: Optional[float] = None, top_tasks: int = 20) -> Dict[str, Any]:
+        """
+        Sample the event-loop thread for a period of time
+
+        Args:
+            duration: Seconds to sample for
+            interval: Seconds between samples (defaults to the profiler interval)
+            top_tasks: Number of tasks to report
+
+        Returns:
+            Collapsed stacks, sample counts and the top tasks by wall time
+        """
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            thread_id = threading.get_ident()
+            own_task = asyncio.current_task()
+            drivers = self._driver_frames(sys._getframe())
+
+            try:
+                result = await asyncio.to_thread(
+                    self._sample, loop, thread_id, own_task, drivers, duration, interval or self.interval
+                )
+            finally:
+                # Labels are keyed by code objects; don't keep them alive between profiles
+                self._labels.clear()
+                del drivers
+
+        stacks: Counter = result["stacks"]
+        tasks: List[_TaskStats] = result["tasks"]
+        tasks.sort(key=lambda stats: (stats.last_seen - stats.first_seen, stats.running_samples), reverse=True)
+
+        return {
+            "duration": round(result["elapsed"], 3),
+            "interval_ms": round((interval or self.interval) * 1000, 3),
+            "samples": result["samples"],
+            "idle_samples": result["idle_samples"],
+            "collapsed": "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()),
+            "top_tasks": [
+                {
+                    "name": stats.name,
+                    "coroutine": stats.coroutine,
+                    "wall_time": round(stats.last_seen - stats.first_seen, 3),
+                    "running_time": round(stats.running_samples * result["sample_period"], 3),
+                    "finished": stats.done,
+                    "awaiting": stats.location,
+                }
+                for stats in tasks[:top_tasks]
+            ],
+        }
+
+    def _driver_frames(self, frame) -> Dict[int, Any]:
+        """
+        Get the frames driving the event loop below the calling coroutine
+
+        When the loop waits for I/O inside a C implementation such as uvloop,
+        the innermost Python frame of the loop thread is one of these, so a
+        sample that stops at one of them is idle rather than running code.
+        """
+        while frame is not None and frame.f_code.co_flags & COROUTINE_FLAGS:
+            frame = frame.f_back
+        drivers = {}
+        while frame is not None:
+            drivers[id(frame)] = frame
+            frame = frame.f_back
+        return drivers
+
+    def _is_idle(self, frame, drivers: Dict[int, Any]) -> bool:
+        """Whether a sampled loop-thread frame is the loop waiting for work"""
+        if frame.f_code.co_name in IDLE_FUNCTIONS and frame.f_globals.get("__name__") == "selectors":
+            return True
+        return drivers.get(id(frame)) is frame
+
+    def _sample(self, loop, thread_id: int, own_task, drivers: Dict[int, Any],
+                duration: float, interval: float) -> Dict[str, Any]:
+        """Sampling loop; runs in a helper thread while the event loop carries on"""
+        stacks: Counter = Counter()
+        tasks: Dict[int, _TaskStats] = {}
+        roots: Dict[int, Tuple[Any, _TaskStats]] = {}
+        samples = idle_samples = 0
+        pending: Optional[concurrent.futures.Future] = None
+
+        started = time.perf_counter()
+        deadline = started + duration
+        next_scan = started
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+
+            samples += 1
+            if self._is_idle(frame, drivers):
+                idle_samples += 1
+            else:
+                stack, running = self._collapse(frame, roots)
+                stacks[stack] += 1
+                if running is not None:
+                    running.running_samples += 1
+            del frame
+
+            # Never wait on the loop here: a blocked loop is what a profile is for
+            if now >= next_scan and (pending is None or pending.done()):
+                if pending is not None:
+                    roots = self._apply_snapshot(tasks, pending.result())
+                pending = self._request_snapshot(loop, own_task)
+                next_scan = now + self.task_scan_interval
+
+            time.sleep(interval)
+
+        elapsed = time.perf_counter() - started
+        try:
+            pending = self._request_snapshot(loop, own_task)
+            self._apply_snapshot(tasks, pending.result(timeout=max(1.0, self.task_scan_interval)))
+        except (concurrent.futures.TimeoutError, RuntimeError):
+            pass
+
+        return {
+            "stacks": stacks,
+            "tasks": list(tasks.values()),
+            "samples": samples,
+            "idle_samples": idle_samples,
+            "elapsed": elapsed,
+            "sample_period": elapsed / samples if samples else interval,
+        }
+
+    def _task_stats(self, tasks: Dict[int, _TaskStats], task: asyncio.Task, now: float) -> _TaskStats:
+        """Get the stats of a task, starting them on first sight"""
+        stats = tasks.get(id(task))
+        if stats is None or stats.ref() is not task:
+            stats = _TaskStats(task, now)
+            if len(tasks) < self.max_tasks:
+                tasks[id(task)] = stats
+        return stats
+
+    def _request_snapshot(self, loop, own_task) -> concurrent.futures.Future:
+        """Schedule a task snapshot on the loop thread; called from the helper thread"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def snapshot():
+            try:
+                future.set_result(self._snapshot_tasks(own_task))
+            except BaseException as e:
+                future.set_exception(e)
+
+        loop.call_soon_threadsafe(snapshot)
+        return future
+
+    def _snapshot_tasks(self, own_task) -> Tuple[float, List[Tuple[asyncio.Task, Any, Optional[str]]]]:
+        """List live tasks with their root frame and await location; runs on the loop thread"""
+        now = time.perf_counter()
+        snapshot = []
+        for task in asyncio.all_tasks():
+            if task is own_task:
+                continue
+            coro = task.get_coro()
+            root = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None)
+            snapshot.append((task, root, self._await_location(coro)))
+        return now, snapshot
+
+    def _apply_snapshot(self, tasks: Dict[int, _TaskStats], snapshot) -> Dict[int, Tuple[Any, _TaskStats]]:
+        """
+        Update the wall time and await location of every live task
+
+        Returns each task's root coroutine frame and stats by the frame's id,
+        for attributing samples until the next snapshot.
+        """
+        now, live = snapshot
+        roots = {}
+        for task, root, location in live:
+            stats = self._task_stats(tasks, task, now)
+            stats.last_seen = now
+            stats.location = location
+            if root is not None:
+                roots[id(root)] = (root, stats)
+
+        live_ids = {id(task) for task, _, _ in live}
+        for task_id, stats in tasks.items():
+            if not stats.done and task_id not in live_ids:
+                stats.done = True
+        return roots
+
+    def _await_location(self, coro) -> Optional[str]:
+        """Describe where a suspended coroutine chain is waiting"""
+        location = None
+        depth = 0
+        while coro is not None and depth < self.max_depth:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None)
+            if frame is None:
+                break
+            location = f"{self._label(frame.f_code, frame.f_globals)}:{frame.f_lineno}"
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None)
+            depth += 1
+        return location
+
+    def _collapse(self, frame, roots: Dict[int, Tuple[Any, _TaskStats]]) -> Tuple[str, Optional[_TaskStats]]:
+        """
+        Render a stack root-first as a semicolon-separated line
+
+        Also returns the stats of the task whose root coroutine frame is on
+        the stack, if it was in the last snapshot.
+        """
+        labels = []
+        running = None
+        while frame is not None and len(labels) < self.max_depth:
+            labels.append(self._label(frame.f_code, frame.f_globals))
+            if running is None:
+                root, stats = roots.get(id(frame), (None, None))
+                if root is frame:
+                    running = stats
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels), running
+
+    def _label(self, code, module_globals) -> str:
+        """Get the module-qualified name of a code object"""
+        label = self._labels.get(code)
+        if label is None:
+            module = module_globals.get("__name__", "?")
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{module}:{name}".replace(";", ",").replace(" ", "_")
+            if len(self._labels) >= self.max_labels:
+                self._labels.clear()
+            self._labels[code] = label
+        return label
+
+
+# Global profiler instance
+sampling_profiler = SamplingProfiler(interval=settings.PROFILER_INTERVAL_MS / 1000)
@@ -0,0 +1,400 @@
+"""
+Skill Taxonomy
+
+The canonical list of skills known to the platform, shared by resume
+parsing, skill extraction and job matching. Every skill has:
+
+- an integer id, so skill sets can be kept as bitsets (Python ints) and
+  compared with & and bit_count()
+- aliases ("node", "nodejs" and "Node.js" are one skill)
+- a category bitmask (Docker is both cloud and devops)
+
+Names and aliases are stored in a character trie keyed on their compact
+form (lowercase, with spaces and punctuation other than "+" and "#"
+removed), so resolving a name and scanning text both cost time
+proportional to the length of the text. The taxonomy is fixed once built:
+reading it never adds names, so ids and bitset widths stay bounded however
+many free-text skills pass through it.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+CATEGORIES = (
+    'programming', 'web_development', 'databases', 'cloud', 'devops', 'data_science', 'mobile',
+    'design', 'project_management', 'version_control', 'operating_systems', 'soft_skills'
+)
+
+# (canonical name, categories, aliases)
+SKILLS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    # Programming languages
+    ('Python', ('programming',), ('python3',)),
+    ('JavaScript', ('programming',), ('js', 'ecmascript', 'es6')),
+    ('TypeScript', ('programming',), ('ts',)),
+    ('Java', ('programming', 'mobile'), ()),
+    ('C++', ('programming',), ('cpp',)),
+    ('C#', ('programming',), ('c sharp', 'csharp')),
+    ('Go', ('programming',), ('golang',)),
+    ('Rust', ('programming',), ()),
+    ('PHP', ('programming',), ()),
+    ('Ruby', ('programming',), ()),
+    ('Swift', ('programming', 'mobile'), ()),
+    ('Kotlin', ('programming', 'mobile'), ()),
+    ('Scala', ('programming',), ()),
+    ('R', ('programming', 'data_science'), ()),
+    ('MATLAB', ('programming',), ()),
+    ('SQL', ('programming', 'databases'), ()),
+    ('Perl', ('programming',), ()),
+    ('Shell', ('programming',), ('bash', 'shell scripting')),
+    ('PowerShell', ('programming',), ()),
+    ('VBA', ('programming',), ()),
+    ('Assembly', ('programming',), ()),
+    ('Objective-C', ('programming', 'mobile'), ('objc',)),
+    ('Dart', ('programming',), ()),
+    ('Elixir', ('programming',), ()),
+    ('Haskell', ('programming',), ()),
+
+    # Web development
+    ('HTML', ('web_development',), ('html5',)),
+    ('CSS', ('web_development',), ('css3',)),
+    ('React', ('web_development',), ('react.js', 'reactjs')),
+    ('Angular', ('web_development',), ('angularjs', 'angular.js')),
+    ('Vue.js', ('web_development',), ('vue', 'vuejs')),
+    ('Node.js', ('web_development',), ('node', 'nodejs')),
+    ('Express', ('web_development',), ('express.js', 'expressjs')),
+    ('Django', ('web_development',), ()),
+    ('Flask', ('web_development',), ()),
+    ('FastAPI', ('web_development',), ()),
+    ('Spring', ('web_development',), ('spring boot',)),
+    ('Laravel', ('web_development',), ()),
+    ('Ruby on Rails', ('web_development',), ('rails', 'ror')),
+    ('ASP.NET', ('web_development',), ('asp.net core',)),
+    ('jQuery', ('web_development',), ()),
+    ('Bootstrap', ('web_development',), ()),
+    ('Tailwind CSS', ('web_development',), ('tailwind',)),
+    ('Sass', ('web_development',), ('scss',)),
+    ('Less', ('web_development',), ()),
+    ('Webpack', ('web_development',), ()),
+    ('Gulp', ('web_development',), ()),
+    ('Grunt', ('web_development',), ()),
+    ('Next.js', ('web_development',), ('nextjs',)),
+    ('Nuxt.js', ('web_development',), ('nuxtjs', 'nuxt')),
+    ('Svelte', ('web_development',), ()),
+    ('Ember.js', ('web_development',), ('emberjs',)),
+    ('Backbone.js', ('web_development',), ('backbonejs',)),
+
+    # Databases
+    ('MySQL', ('databases',), ()),
+    ('PostgreSQL', ('databases',), ('postgres', 'psql')),
+    ('MongoDB', ('databases',), ('mongo',)),
+    ('Redis', ('databases',), ()),
+    ('SQLite', ('databases',), ()),
+    ('Oracle', ('databases',), ('oracle database',)),
+    ('SQL Server', ('databases',), ('mssql', 'microsoft sql server')),
+    ('Cassandra', ('databases',), ('apache cassandra',)),
+    ('DynamoDB', ('databases',), ()),
+    ('Firebase', ('databases',), ()),
+    ('Elasticsearch', ('databases',), ('elastic search',)),
+    ('Neo4j', ('databases',), ()),
+    ('CouchDB', ('databases',), ()),
+    ('MariaDB', ('databases',), ()),
+    ('InfluxDB', ('databases',), ()),
+    ('Amazon RDS', ('databases', 'cloud'), ('aws rds',)),
+    ('Google Cloud SQL', ('databases', 'cloud'), ()),
+
+    # Cloud platforms
+    ('AWS', ('cloud',), ('amazon web services',)),
+    ('Azure', ('cloud',), ('microsoft azure',)),
+    ('GCP', ('cloud',), ('google cloud platform', 'google cloud')),
+    ('Heroku', ('cloud',), ()),
+    ('DigitalOcean', ('cloud',), ()),
+    ('Linode', ('cloud',), ()),
+    ('Vultr', ('cloud',), ()),
+    ('IBM Cloud', ('cloud',), ()),
+    ('Oracle Cloud', ('cloud',), ()),
+    ('Alibaba Cloud', ('cloud',), ()),
+
+    # DevOps
+    ('Docker', ('cloud', 'devops'), ()),
+    ('Kubernetes', ('cloud', 'devops'), ('k8s',)),
+    ('Terraform', ('cloud', 'devops'), ()),
+    ('Ansible', ('cloud', 'devops'), ()),
+    ('Jenkins', ('devops',), ()),
+    ('GitLab CI', ('devops',), ('gitlab ci/cd',)),
+    ('GitHub Actions', ('devops',), ()),
+    ('Travis CI', ('devops',), ()),
+    ('CircleCI', ('devops',), ()),
+    ('CI/CD', ('devops',), ('continuous integration',)),
+    ('Vagrant', ('devops',), ()),
+    ('Chef', ('devops',), ()),
+    ('Puppet', ('devops',), ()),
+    ('Nagios', ('devops',), ()),
+    ('Prometheus', ('devops',), ()),
+    ('Grafana', ('devops',), ()),
+    ('ELK Stack', ('devops',), ('elk',)),
+    ('Splunk', ('devops',), ()),
+    ('Monitoring', ('devops',), ()),
+
+    # Data science
+    ('Machine Learning', ('data_science',), ('ml',)),
+    ('Deep Learning', ('data_science',), ()),
+    ('Data Science', ('data_science',), ()),
+    ('AI', ('data_science',), ('artificial intelligence',)),
+    ('Pandas', ('data_science',), ()),
+    ('NumPy', ('data_science',), ()),
+    ('Scikit-learn', ('data_science',), ('sklearn',)),
+    ('TensorFlow', ('data_science',), ()),
+    ('PyTorch', ('data_science',), ()),
+    ('Keras', ('data_science',), ()),
+    ('Matplotlib', ('data_science',), ()),
+    ('Seaborn', ('data_science',), ()),
+    ('Jupyter', ('data_science',), ('jupyter notebook',)),
+    ('Apache Spark', ('data_science',), ('spark', 'pyspark')),
+    ('Hadoop', ('data_science',), ('apache hadoop',)),
+    ('Tableau', ('data_science',), ()),
+    ('Power BI', ('data_science',), ('powerbi',)),
+    ('D3.js', ('data_science',), ('d3',)),
+    ('Plotly', ('data_science',), ()),
+    ('OpenCV', ('data_science',), ()),
+    ('NLTK', ('data_science',), ()),
+    ('spaCy', ('data_science',), ()),
+
+    # Mobile development
+    ('iOS', ('mobile',), ()),
+    ('Android', ('mobile',), ()),
+    ('React Native', ('mobile',), ()),
+    ('Flutter', ('mobile',), ()),
+    ('Xamarin', ('mobile',), ()),
+    ('Ionic', ('mobile',), ()),
+    ('PhoneGap', ('mobile',), ()),
+    ('Cordova', ('mobile',), ('apache cordova',)),
+
+    # Design
+    ('Figma', ('design',), ()),
+    ('Sketch', ('design',), ()),
+    ('Adobe XD', ('design',), ()),
+    ('Adobe Creative Suite', ('design',), ('adobe creative cloud',)),
+    ('Photoshop', ('design',), ('adobe photoshop',)),
+    ('Illustrator', ('design',), ('adobe illustrator',)),
+    ('InDesign', ('design',), ('adobe indesign',)),
+    ('After Effects', ('design',), ()),
+    ('Premiere Pro', ('design',), ()),
+    ('Canva', ('design',), ()),
+    ('InVision', ('design',), ()),
+    ('Zeplin', ('design',), ()),
+    ('Marvel', ('design',), ()),
+    ('UI/UX', ('design',), ('ux', 'ui design', 'ux design')),
+    ('Prototyping', ('design',), ()),
+
+    # Project management
+    ('Agile', ('project_management',), ()),
+    ('Scrum', ('project_management',), ()),
+    ('Kanban', ('project_management',), ()),
+    ('JIRA', ('project_management',), ()),
+    ('Trello', ('project_management',), ()),
+    ('Asana', ('project_management',), ()),
+    ('Monday.com', ('project_management',), ()),
+    ('Slack', ('project_management',), ()),
+    ('Microsoft Teams', ('project_management',), ('ms teams',)),
+    ('Confluence', ('project_management',), ()),
+    ('Notion', ('project_management',), ()),
+    ('Basecamp', ('project_management',), ()),
+    ('Project Planning', ('project_management',), ()),
+
+    # Version control
+    ('Git', ('version_control',), ()),
+    ('GitHub', ('version_control',), ()),
+    ('GitLab', ('version_control',), ()),
+    ('Bitbucket', ('version_control',), ()),
+    ('SVN', ('version_control',), ('subversion',)),
+    ('Mercurial', ('version_control',), ()),
+    ('Perforce', ('version_control',), ()),
+
+    # Operating systems
+    ('Linux', ('operating_systems',), ()),
+    ('Windows', ('operating_systems',), ()),
+    ('macOS', ('operating_systems',), ('mac os', 'os x')),
+    ('Ubuntu', ('operating_systems',), ()),
+    ('CentOS', ('operating_systems',), ()),
+    ('Red Hat', ('operating_systems',), ('rhel', 'red hat enterprise linux')),
+    ('Debian', ('operating_systems',), ()),
+    ('FreeBSD', ('operating_systems',), ()),
+    ('Unix', ('operating_systems',), ()),
+    ('Windows Server', ('operating_systems',), ()),
+
+    # Soft skills
+    ('Leadership', ('soft_skills',), ()),
+    ('Communication', ('soft_skills',), ()),
+    ('Teamwork', ('soft_skills',), ()),
+    ('Problem Solving', ('soft_skills',), ()),
+    ('Creativity', ('soft_skills',), ()),
+    ('Adaptability', ('soft_skills',), ()),
+    ('Time Management', ('soft_skills',), ()),
+    ('Critical Thinking', ('soft_skills',), ()),
+    ('Analytical Thinking', ('soft_skills',), ()),
+    ('Collaboration', ('soft_skills',), ()),
+)
+
+# Characters dropped from names to form the trie key
+_NON_KEY = re.compile(r"[^\w+#]|_")
+# Words of free text, in the same alphabet as trie keys
+_TOKEN = re.compile(r"[^\W_]+[+#]*|[+#]+")
+
+# Trie node key marking the skill id of the name ending at that node
+_ID = ""
+
+
+def skill_key(name: str) -> str:
+    """Compact lookup key of a skill name: "Node.js", "node js" and "NodeJS" give "nodejs" """
+    return _NON_KEY.sub("", name.lower())
+
+
+def category_bit(category: str) -> int:
+    """Bitmask of a single category"""
+    return 1 << CATEGORIES.index(category)
+
+
+class SkillTaxonomy:
+    """Canonical skills with integer ids, an alias trie and category bitmasks"""
+
+    def __init__(self, skills: Sequence[Tuple[str, Sequence[str], Sequence[str]]] = SKILLS):
+        self.names: List[str] = []
+        self.category_masks: List[int] = []
+        # Every taxonomy spelling (names and aliases) with its skill id
+        self.spellings: List[Tuple[str, int]] = []
+        self._trie: Dict[str, dict] = {}
+
+        for name, categories, aliases in skills:
+            skill_id = len(self.names)
+            self.names.append(name)
+            self.category_masks.append(sum(category_bit(category) for category in set(categories)))
+            for alias in (name,) + tuple(aliases):
+                self._insert(skill_key(alias), skill_id)
+                self.spellings.append((alias, skill_id))
+
+        # Number of skills; ids and bitset bits run from 0 to canonical_count - 1
+        self.canonical_count = len(self.names)
+
+        # Bitset of the skill ids in each category
+        self.category_members: List[int] = [0] * len(CATEGORIES)
+        for skill_id, mask in enumerate(self.category_masks):
+            for bit in range(len(CATEGORIES)):
+                if mask >> bit & 1:
+                    self.category_members[bit] |= 1 << skill_id
+        self._related: Dict[int, int] = {}
+
+    def _insert(self, key: str, skill_id: int):
+        node = self._trie
+        for char in key:
+            node = node.setdefault(char, {})
+        existing = node.setdefault(_ID, skill_id)
+        if existing != skill_id:
+            raise ValueError(f"Skill alias {key!r} is used by both {self.names[existing]} and {self.names[skill_id]}")
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Id of a skill name or alias, or None for a name outside the taxonomy"""
+        node = self._trie
+        for char in skill_key(name) or name.strip().lower():
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(_ID)
+
+    def ids(self, names: Iterable[str]) -> List[int]:
+        """Ids of the taxonomy skills among skill names, in order; other names are skipped"""
+        return [skill_id for skill_id in map(self.lookup, names) if skill_id is not None]
+
+    def name(self, skill_id: int) -> str:
+        """Canonical display name of a skill"""
+        return self.names[skill_id]
+
+    def canonical_name(self, name: str) -> str:
+        """Canonical display name for a skill name or alias ("nodejs" gives "Node.js"), other names as given"""
+        skill_id = self.lookup(name)
+        return self.names[skill_id] if skill_id is not None else name.strip()
+
+    def categories(self, skill_id: int) -> List[str]:
+        """Category names of a skill"""
+        mask = self.category_masks[skill_id]
+        return [category for bit, category in enumerate(CATEGORIES) if mask >> bit & 1]
+
+    def in_category(self, skill_id: int, category: str) -> bool:
+        return bool(self.category_masks[skill_id] & category_bit(category))
+
+    def related_bits(self, mask: int) -> int:
+        """Bitset of the skills in any category of a category mask"""
+        related = self._related.get(mask)
+        if related is None:
+            related = 0
+            for bit in range(len(CATEGORIES)):
+                if mask >> bit & 1:
+                    related |= self.category_members[bit]
+            self._related[mask] = related
+        return related
+
+    @staticmethod
+    def bitset(ids: Iterable[int]) -> int:
+        """Bitset with the bit of every skill id set"""
+        bits = 0
+        for skill_id in ids:
+            bits |= 1 << skill_id
+        return bits
+
+    @staticmethod
+    def bit_ids(bits: int) -> List[int]:
+        """Skill ids set in a bitset, lowest first"""
+        ids = []
+        while bits:
+            low = bits & -bits
+            ids.append(low.bit_length() - 1)
+            bits ^= low
+        return ids
+
+    def extract(self, text: str) -> List[int]:
+        """
+        Find taxonomy skills mentioned in free text
+
+        Scans the text once, matching the longest skill name that starts at
+        each word, so "React Native" is found as one skill rather than React.
+
+        Args:
+            text: Resume, job description or other text
+
+        Returns:
+            Ids of the skills found, in order of first mention
+        """
+        tokens = _TOKEN.findall(text.lower())
+        found: Dict[int, None] = {}
+        position = 0
+        while position < len(tokens):
+            node, match, match_end = self._trie, None, position
+            for end in range(position, len(tokens)):
+                for char in tokens[end]:
+                    node = node.get(char)
+                    if node is None:
+                        break
+                if node is None:
+                    break
+                skill_id = node.get(_ID)
+                if skill_id is not None:
+                    match, match_end = skill_id, end
+            if match is not None:
+                found.setdefault(match)
+            position = match_end + 1
+        return list(found)
+
+    def extract_names(self, text: str) -> List[str]:
+        """Canonical names of the taxonomy skills mentioned in free text"""
+        return [self.names[skill_id] for skill_id in self.extract(text)]
+
+    def group_by_category(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """Canonical names of the taxonomy skills among skill names by category; skills may appear under several"""
+        grouped: Dict[str, List[str]] = {}
+        for skill_id in dict.fromkeys(self.ids(names)):
+            for category in self.categories(skill_id):
+                grouped.setdefault(category, []).append(self.names[skill_id])
+        return grouped
+
+
+# Global skill taxonomy instance
+skill_taxonomy = SkillTaxonomy()
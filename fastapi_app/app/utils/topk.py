@@ -0,0 +1,83 @@
+"""
+Top-k Selection
+
+Picks the k best-scoring items from a stream without sorting, or even
+keeping, the whole stream. Candidates and jobs can be scored straight off
+a database cursor or a generator while memory stays O(k).
+
+The selector keeps a min-heap of the k best items seen so far. Its lowest
+score is the bar a new item has to clear, which allows two shortcuts:
+
+- an item whose score upper bound (e.g. its skill score with perfect
+  marks for everything else) does not clear the bar is skipped before the
+  expensive part of its score is computed
+- once every kept item has the highest possible score, nothing can
+  displace them and the rest of the stream is not read
+
+Results are ordered as a stable sort by descending score would order
+them: ties keep the order in which the items arrived.
+"""
+
+import heapq
+import itertools
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class TopK(Generic[T]):
+    """The k highest-scoring items pushed so far"""
+
+    def __init__(self, k: int, max_score: Optional[float] = None):
+        """
+        Args:
+            k: Number of items to keep
+            max_score: Highest score any item can get, if known; enables early termination
+        """
+        self.k = max(k, 0)
+        self.max_score = max_score
+        self._heap: List[Tuple[float, int, T]] = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> float:
+        """Score an item must beat to be kept; -inf until k items are kept"""
+        if len(self._heap) < self.k:
+            return float('-inf')
+        return self._heap[0][0] if self._heap else float('inf')
+
+    @property
+    def saturated(self) -> bool:
+        """True when no further item can be kept, so the input need not be read further"""
+        if self.k == 0:
+            return True
+        return self.max_score is not None and self.threshold >= self.max_score
+
+    def admits(self, upper_bound: float) -> bool:
+        """Whether an item whose score is at most upper_bound could still be kept"""
+        return upper_bound > self.threshold
+
+    def push(self, item: T, score: float) -> bool:
+        """
+        Offer an item
+
+        Returns:
+            True if the item is kept (for now)
+        """
+        if not score > self.threshold:
+            return False
+        # Later arrivals sort lower among equal scores, so they are evicted first
+        entry = (score, -next(self._order), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+        return True
+
+    def results(self) -> List[Tuple[T, float]]:
+        """Kept (item, score) pairs, best first"""
+        return [(item, score) for score, _, item in sorted(self._heap, key=lambda entry: (-entry[0], -entry[1]))]
+
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Authentication Benchmark Script
+
+Measures how authentication work affects the rest of the API.
+
+Login storm: fires a burst of concurrent logins while probing an unrelated
+endpoint (/health) and reports its latency percentiles with and without the
+storm. With password hashing offloaded to a thread pool the /health p99
+should stay flat.
+
+Auth micro: compares token decoding with and without the verified-token
+cache, and the per-request overhead of an authenticated endpoint with the
+token and principal caches enabled versus disabled (in-process only).
+
+Runs in-process against the ASGI app by default (using a separate benchmark
+database), or against a running server with --base-url.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Dict, List, Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark_auth.db")
+
+import httpx
+
+from app.core.metrics import percentiles
+
+PASSWORD = "BenchPass123"
+
+
+async def create_client(base_url: Optional[str]) -> httpx.AsyncClient:
+    """Create an HTTP client for a live server or the in-process app"""
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=60.0)
+
+    from app.core.database import init_db
+    from main import app
+
+    await init_db()
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0)
+
+
+async def ensure_users(client: httpx.AsyncClient, count: int) -> List[str]:
+    """Register benchmark users (idempotent) and return their emails"""
+    emails = [f"bench_user_{i}@example.com" for i in range(count)]
+
+    for email in emails:
+        await client.post("/api/v1/auth/register", json={
+            "email": email,
+            "password": PASSWORD,
+            "confirm_password": PASSWORD,
+            "user_type": "candidate"
+        })
+
+    return emails
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> List[float]:
+    """Repeatedly request /health and record latencies until stopped"""
+    samples = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def login_storm(client: httpx.AsyncClient, emails: List[str], rounds: int) -> List[float]:
+    """Fire concurrent logins for every user, `rounds` times"""
+    samples = []
+
+    async def login(email: str):
+        started = time.perf_counter()
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        samples.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            print(f"⚠️  Login failed for {email}: {response.status_code}")
+
+    for _ in range(rounds):
+        await asyncio.gather(*(login(email) for email in emails))
+
+    return samples
+
+
+async def run_login_storm(base_url: Optional[str], users: int, rounds: int, probe_interval: float):
+    """Compare /health latency at rest and during a login storm"""
+    print("🚀 Login storm benchmark")
+    print("=" * 50)
+
+    async with await create_client(base_url) as client:
+        emails = await ensure_users(client, users)
+
+        # Baseline: probe without load
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, stop, probe_interval))
+        await asyncio.sleep(2.0)
+        stop.set()
+        baseline = await probe_task
+
+        # Storm: probe while logins run
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, stop, probe_interval))
+        started = time.perf_counter()
+        login_samples = await login_storm(client, emails, rounds)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        during_storm = await probe_task
+
+    print(f"Logins: {len(login_samples)} in {elapsed:.2f}s ({len(login_samples) / elapsed:.1f}/s)")
+    print(f"Login latency (ms):        {percentiles(login_samples)}")
+    print(f"/health at rest (ms):      {percentiles(baseline)}")
+    print(f"/health during storm (ms): {percentiles(during_storm)}")
+
+    if baseline and during_storm:
+        ratio = percentiles(during_storm)["p99"] / max(percentiles(baseline)["p99"], 0.01)
+        print(f"p99 ratio (storm / rest): {ratio:.1f}x")
+
+
+def time_calls(func, iterations: int) -> List[float]:
+    """Time repeated synchronous calls"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def time_requests(client: httpx.AsyncClient, path: str, headers: Dict[str, str], iterations: int) -> List[float]:
+    """Time repeated sequential GET requests"""
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        samples.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.text}")
+    return samples
+
+
+def set_auth_caches(enabled: bool, token_cache_size: int, principal_ttl: float):
+    """Enable or disable the token and principal caches"""
+    from app.core.security import token_cache, principal_cache
+
+    token_cache.clear()
+    principal_cache.clear()
+    token_cache.max_size = token_cache_size if enabled else 0
+    principal_cache.ttl = principal_ttl if enabled else 0
+
+
+async def run_auth_micro(iterations: int):
+    """Compare cached and uncached authentication overhead"""
+    from jose import jwt
+    from app.core.config import settings
+    from app.core.security import create_access_token, decode_token, token_cache, principal_cache
+
+    print("🔬 Authentication microbenchmarks")
+    print("=" * 50)
+
+    token = create_access_token(subject=1)
+    uncached = time_calls(
+        lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        iterations
+    )
+    cached = time_calls(lambda: decode_token(token), iterations)
+
+    print(f"jwt.decode (uncached) mean: {statistics.mean(uncached) * 1e6:.1f}µs")
+    print(f"decode_token (cached) mean: {statistics.mean(cached) * 1e6:.1f}µs")
+    print(f"Speedup: {statistics.mean(uncached) / statistics.mean(cached):.1f}x")
+
+    token_cache_size, principal_ttl = token_cache.max_size, principal_cache.ttl
+
+    async with await create_client(None) as client:
+        email = (await ensure_users(client, 1))[0]
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        path = "/api/v1/applications/"
+
+        set_auth_caches(False, token_cache_size, principal_ttl)
+        without_cache = await time_requests(client, path, headers, iterations)
+
+        set_auth_caches(True, token_cache_size, principal_ttl)
+        with_cache = await time_requests(client, path, headers, iterations)
+
+    print(f"GET {path} without auth caches (ms): {percentiles(without_cache)}")
+    print(f"GET {path} with auth caches (ms):    {percentiles(with_cache)}")
+    saved = statistics.mean(without_cache) - statistics.mean(with_cache)
+    print(f"Auth overhead saved per request: {saved * 1000:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authentication benchmarks")
+    parser.add_argument("--mode", choices=["storm", "micro", "all"], default="all", help="Benchmark to run")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--users", type=int, default=20, help="Number of users logging in concurrently")
+    parser.add_argument("--rounds", type=int, default=3, help="Number of login bursts")
+    parser.add_argument("--probe-interval", type=float, default=0.01, help="Seconds between /health probes")
+    parser.add_argument("--iterations", type=int, default=500, help="Iterations for microbenchmarks")
+    args = parser.parse_args()
+
+    if args.mode in ("storm", "all"):
+        asyncio.run(run_login_storm(args.base_url, args.users, args.rounds, args.probe_interval))
+    if args.mode in ("micro", "all"):
+        if args.base_url:
+            print("⚠️  Microbenchmarks run in-process only; ignoring --base-url")
+        asyncio.run(run_auth_micro(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
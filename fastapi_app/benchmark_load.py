@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Load Test and Benchmark Script
+
+Drives a realistic mixed workload against the API and reports throughput
+and p50/p95/p99 latency per route:
+- Job search (anonymous) and job detail (signed in)
+- Applying to jobs
+- Recruiter dashboards and application pipelines
+- Job recommendations
+- WebSocket notifications (HTTP send to delivery on the socket)
+
+Runs against a seeded dataset (see seed_data.py). Each run is saved as a
+JSON baseline named after the dataset size and compared with the previous
+run for the same dataset, flagging routes whose p95 latency or throughput
+regressed beyond a threshold.
+
+Transports:
+- asgi: in-process through httpx's ASGI transport (no WebSocket scenario)
+- uvicorn: in-process uvicorn server on a local port (default)
+- --base-url: an already running local server using the same database
+
+Usage:
+    DATABASE_URL=sqlite:///./benchmark_load.db python seed_data.py --scale 100k
+    DATABASE_URL=sqlite:///./benchmark_load.db python benchmark_load.py --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark_load.db")
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.metrics import percentiles
+
+SEARCH_TERMS = ["Python", "React", "Engineer", "Data", "Developer", "Kubernetes", "Manager", "Go"]
+LOCATIONS = ["San Francisco", "New York", "Berlin", "Remote", "London", "Nairobi"]
+
+# Scenario weights for the mixed workload
+DEFAULT_MIX = {
+    "job_search": 35,
+    "job_detail": 25,
+    "apply": 8,
+    "dashboard": 10,
+    "pipeline": 7,
+    "recommendations": 8,
+    "notification": 7,
+}
+
+# A key every successful dashboard response has in its stats, per user type
+DASHBOARD_KEYS = {"candidate": "total_applications", "recruiter": "total_jobs"}
+
+
+class Recorder:
+    """Collects latency samples and status codes per route"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, elapsed: float, status: Any, ok: bool):
+        self.samples[route].append(elapsed)
+        self.statuses[route][str(status)] += 1
+        if not ok:
+            self.errors[route] += 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, Any]]:
+        routes = {}
+        for route in sorted(self.samples):
+            samples = self.samples[route]
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors[route],
+                "throughput": round(len(samples) / duration, 2),
+                **percentiles(samples),
+                "statuses": dict(self.statuses[route]),
+            }
+        return routes
+
+
+class Workload:
+    """Dataset handles and authenticated users shared by virtual users"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.job_ids: List[int] = []
+        self.candidates: List[Dict[str, Any]] = []
+        self.recruiters: List[Dict[str, Any]] = []
+        self.sockets: Dict[int, "WebSocketListener"] = {}
+
+    async def request(self, route: str, method: str, url: str, token: Optional[str] = None,
+                      ok_statuses=(200,), validate: Optional[Callable[[Any], bool]] = None,
+                      **kwargs) -> Optional[httpx.Response]:
+        """
+        Send a request and record its latency under `route`
+
+        With `validate`, a response only counts as a success if its JSON
+        body passes the check; other responses are recorded as "invalid".
+        """
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(route, time.perf_counter() - started, type(e).__name__, False)
+            return None
+        elapsed = time.perf_counter() - started
+
+        status, ok = response.status_code, response.status_code in ok_statuses
+        if ok and validate is not None:
+            try:
+                ok = bool(validate(response.json()))
+            except ValueError:
+                ok = False
+            if not ok:
+                status = f"{status} invalid"
+        self.recorder.record(route, elapsed, status, ok)
+        return response
+
+    # Scenarios
+
+    async def job_search(self):
+        params = {"search": self.rng.choice(SEARCH_TERMS), "limit": 20, "skip": self.rng.choice([0, 0, 20, 40])}
+        if self.rng.random() < 0.3:
+            params["location"] = self.rng.choice(LOCATIONS)
+        await self.request("GET /api/v1/jobs/ (search)", "GET", "/api/v1/jobs/", params=params)
+
+    async def job_detail(self):
+        candidate = self.rng.choice(self.candidates)
+        job_id = self.rng.choice(self.job_ids)
+        await self.request("GET /api/v1/jobs/{job_id}", "GET", f"/api/v1/jobs/{job_id}", token=candidate["token"])
+
+    async def apply(self):
+        candidate = self.rng.choice(self.candidates)
+        # Walk each candidate through the jobs they have not applied to yet
+        while candidate["next_job"] < len(self.job_ids):
+            job_id = self.job_ids[candidate["next_job"]]
+            candidate["next_job"] += 1
+            if job_id not in candidate["applied"]:
+                break
+        else:
+            return
+        candidate["applied"].add(job_id)
+        await self.request(
+            "POST /api/v1/applications/", "POST", "/api/v1/applications/",
+            token=candidate["token"], ok_statuses=(201,),
+            json={"job_id": job_id, "cover_letter": "Benchmark application"}
+        )
+
+    async def dashboard(self):
+        user = self.rng.choice(self.recruiters + self.candidates)
+        await self.request(
+            "GET /api/v1/analytics/dashboard", "GET", "/api/v1/analytics/dashboard", token=user["token"],
+            validate=lambda body: DASHBOARD_KEYS.get(body.get("user_type")) in (body.get("stats") or {})
+        )
+
+    async def pipeline(self):
+        recruiter = self.rng.choice(self.recruiters)
+        params = {"limit": 20}
+        if self.rng.random() < 0.5:
+            params["status_filter"] = "submitted"
+        await self.request(
+            "GET /api/v1/applications/ (recruiter)", "GET", "/api/v1/applications/",
+            token=recruiter["token"], params=params
+        )
+
+    async def recommendations(self):
+        candidate = self.rng.choice(self.candidates)
+        await self.request(
+            "GET /api/v1/ai/job-recommendations", "GET", "/api/v1/ai/job-recommendations",
+            token=candidate["token"], params={"limit": 10}
+        )
+
+    async def notification(self):
+        if not self.sockets:
+            return
+        user_id = self.rng.choice(list(self.sockets))
+        listener = self.sockets[user_id]
+        marker = f"bench-{time.perf_counter_ns()}"
+        waiter = listener.expect(marker)
+
+        started = time.perf_counter()
+        response = await self.request(
+            "POST /api/v1/websocket/notifications/send", "POST", "/api/v1/websocket/notifications/send",
+            token=self.recruiters[0]["token"],
+            params={"user_id": user_id, "title": "Benchmark", "message": marker}
+        )
+        if response is None or response.status_code != 200:
+            listener.cancel(marker)
+            return
+
+        try:
+            await asyncio.wait_for(waiter, timeout=5.0)
+            self.recorder.record("WS notification delivery", time.perf_counter() - started, "delivered", True)
+        except asyncio.TimeoutError:
+            listener.cancel(marker)
+            self.recorder.record("WS notification delivery", time.perf_counter() - started, "timeout", False)
+
+
+class WebSocketListener:
+    """Keeps a WebSocket open and resolves waiters when their message arrives"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.waiters: Dict[str, asyncio.Future] = {}
+        self.connection = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        import websockets
+
+        self.connection = await websockets.connect(self.url)
+        self.task = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        try:
+            async for raw in self.connection:
+                text = raw if isinstance(raw, str) else raw.decode("utf-8", "replace")
+                for marker in [marker for marker in self.waiters if marker in text]:
+                    waiter = self.waiters.pop(marker)
+                    if not waiter.done():
+                        waiter.set_result(text)
+        except Exception:
+            pass
+
+    def expect(self, marker: str) -> asyncio.Future:
+        self.waiters[marker] = asyncio.get_running_loop().create_future()
+        return self.waiters[marker]
+
+    def cancel(self, marker: str):
+        waiter = self.waiters.pop(marker, None)
+        if waiter and not waiter.done():
+            waiter.cancel()
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+        if self.connection:
+            await self.connection.close()
+
+
+async def dataset_info() -> Dict[str, int]:
+    """Count the rows of the main tables"""
+    from app.core.database import engine
+    from app.models.application import Application
+    from app.models.job import Job
+    from app.models.user import CandidateProfile, RecruiterProfile
+    from app.models.company import Company
+
+    counts = {}
+    async with engine.connect() as conn:
+        for name, model in [("companies", Company), ("recruiters", RecruiterProfile),
+                            ("candidates", CandidateProfile), ("jobs", Job), ("applications", Application)]:
+            counts[name] = (await conn.execute(select(func.count(model.id)))).scalar() or 0
+    return counts
+
+
+async def load_dataset(users: int, seed_scale: Optional[str]) -> Dict[str, Any]:
+    """Pick seeded users and active jobs, seeding the database first if needed"""
+    from app.core.database import engine, init_db
+    from app.models.application import Application
+    from app.models.job import Job
+    from app.models.user import CandidateProfile, User
+
+    await init_db()
+    async with engine.connect() as conn:
+        seeded = (await conn.execute(
+            select(func.count(User.id)).where(User.email.like("seed_candidate_%"))
+        )).scalar()
+
+    if not seeded:
+        if not seed_scale:
+            sys.exit("❌ No seeded users found. Run seed_data.py first or pass --seed-scale.")
+        import seed_data
+        print(f"🌱 Seeding {seed_scale} dataset...")
+        counts = dict(seed_data.SCALES[seed_scale])
+        await seed_data.seed(counts, seed_value=42, batch_size=5000)
+
+    async with engine.connect() as conn:
+        candidates = (await conn.execute(
+            select(User.id, User.email, CandidateProfile.id.label("profile_id"))
+            .join(CandidateProfile, CandidateProfile.user_id == User.id)
+            .where(User.email.like("seed_candidate_%")).order_by(User.id).limit(users)
+        )).all()
+        applied = defaultdict(set)
+        for profile_id, job_id in (await conn.execute(
+            select(Application.candidate_id, Application.job_id)
+            .where(Application.candidate_id.in_([row.profile_id for row in candidates]))
+        )).all():
+            applied[profile_id].add(job_id)
+        recruiters = (await conn.execute(
+            select(User.id, User.email).where(User.email.like("seed_recruiter_%")).order_by(User.id).limit(max(1, users // 2))
+        )).all()
+        job_ids = (await conn.execute(
+            select(Job.id).where(Job.status == "active").order_by(Job.id).limit(5000)
+        )).scalars().all()
+
+    return {
+        "candidates": [
+            {"user_id": row.id, "email": row.email, "applied": applied[row.profile_id], "next_job": 0}
+            for row in candidates
+        ],
+        "recruiters": [{"user_id": row.id, "email": row.email} for row in recruiters],
+        "job_ids": list(job_ids),
+    }
+
+
+async def login_all(client: httpx.AsyncClient, users: List[Dict[str, Any]]):
+    """Log in every user and attach their access token"""
+    from seed_data import SEED_PASSWORD
+
+    async def login(user):
+        response = await client.post("/api/v1/auth/login", json={"email": user["email"], "password": SEED_PASSWORD})
+        response.raise_for_status()
+        user["token"] = response.json()["access_token"]
+
+    await asyncio.gather(*(login(user) for user in users))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_uvicorn():
+    """Start the app on a local port inside this process"""
+    import uvicorn
+    from main import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+async def virtual_user(workload: Workload, scenarios: List[str], weights: List[int], deadline: float):
+    """Run weighted scenarios back to back until the deadline"""
+    while time.perf_counter() < deadline:
+        scenario = workload.rng.choices(scenarios, weights)[0]
+        await getattr(workload, scenario)()
+
+
+async def run(args) -> Dict[str, Any]:
+    """Run the benchmark and return the results document"""
+    server = server_task = None
+    base_url = args.base_url
+    if not base_url and args.transport == "uvicorn":
+        dataset = await load_dataset(args.users, args.seed_scale)
+        server, server_task, base_url = await start_uvicorn()
+    else:
+        dataset = await load_dataset(args.users, args.seed_scale)
+
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=httpx.Limits(max_connections=args.concurrency * 2))
+    else:
+        from main import app
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://benchmark", timeout=30.0
+        )
+
+    mix = dict(DEFAULT_MIX)
+    for item in args.mix or []:
+        name, weight = item.split("=")
+        mix[name] = int(weight)
+    if not base_url:
+        mix.pop("notification", None)
+        print("ℹ️  WebSocket scenario needs a server; skipped with --transport asgi")
+
+    recorder = Recorder()
+    workload = Workload(client, recorder, random.Random(args.seed))
+    workload.job_ids = dataset["job_ids"]
+    workload.candidates = dataset["candidates"]
+    workload.recruiters = dataset["recruiters"]
+
+    try:
+        print(f"🔐 Logging in {len(workload.candidates)} candidates and {len(workload.recruiters)} recruiters...")
+        await login_all(client, workload.candidates + workload.recruiters)
+
+        if mix.get("notification"):
+            ws_base = base_url.replace("http", "ws", 1)
+            for candidate in workload.candidates:
+                listener = WebSocketListener(
+                    f"{ws_base}/api/v1/websocket/ws/{candidate['user_id']}?token={candidate['token']}"
+                )
+                await listener.start()
+                workload.sockets[candidate["user_id"]] = listener
+
+        # Warm up caches and connection pools without recording
+        warmup_recorder = workload.recorder
+        workload.recorder = Recorder()
+        await asyncio.gather(*(
+            virtual_user(workload, list(mix), list(mix.values()), time.perf_counter() + args.warmup)
+            for _ in range(args.concurrency)
+        ))
+        workload.recorder = warmup_recorder
+
+        print(f"🚀 Running {args.concurrency} virtual users for {args.duration}s...")
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            virtual_user(workload, list(mix), list(mix.values()), started + args.duration)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        for listener in workload.sockets.values():
+            await listener.stop()
+        await client.aclose()
+        if server:
+            server.should_exit = True
+            await server_task
+
+    routes = recorder.summary(elapsed)
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "transport": "external" if args.base_url else args.transport,
+        "dataset": await dataset_info(),
+        "settings": {
+            "concurrency": args.concurrency, "duration": args.duration,
+            "users": args.users, "seed": args.seed, "mix": mix,
+        },
+        "total": {
+            "requests": sum(route["requests"] for route in routes.values()),
+            "throughput": round(sum(route["requests"] for route in routes.values()) / elapsed, 2),
+        },
+        "routes": routes,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """List routes whose p95 latency or throughput regressed beyond the threshold"""
+    regressions = []
+    for route, stats in current["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous or not previous.get("requests"):
+            continue
+        if previous["p95"] > 0 and stats["p95"] > previous["p95"] * (1 + threshold):
+            regressions.append(f"{route}: p95 {previous['p95']}ms → {stats['p95']}ms")
+        if stats["throughput"] < previous["throughput"] * (1 - threshold):
+            regressions.append(f"{route}: throughput {previous['throughput']}/s → {stats['throughput']}/s")
+        if stats["errors"] > previous["errors"]:
+            regressions.append(f"{route}: errors {previous['errors']} → {stats['errors']}")
+    return regressions
+
+
+def print_report(results: Dict[str, Any]):
+    print("=" * 100)
+    print(f"Dataset: {results['dataset']}")
+    print(f"{'Route':<48} {'req':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, stats in results["routes"].items():
+        print(
+            f"{route:<48} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput']:>8.1f} "
+            f"{stats['p50']:>8.1f} {stats['p95']:>8.1f} {stats['p99']:>8.1f}"
+        )
+    print(f"Total: {results['total']['requests']} requests, {results['total']['throughput']}/s (latency in ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed workload HTTP/WebSocket benchmark")
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="uvicorn", help="In-process transport")
+    parser.add_argument("--base-url", help="Benchmark a running local server instead")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unrecorded warm-up seconds")
+    parser.add_argument("--users", type=int, default=20, help="Seeded candidates to log in (recruiters: half)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for scenario selection")
+    parser.add_argument("--seed-scale", help="Seed this dataset scale first if the database has no seeded users")
+    parser.add_argument("--mix", nargs="*", help="Override scenario weights, e.g. apply=0 job_search=50")
+    parser.add_argument("--results-dir", default="benchmark_results", help="Directory for JSON baselines")
+    parser.add_argument("--label", help="Baseline name (defaults to one derived from the dataset size)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative change flagged as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit non-zero on regressions")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    dataset = results["dataset"]
+    # Applying adds rows, so name baselines after tables the run leaves alone
+    label = args.label or f"jobs{dataset['jobs']}_candidates{dataset['candidates']}"
+    results_dir = Path(args.results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / f"{label}.json"
+
+    regressions = []
+    if path.exists():
+        baseline = json.loads(path.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        path.with_suffix(".previous.json").write_text(json.dumps(baseline, indent=2))
+        if regressions:
+            print(f"⚠️  {len(regressions)} regression(s) against {path}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+        else:
+            print(f"✅ No regressions against {path}")
+
+    path.write_text(json.dumps(results, indent=2))
+    print(f"💾 Saved results to {path}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,10 @@ A comprehensive recruitment platform built with FastAPI featuring:
 - Comprehensive API documentation
 """
 
-from fastapi import FastAPI, Request, status
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import logging
@@ -24,7 +24,10 @@ try:
     from app.core.config import settings
     from app.core.database import init_db
     from app.api.v1.api import api_router
+    from app.core.metrics import MetricsMiddleware, metrics
+    from app.core.security import require_metrics_access
     from app.core.exceptions import (
+        BaseHTTPException,
         ValidationException,
         AuthenticationException,
         AuthorizationException,
@@ -35,6 +38,7 @@ except ImportError:
     # Fallback for basic testing
     class Settings:
         ALLOWED_HOSTS = ["*"]
+        METRICS_ENABLED = False
     settings = Settings()
     
     async def init_db():
@@ -98,6 +102,13 @@ async def lifespan(app: FastAPI):
         logger.info("Background task workers stopped")
     except ImportError:
         pass
+    
+    # Cancel pending presence flushes
+    try:
+        from app.services.websocket_service import websocket_service
+        await websocket_service.manager.presence.stop()
+    except ImportError:
+        pass
 
 
 # Create FastAPI application
@@ -181,8 +192,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Add request metrics middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Mount static files
 static_path = Path("static")
 static_path.mkdir(exist_ok=True)
@@ -195,6 +211,16 @@ app.mount("/media", StaticFiles(directory="media"), name="media")
 
 
 # Exception handlers
+@app.exception_handler(BaseHTTPException)
+async def app_exception_handler(request: Request, exc: BaseHTTPException):
+    """Return the status code of the application's own exceptions"""
+    content = {"detail": exc.message}
+    if exc.details:
+        content["details"] = exc.details
+    headers = {"WWW-Authenticate": "Bearer"} if exc.status_code == status.HTTP_401_UNAUTHORIZED else None
+    return JSONResponse(status_code=exc.status_code, content=content, headers=headers)
+
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
@@ -241,6 +267,21 @@ async def health_check():
     }
 
 
+# Prometheus metrics endpoint
+if settings.METRICS_ENABLED:
+    @app.get(
+        "/metrics", tags=["Health"], include_in_schema=False,
+        dependencies=[Depends(require_metrics_access)]
+    )
+    async def metrics_endpoint():
+        """
+        Request, database and external service metrics in Prometheus text format
+        
+        Open to clients in METRICS_ALLOWED_IPS (loopback by default) and to admins.
+        """
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 # Include API router
 try:
     app.include_router(api_router, prefix="/api/v1")
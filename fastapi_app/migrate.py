@@ -8,7 +8,7 @@ Run this before starting the application for the first time.
 
 import asyncio
 import logging
-from app.core.database import init_db, engine
+from app.core.database import init_db, create_indexes, engine
 from app.core.config import settings
 
 # Configure logging
@@ -38,6 +38,19 @@ async def create_tables():
         await engine.dispose()
 
 
+async def add_indexes():
+    """Add missing indexes to existing tables"""
+    try:
+        logger.info("Adding missing indexes...")
+        created = await create_indexes()
+        logger.info(f"Added {len(created)} indexes")
+    except Exception as e:
+        logger.error(f"Adding indexes failed: {e}")
+        raise
+    finally:
+        await engine.dispose()
+
+
 async def create_sample_data():
     """Create sample data for testing (optional)"""
     from sqlalchemy.ext.asyncio import AsyncSession
@@ -191,9 +204,18 @@ async def main():
         action="store_true", 
         help="Create sample data for testing"
     )
+    parser.add_argument(
+        "--indexes-only",
+        action="store_true",
+        help="Only add missing indexes to an existing database"
+    )
     
     args = parser.parse_args()
     
+    if args.indexes_only:
+        await add_indexes()
+        return
+    
     # Create tables
     await create_tables()
     
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+
+Seeds the database with a realistic population for load testing:
+companies, recruiters, candidates with skills, jobs, applications,
+parsed resumes, talent pool entries and job matches.
+
+Rows are generated lazily and loaded with executemany in batched
+transactions, so large scales run in constant memory. Generation is
+deterministic for a given --seed, with timestamps as fixed offsets back
+from the start of the current UTC day, so date-windowed queries (last 30
+days, this quarter) find data whenever the seed is run. IDs continue
+after existing rows, so seeding an existing database appends to it.
+
+All seeded users share the password SEED_PASSWORD, so load tests can log
+in as any of them (emails: seed_candidate_<id>@example.com,
+seed_recruiter_<id>@example.com).
+
+Usage:
+    python seed_data.py --scale 10k
+    DATABASE_URL=sqlite:///./load_test.db python seed_data.py --scale 1m --seed 7
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import func, insert, select
+
+from app.core.database import engine, init_db
+from app.core.security import get_password_hash
+from app.models.application import Application, ParsedResume
+from app.models.company import Company
+from app.models.job import Job
+from app.models.talent_pool import JobMatch, TalentPoolEntry
+from app.models.user import CandidateProfile, RecruiterProfile, User
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+SEED_PASSWORD = "SeedPass123"
+
+# Row counts per entity for each scale preset (roughly the total row count)
+SCALES = {
+    "10k": {
+        "companies": 50, "recruiters": 200, "candidates": 2000, "jobs": 800,
+        "applications": 5000, "parsed_resumes": 1000, "job_matches": 1000,
+    },
+    "100k": {
+        "companies": 500, "recruiters": 2000, "candidates": 20000, "jobs": 8000,
+        "applications": 50000, "parsed_resumes": 10000, "job_matches": 10000,
+    },
+    "1m": {
+        "companies": 5000, "recruiters": 20000, "candidates": 200000, "jobs": 80000,
+        "applications": 500000, "parsed_resumes": 100000, "job_matches": 100000,
+    },
+    "10m": {
+        "companies": 50000, "recruiters": 200000, "candidates": 2000000, "jobs": 800000,
+        "applications": 5000000, "parsed_resumes": 1000000, "job_matches": 1000000,
+    },
+}
+
+SKILL_GROUPS = {
+    "backend": ["Python", "Java", "Go", "Node.js", "FastAPI", "Django", "Spring Boot", "PostgreSQL", "Redis"],
+    "frontend": ["JavaScript", "TypeScript", "React", "Vue.js", "Angular", "HTML", "CSS", "Tailwind CSS"],
+    "data": ["Python", "SQL", "Pandas", "NumPy", "Spark", "Airflow", "Machine Learning", "TensorFlow", "PyTorch"],
+    "devops": ["Docker", "Kubernetes", "AWS", "Terraform", "Linux", "CI/CD", "Azure", "GCP", "Ansible"],
+    "mobile": ["Swift", "Kotlin", "React Native", "Flutter", "iOS", "Android", "Firebase"],
+    "product": ["Agile", "Scrum", "Jira", "Roadmapping", "User Research", "Analytics", "Communication"],
+}
+SOFT_SKILLS = ["Communication", "Leadership", "Teamwork", "Problem Solving", "Mentoring", "Time Management"]
+
+TITLES = {
+    "backend": ["Backend Engineer", "Python Developer", "Software Engineer", "API Engineer"],
+    "frontend": ["Frontend Developer", "UI Engineer", "Web Developer", "React Developer"],
+    "data": ["Data Scientist", "Data Engineer", "ML Engineer", "Analytics Engineer"],
+    "devops": ["DevOps Engineer", "Site Reliability Engineer", "Platform Engineer", "Cloud Engineer"],
+    "mobile": ["iOS Developer", "Android Developer", "Mobile Engineer"],
+    "product": ["Product Manager", "Scrum Master", "Product Owner"],
+}
+LEVELS = [("entry", 0, 1), ("junior", 1, 3), ("mid", 3, 6), ("senior", 6, 10), ("lead", 8, 15)]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+               "Maria", "Wei", "Aisha", "Carlos", "Priya", "Olga", "Kenji", "Fatima", "Liam", "Zara"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Okafor", "Patel", "Novak", "Kim", "Silva", "Müller", "Haddad",
+              "Johnson", "Nguyen", "Rossi", "Kowalski", "Tanaka", "Ali", "Brown", "Lopez", "Singh", "Ivanova"]
+CITIES = [("San Francisco", "CA", "USA"), ("New York", "NY", "USA"), ("Austin", "TX", "USA"),
+          ("Seattle", "WA", "USA"), ("Toronto", "ON", "Canada"), ("London", "", "UK"),
+          ("Berlin", "", "Germany"), ("Nairobi", "", "Kenya"), ("Kampala", "", "Uganda"),
+          ("Bangalore", "KA", "India"), ("Singapore", "", "Singapore"), ("Remote", "", "")]
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "Education", "Retail", "Logistics", "Media", "Energy"]
+COMPANY_WORDS = ["Nova", "Blue", "Bright", "Quantum", "Peak", "Urban", "Green", "Swift", "Atlas", "Pixel",
+                 "Cedar", "Orbit", "Lumen", "Vertex", "Harbor", "Summit"]
+COMPANY_SUFFIXES = ["Labs", "Systems", "Technologies", "Solutions", "Analytics", "Networks", "Health", "Works"]
+COMPANY_SIZES = ["startup", "small", "medium", "large", "enterprise"]
+JOB_TYPES = ["full_time"] * 6 + ["contract", "part_time", "internship", "freelance"]
+JOB_STATUSES = ["active"] * 7 + ["closed", "paused", "draft"]
+REMOTE_TYPES = ["onsite", "remote", "hybrid"]
+APPLICATION_STATUSES = (["submitted"] * 10 + ["under_review"] * 5 + ["screening"] * 3 + ["rejected"] * 6
+                        + ["interview_scheduled"] * 2 + ["interviewed", "offer_extended", "hired", "withdrawn"])
+SOURCES = ["website", "linkedin", "referral", "job_board", "career_fair"]
+BENEFITS = ["Health Insurance", "401k", "Flexible Hours", "Remote Work", "Stock Options", "Learning Budget"]
+
+
+class SeedContext:
+    """Shared state for one seeding run: counts, ID ranges and randomness"""
+
+    def __init__(self, counts: Dict[str, int], seed: int, id_offsets: Dict[str, int]):
+        self.counts = counts
+        self.seed = seed
+        self.offsets = id_offsets
+        # Same seed, same offsets back from today; stable within a day
+        self.now = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.password_hash = get_password_hash(SEED_PASSWORD)
+
+        # Users: recruiters first, then candidates
+        self.recruiter_user_base = id_offsets["users"]
+        self.candidate_user_base = id_offsets["users"] + counts["recruiters"]
+
+    def rng(self, name: str) -> random.Random:
+        """Get an independent, deterministic random stream for a table"""
+        return random.Random(f"{self.seed}:{name}")
+
+    def ids(self, table: str, count_key: str) -> range:
+        """Get the IDs generated for a table"""
+        start = self.offsets[table] + 1
+        return range(start, start + self.counts[count_key])
+
+    def pick_id(self, rng: random.Random, table: str, count_key: str) -> int:
+        """Pick a random generated ID of a table"""
+        return self.offsets[table] + 1 + rng.randrange(self.counts[count_key])
+
+    def past(self, rng: random.Random, days: int = 365) -> datetime:
+        """Pick a timestamp within the last `days` days"""
+        return self.now - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def _skills(rng: random.Random, group: str, count: int) -> List[str]:
+    """Pick skills, mostly from one group with some cross-over"""
+    pool = SKILL_GROUPS[group]
+    picked = rng.sample(pool, min(count, len(pool)))
+    if rng.random() < 0.4:
+        other = SKILL_GROUPS[rng.choice(list(SKILL_GROUPS))]
+        picked.append(rng.choice(other))
+    return list(dict.fromkeys(picked))
+
+
+def generate_companies(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate company rows"""
+    rng = ctx.rng("companies")
+    for company_id in ctx.ids("companies", "companies"):
+        name = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}"
+        city, state, country = rng.choice(CITIES)
+        yield {
+            "id": company_id,
+            "name": name,
+            "slug": f"{name.lower().replace(' ', '-')}-{company_id}",
+            "description": f"{name} builds products for the {rng.choice(INDUSTRIES).lower()} industry.",
+            "industry": rng.choice(INDUSTRIES),
+            "company_size": rng.choice(COMPANY_SIZES),
+            "city": city,
+            "state": state,
+            "country": country,
+            "website": f"https://{name.lower().replace(' ', '')}{company_id}.example.com",
+            "benefits": rng.sample(BENEFITS, 3),
+            "is_verified": rng.random() < 0.6,
+            "is_active": True,
+            "created_at": ctx.past(rng, 1500),
+        }
+
+
+def generate_users(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate user rows for all recruiters and candidates"""
+    rng = ctx.rng("users")
+    total = ctx.counts["recruiters"] + ctx.counts["candidates"]
+    for index in range(total):
+        user_id = ctx.offsets["users"] + 1 + index
+        is_recruiter = index < ctx.counts["recruiters"]
+        user_type = "recruiter" if is_recruiter else "candidate"
+        created_at = ctx.past(rng, 730)
+        yield {
+            "id": user_id,
+            "email": f"seed_{user_type}_{user_id}@example.com",
+            "hashed_password": ctx.password_hash,
+            "user_type": user_type,
+            "is_active": True,
+            "is_verified": True,
+            "is_superuser": False,
+            "created_at": created_at,
+            "email_verified_at": created_at,
+        }
+
+
+def generate_recruiters(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate recruiter profile rows"""
+    rng = ctx.rng("recruiters")
+    for index, profile_id in enumerate(ctx.ids("recruiter_profiles", "recruiters")):
+        yield {
+            "id": profile_id,
+            "user_id": ctx.recruiter_user_base + 1 + index,
+            "company_id": ctx.pick_id(rng, "companies", "companies"),
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "title": rng.choice(["Technical Recruiter", "Talent Partner", "Hiring Manager", "HR Lead"]),
+            "department": "Talent Acquisition",
+            "profile_completed": True,
+            "created_at": ctx.past(rng, 730),
+        }
+
+
+def _candidate_traits(ctx: SeedContext, index: int) -> Dict[str, Any]:
+    """Derive a candidate's traits from its index (shared by related tables)"""
+    rng = random.Random(f"{ctx.seed}:candidate:{index}")
+    group = rng.choice(list(SKILL_GROUPS))
+    level, min_years, max_years = rng.choice(LEVELS)
+    return {
+        "group": group,
+        "level": level,
+        "years": rng.randint(min_years, max_years),
+        "skills": _skills(rng, group, rng.randint(3, 7)),
+        "city": rng.choice(CITIES),
+        "title": rng.choice(TITLES[group]),
+        "first_name": rng.choice(FIRST_NAMES),
+        "last_name": rng.choice(LAST_NAMES),
+        "salary": rng.randrange(40, 220) * 1000,
+    }
+
+
+def generate_candidates(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate candidate profile rows"""
+    rng = ctx.rng("candidates")
+    for index, profile_id in enumerate(ctx.ids("candidate_profiles", "candidates")):
+        traits = _candidate_traits(ctx, index)
+        city, state, country = traits["city"]
+        yield {
+            "id": profile_id,
+            "user_id": ctx.candidate_user_base + 1 + index,
+            "first_name": traits["first_name"],
+            "last_name": traits["last_name"],
+            "location": ", ".join(part for part in (city, state, country) if part),
+            "current_title": traits["title"],
+            "summary": f"{traits['level'].title()} {traits['title']} with {traits['years']} years of experience.",
+            "experience_years": traits["years"],
+            "salary_expectation": traits["salary"],
+            "skills": traits["skills"],
+            "preferred_locations": [city],
+            "preferred_job_types": ["full_time"],
+            "remote_preference": rng.choice(REMOTE_TYPES),
+            "profile_completed": True,
+            "completion_percentage": rng.randint(60, 100),
+            "created_at": ctx.past(rng, 730),
+        }
+
+
+def generate_talent_pool(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate talent pool entries (one per candidate)"""
+    rng = ctx.rng("talent_pool")
+    for index, entry_id in enumerate(ctx.ids("talent_pool_entries", "candidates")):
+        traits = _candidate_traits(ctx, index)
+        yield {
+            "id": entry_id,
+            "candidate_id": ctx.offsets["candidate_profiles"] + 1 + index,
+            "is_active": True,
+            "is_available": rng.random() < 0.8,
+            "preferred_roles": [traits["title"]],
+            "preferred_locations": [traits["city"][0]],
+            "preferred_salary_min": traits["salary"],
+            "auto_matching_enabled": rng.random() < 0.7,
+            "match_score_threshold": 0.5,
+            "created_at": ctx.past(rng, 365),
+        }
+
+
+def generate_jobs(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate job rows"""
+    rng = ctx.rng("jobs")
+    for job_id in ctx.ids("jobs", "jobs"):
+        group = rng.choice(list(SKILL_GROUPS))
+        level, min_years, max_years = rng.choice(LEVELS)
+        title = f"{level.title()} {rng.choice(TITLES[group])}"
+        city, state, country = rng.choice(CITIES)
+        salary_min = rng.randrange(40, 200) * 1000
+        created_at = ctx.past(rng, 365)
+        yield {
+            "id": job_id,
+            "company_id": ctx.pick_id(rng, "companies", "companies"),
+            "recruiter_id": ctx.pick_id(rng, "recruiter_profiles", "recruiters"),
+            "title": title,
+            "slug": f"{title.lower().replace(' ', '-')}-{job_id}",
+            "description": f"We are hiring a {title} to join our {group} team.",
+            "summary": f"{title} in {city}",
+            "job_type": rng.choice(JOB_TYPES),
+            "experience_level": level,
+            "remote_type": rng.choice(REMOTE_TYPES),
+            "location": ", ".join(part for part in (city, state, country) if part),
+            "city": city,
+            "state": state,
+            "country": country,
+            "is_remote_ok": rng.random() < 0.4,
+            "requirements": _skills(rng, group, rng.randint(3, 6)),
+            "min_experience_years": min_years,
+            "max_experience_years": max_years,
+            "salary_min": salary_min,
+            "salary_max": salary_min + rng.randrange(10, 60) * 1000,
+            "benefits": rng.sample(BENEFITS, 3),
+            "status": rng.choice(JOB_STATUSES),
+            "view_count": rng.randrange(0, 5000),
+            "created_at": created_at,
+            "published_at": created_at,
+        }
+
+
+def generate_applications(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate application rows (a candidate never applies to a job twice)"""
+    rng = ctx.rng("applications")
+    candidates, jobs = ctx.counts["candidates"], ctx.counts["jobs"]
+
+    for sequence, application_id in enumerate(ctx.ids("applications", "applications")):
+        # Candidates apply in rounds; each round moves to the next job from a
+        # per-candidate starting point, so pairs stay distinct
+        index, round_number = sequence % candidates, sequence // candidates
+        if round_number >= jobs:
+            return
+        job_index = (index * 2654435761 + ctx.seed * 97 + round_number) % jobs
+        created_at = ctx.past(rng, 365)
+        yield {
+            "id": application_id,
+            "job_id": ctx.offsets["jobs"] + 1 + job_index,
+            "candidate_id": ctx.offsets["candidate_profiles"] + 1 + index,
+            "status": rng.choice(APPLICATION_STATUSES),
+            "cover_letter": "I am excited to apply for this role." if rng.random() < 0.5 else None,
+            "source": rng.choice(SOURCES),
+            "internal_rating": round(rng.uniform(1, 5), 1) if rng.random() < 0.3 else None,
+            "created_at": created_at,
+            "submitted_at": created_at,
+        }
+
+
+def generate_parsed_resumes(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate parsed resume rows for a spread of applications"""
+    rng = ctx.rng("parsed_resumes")
+    applications = ctx.counts["applications"]
+    candidates = ctx.counts["candidates"]
+    step = max(1, applications // max(1, ctx.counts["parsed_resumes"]))
+    application_ids = range(ctx.offsets["applications"] + 1, ctx.offsets["applications"] + 1 + applications, step)
+
+    for resume_id, application_id in zip(ctx.ids("parsed_resumes", "parsed_resumes"), application_ids):
+        # Same candidate as generate_applications assigned to this application
+        traits = _candidate_traits(ctx, (application_id - ctx.offsets["applications"] - 1) % candidates)
+        city, state, country = traits["city"]
+        yield {
+            "id": resume_id,
+            "application_id": application_id,
+            "full_name": f"{traits['first_name']} {traits['last_name']}",
+            "location": ", ".join(part for part in (city, state, country) if part),
+            "summary": f"{traits['title']} with {traits['years']} years of experience.",
+            "technical_skills": traits["skills"],
+            "soft_skills": rng.sample(SOFT_SKILLS, 2),
+            "total_experience_years": float(traits["years"]),
+            "work_experience": [{"title": traits["title"], "years": traits["years"]}],
+            "education": [{"degree": rng.choice(["BSc", "MSc", "BEng", "Diploma"])}],
+            "ai_score": round(rng.uniform(4, 10), 1),
+            "career_level": traits["level"],
+            "skill_match_score": round(rng.random(), 3),
+            "parsing_confidence": round(rng.uniform(0.6, 1.0), 2),
+            "created_at": ctx.past(rng, 365),
+        }
+
+
+def generate_job_matches(ctx: SeedContext) -> Iterator[Dict[str, Any]]:
+    """Generate job match rows between talent pool entries and jobs"""
+    rng = ctx.rng("job_matches")
+    for match_id in ctx.ids("job_matches", "job_matches"):
+        index = rng.randrange(ctx.counts["candidates"])
+        traits = _candidate_traits(ctx, index)
+        matched = rng.sample(traits["skills"], rng.randint(1, len(traits["skills"])))
+        skill_score = round(len(matched) / len(traits["skills"]), 3)
+        yield {
+            "id": match_id,
+            "talent_entry_id": ctx.offsets["talent_pool_entries"] + 1 + index,
+            "job_id": ctx.pick_id(rng, "jobs", "jobs"),
+            "overall_score": round(0.5 * skill_score + 0.5 * rng.random(), 3),
+            "skill_score": skill_score,
+            "experience_score": round(rng.random(), 3),
+            "location_score": round(rng.random(), 3),
+            "salary_score": round(rng.random(), 3),
+            "matched_skills": matched,
+            "missing_skills": [],
+            "status": rng.choice(["pending", "viewed", "interested", "not_interested"]),
+            "created_at": ctx.past(rng, 180),
+        }
+
+
+# Load order respects foreign keys: (model, count key, generator)
+SEED_PLAN: List[tuple] = [
+    (Company, "companies", generate_companies),
+    (User, None, generate_users),
+    (RecruiterProfile, "recruiters", generate_recruiters),
+    (CandidateProfile, "candidates", generate_candidates),
+    (TalentPoolEntry, "candidates", generate_talent_pool),
+    (Job, "jobs", generate_jobs),
+    (Application, "applications", generate_applications),
+    (ParsedResume, "parsed_resumes", generate_parsed_resumes),
+    (JobMatch, "job_matches", generate_job_matches),
+]
+
+
+async def get_id_offsets() -> Dict[str, int]:
+    """Get the current maximum ID of every seeded table"""
+    offsets = {}
+    async with engine.connect() as conn:
+        for model, _, _ in SEED_PLAN:
+            result = await conn.execute(select(func.max(model.id)))
+            offsets[model.__tablename__] = result.scalar() or 0
+    return offsets
+
+
+async def load_table(model, rows: Iterator[Dict[str, Any]], batch_size: int) -> int:
+    """
+    Bulk insert generated rows with executemany, one transaction per batch
+
+    Returns:
+        Number of rows inserted
+    """
+    statement = insert(model.__table__)
+    total = 0
+
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        async with engine.begin() as conn:
+            await conn.execute(statement, batch)
+        total += len(batch)
+
+    return total
+
+
+def planned_rows(counts: Dict[str, int]) -> int:
+    """Number of rows SEED_PLAN inserts for the given counts, across all tables"""
+    rows = {
+        None: counts["recruiters"] + counts["candidates"],  # users
+        # A candidate applies to each job at most once
+        "applications": min(counts["applications"], counts["candidates"] * counts["jobs"]),
+    }
+    return sum(rows.get(count_key, counts.get(count_key, 0)) for _, count_key, _ in SEED_PLAN)
+
+
+async def seed(counts: Dict[str, int], seed_value: int, batch_size: int):
+    """Generate and load the full dataset"""
+    await init_db()
+    offsets = await get_id_offsets()
+    ctx = SeedContext(counts, seed_value, offsets)
+
+    logger.info(
+        f"Seeding {planned_rows(counts):,} rows into {len(SEED_PLAN)} tables (seed={seed_value}, batch={batch_size})"
+    )
+    started = time.perf_counter()
+    grand_total = 0
+
+    for model, _, generator in SEED_PLAN:
+        table_started = time.perf_counter()
+        inserted = await load_table(model, generator(ctx), batch_size)
+        elapsed = time.perf_counter() - table_started
+        grand_total += inserted
+        logger.info(
+            f"{model.__tablename__}: {inserted:,} rows in {elapsed:.1f}s "
+            f"({inserted / max(elapsed, 1e-9):,.0f} rows/s)"
+        )
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Seeded {grand_total:,} rows in {elapsed:.1f}s ({grand_total / max(elapsed, 1e-9):,.0f} rows/s)")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic data generator for load testing")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k", help="Dataset size preset")
+    parser.add_argument("--multiplier", type=float, default=1.0, help="Scale every preset count by this factor")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per insert transaction")
+    args = parser.parse_args()
+
+    counts = {key: max(1, int(value * args.multiplier)) for key, value in SCALES[args.scale].items()}
+    counts["parsed_resumes"] = min(counts["parsed_resumes"], counts["applications"])
+
+    asyncio.run(seed(counts, args.seed, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+AI Streaming Test Script
+
+Serves the app in-process against a local mock OpenAI-compatible server
+that streams its completions slowly, and checks the streaming endpoints
+for job descriptions and interview questions: the first bytes and the
+first generated text must arrive long before generation finishes, job
+description sections must be emitted as they complete, and the final
+result must match what the blocking endpoints return. Also checks that
+the incremental section parser agrees with a whole-text parse however
+the text is chunked, and that a slow consumer's time between chunks is
+not recorded as OpenAI time.
+
+Runs in-process with a temporary database; no server or API key needed.
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+JOB_DESCRIPTION = """**Senior Backend Engineer**
+
+Company Overview:
+Acme builds hiring tools used by thousands of recruiters.
+We are a remote-first team of forty.
+
+Role Summary:
+You will design and run the services behind our matching engine.
+
+Key Responsibilities:
+- Build APIs in Python and FastAPI
+- Own PostgreSQL schema changes and performance
+- Mentor other engineers
+
+Required Qualifications:
+- 5+ years of backend development
+- Experience with AWS and Docker
+
+Preferred Qualifications:
+- Kubernetes in production
+
+Benefits and Perks:
+- Flexible hours
+- Learning budget
+
+Apply today with your resume.
+"""
+
+INTERVIEW_QUESTIONS = json.dumps({
+    "interview_type": "technical",
+    "questions": [
+        {"question": "How would you index a table for range scans?", "category": "databases"},
+        {"question": "Describe a production incident you resolved.", "category": "experience"}
+    ],
+    "evaluation_rubric": {"excellent": "Clear trade-offs", "poor": "Vague answers"}
+}, indent=2)
+
+
+def reference_parse(content: str) -> dict:
+    """Whole-text section parse the job description endpoint has always used"""
+    sections = {}
+    current_section = None
+    current_content = []
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if any(keyword in line.lower() for keyword in ['company overview', 'role summary', 'responsibilities', 'qualifications', 'benefits']):
+            if current_section:
+                sections[current_section] = '\n'.join(current_content)
+            current_section = line.lower().replace(':', '').replace(' ', '_')
+            current_content = []
+        elif line:
+            current_content.append(line)
+
+    if current_section:
+        sections[current_section] = '\n'.join(current_content)
+
+    return sections
+
+
+class StreamingLLMServer:
+    """OpenAI-compatible chat completions server that streams completions slowly"""
+
+    def __init__(self, first_token_latency: float = 0.3, chunk_delay: float = 0.04, chunk_size: int = 12):
+        self.first_token_latency = first_token_latency
+        self.chunk_delay = chunk_delay
+        self.chunk_size = chunk_size
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests += 1
+                prompt = body["messages"][-1]["content"]
+                content = INTERVIEW_QUESTIONS if "interview questions" in prompt else JOB_DESCRIPTION
+                time.sleep(server.first_token_latency)
+
+                if not body.get("stream"):
+                    time.sleep(server.chunk_delay * len(content) / server.chunk_size)
+                    data = json.dumps({
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body["model"],
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": 100, "completion_tokens": 200, "total_tokens": 300}
+                    }).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for start in range(0, len(content), server.chunk_size):
+                    chunk = {
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": body["model"],
+                        "choices": [{"index": 0, "delta": {"content": content[start:start + server.chunk_size]}, "finish_reason": None}]
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                    time.sleep(server.chunk_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+llm = StreamingLLMServer()
+work_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = "test-key"
+os.environ["OPENAI_BASE_URL"] = llm.url
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["LLM_CACHE_PATH"] = os.path.join(work_dir.name, "llm_responses.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'streaming.db')}"
+
+import httpx
+import uvicorn
+
+from app.core.database import AsyncSessionLocal, init_db
+from app.core.security import create_access_token, get_password_hash
+from app.models.user import User
+from app.core.metrics import metrics
+from app.services.openai_service import JobDescriptionSectionParser, openai_service
+
+JOB_REQUEST = {
+    "job_title": "Senior Backend Engineer",
+    "company_info": {"name": "Acme", "industry": "HR tech"},
+    "requirements": ["Python", "FastAPI", "PostgreSQL"]
+}
+QUESTIONS_REQUEST = {
+    "job_description": "Senior backend engineer working on Python services",
+    "interview_type": "technical"
+}
+
+
+async def create_user(email: str, user_type: str) -> str:
+    """Create a verified user and return a bearer token for them"""
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email=email,
+            hashed_password=get_password_hash("Password123!"),
+            user_type=user_type,
+            is_active=True,
+            is_verified=True
+        )
+        session.add(user)
+        await session.commit()
+        return create_access_token(user.id)
+
+
+async def read_events(client: httpx.AsyncClient, path: str, payload: dict, token: str):
+    """POST to a streaming endpoint, returning (arrival time, event, data) tuples and the time to first byte"""
+    started = time.perf_counter()
+    events, first_byte, buffer = [], None, ""
+    async with client.stream("POST", path, json=payload, headers={"Authorization": f"Bearer {token}"}) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return response.status_code, None, []
+        async for text in response.aiter_text():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            buffer += text
+            *messages, buffer = buffer.split("\n\n")
+            for message in messages:
+                fields = dict(line.split(": ", 1) for line in message.split("\n"))
+                events.append((time.perf_counter() - started, fields["event"], json.loads(fields["data"])))
+    return 200, first_byte, events
+
+
+def test_incremental_parser() -> bool:
+    """Test that chunked parsing matches the whole-text parse for any chunking"""
+    print("🔍 Testing incremental section parser...")
+
+    rng = random.Random(7)
+    for trial in range(300):
+        parser = JobDescriptionSectionParser()
+        emitted = {}
+        position = 0
+        while position < len(JOB_DESCRIPTION):
+            size = rng.randint(1, 40)
+            for name, content in parser.feed(JOB_DESCRIPTION[position:position + size]):
+                emitted[name] = content
+            position += size
+        for name, content in parser.close():
+            emitted[name] = content
+
+        if emitted != reference_parse(JOB_DESCRIPTION) or parser.sections != emitted:
+            print(f"❌ Chunking {trial} produced different sections: {sorted(emitted)}")
+            return False
+
+    print(f"✅ 300 random chunkings matched the whole-text parse ({len(emitted)} sections)")
+    return True
+
+
+async def test_job_description_stream(client: httpx.AsyncClient, token: str) -> bool:
+    """Test time to first byte, incremental sections and the final result"""
+    print("🔍 Testing streamed job description...")
+
+    status, first_byte, events = await read_events(client, "/api/v1/ai-enhanced/generate-job-description/stream", JOB_REQUEST, token)
+    if status != 200:
+        print(f"❌ Stream returned {status}")
+        return False
+
+    names = [event for _, event, _ in events]
+    first_token = next(at for at, event, _ in events if event == "token")
+    sections = [(at, data["name"]) for at, event, data in events if event == "section"]
+    done_at, _, done = events[-1]
+    text = "".join(data for _, event, data in events if event == "token")
+
+    print(f"   First byte: {first_byte * 1000:.0f}ms, first token: {first_token * 1000:.0f}ms, "
+          f"done: {done_at * 1000:.0f}ms, {names.count('token')} tokens, {len(sections)} sections")
+
+    if names[0] != "start" or names[-1] != "done":
+        print(f"❌ Unexpected event order: {names[:3]} ... {names[-3:]}")
+        return False
+    if first_byte > 1.0 or first_token > 1.0 or done_at < 1.5:
+        print("❌ Generation was not streamed")
+        return False
+    if text != JOB_DESCRIPTION or done["generated_description"] != JOB_DESCRIPTION:
+        print("❌ Streamed text differs from the generated description")
+        return False
+    if done["sections"] != reference_parse(JOB_DESCRIPTION) or [name for _, name in sections] != list(done["sections"]):
+        print(f"❌ Sections differ: {[name for _, name in sections]}")
+        return False
+    if sections[0][0] > done_at / 2:
+        print("❌ First section was not emitted before generation finished")
+        return False
+
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/v1/ai-enhanced/generate-job-description", json=JOB_REQUEST, headers={"Authorization": f"Bearer {token}"}
+    )
+    blocking = time.perf_counter() - started
+    if response.status_code != 200 or response.json()["data"]["sections"] != done["sections"]:
+        print(f"❌ Blocking endpoint disagrees with the stream ({response.status_code})")
+        return False
+
+    print(f"   Blocking endpoint: first byte after {blocking * 1000:.0f}ms")
+    print("✅ Job description streamed with sections as they completed")
+    return True
+
+
+async def test_interview_questions_stream(client: httpx.AsyncClient, token: str) -> bool:
+    """Test that interview questions stream and finish with the parsed questions"""
+    print("🔍 Testing streamed interview questions...")
+
+    status, first_byte, events = await read_events(
+        client, "/api/v1/ai-enhanced/generate-interview-questions-advanced/stream", QUESTIONS_REQUEST, token
+    )
+    if status != 200:
+        print(f"❌ Stream returned {status}")
+        return False
+
+    done_at, event, done = events[-1]
+    tokens = sum(1 for _, name, _ in events if name == "token")
+    print(f"   First byte: {first_byte * 1000:.0f}ms, done: {done_at * 1000:.0f}ms, {tokens} tokens")
+
+    if event != "done" or first_byte > 1.0 or tokens < 2:
+        print("❌ Interview questions were not streamed")
+        return False
+    if done.get("questions") != json.loads(INTERVIEW_QUESTIONS)["questions"]:
+        print(f"❌ Unexpected result: {done}")
+        return False
+
+    print("✅ Interview questions streamed and parsed")
+    return True
+
+
+def openai_seconds() -> float:
+    """Total recorded time of successful OpenAI calls"""
+    series = metrics.external_duration._series.get(("openai", "success"))
+    return series[-2] if series else 0.0
+
+
+async def test_slow_consumer_timing() -> bool:
+    """Test that stream timing counts waits on the upstream, not the consumer"""
+    print("🔍 Testing OpenAI time of a slowly consumed stream...")
+
+    pause = 0.1
+    before = openai_seconds()
+    started = time.perf_counter()
+    chunks = 0
+    messages = [{"role": "user", "content": "Write a job description for a slow reader"}]
+    async for _ in openai_service._stream_complete(messages, temperature=0.7):
+        chunks += 1
+        await asyncio.sleep(pause)
+    elapsed = time.perf_counter() - started
+    recorded = openai_seconds() - before
+
+    print(f"   {chunks} chunks in {elapsed:.2f}s, {chunks * pause:.2f}s of it in the consumer; "
+          f"OpenAI time recorded: {recorded:.2f}s")
+    if chunks < 2 or recorded <= 0 or recorded > elapsed - 0.9 * chunks * pause:
+        print("❌ Consumer time was counted as OpenAI time")
+        return False
+
+    print("✅ Only upstream waits are recorded")
+    return True
+
+
+async def test_permissions(client: httpx.AsyncClient, token: str) -> bool:
+    """Test that candidates cannot use the streaming generators"""
+    print("🔍 Testing streaming endpoint permissions...")
+
+    before = llm.requests
+    status, _, _ = await read_events(client, "/api/v1/ai-enhanced/generate-job-description/stream", JOB_REQUEST, token)
+    if status != 403 or llm.requests != before:
+        print(f"❌ Candidate got {status}")
+        return False
+
+    print("✅ Candidates are refused with 403")
+    return True
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_tests():
+    from main import app
+
+    await init_db()
+    recruiter = await create_user("stream_recruiter@example.com", "recruiter")
+    candidate = await create_user("stream_candidate@example.com", "candidate")
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            return [
+                test_incremental_parser(),
+                await test_job_description_stream(client, recruiter),
+                await test_interview_questions_stream(client, recruiter),
+                await test_slow_consumer_timing(),
+                await test_permissions(client, candidate),
+            ]
+    finally:
+        server.should_exit = True
+        await task
+
+
+def main():
+    """Run all AI streaming tests"""
+    print("🚀 AI streaming tests")
+    print("=" * 50)
+
+    try:
+        results = asyncio.run(run_tests())
+    finally:
+        llm.stop()
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All AI streaming tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} AI streaming test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Authentication Cache Test Script
+
+Checks that cached principals are invalidated when changes to a user or
+profile commit (not when they flush), that a lookup racing a commit can
+never cache the old row, that the cache's version map stays bounded, that
+requests only hold the write connection between their first write and
+commit (so authenticated reads never wait for it), and that revoking a user's tokens catches tokens issued earlier in the same second.
+
+Runs in-process with a temporary database; no server or API key needed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+work_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["DATABASE_POOL_TIMEOUT"] = "1"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'auth.db')}"
+
+import httpx
+from sqlalchemy import insert, select
+
+from app.core.database import AsyncSessionLocal, ReadSessionLocal, RequestSessionLocal, engine, init_db
+from jose import JWTError
+
+from app.core.security import (
+    PrincipalCache, create_access_token, decode_token, get_password_hash, get_principal, principal_cache,
+    revoke_user_tokens, verify_password
+)
+from app.models.user import CandidateProfile, User
+
+USER_ID = 1
+PASSWORD_USER_ID = 2
+
+
+def bearer(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+
+async def test_invalidate_on_commit() -> bool:
+    """Test that principals are invalidated after commit, not at flush"""
+    print("🔍 Testing principal invalidation on commit...")
+
+    async with ReadSessionLocal() as read:
+        principal = await get_principal(read, USER_ID)
+    if principal is None or principal_cache.get(USER_ID) is None:
+        print("❌ Principal was not cached")
+        return False
+
+    async with AsyncSessionLocal() as session:
+        user = await session.get(User, USER_ID)
+        user.is_active = False
+        await session.flush()
+        if principal_cache.get(USER_ID) is None:
+            print("❌ Principal invalidated at flush, before the change committed")
+            return False
+
+        # A lookup between flush and commit reads and caches the old committed row
+        principal_cache.clear()
+        async with ReadSessionLocal() as read:
+            stale = await get_principal(read, USER_ID)
+        await session.commit()
+
+    # Once the change commits, the old row must no longer be served
+    async with ReadSessionLocal() as read:
+        fresh = await get_principal(read, USER_ID)
+    if not stale.is_active or fresh.is_active:
+        print(f"❌ Disabled user still served from cache after commit: {fresh}")
+        return False
+
+    async with AsyncSessionLocal() as session:
+        session.add(CandidateProfile(user_id=USER_ID))
+        version = principal_cache.version(USER_ID)
+        await session.flush()
+        await session.rollback()
+    if principal_cache.version(USER_ID) != version:
+        print("❌ A rolled back change invalidated the principal")
+        return False
+
+    async with AsyncSessionLocal() as session:
+        (await session.get(User, USER_ID)).is_active = True
+        session.add(CandidateProfile(user_id=USER_ID))
+        await session.commit()
+    async with ReadSessionLocal() as read:
+        principal = await get_principal(read, USER_ID)
+    if not principal.is_active or principal.candidate_profile_id is None:
+        print(f"❌ Principal not refreshed after profile insert: {principal}")
+        return False
+
+    print("✅ Principals invalidated when changes commit")
+    return True
+
+
+def test_bounded_versions() -> bool:
+    """Test that the version map is bounded and pruning never revives old versions"""
+    print("🔍 Testing principal cache version bound...")
+
+    cache = PrincipalCache(ttl=30, max_size=100)
+    in_flight = cache.version(0)
+    for user_id in range(10_000):
+        cache.invalidate(user_id)
+    if len(cache._versions) > 100:
+        print(f"❌ Version map holds {len(cache._versions)} users")
+        return False
+
+    # User 0's version was pruned; a lookup that started before its
+    # invalidation must still be rejected
+    principal = type("P", (), {"id": 0})()
+    cache.set(principal, in_flight)
+    if cache.get(0) is not None:
+        print("❌ Lookup from before the invalidation was cached after pruning")
+        return False
+    cache.set(principal, cache.version(0))
+    if cache.get(0) is not principal:
+        print("❌ Current lookup was not cached")
+        return False
+
+    print("✅ Version map stays bounded")
+    return True
+
+
+async def test_reads_while_writer_busy(client: httpx.AsyncClient) -> bool:
+    """Test that requests take the write connection only while they write"""
+    print("🔍 Testing requests while the writer is busy...")
+
+    # Hold the only write connection, as a slow writer elsewhere would
+    async with engine.connect() as writer:
+        await writer.execute(select(1))
+        for path in ("/api/v1/users/me", "/api/v1/files/storage-usage"):
+            response = await client.get(path, headers=bearer(USER_ID))
+            if response.status_code != 200:
+                print(f"❌ GET {path} returned {response.status_code} while the writer was busy")
+                return False
+
+    async with RequestSessionLocal() as session:
+        user = (await session.execute(select(User).where(User.id == USER_ID))).scalar_one()
+        if engine.pool.checkedout():
+            print("❌ A read took the write connection")
+            return False
+        user.phone = "555-0100"
+        await session.flush()
+        if not engine.pool.checkedout():
+            print("❌ The write did not go to the write connection")
+            return False
+        await session.commit()
+        await session.execute(select(User).where(User.id == USER_ID))
+        if engine.pool.checkedout():
+            print("❌ Write connection still held after commit")
+            return False
+
+    response = await client.post(
+        "/api/v1/users/change-password",
+        headers=bearer(PASSWORD_USER_ID),
+        json={"current_password": "old-password", "new_password": "new-password",
+              "confirm_password": "new-password"}
+    )
+    async with ReadSessionLocal() as read:
+        hashed = (await read.get(User, PASSWORD_USER_ID)).hashed_password
+    if response.status_code != 200 or not verify_password("new-password", hashed):
+        print(f"❌ Password change returned {response.status_code} and was not saved")
+        return False
+
+    print("✅ Reads never wait for the writer; writes hold it until commit")
+    return True
+
+
+def test_revoke_same_second() -> bool:
+    """Test that revocation catches earlier tokens from the same second but not later ones"""
+    print("🔍 Testing token revocation...")
+
+    for user_id in range(1000, 1100):
+        before = create_access_token(user_id)
+        decode_token(before)  # cached claims must not bypass the revocation
+        revoke_user_tokens(user_id)
+        after = create_access_token(user_id)
+        try:
+            decode_token(before)
+            print(f"❌ Token issued just before the revocation survived: iat={decode_token(before)['iat']}")
+            return False
+        except JWTError:
+            pass
+        if decode_token(after)["sub"] != str(user_id):
+            print("❌ Token issued after the revocation was rejected")
+            return False
+
+    print("✅ Revocation covers every earlier token")
+    return True
+
+
+async def run_tests():
+    from main import app
+
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), [
+            {"id": USER_ID, "email": "candidate@example.com", "hashed_password": "x", "user_type": "candidate",
+             "is_active": True, "is_verified": True},
+            {"id": PASSWORD_USER_ID, "email": "recruiter@example.com",
+             "hashed_password": get_password_hash("old-password"), "user_type": "recruiter",
+             "is_active": True, "is_verified": True}
+        ])
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return [
+            await test_invalidate_on_commit(),
+            test_bounded_versions(),
+            await test_reads_while_writer_busy(client),
+            test_revoke_same_second(),
+        ]
+
+
+def main():
+    """Run all authentication cache tests"""
+    print("🚀 Authentication cache tests")
+    print("=" * 50)
+
+    results = asyncio.run(run_tests())
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All authentication cache tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} authentication cache test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
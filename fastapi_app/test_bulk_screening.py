@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Bulk Screening Test Script
+
+Screens a job with 1,000 applicants through the API and background task
+system against a local mock OpenAI-compatible server, and checks that:
+only the best local matches reach the LLM, several candidates are packed
+into each prompt within the token budget, progress is reported while the
+task runs, ratings and candidate rankings are written back, and only
+the job's company can read the task.
+
+Runs in-process with a temporary database; no server or API key needed.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ScreeningLLMServer:
+    """OpenAI-compatible server answering batch screening prompts"""
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.requests = 0
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                refs = re.findall(r"^\s*\[(C\d+)\]$", prompt, re.MULTILINE)
+                with server._lock:
+                    server.requests += 1
+                    server.batch_sizes.append(len(refs))
+                time.sleep(server.latency)
+
+                results = [
+                    {
+                        "ref": ref,
+                        "screening_score": 60 + index * 3,
+                        "recommendation": "interview",
+                        "strengths": ["Relevant stack"],
+                        "concerns": ["Limited leadership"]
+                    }
+                    for index, ref in enumerate(refs)
+                ]
+                data = json.dumps({
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps(results)}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 50 * len(refs), "total_tokens": 0}
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.batch_sizes = []
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+llm = ScreeningLLMServer()
+work_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = "test-key"
+os.environ["OPENAI_BASE_URL"] = llm.url
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["LLM_CACHE_PATH"] = os.path.join(work_dir.name, "llm_responses.db")
+os.environ["LLM_TOKENS_PER_MINUTE"] = "100000000"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'screening.db')}"
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.core.security import create_access_token
+from app.models.application import Application
+from app.models.company import Company
+from app.models.job import Job
+from app.models.talent_pool import CandidateRanking
+from app.models.user import CandidateProfile, RecruiterProfile, User
+from app.services.openai_service import openai_service
+from app.utils.background_tasks import task_manager
+
+APPLICANTS = 1000
+WITHDRAWN = 20
+JOB_SKILLS = ["Python", "FastAPI", "PostgreSQL", "Docker", "AWS"]
+OTHER_SKILLS = ["Java", "React", "Go", "Kubernetes", "Terraform", "Redis", "Spark", "Swift", "Kotlin"]
+
+
+async def seed() -> dict:
+    """Create two companies with a recruiter each, one job and its applicants"""
+    rng = random.Random(11)
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.execute(insert(Company), [
+            {"id": 1, "name": "Acme", "slug": "acme"},
+            {"id": 2, "name": "Other", "slug": "other"}
+        ])
+        await conn.execute(insert(User), [
+            {"id": 1, "email": "recruiter@acme.test", "hashed_password": "x", "user_type": "recruiter",
+             "is_active": True, "is_verified": True},
+            {"id": 2, "email": "recruiter@other.test", "hashed_password": "x", "user_type": "recruiter",
+             "is_active": True, "is_verified": True}
+        ] + [
+            {"id": 100 + i, "email": f"candidate{i}@example.test", "hashed_password": "x",
+             "user_type": "candidate", "is_active": True, "is_verified": True}
+            for i in range(APPLICANTS + WITHDRAWN)
+        ])
+        await conn.execute(insert(RecruiterProfile), [
+            {"id": 1, "user_id": 1, "company_id": 1},
+            {"id": 2, "user_id": 2, "company_id": 2}
+        ])
+        await conn.execute(insert(Job), [{
+            "id": 1, "company_id": 1, "recruiter_id": 1, "title": "Backend Engineer", "slug": "backend-engineer",
+            "description": "Build our APIs.", "requirements": JOB_SKILLS, "min_experience_years": 3,
+            "status": "active"
+        }])
+        await conn.execute(insert(CandidateProfile), [
+            {
+                "id": i + 1, "user_id": 100 + i, "current_title": "Software Engineer",
+                "summary": "Engineer who enjoys building reliable services. " * rng.randint(1, 6),
+                "experience_years": rng.randint(0, 12),
+                "skills": rng.sample(JOB_SKILLS, rng.randint(0, 5)) + rng.sample(OTHER_SKILLS, rng.randint(1, 4)),
+                "location": "Remote"
+            }
+            for i in range(APPLICANTS + WITHDRAWN)
+        ])
+        await conn.execute(insert(Application), [
+            {
+                "id": i + 1, "job_id": 1, "candidate_id": i + 1,
+                "status": "withdrawn" if i >= APPLICANTS else "submitted",
+                "cover_letter": "I would love to join your team." if i % 2 else None
+            }
+            for i in range(APPLICANTS + WITHDRAWN)
+        ])
+
+    return {"acme": create_access_token(1), "other": create_access_token(2)}
+
+
+async def run_screening(client: httpx.AsyncClient, token: str):
+    """Start a screening and poll it to completion, returning the final status and progress seen"""
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post("/api/v1/ai-enhanced/screen-job-applicants/1", headers=headers)
+    if response.status_code != 200:
+        return response.status_code, None, []
+
+    task_id = response.json()["task_id"]
+    snapshots = []
+    while True:
+        status = (await client.get(f"/api/v1/ai-enhanced/screen-job-applicants/tasks/{task_id}", headers=headers)).json()
+        if status["progress"]:
+            snapshots.append(status["progress"])
+        if status["status"] in ("completed", "failed"):
+            return 200, status, snapshots
+        await asyncio.sleep(0.05)
+
+
+async def test_screening(client: httpx.AsyncClient, tokens: dict) -> bool:
+    """Test LLM call reduction, prompt packing, progress and write-back"""
+    print(f"🔍 Testing screening of {APPLICANTS} applicants...")
+
+    llm.reset()
+    started = time.perf_counter()
+    status_code, status, snapshots = await run_screening(client, tokens["acme"])
+    elapsed = time.perf_counter() - started
+    if status_code != 200 or status["status"] != "completed":
+        print(f"❌ Screening failed: {status_code} {status}")
+        return False
+
+    result = status["result"]
+    shortlisted = min(settings.BULK_SCREENING_MAX_LLM_CANDIDATES, math.ceil(APPLICANTS * settings.BULK_SCREENING_LLM_SHARE))
+    print(f"   {result['applicants']} applicants, {result['shortlisted']} shortlisted, "
+          f"{result['screened']} screened in {llm.requests} LLM calls ({elapsed:.1f}s)")
+    print(f"   Candidates per prompt: {llm.batch_sizes}")
+
+    if result["applicants"] != APPLICANTS or result["shortlisted"] != shortlisted or result["screened"] != shortlisted:
+        print(f"❌ Unexpected result: {result}")
+        return False
+    if llm.requests != math.ceil(shortlisted / settings.BULK_SCREENING_BATCH_SIZE) or llm.requests > APPLICANTS * 0.02:
+        print(f"❌ Expected packed prompts, got {llm.requests} LLM calls")
+        return False
+    if max(llm.batch_sizes) > settings.BULK_SCREENING_BATCH_SIZE or sum(llm.batch_sizes) != shortlisted:
+        print("❌ Prompts were packed beyond the batch size or lost candidates")
+        return False
+
+    stages = [snapshot["stage"] for snapshot in snapshots]
+    done = [snapshot["batches_done"] for snapshot in snapshots if snapshot["stage"] == "screening"]
+    if "screening" not in stages or done != sorted(done) or len(set(done)) < 3:
+        print(f"❌ Progress was not reported during screening: {done}")
+        return False
+
+    async with AsyncSessionLocal() as session:
+        rated = (await session.execute(
+            select(func.count()).select_from(Application).where(Application.internal_rating.is_not(None))
+        )).scalar()
+        rankings = (await session.execute(
+            select(CandidateRanking.rank, CandidateRanking.skill_match_score, CandidateRanking.experience_score,
+                   CandidateRanking.recommendations, CandidateRanking.candidate_id)
+            .where(CandidateRanking.job_id == 1).order_by(CandidateRanking.rank)
+        )).all()
+
+    if rated != shortlisted:
+        print(f"❌ {rated} internal ratings written, expected {shortlisted}")
+        return False
+    if [row.rank for row in rankings] != list(range(1, APPLICANTS + 1)):
+        print(f"❌ Rankings are not a complete 1..{APPLICANTS} ordering")
+        return False
+    if any(row.candidate_id > APPLICANTS for row in rankings):
+        print("❌ Withdrawn applications were ranked")
+        return False
+
+    screened, rest = rankings[:shortlisted], rankings[shortlisted:]
+    local = lambda row: row.skill_match_score * row.experience_score
+    if not all(row.recommendations == ["interview"] for row in screened) or any(row.recommendations for row in rest):
+        print("❌ Screened applicants do not lead the rankings")
+        return False
+    if min(map(local, screened)) < max(map(local, rest)):
+        print("❌ Shortlist is not the best local matches")
+        return False
+
+    print(f"✅ {APPLICANTS} applicants screened with {llm.requests} LLM calls instead of {APPLICANTS}")
+    return True
+
+
+async def test_rescreening(client: httpx.AsyncClient, tokens: dict) -> bool:
+    """Test that screening again replaces the job's rankings"""
+    print("🔍 Testing rescreening...")
+
+    status_code, status, _ = await run_screening(client, tokens["acme"])
+    async with AsyncSessionLocal() as session:
+        count = (await session.execute(
+            select(func.count()).select_from(CandidateRanking).where(CandidateRanking.job_id == 1)
+        )).scalar()
+
+    if status_code != 200 or status["status"] != "completed" or count != APPLICANTS:
+        print(f"❌ Rescreening left {count} rankings")
+        return False
+
+    print("✅ Rankings replaced, not duplicated")
+    return True
+
+
+async def test_permissions(client: httpx.AsyncClient, tokens: dict) -> bool:
+    """Test that recruiters cannot screen other companies' jobs or read their tasks"""
+    print("🔍 Testing screening permissions...")
+
+    llm.reset()
+    status_code, _, _ = await run_screening(client, tokens["other"])
+    missing = await client.post(
+        "/api/v1/ai-enhanced/screen-job-applicants/999", headers={"Authorization": f"Bearer {tokens['acme']}"}
+    )
+    if status_code != 403 or missing.status_code != 404 or llm.requests:
+        print(f"❌ Other company got {status_code}, missing job got {missing.status_code}")
+        return False
+
+    task_id = (await client.post(
+        "/api/v1/ai-enhanced/screen-job-applicants/1", headers={"Authorization": f"Bearer {tokens['acme']}"}
+    )).json()["task_id"]
+    statuses = {
+        name: (await client.get(
+            f"/api/v1/ai-enhanced/screen-job-applicants/tasks/{task_id}", headers={"Authorization": f"Bearer {tokens[name]}"}
+        )).status_code
+        for name in ("acme", "other")
+    }
+    if statuses != {"acme": 200, "other": 403}:
+        print(f"❌ Task status codes by company: {statuses}")
+        return False
+
+    print("✅ Other companies' recruiters are refused")
+    return True
+
+
+async def test_without_client(client: httpx.AsyncClient, tokens: dict) -> bool:
+    """Test that screening without an LLM client reports no LLM calls"""
+    print("🔍 Testing screening without an LLM client...")
+
+    llm_client, openai_service.client = openai_service.client, None
+    try:
+        status_code, status, _ = await run_screening(client, tokens["acme"])
+    finally:
+        openai_service.client = llm_client
+
+    result = status["result"] if status else {}
+    if status_code != 200 or (result.get("shortlisted"), result.get("screened"), result.get("llm_calls")) != (0, 0, 0):
+        print(f"❌ Screening without a client reported {result}")
+        return False
+
+    print("✅ No LLM calls reported when there is no client")
+    return True
+
+
+async def run_tests():
+    from main import app
+
+    tokens = await seed()
+    await task_manager.start_workers(num_workers=2)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            return [
+                await test_screening(client, tokens),
+                await test_rescreening(client, tokens),
+                await test_permissions(client, tokens),
+                await test_without_client(client, tokens),
+            ]
+    finally:
+        await task_manager.stop_workers()
+
+
+def main():
+    """Run all bulk screening tests"""
+    print("🚀 Bulk screening tests")
+    print("=" * 50)
+
+    try:
+        results = asyncio.run(run_tests())
+    finally:
+        llm.stop()
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All bulk screening tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} bulk screening test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+File Catalog Test Script
+
+Checks that uploads and deletes keep the file catalog and per-user storage
+totals in step with the upload directory, that listing, storage usage and
+cleanup through the API read the catalog, that existing files can be
+backfilled into it, and how listing 10,000 files compares with walking
+the upload tree. The API calls go through the single SQLite write
+connection, so a service that opened its own write session inside a
+request would time out here.
+
+Runs in-process in a temporary directory with a temporary database; no
+server or API key needed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+work_dir = tempfile.TemporaryDirectory()
+os.chdir(work_dir.name)
+os.makedirs("logs", exist_ok=True)
+
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'files.db')}"
+os.environ["DATABASE_POOL_TIMEOUT"] = "5"
+
+import httpx
+from sqlalchemy import insert, update
+
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.core.security import create_access_token
+from app.models.file import StorageUsage, StoredFile
+from app.models.user import User
+from app.utils.file_handler import file_handler
+
+USER_ID = 1
+OTHER_USER_ID = 2
+
+
+def walk_usage(user_id: int) -> tuple:
+    """Files and bytes of a user found by walking the upload tree, thumbnails excluded"""
+    files, size = 0, 0
+    for file_type in ("image", "document", "video"):
+        for path in (file_handler.upload_dir / file_type / str(user_id)).rglob("*"):
+            if path.is_file() and not path.name.startswith("thumb_"):
+                files += 1
+                size += path.stat().st_size
+    return files, size
+
+
+async def upload(client: httpx.AsyncClient, headers: dict, name: str, content: bytes, subfolder: str = None) -> dict:
+    """Upload a text document through the API"""
+    data = {"file_type": "document"}
+    if subfolder:
+        data["subfolder"] = subfolder
+    response = await client.post(
+        "/api/v1/files/upload", headers=headers, data=data, files={"file": (name, content, "text/plain")}
+    )
+    response.raise_for_status()
+    return response.json()["file_info"]
+
+
+async def test_catalog_api(client: httpx.AsyncClient) -> bool:
+    """Test listing, storage usage, delete and cleanup through the API"""
+    print("🔍 Testing file catalog through the API...")
+
+    headers = {"Authorization": f"Bearer {create_access_token(USER_ID)}"}
+    other_headers = {"Authorization": f"Bearer {create_access_token(OTHER_USER_ID)}"}
+
+    uploaded = []
+    for i in range(6):
+        uploaded.append(await upload(
+            client, headers, f"notes-{i}.txt", f"notes {i} ".encode() * (i + 1),
+            subfolder="resumes/2026" if i % 2 else None
+        ))
+    await upload(client, other_headers, "other.txt", b"someone else's file")
+    if any("file_id" not in info for info in uploaded):
+        print("❌ Upload response is missing the catalog id")
+        return False
+
+    listing = (await client.get("/api/v1/files/list", headers=headers)).json()
+    if listing["total_files"] != 6 or [f["file_id"] for f in listing["files"]] != [f["file_id"] for f in reversed(uploaded)]:
+        print(f"❌ Listed {listing['total_files']} files, expected the 6 uploads newest first")
+        return False
+    page = (await client.get("/api/v1/files/list", headers=headers, params={"limit": 2, "offset": 1})).json()
+    if page["total_files"] != 6 or [f["file_id"] for f in page["files"]] != [uploaded[4]["file_id"], uploaded[3]["file_id"]]:
+        print("❌ Paging returned the wrong files")
+        return False
+    nested = (await client.get("/api/v1/files/list", headers=headers, params={"subfolder": "resumes"})).json()
+    if nested["total_files"] != 3:
+        print(f"❌ Subfolder filter found {nested['total_files']} files, expected 3")
+        return False
+
+    usage = (await client.get("/api/v1/files/storage-usage", headers=headers)).json()
+    if (usage["total_files"], usage["total_size_bytes"]) != walk_usage(USER_ID) or usage["file_types"]["document"] != 6:
+        print(f"❌ Storage usage {usage['total_files']} files, {usage['total_size_bytes']} bytes; "
+              f"the upload tree has {walk_usage(USER_ID)}")
+        return False
+
+    deleted = uploaded.pop(0)
+    response = await client.delete("/api/v1/files/delete", headers=headers, params={"file_path": deleted["file_path"]})
+    if response.status_code != 200 or Path(deleted["file_path"]).exists():
+        print(f"❌ Delete failed: {response.status_code} {response.text}")
+        return False
+    usage = (await client.get("/api/v1/files/storage-usage", headers=headers)).json()
+    if (usage["total_files"], usage["total_size_bytes"]) != walk_usage(USER_ID):
+        print("❌ Storage usage not reduced by the deleted file")
+        return False
+
+    # Age two of the user's files and the other user's file past the cutoff
+    aged = [uploaded[0], uploaded[1]]
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(StoredFile)
+            .where(StoredFile.id.in_([info["file_id"] for info in aged]) | (StoredFile.owner_id == OTHER_USER_ID))
+            .values(created_at=datetime.utcnow() - timedelta(days=40))
+        )
+        await session.commit()
+
+    result = (await client.post("/api/v1/files/cleanup", headers=headers, data={"days_old": 30})).json()
+    if result["deleted_files"] != 2 or result["deleted_size_bytes"] != sum(info["file_size"] for info in aged):
+        print(f"❌ Cleanup deleted {result['deleted_files']} files, expected 2")
+        return False
+    if any(Path(info["file_path"]).exists() for info in aged) or walk_usage(OTHER_USER_ID)[0] != 1:
+        print("❌ Cleanup removed the wrong files from disk")
+        return False
+    usage = (await client.get("/api/v1/files/storage-usage", headers=headers)).json()
+    listing = (await client.get("/api/v1/files/list", headers=headers)).json()
+    if (usage["total_files"], usage["total_size_bytes"]) != walk_usage(USER_ID) or listing["total_files"] != 3:
+        print("❌ Catalog and storage usage out of step with the upload tree after cleanup")
+        return False
+
+    print("✅ Catalog and storage usage follow uploads, deletes and cleanup")
+    return True
+
+
+async def test_backfill() -> bool:
+    """Test cataloguing files written before the catalog existed"""
+    print("🔍 Testing catalog backfill...")
+
+    before = walk_usage(USER_ID)
+    legacy_dir = file_handler.upload_dir / "image" / str(USER_ID) / "avatars"
+    legacy_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(5):
+        (legacy_dir / f"legacy-{i}.png").write_bytes(b"\x89PNG" + bytes(100 * i))
+        (legacy_dir / f"thumb_legacy-{i}.png").write_bytes(b"\x89PNG")
+
+    added = await file_handler.catalog_existing_files()
+    again = await file_handler.catalog_existing_files()
+    usage = await file_handler.get_storage_usage(USER_ID)
+    files, total = await file_handler.list_files(USER_ID, file_type="image", subfolder="avatars")
+
+    if added != 5 or again != 0:
+        print(f"❌ Backfill added {added} then {again} files, expected 5 then 0")
+        return False
+    if (usage["total_files"], usage["total_bytes"]) != walk_usage(USER_ID) or walk_usage(USER_ID)[0] != before[0] + 5:
+        print(f"❌ Storage usage after backfill {usage}, upload tree has {walk_usage(USER_ID)}")
+        return False
+    if total != 5 or not all(f["subfolder"] == "avatars" for f in files):
+        print(f"❌ Backfilled files listed as {[(f['filename'], f['subfolder']) for f in files]}")
+        return False
+
+    print("✅ Existing files catalogued once with their owner, subfolder and sizes")
+    return True
+
+
+async def test_listing_speed() -> bool:
+    """Compare catalog queries with walking the upload tree for 10,000 files"""
+    print("🔍 Testing listing 10,000 files...")
+
+    user_id = 3
+    count = 10_000
+    file_dir = file_handler.upload_dir / "document" / str(user_id)
+    file_dir.mkdir(parents=True)
+    created = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        path = file_dir / f"{i:05d}.txt"
+        path.write_bytes(b"x" * (i % 100 + 1))
+        rows.append({
+            "owner_id": user_id, "file_type": "document", "file_path": str(path), "original_filename": path.name,
+            "file_size": i % 100 + 1, "mime_type": "text/plain", "created_at": created - timedelta(seconds=i)
+        })
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), [{"id": user_id, "email": "bulk@example.test", "hashed_password": "x",
+                                           "user_type": "candidate", "is_active": True, "is_verified": True}])
+        await conn.execute(insert(StoredFile), rows)
+        await conn.execute(insert(StorageUsage), [{"owner_id": user_id, "file_type": "document", "file_count": count,
+                                                   "total_bytes": sum(row["file_size"] for row in rows)}])
+
+    started = time.perf_counter()
+    walked = sorted(
+        (path.stat().st_mtime, path) for path in file_dir.rglob("*") if path.is_file()
+    )[-1000:]
+    walk_size = walk_usage(user_id)
+    walk_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    files, total = await file_handler.list_files(user_id, limit=1000)
+    usage = await file_handler.get_storage_usage(user_id)
+    catalog_time = time.perf_counter() - started
+
+    print(f"   Walking the upload tree: {walk_time * 1000:.0f}ms; catalog queries: {catalog_time * 1000:.0f}ms")
+    if total != count or len(files) != 1000 or len(walked) != 1000 or files[0]["filename"] != "00000.txt":
+        print(f"❌ Listed {len(files)} of {total} files")
+        return False
+    if (usage["total_files"], usage["total_bytes"]) != walk_size:
+        print(f"❌ Storage usage {usage} differs from the upload tree {walk_size}")
+        return False
+    if catalog_time >= walk_time:
+        print("❌ Catalog queries are not faster than walking the upload tree")
+        return False
+
+    print("✅ Catalog listing and storage usage beat walking the upload tree")
+    return True
+
+
+async def run_tests():
+    from main import app
+
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), [
+            {"id": USER_ID, "email": "candidate@example.test", "hashed_password": "x", "user_type": "candidate",
+             "is_active": True, "is_verified": True},
+            {"id": OTHER_USER_ID, "email": "other@example.test", "hashed_password": "x", "user_type": "candidate",
+             "is_active": True, "is_verified": True}
+        ])
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        return [
+            await test_catalog_api(client),
+            await test_backfill(),
+            await test_listing_speed(),
+        ]
+
+
+def main():
+    """Run all file catalog tests"""
+    print("🚀 File catalog tests")
+    print("=" * 50)
+
+    results = asyncio.run(run_tests())
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All file catalog tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} file catalog test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
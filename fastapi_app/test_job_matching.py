@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Job Matching Test Script
+
+Checks the job matching engine's two-phase API: numeric scores for
+ranking many candidate/job pairs without building any explanation text,
+and explanations built only for the matches that are returned.
+
+No server, database or API key needed.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from job_matching_engine import JobMatchingEngine
+
+from app.utils.skill_taxonomy import skill_taxonomy
+
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Remote"]
+
+
+def make_pool(seed: int, candidates: int, jobs: int):
+    """Random candidates and jobs over the taxonomy's skills"""
+    rng = random.Random(seed)
+    names = skill_taxonomy.names[:skill_taxonomy.canonical_count]
+    candidate_pool = [
+        {
+            "skills": rng.sample(names, rng.randint(5, 20)),
+            "total_experience_years": rng.randint(0, 12),
+            "location": rng.choice(LOCATIONS),
+            "education": [{"degree": "Bachelor of Science"}] if rng.random() < 0.6 else [],
+            "preferences": {"job_types": ["full-time"], "min_salary": rng.randint(60, 150) * 1000}
+        }
+        for _ in range(candidates)
+    ]
+    job_pool = [
+        {
+            "required_skills": rng.sample(names, 5),
+            "preferred_skills": rng.sample(names, 3),
+            "min_experience": rng.randint(0, 6),
+            "max_experience": rng.choice([None, 10]),
+            "location": rng.choice(LOCATIONS),
+            "remote_ok": rng.random() < 0.3,
+            "salary_min": 90000,
+            "salary_max": 140000,
+            "job_type": "full-time",
+            "status": "active"
+        }
+        for _ in range(jobs)
+    ]
+    return candidate_pool, job_pool
+
+
+def test_score_only_path() -> bool:
+    """Test that scores and explanations add up to the comprehensive match"""
+    print("🔍 Testing score-only path...")
+
+    engine = JobMatchingEngine()
+    candidates, jobs = make_pool(1, 200, 10)
+    for candidate in candidates:
+        for job in jobs:
+            scores = engine.calculate_match_scores(candidate, job)
+            if set(scores) != {"overall_score", "skill_score", "experience_score", "location_score",
+                               "education_score", "preference_score"}:
+                print(f"❌ Score-only result has extra fields: {sorted(scores)}")
+                return False
+
+            full = engine.calculate_comprehensive_match(candidate, job)
+            rounded = {name: round(score, 2) for name, score in scores.items()}
+            if {name: full[name] for name in rounded} != rounded:
+                print("❌ Comprehensive match scores differ from the score-only path")
+                return False
+            if engine.explain_match(candidate, job, scores) != {name: full[name] for name in full if name not in rounded}:
+                print("❌ Explanation differs from the comprehensive match")
+                return False
+            if engine.calculate_comprehensive_match(candidate, job, scores) != full:
+                print("❌ Comprehensive match from known scores differs")
+                return False
+
+    print("✅ Scores and explanations match calculate_comprehensive_match")
+    return True
+
+
+def test_explanations_for_top_only() -> bool:
+    """Test that ranking explains only the matches it returns"""
+    print("🔍 Testing explanations for the top matches only...")
+
+    engine = JobMatchingEngine()
+    candidates, jobs = make_pool(2, 5000, 1)
+    job = jobs[0]
+
+    started = time.perf_counter()
+    expected = sorted(
+        ((candidate, engine.calculate_comprehensive_match(candidate, job)) for candidate in candidates),
+        key=lambda match: match[1]["overall_score"], reverse=True
+    )[:20]
+    explained_all = time.perf_counter() - started
+
+    explained = []
+    explain_match = engine.explain_match
+    engine.explain_match = lambda candidate, job_data, scores=None: explained.append(candidate) or explain_match(candidate, job_data, scores)
+
+    started = time.perf_counter()
+    top = engine.find_best_candidates_for_job(job, candidates, top_n=20)
+    ranked = time.perf_counter() - started
+    engine.explain_match = explain_match
+
+    print(f"   Ranked {len(candidates)} candidates in {ranked * 1000:.0f}ms, "
+          f"{explained_all * 1000:.0f}ms when every pair is explained")
+    if len(explained) != 20:
+        print(f"❌ {len(explained)} matches explained, expected 20")
+        return False
+    if [match[1]["overall_score"] for match in top] != [match[1]["overall_score"] for match in expected]:
+        print("❌ Top matches differ from a full ranking")
+        return False
+    if not all("fit_analysis" in match and "match_reasons" in match for _, match in top):
+        print("❌ Returned matches are missing their explanation")
+        return False
+
+    print("✅ Only the returned matches are explained")
+    return True
+
+
+def main():
+    """Run all job matching tests"""
+    print("🚀 Job matching tests")
+    print("=" * 50)
+
+    results = [
+        test_score_only_path(),
+        test_explanations_for_top_only(),
+    ]
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All job matching tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} job matching test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache Test Script
+
+Runs OpenAIService against a stub OpenAI-compatible server and checks the
+response cache: repeated prompts must be answered from the cache (the stub
+counts the requests that reach it, giving the hit rate), hits must return
+in milliseconds, and TTL expiry, LRU eviction and the opt-in
+near-duplicate resume lookup must behave. Pruning must run once per
+interval on an indexed column, not on every store, and responses that
+are not the JSON the caller expects must not be cached.
+
+Runs in-process with a temporary cache file; no server or API key needed.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubLLMServer:
+    """Minimal OpenAI-compatible chat completions server that counts requests"""
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests += 1
+                time.sleep(server.latency)
+
+                prompt = body["messages"][-1]["content"]
+                digest = hashlib.sha256(prompt.encode()).hexdigest()[:12]
+                content = json.dumps({"overall_score": 80, "digest": digest})
+                if "PLAIN TEXT" in prompt:
+                    content = "I'm sorry, I can't analyze this resume right now."
+                payload = {
+                    "id": f"chatcmpl-{digest}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 20, "total_tokens": len(prompt) // 4 + 20}
+                }
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+stub = StubLLMServer()
+cache_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = "test-key"
+os.environ["OPENAI_BASE_URL"] = stub.url
+os.environ["LLM_CACHE_PATH"] = os.path.join(cache_dir.name, "llm_responses.db")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from app.core.config import settings
+from app.services.llm_cache import LLMResponseCache, llm_cache
+from app.services.openai_service import openai_service
+
+RESUMES = [
+    f"Candidate {i}\nSenior engineer with {i + 3} years of Python, FastAPI and PostgreSQL.\n"
+    f"Led a team of {i + 2} building data pipelines on AWS. Skills: Docker, Kubernetes, React."
+    for i in range(5)
+]
+JOBS = [f"Backend engineer role {j}: Python, SQL and cloud experience required." for j in range(3)]
+
+
+async def test_repeated_analyses_hit_cache() -> bool:
+    """Test that re-analyzing the same resume and job pair is served from the cache"""
+    print("🔍 Testing cache hit rate against the stub server...")
+
+    recruiters = 4
+    miss_latencies, hit_latencies = [], []
+
+    for _ in range(recruiters):
+        for resume in RESUMES:
+            for job in JOBS:
+                before = stub.requests
+                started = time.perf_counter()
+                analysis = await openai_service.analyze_resume_advanced(resume, job)
+                elapsed = time.perf_counter() - started
+                (miss_latencies if stub.requests > before else hit_latencies).append(elapsed)
+                if analysis.get("overall_score") != 80:
+                    print(f"❌ Unexpected analysis: {analysis}")
+                    return False
+
+    unique = len(RESUMES) * len(JOBS)
+    calls = unique * recruiters
+    stats = llm_cache.stats()
+    print(f"   Calls: {calls}, reached stub: {stub.requests}, hit rate: {stats['hit_rate']:.0%}")
+    print(f"   Miss median: {statistics.median(miss_latencies) * 1000:.1f}ms, "
+          f"hit median: {statistics.median(hit_latencies) * 1000:.2f}ms")
+
+    if stub.requests != unique:
+        print(f"❌ Expected {unique} stub requests, got {stub.requests}")
+        return False
+    if statistics.median(hit_latencies) > 0.01:
+        print("❌ Cache hits are not answered in milliseconds")
+        return False
+
+    print("✅ Repeated analyses served from cache")
+    return True
+
+
+async def test_prompt_normalization() -> bool:
+    """Test that layout differences in a prompt map to the same entry"""
+    print("🔍 Testing prompt normalization...")
+
+    before = stub.requests
+    reformatted = RESUMES[0].replace("\n", "\n\n    ").replace(" ", "  ")
+    await openai_service.analyze_resume_advanced(reformatted, JOBS[0])
+
+    if stub.requests != before:
+        print("❌ Whitespace-only change missed the cache")
+        return False
+
+    await openai_service.generate_job_description("Data Engineer", {"name": "Acme"}, ["Python", "SQL"])
+    await openai_service.generate_job_description("Data Engineer", {"name": "Acme"}, ["Python", "SQL"])
+    if stub.requests != before + 1:
+        print("❌ Repeated job description generation was not cached")
+        return False
+
+    print("✅ Prompts normalized before hashing")
+    return True
+
+
+async def test_ttl_and_lru() -> bool:
+    """Test expiry and least recently used eviction"""
+    print("🔍 Testing TTL and LRU eviction...")
+
+    path = os.path.join(cache_dir.name, "bounded.db")
+    cache = LLMResponseCache(path, ttl=3600, max_entries=3, prune_interval=0)
+    keys = [cache.make_key("model", [{"role": "user", "content": f"prompt {i}"}], 0.5) for i in range(5)]
+
+    for key in keys[:3]:
+        await cache.set(key, "model", 0.5, f"response {key[:6]}")
+    await cache.get(keys[0])  # Refresh the oldest entry
+    for key in keys[3:]:
+        await cache.set(key, "model", 0.5, f"response {key[:6]}")
+
+    present = [await cache.get(key) is not None for key in keys]
+    if present != [True, False, False, True, True]:
+        print(f"❌ Unexpected entries after eviction: {present}")
+        return False
+
+    cache.ttl = 0.05
+    await asyncio.sleep(0.1)
+    if await cache.get(keys[4]) is not None:
+        print("❌ Expired entry was returned")
+        return False
+
+    print("✅ Entries expire and the least recently used are evicted")
+    return True
+
+
+async def test_prune_interval() -> bool:
+    """Test that a burst of stores prunes once, using the created_at index"""
+    print("🔍 Testing prune interval...")
+
+    cache = LLMResponseCache(os.path.join(cache_dir.name, "pruned.db"), ttl=3600, max_entries=50)
+    keys = [cache.make_key("model", [{"role": "user", "content": f"burst {i}"}], 0.5) for i in range(200)]
+    await cache.set(keys[0], "model", 0.5, "first")
+
+    statements = []
+    cache._connect().set_trace_callback(statements.append)
+    for key in keys[1:]:
+        await cache.set(key, "model", 0.5, "response")
+    cache._connect().set_trace_callback(None)
+    deletes = [statement for statement in statements if statement.startswith("DELETE")]
+    plan = cache._execute("EXPLAIN QUERY PLAN DELETE FROM llm_responses WHERE created_at < ?", (0,))
+    count = cache._execute("SELECT COUNT(*) FROM llm_responses")[0][0]
+
+    if deletes or count != 200:
+        print(f"❌ {len(deletes)} DELETE statements over 199 stores; {count} entries kept")
+        return False
+    if not any("ix_llm_responses_created_at" in row[-1] for row in plan):
+        print(f"❌ Expiry does not use the created_at index: {plan}")
+        return False
+
+    cache._next_prune = 0.0
+    await cache.set(keys[0], "model", 0.5, "again")
+    count = cache._execute("SELECT COUNT(*) FROM llm_responses")[0][0]
+    if count != 50:
+        print(f"❌ {count} entries after the next prune, expected 50")
+        return False
+
+    print("✅ Expiry and eviction run once per interval on an index")
+    return True
+
+
+async def test_unparseable_not_cached() -> bool:
+    """Test that a response that is not the expected JSON is not cached"""
+    print("🔍 Testing unparseable responses...")
+
+    before = stub.requests
+    for _ in range(2):
+        analysis = await openai_service.analyze_resume_advanced(f"PLAIN TEXT {RESUMES[1]}", JOBS[0])
+    if stub.requests != before + 2 or "analyzed_at" not in analysis:
+        print(f"❌ Stub reached {stub.requests - before} times for two unparseable analyses, expected 2")
+        return False
+
+    print("✅ Unparseable responses are retried rather than cached")
+    return True
+
+
+async def test_near_duplicate_resumes() -> bool:
+    """Test the opt-in near-duplicate lookup for temperature-0 analyses"""
+    print("🔍 Testing near-duplicate resume lookup...")
+
+    resume = (
+        "Jane Doe - Senior Software Engineer. Eight years building Python services with FastAPI, "
+        "Django and PostgreSQL. Designed event pipelines on AWS using Kafka and Lambda. Mentored "
+        "six engineers, led the migration to Kubernetes and cut infrastructure costs by thirty percent. "
+        "Education: BSc Computer Science, University of Example. Skills: Python, Go, SQL, Docker, "
+        "Terraform, React, TypeScript, GraphQL, Redis, Elasticsearch."
+    )
+    reformatted = resume.upper().replace(". ", ".\n• ").replace(", ", " , ")
+    different = RESUMES[3]
+
+    settings.OPENAI_RESUME_ANALYSIS_TEMPERATURE = 0.0
+    try:
+        llm_cache.near_duplicates = False
+        before = stub.requests
+        await openai_service.analyze_resume_advanced(resume, JOBS[1])
+        await openai_service.analyze_resume_advanced(reformatted, JOBS[1])
+        if stub.requests != before + 2:
+            print("❌ Near-duplicate lookup ran while disabled")
+            return False
+
+        llm_cache.near_duplicates = True
+        await llm_cache.clear()
+        before = stub.requests
+        await openai_service.analyze_resume_advanced(resume, JOBS[1])
+        await openai_service.analyze_resume_advanced(reformatted, JOBS[1])
+        near_hit = stub.requests == before + 1
+        await openai_service.analyze_resume_advanced(reformatted, JOBS[2])
+        other_job = stub.requests == before + 2
+        await openai_service.analyze_resume_advanced(different, JOBS[1])
+        other_resume = stub.requests == before + 3
+    finally:
+        llm_cache.near_duplicates = False
+        settings.OPENAI_RESUME_ANALYSIS_TEMPERATURE = 0.3
+
+    if not (near_hit and other_job and other_resume):
+        print(f"❌ near hit: {near_hit}, separate job: {other_job}, separate resume: {other_resume}")
+        return False
+
+    print(f"✅ Reformatted resume reused the analysis ({llm_cache.stats()['near_hits']} near hits)")
+    return True
+
+
+async def run_tests():
+    return [
+        await test_repeated_analyses_hit_cache(),
+        await test_prompt_normalization(),
+        await test_ttl_and_lru(),
+        await test_prune_interval(),
+        await test_unparseable_not_cached(),
+        await test_near_duplicate_resumes(),
+    ]
+
+
+def main():
+    """Run all LLM cache tests"""
+    print("🚀 LLM response cache tests")
+    print("=" * 50)
+
+    try:
+        results = asyncio.run(run_tests())
+    finally:
+        stub.stop()
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All LLM cache tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} LLM cache test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
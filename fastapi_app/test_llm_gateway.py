@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+LLM Gateway Test Script
+
+Runs OpenAIService against a local mock OpenAI-compatible server and
+checks the LLM gateway: concurrent calls stay within the global and
+per-tenant limits, identical in-flight prompts are coalesced into one
+request, 429 and 5xx responses are retried with backoff, client errors
+are not, and the token bucket paces requests.
+
+Runs in-process; no server or API key needed.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockOpenAIServer:
+    """OpenAI-compatible chat completions server with failure injection"""
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+        self.requests = 0
+        self.active = 0
+        self.peak = 0
+        self.failures = []  # (status, retry-after) answered before succeeding
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests += 1
+                    server.active += 1
+                    server.peak = max(server.peak, server.active)
+                    failure = server.failures.pop(0) if server.failures else None
+                try:
+                    time.sleep(server.latency)
+                    if failure:
+                        status, retry_after = failure
+                        self._reply(status, {"error": {"message": "injected failure", "type": "test"}}, retry_after)
+                        return
+                    content = json.dumps({"overall_score": 70, "recommendation": "interview"})
+                    self._reply(200, {
+                        "id": "chatcmpl-mock",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body["model"],
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+                    })
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _reply(self, status, payload, retry_after=None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if retry_after is not None:
+                    self.send_header("Retry-After", str(retry_after))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.request_queue_size = 256
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.active = self.peak = 0
+            self.failures = []
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+mock = MockOpenAIServer()
+cache_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = "test-key"
+os.environ["OPENAI_BASE_URL"] = mock.url
+os.environ["LLM_CACHE_PATH"] = os.path.join(cache_dir.name, "llm_responses.db")
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["LLM_MAX_CONCURRENCY"] = "6"
+os.environ["LLM_TENANT_MAX_CONCURRENCY"] = "4"
+os.environ["LLM_RETRY_BACKOFF"] = "0.05"
+os.environ["LLM_TOKENS_PER_MINUTE"] = "100000000"  # Pacing is tested on its own bucket
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from app.services.llm_gateway import TokenBucket, llm_gateway, set_llm_tenant
+from app.services.openai_service import openai_service
+
+JOB = "Backend engineer: Python, FastAPI, PostgreSQL, AWS."
+
+
+async def screen_as(tenant, index: int):
+    """Screen one synthetic applicant on behalf of a tenant"""
+    set_llm_tenant(tenant)
+    return await openai_service.screen_candidate_application(
+        JOB, {"resume_text": f"Applicant {index}: Python developer", "skills": ["Python"]}
+    )
+
+
+async def test_concurrency_limits() -> bool:
+    """Test that a screening burst stays within the tenant and global limits"""
+    print("🔍 Testing concurrency limits...")
+
+    mock.reset()
+    started = time.perf_counter()
+    results = await asyncio.gather(*(screen_as(("company", 1), i) for i in range(200)))
+    elapsed = time.perf_counter() - started
+    single_peak = mock.peak
+
+    fallbacks = sum(1 for result in results if result.get("fallback"))
+    print(f"   200 screenings for one company in {elapsed:.1f}s, peak concurrency {single_peak}")
+    if single_peak > 4 or fallbacks:
+        print(f"❌ Peak {single_peak} exceeds the tenant limit of 4 or {fallbacks} calls fell back")
+        return False
+
+    mock.reset()
+    await asyncio.gather(*(
+        screen_as(("company", 100 + i % 3), 1000 + i) for i in range(60)
+    ))
+    print(f"   60 screenings across three companies, peak concurrency {mock.peak}")
+    if mock.peak > 6 or mock.peak <= 4:
+        print(f"❌ Peak {mock.peak} should exceed one tenant's limit but stay within the global limit of 6")
+        return False
+
+    print("✅ Tenant and global limits hold")
+    return True
+
+
+async def test_single_flight() -> bool:
+    """Test that identical concurrent prompts share one request"""
+    print("🔍 Testing single-flight coalescing...")
+
+    mock.reset()
+    before = llm_gateway.stats()["coalesced"]
+    results = await asyncio.gather(*(
+        openai_service.analyze_resume_advanced("Python developer, 5 years", JOB) for _ in range(50)
+    ))
+    coalesced = llm_gateway.stats()["coalesced"] - before
+
+    print(f"   50 identical analyses, {mock.requests} request(s) sent, {coalesced} coalesced")
+    if mock.requests != 1 or coalesced != 49 or any(result.get("overall_score") != 70 for result in results):
+        print("❌ Identical prompts were not coalesced")
+        return False
+
+    print("✅ Identical in-flight prompts coalesced")
+    return True
+
+
+async def test_retries() -> bool:
+    """Test retries on 429 and 5xx and no retry on client errors"""
+    print("🔍 Testing retries...")
+
+    mock.reset()
+    mock.failures = [(429, "0.1"), (429, None), (503, None)]
+    before = llm_gateway.stats()["retries"]
+    result = await screen_as(("company", 2), 5000)
+    retries = llm_gateway.stats()["retries"] - before
+
+    if result.get("fallback") or mock.requests != 4 or retries != 3:
+        print(f"❌ Expected 3 retries then success, got {retries} retries and {mock.requests} requests")
+        return False
+
+    mock.reset()
+    mock.failures = [(400, None)]
+    result = await screen_as(("company", 2), 5001)
+    if not result.get("fallback") or mock.requests != 1:
+        print(f"❌ Client error was retried ({mock.requests} requests)")
+        return False
+
+    print("✅ Rate limits and server errors retried, client errors not")
+    return True
+
+
+async def test_token_bucket() -> bool:
+    """Test that an exhausted bucket paces acquisitions at its rate"""
+    print("🔍 Testing token bucket pacing...")
+
+    bucket = TokenBucket(per_minute=600)  # 10 per second after the initial burst
+    await bucket.acquire(600)
+    started = time.perf_counter()
+    await bucket.acquire(5)
+    elapsed = time.perf_counter() - started
+
+    if not 0.4 <= elapsed <= 0.8:
+        print(f"❌ Waited {elapsed:.2f}s for 5 tokens at 10/s")
+        return False
+
+    print(f"✅ Waited {elapsed:.2f}s for 5 tokens at 10/s")
+    return True
+
+
+async def run_tests():
+    return [
+        await test_concurrency_limits(),
+        await test_single_flight(),
+        await test_retries(),
+        await test_token_bucket(),
+    ]
+
+
+def main():
+    """Run all LLM gateway tests"""
+    print("🚀 LLM gateway tests")
+    print("=" * 50)
+
+    try:
+        results = asyncio.run(run_tests())
+    finally:
+        mock.stop()
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All LLM gateway tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} LLM gateway test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
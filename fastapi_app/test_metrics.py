@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Request Metrics Test Script
+
+Checks that sampled requests get a Server-Timing header with their
+database, external service and total time, that requests are recorded
+under their route template rather than the concrete path, that unsampled
+requests pass through untouched, and that /metrics is only served to
+allowlisted addresses and admins.
+
+Runs in-process with a temporary database; no server or API key needed.
+"""
+
+import asyncio
+import os
+import re
+import sys
+import tempfile
+
+work_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "true"
+os.environ["METRICS_SAMPLE_RATE"] = "1.0"
+os.environ["METRICS_ALLOWED_IPS"] = "127.0.0.1,::1,192.168.10.0/24"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'metrics.db')}"
+
+import httpx
+from sqlalchemy import insert
+
+from app.core.database import engine, init_db
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, metrics, track_external
+from app.core.security import create_access_token
+from app.models.user import User
+
+CANDIDATE_ID = 1
+ADMIN_ID = 2
+
+SERVER_TIMING = re.compile(r'^db;dur=[\d.]+;desc="(\d+) queries"(?:, \w+;dur=[\d.]+)*, total;dur=([\d.]+)$')
+
+
+def bearer(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+
+async def test_server_timing(client: httpx.AsyncClient) -> bool:
+    """Test the Server-Timing header and route-template labels of app requests"""
+    print("🔍 Testing Server-Timing and route labels...")
+
+    response = await client.get("/api/v1/files/storage-usage", headers=bearer(CANDIDATE_ID))
+    header = response.headers.get("server-timing", "")
+    match = SERVER_TIMING.match(header)
+    if response.status_code != 200 or match is None or int(match.group(1)) < 1:
+        print(f"❌ Response {response.status_code} with Server-Timing {header!r}")
+        return False
+
+    await client.get("/api/v1/jobs/98765")
+    rendered = metrics.render()
+    if '/api/v1/jobs/{job_id}"' not in rendered or "98765" in rendered:
+        print("❌ Request not recorded under its route template")
+        return False
+    queries = re.search(
+        r'http_request_db_queries_total\{method="GET",route="/api/v1/files/storage-usage"\} (\d+)', rendered
+    )
+    if queries is None or int(queries.group(1)) < 1:
+        print("❌ Database queries not counted for the route")
+        return False
+
+    print(f"✅ {header}")
+    return True
+
+
+async def test_external_and_sampling() -> bool:
+    """Test external call timing and that unsampled requests are not instrumented"""
+    print("🔍 Testing external timing and sampling...")
+
+    async def app(scope, receive, send):
+        async with track_external("openai"):
+            await asyncio.sleep(0.02)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    sampled = MetricsRegistry(sample_rate=1.0)
+    unsampled = MetricsRegistry(sample_rate=0.0)
+    headers = {}
+    for name, registry in (("sampled", sampled), ("unsampled", unsampled)):
+        transport = httpx.ASGITransport(app=MetricsMiddleware(app, registry=registry))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            headers[name] = (await client.get("/")).headers.get("server-timing")
+
+    openai = re.search(r"openai;dur=([\d.]+)", headers["sampled"] or "")
+    if openai is None or float(openai.group(1)) < 20:
+        print(f"❌ Sampled Server-Timing {headers['sampled']!r}")
+        return False
+    if headers["unsampled"] is not None or 'route="unmatched"' in unsampled.render():
+        print("❌ Unsampled request was instrumented")
+        return False
+    if 'external_call_duration_seconds_count{service="openai",outcome="success"}' not in metrics.render():
+        print("❌ External call not recorded")
+        return False
+
+    print(f"✅ {headers['sampled']}; unsampled request untouched")
+    return True
+
+
+async def test_metrics_access(app) -> bool:
+    """Test that /metrics is served to allowlisted addresses and admins only"""
+    print("🔍 Testing /metrics access...")
+
+    cases = [
+        ("loopback", "127.0.0.1", None, 200),
+        ("allowlisted network", "192.168.10.7", None, 200),
+        ("outside, no token", "203.0.113.9", None, 401),
+        ("outside, candidate", "203.0.113.9", CANDIDATE_ID, 403),
+        ("outside, admin", "203.0.113.9", ADMIN_ID, 200),
+    ]
+    for name, address, user_id, expected in cases:
+        transport = httpx.ASGITransport(app=app, client=(address, 40000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/metrics", headers=bearer(user_id) if user_id else {})
+        if response.status_code != expected:
+            print(f"❌ {name}: {response.status_code}, expected {expected}")
+            return False
+        if expected == 200 and "# TYPE http_requests_total counter" not in response.text:
+            print(f"❌ {name}: not a Prometheus exposition")
+            return False
+
+    print("✅ Loopback, allowlisted networks and admins only")
+    return True
+
+
+async def run_tests():
+    from main import app
+
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), [
+            {"id": CANDIDATE_ID, "email": "candidate@example.test", "hashed_password": "x",
+             "user_type": "candidate", "is_active": True, "is_verified": True},
+            {"id": ADMIN_ID, "email": "admin@example.test", "hashed_password": "x",
+             "user_type": "admin", "is_active": True, "is_verified": True}
+        ])
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return [
+            await test_server_timing(client),
+            await test_external_and_sampling(),
+            await test_metrics_access(app),
+        ]
+
+
+def main():
+    """Run all request metrics tests"""
+    print("🚀 Request metrics tests")
+    print("=" * 50)
+
+    results = asyncio.run(run_tests())
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All request metrics tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} request metrics test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler Test Script
+
+Checks that an idle event loop is reported as idle, that a busy task's
+samples and running time are attributed to it, that the task list is only
+ever read on the loop thread, that a loop waiting inside C code (as with
+uvloop) counts as idle, and that the code label cache stays bounded.
+
+Runs in-process; no server or API key needed.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+os.environ["OPENAI_API_KEY"] = ""
+
+from app.utils.profiler import SamplingProfiler
+
+
+def burn(seconds: float):
+    """Keep the loop thread busy without yielding"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def busy_worker():
+    """Run CPU-bound chunks, yielding to the loop between them"""
+    while True:
+        burn(0.01)
+        await asyncio.sleep(0)
+
+
+async def test_idle_loop() -> bool:
+    """Test that samples of a loop waiting for I/O are counted as idle"""
+    print("🔍 Testing idle loop detection...")
+
+    result = await SamplingProfiler(interval=0.002).profile(0.3)
+    share = result["idle_samples"] / max(result["samples"], 1)
+    if result["samples"] < 20 or share < 0.8:
+        print(f"❌ {result['idle_samples']} of {result['samples']} samples idle")
+        return False
+
+    print(f"✅ {share:.0%} of {result['samples']} samples idle")
+    return True
+
+
+async def test_busy_task() -> bool:
+    """Test that samples and running time go to the task that was running"""
+    print("🔍 Testing task attribution...")
+
+    worker = asyncio.create_task(busy_worker(), name="busy")
+    short = asyncio.create_task(asyncio.sleep(0.1), name="short")
+    try:
+        result = await SamplingProfiler(interval=0.002, task_scan_interval=0.02).profile(0.5)
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, short, return_exceptions=True)
+
+    if "busy_worker" not in result["collapsed"] or ":burn" not in result["collapsed"]:
+        print("❌ Busy coroutine missing from the collapsed stacks")
+        return False
+    tasks = {task["name"]: task for task in result["top_tasks"]}
+    busy = tasks.get("busy")
+    # The sampler mostly gets the GIL when the loop releases it to poll, so
+    # a loop that is always busy still shows up as only partly running
+    if busy is None or busy["finished"] or busy["running_time"] < 0.15:
+        print(f"❌ Busy task reported as {busy}")
+        return False
+    if "short" not in tasks or not tasks["short"]["finished"] or tasks["short"]["running_time"] > 0.05:
+        print(f"❌ Short task reported as {tasks.get('short')}")
+        return False
+
+    print(f"✅ Busy task ran {busy['running_time']}s of {result['duration']}s; short task finished")
+    return True
+
+
+async def test_loop_thread_only() -> bool:
+    """Test that the task list and current task are only read on the loop thread"""
+    print("🔍 Testing task snapshots run on the loop thread...")
+
+    loop_thread = threading.get_ident()
+    callers = set()
+    all_tasks, current_task = asyncio.all_tasks, asyncio.current_task
+
+    def record_all_tasks(*args):
+        callers.add(threading.get_ident())
+        return all_tasks(*args)
+
+    def record_current_task(*args):
+        callers.add(threading.get_ident())
+        return current_task(*args)
+
+    asyncio.all_tasks, asyncio.current_task = record_all_tasks, record_current_task
+    worker = asyncio.create_task(busy_worker())
+    try:
+        await SamplingProfiler(interval=0.002, task_scan_interval=0.01).profile(0.3)
+    finally:
+        asyncio.all_tasks, asyncio.current_task = all_tasks, current_task
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+
+    if callers != {loop_thread}:
+        print(f"❌ Tasks read from {len(callers - {loop_thread})} other thread(s)")
+        return False
+
+    print("✅ Tasks read on the loop thread only")
+    return True
+
+
+async def test_c_loop_idle() -> bool:
+    """Test that a loop thread stopped in the frame driving the loop counts as idle"""
+    print("🔍 Testing idle detection without Python selector frames...")
+
+    profiler = SamplingProfiler()
+    frame = sys._getframe()
+    drivers = profiler._driver_frames(frame)
+
+    # uvloop's run_until_complete is C code, so an idle loop thread's
+    # innermost Python frame is the one that called it
+    driver = frame
+    while driver.f_code.co_name != "run_until_complete":
+        driver = driver.f_back
+    driver = driver.f_back
+
+    if profiler._is_idle(frame, drivers) or not profiler._is_idle(driver, drivers):
+        print(f"❌ Coroutine frame idle: {profiler._is_idle(frame, drivers)}; "
+              f"driver frame {driver.f_code.co_name} idle: {profiler._is_idle(driver, drivers)}")
+        return False
+
+    try:
+        import uvloop
+    except ImportError:
+        print("✅ Loop driver frames count as idle (uvloop not installed; not run under it)")
+        return True
+
+    runner = asyncio.Runner(loop_factory=uvloop.new_event_loop)
+    result = await asyncio.to_thread(runner.run, SamplingProfiler(interval=0.002).profile(0.3))
+    runner.close()
+    if result["idle_samples"] / max(result["samples"], 1) < 0.8:
+        print(f"❌ Under uvloop {result['idle_samples']} of {result['samples']} samples idle")
+        return False
+
+    print("✅ Loop driver frames count as idle, including under uvloop")
+    return True
+
+
+async def test_bounded_labels() -> bool:
+    """Test that the code label cache is bounded and emptied after a profile"""
+    print("🔍 Testing label cache bound...")
+
+    profiler = SamplingProfiler(interval=0.001, max_labels=10)
+    sizes = []
+
+    async def watch():
+        while True:
+            sizes.append(len(profiler._labels))
+            await asyncio.sleep(0.001)
+
+    watcher = asyncio.create_task(watch())
+    worker = asyncio.create_task(busy_worker())
+    try:
+        await profiler.profile(0.2)
+    finally:
+        watcher.cancel()
+        worker.cancel()
+        await asyncio.gather(watcher, worker, return_exceptions=True)
+
+    if not sizes or max(sizes) > 10 or profiler._labels:
+        print(f"❌ Label cache reached {max(sizes, default=0)} entries, {len(profiler._labels)} left after profiling")
+        return False
+
+    print(f"✅ Label cache peaked at {max(sizes)} entries and was emptied")
+    return True
+
+
+async def run_tests():
+    return [
+        await test_idle_loop(),
+        await test_busy_task(),
+        await test_loop_thread_only(),
+        await test_c_loop_idle(),
+        await test_bounded_labels(),
+    ]
+
+
+def main():
+    """Run all profiler tests"""
+    print("🚀 Sampling profiler tests")
+    print("=" * 50)
+
+    results = asyncio.run(run_tests())
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All profiler tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} profiler test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Read Routing Test Script
+
+Checks that read sessions rotate over the configured replicas but keep
+every read of one session on the same replica, and that a client that
+just wrote (including with a Core insert statement, which never flushes)
+reads from the primary until the lag tolerance has passed.
+
+Uses three temporary SQLite files as a primary and two replicas, each
+holding a marker row that names it; no server or API key needed.
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+
+work_dir = tempfile.TemporaryDirectory()
+DATABASES = {name: os.path.join(work_dir.name, f"{name}.db") for name in ("primary", "replica-1", "replica-2")}
+
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASES['primary']}"
+os.environ["DATABASE_REPLICA_URLS"] = ",".join(
+    f"sqlite:///{path}" for name, path in DATABASES.items() if name != "primary"
+)
+
+from sqlalchemy import column, insert, table, text
+
+from app.core.database import ReadSessionLocal, RequestSessionLocal, set_consistency_key
+
+for name, path in DATABASES.items():
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE marker (name TEXT)")
+        connection.execute("INSERT INTO marker VALUES (?)", (name,))
+
+MARKER = text("SELECT name FROM marker")
+marker = table("marker", column("name"))
+
+
+async def session_reads(reads: int = 10) -> list:
+    """Names of the databases one read session read from"""
+    async with ReadSessionLocal() as session:
+        return [(await session.execute(MARKER)).scalar() for _ in range(reads)]
+
+
+async def test_session_pinned() -> bool:
+    """Test that one session reads one replica and sessions rotate"""
+    print("🔍 Testing replica choice per session...")
+
+    sessions = [await session_reads() for _ in range(4)]
+    if any(len(set(reads)) != 1 for reads in sessions):
+        print(f"❌ A session read from several databases: {sessions}")
+        return False
+    used = [reads[0] for reads in sessions]
+    if set(used) != {"replica-1", "replica-2"}:
+        print(f"❌ Sessions did not rotate over the replicas: {used}")
+        return False
+
+    print(f"✅ Each session stays on one replica ({', '.join(used)})")
+    return True
+
+
+async def test_read_your_writes() -> bool:
+    """Test that a client reads from the primary right after it writes"""
+    print("🔍 Testing read-your-writes routing...")
+
+    set_consistency_key(42)
+    async with RequestSessionLocal() as session:
+        await session.execute(insert(marker).values(name="write"))
+        await session.commit()
+
+    reads = await session_reads()
+    set_consistency_key(7)
+    other = await session_reads()
+    if set(reads) != {"primary"} or set(other) == {"primary"}:
+        print(f"❌ Writer read from {set(reads)}, other client from {set(other)}")
+        return False
+
+    print("✅ Writer reads its own writes; other clients stay on replicas")
+    return True
+
+
+async def run_tests():
+    return [
+        await test_session_pinned(),
+        await test_read_your_writes(),
+    ]
+
+
+def main():
+    """Run all read routing tests"""
+    print("🚀 Read routing tests")
+    print("=" * 50)
+
+    results = asyncio.run(run_tests())
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All read routing tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} read routing test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
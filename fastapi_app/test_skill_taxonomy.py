@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Skill Taxonomy Test Script
+
+Checks that skill names and aliases resolve to one integer id, that
+versions and typos of taxonomy names resolve to them without changing
+the taxonomy while other skills do not, that category bitmasks replace
+the per-service skill lists, that skills are extracted from text in one
+pass with the longest name winning, and that the resume parser, job
+matching engine and AI service agree on skills, with the engine's skill
+overlap computed on per-job and per-candidate bitsets cached least
+recently used first.
+
+No server, database or API key needed.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+from app.services.ai_service import ai_service
+from app.utils.embeddings import SkillMatcher, skill_matcher
+from app.utils.skill_taxonomy import SkillTaxonomy, category_bit, skill_taxonomy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+
+def test_aliases() -> bool:
+    """Test that names and aliases resolve to one id"""
+    print("🔍 Testing alias resolution...")
+
+    groups = [
+        ["node", "nodejs", "node.js", "Node.js", "NODE JS"],
+        ["Postgres", "PostgreSQL", "psql"],
+        ["k8s", "Kubernetes"],
+        ["golang", "Go"],
+        ["C#", "c sharp", "csharp"],
+    ]
+    for names in groups:
+        ids = {skill_taxonomy.lookup(name) for name in names}
+        if len(ids) != 1 or None in ids:
+            print(f"❌ {names} resolved to {ids}")
+            return False
+
+    distinct = ["Java", "JavaScript", "C++", "C#", "React", "React Native"]
+    if len({skill_taxonomy.lookup(name) for name in distinct}) != len(distinct):
+        print(f"❌ Different skills share an id: {distinct}")
+        return False
+
+    print(f"✅ {sum(map(len, groups))} names resolved to {len(groups)} skills")
+    return True
+
+
+def test_unknown_names_and_categories() -> bool:
+    """Test that unknown names leave the taxonomy unchanged, and category bitmasks"""
+    print("🔍 Testing unknown names and categories...")
+
+    taxonomy = SkillTaxonomy()
+    docker = taxonomy.lookup("docker")
+    if taxonomy.categories(docker) != ["cloud", "devops"] or not taxonomy.category_masks[docker] & category_bit("devops"):
+        print(f"❌ Docker categories: {taxonomy.categories(docker)}")
+        return False
+
+    names = ["Underwater Basket-Weaving", "Docker", "underwater basket weaving"]
+    size = (len(taxonomy.names), len(taxonomy.category_masks), len(taxonomy.spellings))
+    if taxonomy.ids(names) != [docker] or taxonomy.canonical_name(names[0]) != "Underwater Basket-Weaving":
+        print(f"❌ Unknown names resolved to {taxonomy.ids(names)}")
+        return False
+    if taxonomy.group_by_category(names) != {"cloud": ["Docker"], "devops": ["Docker"]}:
+        print(f"❌ Grouped unknown names: {taxonomy.group_by_category(names)}")
+        return False
+    if (len(taxonomy.names), len(taxonomy.category_masks), len(taxonomy.spellings)) != size \
+            or taxonomy.lookup(names[0]) is not None or taxonomy.extract("underwater basket weaving"):
+        print("❌ Reading the taxonomy added names to it")
+        return False
+
+    # Free-text skills never widen bitsets; per comparison they get bits after the taxonomy's
+    free_text = [f"Tool {i} Framework" for i in range(1000)]
+    width = len(skill_taxonomy.names)
+    candidate_bits, job_bits = skill_matcher.bitsets(free_text + ["Docker"], ["tool 7 framework", "Kafka", "Docker"])
+    if skill_matcher.bitset(free_text).bit_length() or len(skill_taxonomy.names) != width:
+        print("❌ Free-text skills were added to the taxonomy")
+        return False
+    if (candidate_bits & job_bits).bit_count() != 2 or job_bits.bit_length() > width + 1002:
+        print(f"❌ Per-comparison bitsets overlap on {(candidate_bits & job_bits).bit_count()} skills")
+        return False
+    required_bits, preferred_bits, free_bits = skill_matcher.job_bitsets(
+        ["tool 7 framework", "Kafka", "Docker"], ["Tool 9 Framework"]
+    )
+    candidate_bits = skill_matcher.candidate_bitset(free_text + ["Docker"], free_bits)
+    if (candidate_bits & required_bits).bit_count() != 2 or (candidate_bits & preferred_bits).bit_count() != 1:
+        print("❌ Cached job and candidate bitsets disagree with per-comparison bitsets")
+        return False
+
+    print("✅ Unknown names leave the taxonomy unchanged; categories are bitmasks")
+    return True
+
+
+def test_fuzzy_resolution() -> bool:
+    """Test that versions and typos resolve, other skills do not, and resolving is pure"""
+    print("🔍 Testing fuzzy resolution...")
+
+    same = [("Tensorflow 2", "TensorFlow"), ("Python 3.11", "Python"), ("Kubernetes (k8s)", "Kubernetes"),
+            ("Kubernets", "Kubernetes"), ("Reactjs Native", "React Native"), ("Postgre SQL", "PostgreSQL")]
+    for name, canonical in same:
+        if skill_matcher.resolve(name) != skill_taxonomy.lookup(canonical):
+            print(f"❌ {name} did not resolve to {canonical}")
+            return False
+    for name in ("Node-RED", "Oracle EBS", "AWS S3", "Java EE", "Mongo DB Atlas", "Reactive"):
+        if skill_matcher.resolve(name) is not None:
+            print(f"❌ {name} resolved to {skill_taxonomy.name(skill_matcher.resolve(name))}")
+            return False
+
+    first = SkillMatcher().encode(["Mongo DB Atlas", "Mongo Atlas"])[0]
+    second = SkillMatcher().encode(["Mongo Atlas", "Mongo DB Atlas"])[0]
+    if first != second[::-1] or first[0] == first[1]:
+        print(f"❌ Resolution depends on order: {first} / {second}")
+        return False
+
+    names, spellings = len(skill_taxonomy.names), len(skill_taxonomy.spellings)
+    started = time.perf_counter()
+    keys = {skill_matcher.key(f"skill-{i}-xyzzy") for i in range(20_000)}
+    elapsed = time.perf_counter() - started
+    print(f"   20,000 unknown names resolved in {elapsed:.1f}s")
+    if len(keys) != 20_000 or (len(skill_taxonomy.names), len(skill_taxonomy.spellings)) != (names, spellings):
+        print(f"❌ {len(keys)} distinct keys; the taxonomy grew to {len(skill_taxonomy.names)} names")
+        return False
+    if elapsed > 30:
+        print("❌ Resolving unknown names is too slow")
+        return False
+
+    print("✅ Versions and typos resolve without changing the taxonomy")
+    return True
+
+
+def test_extraction() -> bool:
+    """Test single-pass extraction with longest matches"""
+    print("🔍 Testing skill extraction...")
+
+    text = ("Built React Native apps and React web apps on Node.js and postgres, deployed with k8s "
+            "via CI/CD. Knows C++ and C#, some machine learning, Ruby on Rails. Java, not JavaScript.")
+    expected = ["React Native", "React", "Node.js", "PostgreSQL", "Kubernetes", "CI/CD", "C++", "C#",
+                "Machine Learning", "Ruby on Rails", "Java", "JavaScript"]
+    found = skill_taxonomy.extract_names(text)
+    if found != expected:
+        print(f"❌ Extracted {found}")
+        return False
+
+    large = text * 5000
+    started = time.perf_counter()
+    skill_taxonomy.extract(large)
+    elapsed = time.perf_counter() - started
+    print(f"   {len(large) // 1000}KB of text scanned in {elapsed * 1000:.0f}ms")
+
+    print("✅ Skills extracted in order, longest names first")
+    return True
+
+
+def test_consumers() -> bool:
+    """Test that the AI service and matching scripts use the taxonomy"""
+    print("🔍 Testing taxonomy consumers...")
+
+    parsed = asyncio.run(ai_service.parse_resume("Jane Doe\nSkills: nodejs, Postgres, k8s, Figma"))
+    if parsed["skills"] != ["Node.js", "PostgreSQL", "Kubernetes", "Figma"]:
+        print(f"❌ AIService extracted {parsed['skills']}")
+        return False
+
+    from job_matching_engine import JobMatchingEngine
+    engine = JobMatchingEngine()
+    bonus = engine._calculate_category_bonus(
+        skill_matcher.bitset(["MySQL", "MongoDB"]), skill_matcher.bitset(["PostgreSQL", "Figma"])
+    )
+    if bonus != 1.0:
+        print(f"❌ Category bonus {bonus}, expected 1.0 for two related database skills")
+        return False
+
+    try:
+        from resume_parser import ResumeParser
+    except ImportError as e:
+        print(f"   ResumeParser skipped ({e.name} not installed)")
+    else:
+        skills = ResumeParser().extract_skills("Docker and Kubernetes on AWS")
+        if skills.get("devops") != ["Docker", "Kubernetes"]:
+            print(f"❌ ResumeParser extracted {skills}")
+            return False
+
+    print("✅ Resume parsing and matching share one taxonomy")
+    return True
+
+
+def test_bitset_matching() -> bool:
+    """Test that bitset skill overlap agrees with set arithmetic and is fast per pair"""
+    print("🔍 Testing bitset skill overlap...")
+
+    from job_matching_engine import JobMatchingEngine
+    engine = JobMatchingEngine()
+    rng = random.Random(3)
+    names = skill_taxonomy.names[:skill_taxonomy.canonical_count] + ["Kafka", "GraphQL", "Microservices"]
+    candidates = [{"skills": rng.sample(names, 25)} for _ in range(500)]
+    job = {"required_skills": rng.sample(names, 10), "preferred_skills": rng.sample(names, 6)}
+
+    required = {skill.lower() for skill in job["required_skills"]}
+    for candidate in candidates[:50]:
+        skills = {skill.lower() for skill in candidate["skills"]}
+        matched = engine._get_matched_skills(candidate, job)
+        missing = engine._get_missing_skills(candidate, job)
+        expected = {skill.lower() for skill in job["required_skills"] + job["preferred_skills"]} & skills
+        if set(matched) != expected or set(missing) != required - skills:
+            print(f"❌ Bitset overlap disagrees with sets: {matched} / {missing}")
+            return False
+
+    # Encodings are evicted least recently used first
+    matcher = SkillMatcher(cache_size=2)
+    for skills in (["Python"], ["Go"], ["Python"], ["Rust"]):
+        matcher.encode(skills)
+    if list(matcher._encoded) != [("Python",), ("Rust",)]:
+        print(f"❌ Encoding cache kept {list(matcher._encoded)}")
+        return False
+
+    for candidate in candidates:
+        engine._calculate_skill_match(candidate, job)
+    started = time.perf_counter()
+    for candidate in candidates:
+        engine._calculate_skill_match(candidate, job)
+    per_pair = (time.perf_counter() - started) / len(candidates) * 1e6
+    print(f"   Skill score per candidate/job pair: {per_pair:.1f}us")
+    if per_pair > 100:
+        print("❌ Skill scoring is too slow")
+        return False
+
+    print("✅ Skill overlap computed on cached bitsets")
+    return True
+
+
+def main():
+    """Run all skill taxonomy tests"""
+    print("🚀 Skill taxonomy tests")
+    print("=" * 50)
+
+    results = [
+        test_aliases(),
+        test_unknown_names_and_categories(),
+        test_fuzzy_resolution(),
+        test_extraction(),
+        test_consumers(),
+        test_bitset_matching(),
+    ]
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All skill taxonomy tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} skill taxonomy test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
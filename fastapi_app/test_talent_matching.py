@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Talent Pool Matching Test Script
+
+Seeds a talent pool of 100,000 candidates and checks that the pool is
+streamed in chunks of plain tuples with memory that does not grow with
+the pool, and that matching a job through the API saves the same top
+matches a full in-memory ranking would once candidates below their own
+threshold and matches already acted on are left out.
+
+Runs in-process with a temporary database; no server or API key needed.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+work_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'talent.db')}"
+
+import httpx
+from sqlalchemy import func, select, update
+
+from app.core.database import AsyncSessionLocal, ReadSessionLocal
+from app.core.security import create_access_token
+from app.models.job import Job
+from app.models.talent_pool import JobMatch, MatchStatus, TalentPoolEntry
+from app.models.user import CandidateProfile, RecruiterProfile
+from app.services.talent_matching import _weighted_score, stream_pool_candidates, talent_matching_service
+from app.utils.background_tasks import task_manager
+from app.utils.embeddings import skill_matcher
+
+import seed_data
+
+POOL_SIZE = 100_000
+
+
+async def stream_peak(limit: int = None):
+    """Rows streamed and peak traced memory while streaming the pool"""
+    streamed = 0
+    tracemalloc.start()
+    async with ReadSessionLocal() as session:
+        async for rows in stream_pool_candidates(session, batch_size=1000):
+            streamed += len(rows)
+            if limit and streamed >= limit:
+                break
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return streamed, peak
+
+
+async def test_stream() -> bool:
+    """Test that streaming yields the auto-matching pool as tuples in flat memory"""
+    print(f"🔍 Testing pool streaming over {POOL_SIZE:,} candidates...")
+
+    async with ReadSessionLocal() as session:
+        expected = (await session.execute(
+            select(func.count()).select_from(TalentPoolEntry)
+            .where(TalentPoolEntry.auto_matching_enabled.is_(True), TalentPoolEntry.is_active.is_(True))
+        )).scalar()
+        chunk = await stream_pool_candidates(session, batch_size=1000).__anext__()
+    fields = ("id", "entry_id", "match_score_threshold", "skills", "experience_years", "location", "salary_expectation")
+    if len(chunk) != 1000 or chunk[0]._fields != fields:
+        print(f"❌ Unexpected chunk: {len(chunk)} rows of {chunk[0]._fields}")
+        return False
+
+    _, small_peak = await stream_peak(limit=10_000)
+    started = time.perf_counter()
+    streamed, peak = await stream_peak()
+    elapsed = time.perf_counter() - started
+    print(f"   Streamed {streamed:,} candidates in {elapsed:.1f}s; peak memory {peak / 1e6:.1f}MB "
+          f"(first 10,000: {small_peak / 1e6:.1f}MB)")
+    if streamed != expected:
+        print(f"❌ Streamed {streamed} candidates, expected {expected}")
+        return False
+    if peak > 2 * small_peak + 1e6:
+        print("❌ Memory grows with the number of candidates streamed")
+        return False
+
+    print("✅ Pool streamed in chunks with flat memory")
+    return True
+
+
+async def pool_scores(job_id: int) -> dict:
+    """Overall score of every auto-matching pool entry, computed over the whole pool in memory"""
+    async with ReadSessionLocal() as session:
+        job = (await session.execute(
+            select(Job.requirements, Job.preferred_qualifications, Job.min_experience_years,
+                   Job.location, Job.remote_type, Job.is_remote_ok, Job.salary_max)
+            .where(Job.id == job_id)
+        )).one()
+        rows = (await session.execute(
+            select(TalentPoolEntry.id, CandidateProfile.skills, CandidateProfile.experience_years,
+                   CandidateProfile.location, CandidateProfile.salary_expectation)
+            .join(CandidateProfile, CandidateProfile.id == TalentPoolEntry.candidate_id)
+            .where(TalentPoolEntry.auto_matching_enabled.is_(True), TalentPoolEntry.is_active.is_(True))
+        )).all()
+
+    service = talent_matching_service
+    required_bits = skill_matcher.bitset(job.requirements or [])
+    preferred_bits = skill_matcher.bitset(job.preferred_qualifications or [])
+    return {
+        row.id: round(_weighted_score(
+            service._skill_score(skill_matcher.bitset(row.skills or []), required_bits, preferred_bits),
+            service._experience_score(row.experience_years, job.min_experience_years),
+            service._location_score(row.location, job),
+            service._salary_score(row.salary_expectation, job.salary_max)
+        ), 4)
+        for row in rows
+    }
+
+
+async def test_match_job(client: httpx.AsyncClient) -> bool:
+    """Test matching a job against the pool through the API"""
+    print("🔍 Testing talent pool matching...")
+
+    async with AsyncSessionLocal() as session:
+        job_id, company_id = (await session.execute(select(Job.id, Job.company_id).order_by(Job.id).limit(1))).one()
+        recruiter_user_id = (await session.execute(
+            select(RecruiterProfile.user_id).where(RecruiterProfile.company_id == company_id).limit(1)
+        )).scalar()
+    scores = await pool_scores(job_id)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+
+    # The best match was already acted on and must survive rematching; the
+    # next ten candidates raised their thresholds out of reach. None of them
+    # may take one of the top places from a candidate who qualifies.
+    acted_on = ranked[0]
+    raised = set(ranked[1:11])
+    async with AsyncSessionLocal() as session:
+        session.add(JobMatch(talent_entry_id=acted_on, job_id=job_id, overall_score=0.1,
+                             status=MatchStatus.INTERESTED))
+        await session.execute(
+            update(TalentPoolEntry).where(TalentPoolEntry.id.in_(raised)).values(match_score_threshold=1.01)
+        )
+        await session.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token(recruiter_user_id)}"}
+    started = time.perf_counter()
+    response = await client.post(f"/api/v1/ai-enhanced/talent-pool-matches/{job_id}", headers=headers)
+    if response.status_code != 200:
+        print(f"❌ Matching request failed: {response.status_code} {response.text}")
+        return False
+    task_id = response.json()["task_id"]
+    while task_manager.get_task_status(task_id)["status"] not in ("completed", "failed"):
+        await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+    status = task_manager.get_task_status(task_id)
+    if status["status"] != "completed":
+        print(f"❌ Matching failed: {status.get('error')}")
+        return False
+
+    async with AsyncSessionLocal() as session:
+        saved = {
+            match.talent_entry_id: match.overall_score
+            for match in (await session.execute(
+                select(JobMatch).where(JobMatch.job_id == job_id, JobMatch.status == MatchStatus.PENDING)
+            )).scalars()
+        }
+        kept = (await session.execute(
+            select(JobMatch.status).where(JobMatch.job_id == job_id, JobMatch.talent_entry_id == acted_on)
+        )).scalars().all()
+
+    # Seeded thresholds are all 0.5; ties at the cut-off may be broken either way
+    eligible = [scores[entry] for entry in ranked if entry != acted_on and entry not in raised and scores[entry] >= 0.5]
+    expected = eligible[:talent_matching_service.top_n]
+    print(f"   Matched {status['result']['scanned']:,} pool candidates in {elapsed:.1f}s, "
+          f"{status['result']['matches']} matches saved")
+    if sorted(saved.values(), reverse=True) != expected or any(scores[entry] != score for entry, score in saved.items()) \
+            or raised & set(saved):
+        print(f"❌ Saved {len(saved)} matches, expected {len(expected)}")
+        return False
+    if kept != [MatchStatus.INTERESTED]:
+        print(f"❌ A match the candidate acted on was replaced: {kept}")
+        return False
+
+    missing_job = (await client.post(
+        "/api/v1/ai-enhanced/talent-pool-matches/999999", headers=headers
+    )).status_code
+    if missing_job != 404:
+        print(f"❌ Matching a missing job returned {missing_job}")
+        return False
+
+    print("✅ Saved matches equal a full in-memory ranking")
+    return True
+
+
+async def run_tests():
+    from main import app
+
+    counts = {
+        "companies": 20, "recruiters": 40, "candidates": POOL_SIZE, "jobs": 20,
+        "applications": 1, "parsed_resumes": 1, "job_matches": 1,
+    }
+    started = time.perf_counter()
+    await seed_data.seed(counts, 42, 5000)
+    print(f"   Seeded {POOL_SIZE:,} candidates in {time.perf_counter() - started:.0f}s")
+
+    await task_manager.start_workers(num_workers=1)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+            return [
+                await test_stream(),
+                await test_match_job(client),
+            ]
+    finally:
+        await task_manager.stop_workers()
+
+
+def main():
+    """Run all talent pool matching tests"""
+    print("🚀 Talent pool matching tests")
+    print("=" * 50)
+
+    results = asyncio.run(run_tests())
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All talent pool matching tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} talent pool matching test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
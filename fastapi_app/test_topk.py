@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Top-k Selection Test Script
+
+Checks that the shared top-k selector returns what sorting everything and
+slicing would, that it reads generators lazily with memory bounded by k,
+that the matching scripts skip pairs whose skill score cannot reach the
+current top k, and that job recommendations stream active jobs from the
+database.
+
+Runs in-process with a temporary database; no server or API key needed.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+work_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'topk.db')}"
+
+from sqlalchemy import insert
+
+from app.core.database import AsyncSessionLocal, engine, init_db
+from app.models.company import Company
+from app.models.job import Job
+from app.models.user import CandidateProfile, RecruiterProfile, User
+from app.services.ai_service import ai_service
+from app.utils.skill_taxonomy import skill_taxonomy
+from app.utils.topk import TopK
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+import ai_matching
+from job_matching_engine import JobMatchingEngine
+
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Remote"]
+SKILLS = skill_taxonomy.names[:skill_taxonomy.canonical_count]
+
+
+def make_candidate(rng: random.Random) -> dict:
+    """A random candidate in the shape both matching scripts read"""
+    return {
+        "skills": rng.sample(SKILLS, rng.randint(3, 15)),
+        "total_experience_years": rng.randint(0, 12),
+        "experience": [{"start_date": str(2024 - rng.randint(0, 10)), "end_date": "2024"}],
+        "location": rng.choice(LOCATIONS),
+        "contact_info": {"location": rng.choice(LOCATIONS)},
+        "education": [{"degree": "Bachelor of Science"}] if rng.random() < 0.6 else [],
+        "preferences": {"job_types": ["full-time"], "min_salary": rng.randint(60, 150) * 1000}
+    }
+
+
+def make_job(rng: random.Random) -> dict:
+    """A random active job in the shape both matching scripts read"""
+    return {
+        "required_skills": rng.sample(SKILLS, 5),
+        "preferred_skills": rng.sample(SKILLS, 3),
+        "min_experience": rng.randint(0, 6),
+        "max_experience": rng.choice([None, 10]),
+        "required_degree": rng.choice(["", "Bachelor"]),
+        "location": rng.choice(LOCATIONS),
+        "remote_ok": rng.random() < 0.3,
+        "salary_min": 90000,
+        "salary_max": 140000,
+        "job_type": "full-time",
+        "status": "active"
+    }
+
+
+def test_selector() -> bool:
+    """Test that the selector matches a stable sort and stays O(k) on a generator"""
+    print("🔍 Testing top-k selector...")
+
+    rng = random.Random(1)
+    for k in (0, 1, 5, 50, 2000):
+        scores = [rng.randint(0, 40) for _ in range(1000)]
+        selector = TopK(k)
+        for index, score in enumerate(scores):
+            selector.push(index, score)
+            if len(selector) > k:
+                print(f"❌ Selector kept {len(selector)} items with k={k}")
+                return False
+        expected = sorted(enumerate(scores), key=lambda pair: pair[1], reverse=True)[:k]
+        if selector.results() != expected:
+            print(f"❌ Results with k={k} differ from a stable sort")
+            return False
+
+    read = []
+
+    def stream():
+        for index in range(1000):
+            read.append(index)
+            yield index
+
+    selector = TopK(3, max_score=1.0)
+    for index in stream():
+        selector.push(index, 1.0 if index % 10 == 0 else 0.5)
+        if selector.saturated:
+            break
+    if [index for index, _ in selector.results()] != [0, 10, 20] or len(read) != 21:
+        print(f"❌ Early termination read {len(read)} items")
+        return False
+
+    print("✅ Same results as sorting and slicing; reading stops once the top k are perfect")
+    return True
+
+
+def test_matching_engine() -> bool:
+    """Test the engine's pruned top-k ranking against a full sort, and its memory on a stream"""
+    print("🔍 Testing job matching engine ranking...")
+
+    engine_ = JobMatchingEngine()
+    rng = random.Random(2)
+    candidates = [make_candidate(rng) for _ in range(5000)]
+    jobs = [make_job(rng) for _ in range(5)]
+
+    scored = []
+    calculate_match_scores = engine_.calculate_match_scores
+    engine_.calculate_match_scores = lambda *args: scored.append(1) or calculate_match_scores(*args)
+
+    for job in jobs:
+        expected = sorted(
+            ((candidate, calculate_match_scores(candidate, job)) for candidate in candidates),
+            key=lambda match: match[1]["overall_score"], reverse=True
+        )[:20]
+        top = engine_.find_best_candidates_for_job(job, iter(candidates), top_n=20)
+        if [candidate for candidate, _ in top] != [candidate for candidate, _ in expected]:
+            print("❌ Top candidates differ from a full sort")
+            return False
+
+        expected = sorted(
+            ((other, calculate_match_scores(candidates[0], other)) for other in jobs * 50),
+            key=lambda match: match[1]["overall_score"], reverse=True
+        )[:10]
+        top = engine_.find_best_matches_for_candidate(candidates[0], jobs * 50, top_n=10)
+        if [job for job, _ in top] != [job for job, _ in expected]:
+            print("❌ Top jobs differ from a full sort")
+            return False
+    engine_.calculate_match_scores = calculate_match_scores
+
+    skipped = 1 - len(scored) / (len(jobs) * (len(candidates) + 250))
+    print(f"   {skipped:.0%} of pairs skipped on their skill score alone")
+
+    def stream(count):
+        stream_rng = random.Random(3)
+        for _ in range(count):
+            yield make_candidate(stream_rng)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    engine_.find_best_candidates_for_job(jobs[0], stream(50_000), top_n=20)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"   Streamed 50,000 candidates in {elapsed:.1f}s, peak memory {peak / 1e6:.1f}MB")
+    if peak > 20e6:
+        print("❌ Memory grows with the number of candidates")
+        return False
+
+    print("✅ Engine ranking matches a full sort")
+    return True
+
+
+def test_ai_matching() -> bool:
+    """Test ai_matching ranking and recommendations against sorting and slicing"""
+    print("🔍 Testing ai_matching ranking...")
+
+    rng = random.Random(4)
+    candidates = [make_candidate(rng) for _ in range(3000)]
+    jobs = [make_job(rng) for _ in range(300)]
+
+    for job in jobs[:5]:
+        ranked = ai_matching.rank_candidates_for_job(candidates, job)
+        top = ai_matching.rank_candidates_for_job((candidate for candidate in candidates), job, top_n=25)
+        if top != ranked[:25]:
+            print("❌ rank_candidates_for_job top_n differs from the full ranking")
+            return False
+
+    for candidate in candidates[:20]:
+        expected = sorted(
+            ((job, ai_matching.calculate_overall_match_score(candidate, job)) for job in jobs),
+            key=lambda match: match[1]["overall_score"], reverse=True
+        )[:10]
+        if ai_matching.recommend_jobs_for_candidate(candidate, iter(jobs), top_n=10) != expected:
+            print("❌ recommend_jobs_for_candidate differs from sorting and slicing")
+            return False
+
+    print("✅ Same rankings as sorting everything")
+    return True
+
+
+async def test_job_recommendations() -> bool:
+    """Test that job recommendations stream active jobs and keep the best ones"""
+    print("🔍 Testing job recommendations...")
+
+    rng = random.Random(5)
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.execute(insert(Company), [{"id": 1, "name": "Acme", "slug": "acme"}])
+        await conn.execute(insert(User), [
+            {"id": 1, "email": "recruiter@acme.test", "hashed_password": "x", "user_type": "recruiter",
+             "is_active": True, "is_verified": True},
+            {"id": 2, "email": "candidate@example.test", "hashed_password": "x", "user_type": "candidate",
+             "is_active": True, "is_verified": True}
+        ])
+        await conn.execute(insert(RecruiterProfile), [{"id": 1, "user_id": 1, "company_id": 1}])
+        await conn.execute(insert(CandidateProfile), [
+            {"id": 1, "user_id": 2, "skills": ["Python", "PostgreSQL", "Docker", "React", "AWS"]}
+        ])
+        await conn.execute(insert(Job), [
+            {
+                "id": i + 1, "company_id": 1, "recruiter_id": 1, "title": f"Job {i}", "slug": f"job-{i}",
+                "description": "Work with " + ", ".join(skills), "requirements": skills,
+                "status": "closed" if i % 7 == 0 else "active"
+            }
+            for i, skills in enumerate(
+                rng.sample(["Python", "Postgres", "Docker", "React", "AWS", "Java", "Go", "Figma"], 4)
+                for _ in range(2000)
+            )
+        ])
+
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        recommendations = await ai_service.get_job_recommendations(db, 2, limit=15)
+        elapsed = time.perf_counter() - started
+
+    expected, requirements = [], {}
+    for i in range(2000):
+        if i % 7:
+            job_id = i + 1
+            async with AsyncSessionLocal() as db:
+                job = await db.get(Job, job_id)
+            requirements[job_id] = job.requirements
+            score = await ai_service.calculate_job_match_score(
+                ["Python", "PostgreSQL", "Docker", "React", "AWS"], job.description, job.requirements
+            )
+            if score > 30:
+                expected.append((job_id, score))
+    expected = sorted(expected, key=lambda pair: pair[1], reverse=True)[:15]
+
+    found = [(recommendation["job_id"], recommendation["match_score"]) for recommendation in recommendations]
+    print(f"   {len(recommendations)} recommendations from 2,000 jobs in {elapsed * 1000:.0f}ms")
+    if found != expected:
+        print(f"❌ Recommendations {found[:3]}..., expected {expected[:3]}...")
+        return False
+    # Jobs ask for "Postgres"; the candidate lists "PostgreSQL"
+    aliased = [recommendation for recommendation in recommendations
+               if "Postgres" in requirements[recommendation["job_id"]]]
+    if not aliased or any("Postgres" not in recommendation["matching_skills"] for recommendation in aliased):
+        print(f"❌ Matching skills miss aliases: {[r['matching_skills'] for r in aliased[:3]]}")
+        return False
+    if recommendations[0]["company_name"] != "Acme":
+        print(f"❌ Recommendation is missing its company: {recommendations[0]}")
+        return False
+
+    print("✅ Recommendations are the best-scoring active jobs")
+    return True
+
+
+def main():
+    """Run all top-k selection tests"""
+    print("🚀 Top-k selection tests")
+    print("=" * 50)
+
+    results = [
+        test_selector(),
+        test_matching_engine(),
+        test_ai_matching(),
+        asyncio.run(test_job_recommendations()),
+    ]
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All top-k selection tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} top-k selection test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
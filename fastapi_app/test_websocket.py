@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+WebSocket Test Script
+
+Checks that room memberships and their per-user reverse index stay in
+step through joins, leaves and disconnects, that presence and typing
+events are coalesced into batched frames for negotiated connections while
+legacy connections keep the original user_status and typing frames, that
+every encoding round-trips, and that notifications sent while a client
+was away are replayed when it reconnects with its last sequence number
+(and never to a connection opened without the user's token), and that the
+log only flushes a session the caller passes in.
+
+Runs in-process against fake sockets and a temporary database; no server
+or API key needed.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+
+work_dir = tempfile.TemporaryDirectory()
+
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir.name, 'websocket.db')}"
+# Flushes are driven by the tests, never by the timer
+os.environ["WEBSOCKET_PRESENCE_FLUSH_INTERVAL"] = "60"
+
+from app.api.v1.endpoints.websocket import websocket_endpoint
+from app.core.database import AsyncSessionLocal, init_db
+from app.core.security import create_access_token
+from app.services.notification_store import notification_store
+from app.services.websocket_service import (
+    ConnectionManager, MessageCodec, MessageEncoding, MessageType, websocket_service
+)
+
+
+class FakeWebSocket:
+    """Records the frames sent to a connection and feeds it queued client frames"""
+
+    def __init__(self, subprotocols=(), extensions: str = ""):
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.headers = {"sec-websocket-extensions": extensions}
+        self.subprotocol = None
+        self.sent = []
+        self.incoming = asyncio.Queue()
+        # Set once the server waits for client frames, i.e. has sent everything on connect
+        self.listening = asyncio.Event()
+
+    async def accept(self, subprotocol=None):
+        self.subprotocol = subprotocol
+
+    async def send_text(self, frame: str):
+        self.sent.append(frame)
+
+    async def send_bytes(self, frame: bytes):
+        self.sent.append(frame)
+
+    async def receive(self):
+        self.listening.set()
+        return await self.incoming.get()
+
+    async def close(self, code: int = 1000, reason: str = None):
+        pass
+
+    def received(self, encoding: MessageEncoding = MessageEncoding.JSON) -> list:
+        """Decode and clear the frames sent so far"""
+        messages = [MessageCodec.decode(frame, encoding) for frame in self.sent]
+        self.sent.clear()
+        return messages
+
+
+def index_consistent(manager: ConnectionManager) -> bool:
+    """Whether rooms and the per-user reverse index describe the same memberships"""
+    forward = {(room_id, user_id) for room_id, members in manager.rooms.items() for user_id in members}
+    reverse = {(room_id, user_id) for user_id, rooms in manager.user_rooms.items() for room_id in rooms}
+    return (forward == reverse
+            and all(manager.rooms.values()) and all(manager.user_rooms.values())
+            and all(user_id in manager.active_connections for _, user_id in forward))
+
+
+async def test_room_index() -> bool:
+    """Test that the reverse room index follows joins, leaves and disconnects"""
+    print("🔍 Testing room membership index...")
+
+    manager = ConnectionManager()
+    rng = random.Random(7)
+    sockets = {}
+    for step in range(3000):
+        user_id, room_id = rng.randrange(20), f"room-{rng.randrange(8)}"
+        action = rng.random()
+        if user_id not in sockets:
+            sockets[user_id] = FakeWebSocket()
+            await manager.connect(sockets[user_id], user_id)
+        elif action < 0.5:
+            await manager.join_room(user_id, room_id)
+        elif action < 0.9:
+            await manager.leave_room(user_id, room_id)
+        else:
+            await manager.disconnect(sockets.pop(user_id), user_id)
+            if user_id in manager.user_rooms or any(user_id in members for members in manager.rooms.values()):
+                print(f"❌ User {user_id} still in rooms after disconnecting")
+                return False
+        if not index_consistent(manager):
+            print(f"❌ Rooms and user_rooms disagree after step {step}")
+            return False
+
+    await manager.presence.stop()
+    print(f"✅ Index consistent through 3,000 operations ({len(manager.rooms)} rooms left)")
+    return True
+
+
+async def test_presence_coalescing() -> bool:
+    """Test batched presence and typing frames, and the legacy frames"""
+    print("🔍 Testing coalesced presence and typing...")
+
+    manager = ConnectionManager()
+    watcher, peer, outsider, legacy = FakeWebSocket(), FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    legacy_outsider = FakeWebSocket()
+    await manager.connect(watcher, 1, encoding=MessageEncoding.COMPACT)
+    await manager.connect(peer, 2, {"name": "Peer", "user_type": "candidate"})
+    await manager.connect(outsider, 3)
+    await manager.connect(legacy, 4, legacy=True)
+    await manager.connect(legacy_outsider, 5, legacy=True)
+    for user_id in (1, 2, 4):
+        await manager.join_room(user_id, "chat")
+    await manager.presence.flush()
+    for socket in (watcher, peer, outsider, legacy, legacy_outsider):
+        socket.sent.clear()
+
+    # Twenty keystroke events become one frame per connection
+    for _ in range(20):
+        manager.presence.set_typing(2, "chat", True)
+    await manager.presence.flush()
+    typing = watcher.received(MessageEncoding.COMPACT)
+    legacy_typing = legacy.received()
+    if typing != [{"type": "typing_indicator", "room_id": "chat", "typing_users": [2], "timestamp": typing[0]["timestamp"]}] \
+            or outsider.received():
+        print(f"❌ Typing frames: {typing}")
+        return False
+    if len(legacy_typing) != 1 or (legacy_typing[0]["user_id"], legacy_typing[0]["is_typing"]) != (2, True):
+        print(f"❌ Legacy typing frames: {legacy_typing}")
+        return False
+
+    # A quick reconnect publishes nothing; going offline one batched change
+    await manager.disconnect(peer, 2)
+    await manager.connect(peer, 2, {"name": "Peer", "user_type": "candidate"})
+    await manager.join_room(2, "chat")
+    await manager.presence.flush()
+    if any(message["type"] in ("presence_update", "user_status") for message in watcher.received(MessageEncoding.COMPACT) + legacy.received()):
+        print("❌ A reconnect flap was published")
+        return False
+
+    await manager.disconnect(peer, 2)
+    await manager.presence.flush()
+    updates = [message for message in watcher.received(MessageEncoding.COMPACT) if message["type"] == "presence_update"]
+    statuses = [message for message in legacy.received() if message["type"] == "user_status"]
+    if len(updates) != 1 or [(c["user_id"], c["status"]) for c in updates[0]["changes"]] != [(2, "offline")]:
+        print(f"❌ Presence updates: {updates}")
+        return False
+    if any(message["type"] in ("presence_update", "user_status")
+           for message in outsider.received() + legacy_outsider.received()):
+        print("❌ Presence update sent to a user not sharing a room")
+        return False
+    if len(statuses) != 1 or {key: statuses[0][key] for key in ("user_id", "status", "user_name", "user_type")} \
+            != {"user_id": 2, "status": "offline", "user_name": "Peer", "user_type": "candidate"}:
+        print(f"❌ Legacy status frames: {statuses}")
+        return False
+
+    await manager.presence.stop()
+    print("✅ One frame per flush; legacy clients keep user_status and typing fields")
+    return True
+
+
+def test_codec_round_trip() -> bool:
+    """Test that every encoding round-trips messages and compact frames are smaller"""
+    print("🔍 Testing message encodings...")
+
+    messages = [
+        {"type": MessageType.NOTIFICATION, "title": "Interview", "message": "Tomorrow at 10", "priority": "high",
+         "data": {"type": "opaque", "user_id": 9, "nested": [1, {"status": "x"}]}, "id": "notif_1_2", "seq": 41},
+        {"type": MessageType.PRESENCE_UPDATE, "changes": [
+            {"user_id": 2, "status": "offline", "user_name": "Peer", "user_type": "candidate"}
+        ]},
+        {"type": MessageType.TYPING_INDICATOR, "room_id": "chat", "user_id": 2, "is_typing": True, "typing_users": [2, 3]},
+        {"type": "custom_event", "unknown_key": "kept"},
+    ]
+    expected = [json.loads(json.dumps(message)) for message in messages]
+    for encoding in MessageEncoding:
+        decoded = [MessageCodec.decode(MessageCodec.encode(message, encoding), encoding) for message in messages]
+        if decoded != expected:
+            print(f"❌ {encoding.value} round trip changed the messages: {decoded}")
+            return False
+
+    timestamped = {"type": MessageType.SYSTEM_MESSAGE, "message": "hi", "timestamp": "2026-01-01T00:00:00"}
+    compact = MessageCodec.decode(MessageCodec.encode(timestamped, MessageEncoding.COMPACT), MessageEncoding.COMPACT)
+    if compact["timestamp"] != 1767225600000:
+        print(f"❌ Compact timestamp {compact['timestamp']}")
+        return False
+    sizes = {encoding: len(MessageCodec.encode(messages[1], encoding)) for encoding in MessageEncoding}
+    if not sizes[MessageEncoding.MSGPACK] < sizes[MessageEncoding.COMPACT] < sizes[MessageEncoding.JSON]:
+        print(f"❌ Frame sizes {sizes}")
+        return False
+
+    negotiated = [
+        MessageCodec.negotiate(None, ["hirequick.msgpack"]),
+        MessageCodec.negotiate("auto", [], "permessage-deflate"),
+        MessageCodec.negotiate("auto"),
+        MessageCodec.negotiate("bogus"),
+        MessageCodec.negotiate(),
+    ]
+    if negotiated != [(MessageEncoding.MSGPACK, "hirequick.msgpack"), (MessageEncoding.COMPACT, None),
+                      (MessageEncoding.MSGPACK, None), (MessageEncoding.JSON, None), (MessageEncoding.JSON, None)]:
+        print(f"❌ Negotiated {negotiated}")
+        return False
+
+    print(f"✅ json, compact and msgpack round-trip ({', '.join(f'{e.value} {n}B' for e, n in sizes.items())})")
+    return True
+
+
+async def open_connection(user_id: int, **params) -> tuple:
+    """Connect through the WebSocket endpoint; returns the socket and the endpoint task"""
+    websocket = FakeWebSocket()
+    task = asyncio.create_task(websocket_endpoint(
+        websocket, user_id, token=params.get("token"), encoding=params.get("encoding"), last_seq=params.get("last_seq")
+    ))
+    await websocket.listening.wait()
+    return websocket, task
+
+
+async def close_connection(websocket: FakeWebSocket, task: asyncio.Task):
+    await websocket.incoming.put({"type": "websocket.disconnect", "code": 1000})
+    await task
+
+
+async def test_replay_after_reconnect() -> bool:
+    """Test that a reconnecting client receives exactly the notifications it missed"""
+    print("🔍 Testing replay after reconnect...")
+
+    user_id = 5
+    token = create_access_token(user_id)
+    websocket, task = await open_connection(user_id, token=token, encoding="msgpack")
+    if websocket in websocket_service.manager.legacy_connections:
+        print("❌ A connection that negotiated msgpack was treated as legacy")
+        return False
+    for i in range(3):
+        await websocket_service.send_notification(user_id, f"Live {i}", "while connected")
+    live = [message for message in websocket.received(MessageEncoding.MSGPACK) if message["type"] == "notification"]
+    last_seq = live[-1]["seq"]
+    await close_connection(websocket, task)
+
+    missed = notification_store.batch_size + 50
+    for i in range(missed):
+        await websocket_service.send_notification(user_id, f"Missed {i}", "while away")
+
+    websocket, task = await open_connection(user_id, token=token, encoding="msgpack", last_seq=last_seq)
+    frames = [message for message in websocket.received(MessageEncoding.MSGPACK) if message["type"] == "notification_replay"]
+    await close_connection(websocket, task)
+    replayed = [message for frame in frames for message in frame["messages"]]
+    sequences = [message["seq"] for message in replayed]
+    if [frame["has_more"] for frame in frames] != [True, False] or len(replayed) != missed:
+        print(f"❌ Replayed {len(replayed)} of {missed} notifications in {len(frames)} frames")
+        return False
+    if sequences != sorted(sequences) or sequences[0] <= last_seq or replayed[0]["title"] != "Missed 0":
+        print("❌ Replay out of order or repeated notifications already seen")
+        return False
+
+    # No token, no replay; no negotiation, legacy frames
+    websocket, task = await open_connection(user_id, last_seq=0)
+    legacy = websocket in websocket_service.manager.legacy_connections
+    anonymous = [message for message in websocket.received() if message["type"] == "notification_replay"]
+    if anonymous or not legacy:
+        print(f"❌ Unauthenticated connection got {len(anonymous)} replay frames (legacy: {legacy})")
+        return False
+
+    # Still no replay once the real user has connected alongside it
+    authenticated, authenticated_task = await open_connection(user_id, token=token)
+    websocket.listening.clear()
+    await websocket.incoming.put({"type": "websocket.receive", "text": json.dumps({"type": "replay", "last_seq": 0})})
+    await websocket.listening.wait()
+    replies = [message["type"] for message in websocket.received()]
+    await close_connection(authenticated, authenticated_task)
+    await close_connection(websocket, task)
+    if "notification_replay" in replies or "error" not in replies:
+        print(f"❌ Unauthenticated connection asking for a replay got {replies}")
+        return False
+
+    print(f"✅ {missed} missed notifications replayed in order after reconnecting")
+    return True
+
+
+async def test_append_in_caller_session() -> bool:
+    """Test that logging through the caller's session leaves the commit to the caller"""
+    print("🔍 Testing notification log in the caller's session...")
+
+    user_id = 9
+    async with AsyncSessionLocal() as session:
+        sequences = await notification_store.append([user_id], {"type": "notification", "title": "Rolled back"}, session)
+        await session.rollback()
+    logged = await notification_store.replay(user_id, 0)
+    if not sequences.get(user_id) or logged:
+        print(f"❌ Sequences {sequences}; {len(logged)} entries survived the caller's rollback")
+        return False
+
+    print("✅ Entries commit or roll back with the caller's session")
+    return True
+
+
+async def run_tests():
+    await init_db()
+    results = [
+        await test_room_index(),
+        await test_presence_coalescing(),
+        test_codec_round_trip(),
+        await test_replay_after_reconnect(),
+        await test_append_in_caller_session(),
+    ]
+    await websocket_service.manager.presence.stop()
+    return results
+
+
+def main():
+    """Run all WebSocket tests"""
+    print("🚀 WebSocket tests")
+    print("=" * 50)
+
+    results = asyncio.run(run_tests())
+
+    print("=" * 50)
+    if all(results):
+        print("🎉 All WebSocket tests passed!")
+        return 0
+
+    print(f"⚠️  {results.count(False)} WebSocket test(s) failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,20 @@
 import json
 import math
-from typing import Dict, List, Any, Tuple
+import os
+import sys
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+# Top-k selection is shared with the FastAPI application
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fastapi_app'))
+from app.utils.topk import TopK
+
+# Weights of the component scores in the overall score
+SCORE_WEIGHTS = {
+    'skills': 0.4,
+    'experience': 0.3,
+    'education': 0.2,
+    'location': 0.1
+}
 
 def calculate_experience_score(candidate_exp: List[Dict], job_requirements: Dict) -> float:
     """Calculate experience match score based on years and relevance"""
@@ -88,7 +102,28 @@ def calculate_location_score(candidate_location: str, job_location: str, remote_
     
     return 30  # Different locations, not remote
 
-def calculate_overall_match_score(candidate: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, float]:
+def weighted_score(skill_score: float, experience_score: float, education_score: float, location_score: float) -> float:
+    """Weighted overall score of the component scores"""
+    return (
+        skill_score * SCORE_WEIGHTS['skills'] +
+        experience_score * SCORE_WEIGHTS['experience'] +
+        education_score * SCORE_WEIGHTS['education'] +
+        location_score * SCORE_WEIGHTS['location']
+    )
+
+def calculate_job_skill_score(candidate: Dict[str, Any], job: Dict[str, Any]) -> float:
+    """Skill score of a candidate for a job"""
+    return calculate_skill_match_advanced(
+        candidate.get('skills', []),
+        job.get('required_skills', []),
+        job.get('preferred_skills', [])
+    )
+
+def upper_bound_match_score(skill_score: float) -> float:
+    """Highest overall score possible with this skill score (perfect marks everywhere else)"""
+    return round(weighted_score(skill_score, 100, 100, 100), 2)
+
+def calculate_overall_match_score(candidate: Dict[str, Any], job: Dict[str, Any], skill_score: Optional[float] = None) -> Dict[str, float]:
     """Calculate comprehensive match score between candidate and job"""
     
     # Extract job requirements
@@ -102,11 +137,8 @@ def calculate_overall_match_score(candidate: Dict[str, Any], job: Dict[str, Any]
     }
     
     # Calculate individual scores
-    skill_score = calculate_skill_match_advanced(
-        candidate.get('skills', []), 
-        job_requirements['required_skills'],
-        job_requirements['preferred_skills']
-    )
+    if skill_score is None:
+        skill_score = calculate_job_skill_score(candidate, job)
     
     experience_score = calculate_experience_score(
         candidate.get('experience', []), 
@@ -125,19 +157,7 @@ def calculate_overall_match_score(candidate: Dict[str, Any], job: Dict[str, Any]
     )
     
     # Weighted overall score
-    weights = {
-        'skills': 0.4,
-        'experience': 0.3,
-        'education': 0.2,
-        'location': 0.1
-    }
-    
-    overall_score = (
-        skill_score * weights['skills'] +
-        experience_score * weights['experience'] +
-        education_score * weights['education'] +
-        location_score * weights['location']
-    )
+    overall_score = weighted_score(skill_score, experience_score, education_score, location_score)
     
     return {
         'overall_score': round(overall_score, 2),
@@ -172,8 +192,34 @@ def calculate_skill_match_advanced(candidate_skills: List[str], required_skills:
     
     return min(100, required_score + preferred_score)
 
-def rank_candidates_for_job(candidates: List[Dict[str, Any]], job: Dict[str, Any]) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
-    """Rank candidates for a specific job based on match scores"""
+def select_top_matches(pairs: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]], top_n: int) -> List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, float]]]:
+    """
+    Select the top_n (candidate, job) pairs by overall score
+    
+    Pairs are read lazily, so they can stream from a database in chunks, and
+    memory stays O(top_n). A pair whose skill score cannot beat the current
+    top_n-th overall score even with perfect marks elsewhere is not scored
+    further.
+    """
+    selector = TopK(top_n, max_score=upper_bound_match_score(100))
+    
+    for candidate, job in pairs:
+        skill_score = calculate_job_skill_score(candidate, job)
+        if not selector.admits(upper_bound_match_score(skill_score)):
+            continue
+        scores = calculate_overall_match_score(candidate, job, skill_score)
+        selector.push((candidate, job, scores), scores['overall_score'])
+        if selector.saturated:
+            break
+    
+    return [match for match, _ in selector.results()]
+
+def rank_candidates_for_job(candidates: Iterable[Dict[str, Any]], job: Dict[str, Any], top_n: Optional[int] = None) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
+    """Rank candidates for a specific job based on match scores (all of them, or the top_n best)"""
+    
+    if top_n is not None:
+        matches = select_top_matches(((candidate, job) for candidate in candidates), top_n)
+        return [(candidate, scores) for candidate, _, scores in matches]
     
     candidate_scores = []
     
@@ -186,19 +232,12 @@ def rank_candidates_for_job(candidates: List[Dict[str, Any]], job: Dict[str, Any
     
     return candidate_scores
 
-def recommend_jobs_for_candidate(candidate: Dict[str, Any], jobs: List[Dict[str, Any]], top_n: int = 10) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
+def recommend_jobs_for_candidate(candidate: Dict[str, Any], jobs: Iterable[Dict[str, Any]], top_n: int = 10) -> List[Tuple[Dict[str, Any], Dict[str, float]]]:
     """Recommend top jobs for a candidate based on match scores"""
     
-    job_scores = []
-    
-    for job in jobs:
-        scores = calculate_overall_match_score(candidate, job)
-        job_scores.append((job, scores))
-    
-    # Sort by overall score (descending)
-    job_scores.sort(key=lambda x: x[1]['overall_score'], reverse=True)
+    matches = select_top_matches(((candidate, job) for job in jobs), top_n)
     
-    return job_scores[:top_n]
+    return [(job, scores) for _, job, scores in matches]
 
 # Example usage and testing
 if __name__ == "__main__":
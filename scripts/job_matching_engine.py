@@ -1,26 +1,46 @@
 import json
 import math
-from typing import Dict, List, Any, Tuple
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Any, Tuple
 from datetime import datetime, timedelta
 import re
 
+# Skill matching is shared with the FastAPI application
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fastapi_app'))
+from app.utils.embeddings import skill_matcher
+from app.utils.skill_taxonomy import skill_taxonomy
+from app.utils.topk import TopK
+
+# Bits of the taxonomy skills; higher bits are free-text skills numbered per job
+_TAXONOMY_BITS = (1 << skill_taxonomy.canonical_count) - 1
+
+
+@lru_cache(maxsize=4096)
+def _skill_names(skills: Tuple[str, ...]) -> Tuple[Tuple[Any, str], ...]:
+    """Distinct skills of a job as (skill key, lowercase name), in the job's order"""
+    names = {}
+    for key, skill in zip(skill_matcher.encode(skills)[0], skills):
+        names.setdefault(key, skill_taxonomy.name(key) if isinstance(key, int) else skill.strip())
+    return tuple((key, name.lower()) for key, name in names.items())
+
+
+@lru_cache(maxsize=4096)
+def _category_groups(skill_bits: int) -> Tuple[Tuple[int, int], ...]:
+    """Skills of a set grouped by category mask, as (group bits, bits of all skills sharing a category)"""
+    by_mask = {}
+    for skill_id in skill_taxonomy.bit_ids(skill_bits):
+        mask = skill_taxonomy.category_masks[skill_id]
+        if mask:
+            by_mask[mask] = by_mask.get(mask, 0) | 1 << skill_id
+    return tuple((members, skill_taxonomy.related_bits(mask)) for mask, members in by_mask.items())
+
+
 class JobMatchingEngine:
     """Advanced job matching engine with AI-powered recommendations"""
     
     def __init__(self):
-        self.skill_categories = {
-            'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift'],
-            'web_development': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'express'],
-            'databases': ['mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'oracle', 'sql server'],
-            'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible'],
-            'data_science': ['pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'r', 'tableau', 'power bi'],
-            'mobile': ['ios', 'android', 'react native', 'flutter', 'xamarin', 'swift', 'kotlin'],
-            'devops': ['jenkins', 'gitlab ci', 'github actions', 'docker', 'kubernetes', 'monitoring'],
-            'design': ['figma', 'sketch', 'adobe creative suite', 'ui/ux', 'prototyping'],
-            'project_management': ['agile', 'scrum', 'kanban', 'jira', 'confluence', 'project planning'],
-            'soft_skills': ['leadership', 'communication', 'teamwork', 'problem solving', 'analytical thinking']
-        }
-        
         self.location_weights = {
             'same_city': 1.0,
             'same_state': 0.8,
@@ -29,6 +49,15 @@ class JobMatchingEngine:
             'different_location': 0.3
         }
         
+        # Weights of the component scores in the overall score
+        self.score_weights = {
+            'skills': 0.35,
+            'experience': 0.25,
+            'location': 0.15,
+            'education': 0.15,
+            'preferences': 0.10
+        }
+        
         self.experience_weights = {
             'exact_match': 1.0,
             'overqualified': 0.8,
@@ -36,102 +65,113 @@ class JobMatchingEngine:
             'entry_level_exception': 0.9
         }
 
-    def calculate_comprehensive_match(self, candidate_data: Dict, job_data: Dict) -> Dict[str, Any]:
-        """Calculate comprehensive match score between candidate and job"""
-        
-        # Individual component scores
-        skill_score = self._calculate_skill_match(candidate_data, job_data)
+    def calculate_comprehensive_match(self, candidate_data: Dict, job_data: Dict, scores: Dict[str, float] = None) -> Dict[str, Any]:
+        """
+        Calculate comprehensive match score between candidate and job
+        
+        Pass scores from calculate_match_scores if the pair was already scored.
+        """
+        if scores is None:
+            scores = self.calculate_match_scores(candidate_data, job_data)
+        return self._build_match(candidate_data, job_data, scores)
+
+    def _build_match(self, candidate_data: Dict, job_data: Dict, scores: Dict[str, float]) -> Dict[str, Any]:
+        """Rounded scores followed by the explanation of a match"""
+        rounded = {name: round(score, 2) for name, score in scores.items()}
+        return {**rounded, **self.explain_match(candidate_data, job_data, scores)}
+
+    def calculate_match_scores(self, candidate_data: Dict, job_data: Dict, skill_score: float = None) -> Dict[str, float]:
+        """
+        Calculate the numeric match scores between candidate and job
+        
+        The fast path for ranking many pairs: no reasons, recommendations or
+        skill lists are built, and scores are not rounded. Call explain_match
+        for the pairs that are shown. Pass skill_score if it is already known.
+        """
+        if skill_score is None:
+            skill_score = self._calculate_skill_match(candidate_data, job_data)
         experience_score = self._calculate_experience_match(candidate_data, job_data)
         location_score = self._calculate_location_match(candidate_data, job_data)
         education_score = self._calculate_education_match(candidate_data, job_data)
         preference_score = self._calculate_preference_match(candidate_data, job_data)
         
-        # Weighted overall score
-        weights = {
-            'skills': 0.35,
-            'experience': 0.25,
-            'location': 0.15,
-            'education': 0.15,
-            'preferences': 0.10
+        return {
+            'overall_score': self._weighted_score(
+                skill_score, experience_score, location_score, education_score, preference_score
+            ),
+            'skill_score': skill_score,
+            'experience_score': experience_score,
+            'location_score': location_score,
+            'education_score': education_score,
+            'preference_score': preference_score
         }
-        
-        overall_score = (
+
+    def _weighted_score(self, skill_score: float, experience_score: float, location_score: float,
+                        education_score: float, preference_score: float) -> float:
+        """Weighted overall score of the component scores"""
+        weights = self.score_weights
+        return (
             skill_score * weights['skills'] +
             experience_score * weights['experience'] +
             location_score * weights['location'] +
             education_score * weights['education'] +
             preference_score * weights['preferences']
         )
+
+    def explain_match(self, candidate_data: Dict, job_data: Dict, scores: Dict[str, float] = None) -> Dict[str, Any]:
+        """Build the human-readable part of a match: skills, reasons, recommendation and fit analysis"""
+        if scores is None:
+            scores = self.calculate_match_scores(candidate_data, job_data)
         
         # Generate match insights
-        match_reasons = self._generate_match_reasons(candidate_data, job_data, {
-            'skill_score': skill_score,
-            'experience_score': experience_score,
-            'location_score': location_score,
-            'education_score': education_score,
-            'preference_score': preference_score
-        })
+        match_reasons = self._generate_match_reasons(candidate_data, job_data, scores)
         
         # AI recommendation
-        ai_recommendation = self._generate_ai_recommendation(overall_score, match_reasons)
+        ai_recommendation = self._generate_ai_recommendation(scores['overall_score'], match_reasons)
         
         return {
-            'overall_score': round(overall_score, 2),
-            'skill_score': round(skill_score, 2),
-            'experience_score': round(experience_score, 2),
-            'location_score': round(location_score, 2),
-            'education_score': round(education_score, 2),
-            'preference_score': round(preference_score, 2),
             'matched_skills': self._get_matched_skills(candidate_data, job_data),
             'missing_skills': self._get_missing_skills(candidate_data, job_data),
             'match_reasons': match_reasons,
             'ai_recommendation': ai_recommendation,
-            'fit_analysis': self._generate_fit_analysis(candidate_data, job_data, overall_score)
+            'fit_analysis': self._generate_fit_analysis(candidate_data, job_data, scores['overall_score'])
         }
 
     def _calculate_skill_match(self, candidate_data: Dict, job_data: Dict) -> float:
         """Calculate skill matching score with category weighting"""
-        candidate_skills = [skill.lower().strip() for skill in candidate_data.get('skills', [])]
-        required_skills = [skill.lower().strip() for skill in job_data.get('required_skills', [])]
-        preferred_skills = [skill.lower().strip() for skill in job_data.get('preferred_skills', [])]
+        required_bits, preferred_bits, free_bits = skill_matcher.job_bitsets(
+            job_data.get('required_skills', []), job_data.get('preferred_skills', [])
+        )
+        candidate_bits = skill_matcher.candidate_bitset(candidate_data.get('skills', []), free_bits)
         
-        if not required_skills:
+        if not required_bits:
             return 75.0  # Neutral score if no requirements
         
-        # Direct matches
-        required_matches = len([skill for skill in required_skills if skill in candidate_skills])
-        preferred_matches = len([skill for skill in preferred_skills if skill in candidate_skills])
+        # Direct matches (aliases such as Postgres and PostgreSQL are one skill)
+        required_matches = (candidate_bits & required_bits).bit_count()
+        preferred_matches = (candidate_bits & preferred_bits).bit_count()
         
         # Category-based matching (for related skills)
-        category_bonus = self._calculate_category_bonus(candidate_skills, required_skills)
+        category_bonus = self._calculate_category_bonus(candidate_bits, required_bits)
         
         # Calculate scores
-        required_score = (required_matches / len(required_skills)) * 70
-        preferred_score = (preferred_matches / len(preferred_skills)) * 20 if preferred_skills else 20
+        required_score = (required_matches / required_bits.bit_count()) * 70
+        preferred_score = (preferred_matches / preferred_bits.bit_count()) * 20 if preferred_bits else 20
         
         total_score = required_score + preferred_score + category_bonus
         return min(100.0, total_score)
 
-    def _calculate_category_bonus(self, candidate_skills: List[str], required_skills: List[str]) -> float:
-        """Calculate bonus points for skills in same categories"""
+    def _calculate_category_bonus(self, candidate_bits: int, required_bits: int) -> float:
+        """Calculate bonus points for candidate skills in the same categories as missing required skills"""
         bonus = 0.0
+        missing_bits = required_bits & ~candidate_bits
         
-        for required_skill in required_skills:
-            if required_skill not in candidate_skills:
-                # Find category of required skill
-                required_category = None
-                for category, skills in self.skill_categories.items():
-                    if required_skill in skills:
-                        required_category = category
-                        break
-                
-                if required_category:
-                    # Check if candidate has other skills in same category
-                    category_skills = self.skill_categories[required_category]
-                    candidate_category_skills = [skill for skill in candidate_skills if skill in category_skills]
-                    
-                    if candidate_category_skills:
-                        bonus += min(2.0, len(candidate_category_skills) * 0.5)
+        for members, related_bits in _category_groups(required_bits & _TAXONOMY_BITS):
+            missing = (missing_bits & members).bit_count()
+            if missing:
+                related = (candidate_bits & related_bits).bit_count()
+                if related:
+                    bonus += missing * min(2.0, related * 0.5)
         
         return min(10.0, bonus)  # Cap bonus at 10 points
 
@@ -281,22 +321,17 @@ class JobMatchingEngine:
 
     def _get_matched_skills(self, candidate_data: Dict, job_data: Dict) -> List[str]:
         """Get list of matched skills"""
-        candidate_skills = [skill.lower().strip() for skill in candidate_data.get('skills', [])]
-        required_skills = [skill.lower().strip() for skill in job_data.get('required_skills', [])]
-        preferred_skills = [skill.lower().strip() for skill in job_data.get('preferred_skills', [])]
+        candidate_keys = set(skill_matcher.encode(candidate_data.get('skills', []))[0])
+        job_skills = job_data.get('required_skills', []) + job_data.get('preferred_skills', [])
         
-        all_job_skills = required_skills + preferred_skills
-        matched = [skill for skill in all_job_skills if skill in candidate_skills]
-        
-        return list(set(matched))  # Remove duplicates
+        return [name for key, name in _skill_names(tuple(job_skills)) if key in candidate_keys]
 
     def _get_missing_skills(self, candidate_data: Dict, job_data: Dict) -> List[str]:
         """Get list of missing required skills"""
-        candidate_skills = [skill.lower().strip() for skill in candidate_data.get('skills', [])]
-        required_skills = [skill.lower().strip() for skill in job_data.get('required_skills', [])]
+        candidate_keys = set(skill_matcher.encode(candidate_data.get('skills', []))[0])
+        required_skills = tuple(job_data.get('required_skills', []))
         
-        missing = [skill for skill in required_skills if skill not in candidate_skills]
-        return missing
+        return [name for key, name in _skill_names(required_skills) if key not in candidate_keys]
 
     def _generate_match_reasons(self, candidate_data: Dict, job_data: Dict, scores: Dict) -> List[str]:
         """Generate human-readable match reasons"""
@@ -430,32 +465,45 @@ class JobMatchingEngine:
         
         return recommendations
 
-    def find_best_matches_for_candidate(self, candidate_data: Dict, jobs: List[Dict], top_n: int = 10) -> List[Tuple[Dict, Dict]]:
-        """Find best job matches for a candidate"""
-        matches = []
-        
-        for job in jobs:
-            if job.get('status') == 'active':
-                match_data = self.calculate_comprehensive_match(candidate_data, job)
-                matches.append((job, match_data))
+    def select_top_matches(self, pairs: Iterable[Tuple[Dict, Dict]], top_n: int) -> List[Tuple[Dict, Dict, Dict[str, float]]]:
+        """
+        Select the top_n (candidate, job) pairs by overall score
+        
+        Pairs are read lazily and memory stays O(top_n). The skill score is
+        computed first: a pair that cannot beat the current top_n-th score
+        even with perfect marks on every other component is skipped.
+        
+        Returns:
+            (candidate, job, scores) triples, best first
+        """
+        selector = TopK(top_n, max_score=self._weighted_score(100.0, 100.0, 100.0, 100.0, 100.0))
+        
+        for candidate_data, job_data in pairs:
+            skill_score = self._calculate_skill_match(candidate_data, job_data)
+            if not selector.admits(self._weighted_score(skill_score, 100.0, 100.0, 100.0, 100.0)):
+                continue
+            scores = self.calculate_match_scores(candidate_data, job_data, skill_score)
+            selector.push((candidate_data, job_data, scores), scores['overall_score'])
+            if selector.saturated:
+                break
         
-        # Sort by overall score
-        matches.sort(key=lambda x: x[1]['overall_score'], reverse=True)
+        return [match for match, _ in selector.results()]
+
+    def find_best_matches_for_candidate(self, candidate_data: Dict, jobs: Iterable[Dict], top_n: int = 10) -> List[Tuple[Dict, Dict]]:
+        """Find best job matches for a candidate"""
+        matches = self.select_top_matches(
+            ((candidate_data, job) for job in jobs if job.get('status') == 'active'), top_n
+        )
         
-        return matches[:top_n]
+        # Explain only the matches returned
+        return [(job, self._build_match(candidate_data, job, scores)) for _, job, scores in matches]
 
-    def find_best_candidates_for_job(self, job_data: Dict, candidates: List[Dict], top_n: int = 20) -> List[Tuple[Dict, Dict]]:
+    def find_best_candidates_for_job(self, job_data: Dict, candidates: Iterable[Dict], top_n: int = 20) -> List[Tuple[Dict, Dict]]:
         """Find best candidate matches for a job"""
-        matches = []
-        
-        for candidate in candidates:
-            match_data = self.calculate_comprehensive_match(candidate, job_data)
-            matches.append((candidate, match_data))
-        
-        # Sort by overall score
-        matches.sort(key=lambda x: x[1]['overall_score'], reverse=True)
+        matches = self.select_top_matches(((candidate, job_data) for candidate in candidates), top_n)
         
-        return matches[:top_n]
+        # Explain only the matches returned
+        return [(candidate, self._build_match(candidate, job_data, scores)) for candidate, _, scores in matches]
 
 # Example usage
 if __name__ == "__main__":
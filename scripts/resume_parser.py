@@ -11,6 +11,12 @@ from nltk.tokenize import word_tokenize, sent_tokenize
 from collections import Counter
 import openai
 import os
+import sys
+
+# Skill matching is shared with the FastAPI application
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fastapi_app'))
+from app.utils.embeddings import skill_matcher
+from app.utils.skill_taxonomy import skill_taxonomy
 
 # Download required NLTK data
 try:
@@ -33,68 +39,12 @@ except OSError:
 class ResumeParser:
     def __init__(self):
         self.stop_words = set(stopwords.words('english'))
-        self.skill_keywords = self._load_skill_keywords()
         self.education_keywords = self._load_education_keywords()
         self.experience_keywords = self._load_experience_keywords()
         
         # Initialize OpenAI if API key is available
         openai.api_key = os.getenv('OPENAI_API_KEY')
     
-    def _load_skill_keywords(self) -> Dict[str, List[str]]:
-        """Load categorized skill keywords"""
-        return {
-            'programming_languages': [
-                'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Ruby', 'PHP', 'Go', 'Rust',
-                'Swift', 'Kotlin', 'TypeScript', 'Scala', 'R', 'MATLAB', 'Perl', 'Shell',
-                'PowerShell', 'VBA', 'Assembly', 'Objective-C', 'Dart', 'Elixir', 'Haskell'
-            ],
-            'web_technologies': [
-                'React', 'Angular', 'Vue.js', 'Node.js', 'Express', 'Django', 'Flask',
-                'Spring', 'Laravel', 'Ruby on Rails', 'ASP.NET', 'jQuery', 'Bootstrap',
-                'Tailwind CSS', 'SASS', 'LESS', 'Webpack', 'Gulp', 'Grunt', 'Next.js',
-                'Nuxt.js', 'Svelte', 'Ember.js', 'Backbone.js'
-            ],
-            'databases': [
-                'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'SQLite', 'Oracle', 'SQL Server',
-                'Cassandra', 'DynamoDB', 'Firebase', 'Elasticsearch', 'Neo4j', 'CouchDB',
-                'MariaDB', 'InfluxDB', 'Amazon RDS', 'Google Cloud SQL'
-            ],
-            'cloud_platforms': [
-                'AWS', 'Azure', 'Google Cloud Platform', 'GCP', 'Heroku', 'DigitalOcean',
-                'Linode', 'Vultr', 'IBM Cloud', 'Oracle Cloud', 'Alibaba Cloud'
-            ],
-            'devops_tools': [
-                'Docker', 'Kubernetes', 'Jenkins', 'GitLab CI', 'GitHub Actions', 'Travis CI',
-                'CircleCI', 'Ansible', 'Terraform', 'Vagrant', 'Chef', 'Puppet', 'Nagios',
-                'Prometheus', 'Grafana', 'ELK Stack', 'Splunk'
-            ],
-            'data_science': [
-                'Machine Learning', 'Deep Learning', 'Data Science', 'AI', 'TensorFlow',
-                'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Matplotlib', 'Seaborn',
-                'Jupyter', 'Apache Spark', 'Hadoop', 'Tableau', 'Power BI', 'D3.js',
-                'Plotly', 'Keras', 'OpenCV', 'NLTK', 'spaCy'
-            ],
-            'mobile_development': [
-                'iOS', 'Android', 'React Native', 'Flutter', 'Xamarin', 'Ionic',
-                'PhoneGap', 'Cordova', 'Swift', 'Objective-C', 'Kotlin', 'Java'
-            ],
-            'design_tools': [
-                'Figma', 'Sketch', 'Adobe XD', 'Photoshop', 'Illustrator', 'InDesign',
-                'After Effects', 'Premiere Pro', 'Canva', 'InVision', 'Zeplin', 'Marvel'
-            ],
-            'project_management': [
-                'Agile', 'Scrum', 'Kanban', 'JIRA', 'Trello', 'Asana', 'Monday.com',
-                'Slack', 'Microsoft Teams', 'Confluence', 'Notion', 'Basecamp'
-            ],
-            'version_control': [
-                'Git', 'GitHub', 'GitLab', 'Bitbucket', 'SVN', 'Mercurial', 'Perforce'
-            ],
-            'operating_systems': [
-                'Linux', 'Windows', 'macOS', 'Ubuntu', 'CentOS', 'Red Hat', 'Debian',
-                'FreeBSD', 'Unix', 'Windows Server'
-            ]
-        }
-    
     def _load_education_keywords(self) -> List[str]:
         """Load education-related keywords"""
         return [
@@ -213,20 +163,9 @@ class ResumeParser:
     
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract categorized skills from resume text"""
-        found_skills = {}
+        found_skills = skill_taxonomy.group_by_category(skill_taxonomy.extract_names(text))
         text_lower = text.lower()
         
-        for category, skills in self.skill_keywords.items():
-            category_skills = []
-            for skill in skills:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    category_skills.append(skill)
-            
-            if category_skills:
-                found_skills[category] = category_skills
-        
         # Extract additional skills using keyword frequency
         words = word_tokenize(text_lower)
         words = [word for word in words if word.isalpha() and word not in self.stop_words]
@@ -533,14 +472,9 @@ class ResumeParser:
         
         job_requirements_lower = [req.lower().strip() for req in job_requirements]
         
-        matched_skills = []
-        missing_skills = []
-        
-        for req in job_requirements_lower:
-            if any(req in skill or skill in req for skill in all_candidate_skills):
-                matched_skills.append(req)
-            else:
-                missing_skills.append(req)
+        # Spelling variants such as Postgres and PostgreSQL count as matches;
+        # substrings such as Java in JavaScript do not
+        matched_skills, missing_skills = skill_matcher.match(all_candidate_skills, job_requirements_lower)
         
         match_percentage = (len(matched_skills) / len(job_requirements)) * 100 if job_requirements else 0
         
@@ -421,10 +421,11 @@ class DatabaseSetup:
                 'remote_ok': 'remote' in [loc.lower() for loc in pool.locations] if pool.locations else False
             }
             
-            match_result = engine.calculate_comprehensive_match(candidate_data, pool_data)
+            match_scores = engine.calculate_match_scores(candidate_data, pool_data)
             
             # Add to pool if match score is above threshold
-            if match_result['overall_score'] >= 60:
+            if match_scores['overall_score'] >= 60:
+                match_result = engine.calculate_comprehensive_match(candidate_data, pool_data, match_scores)
                 TalentPoolCandidate.objects.get_or_create(
                     talent_pool=pool,
                     candidate=candidate,
@@ -587,10 +588,11 @@ class DatabaseSetup:
                 }
                 
                 # Calculate match
-                match_result = engine.calculate_comprehensive_match(candidate_data, job_data)
+                match_scores = engine.calculate_match_scores(candidate_data, job_data)
                 
                 # Create match if score is above threshold
-                if match_result['overall_score'] >= 50:
+                if match_scores['overall_score'] >= 50:
+                    match_result = engine.calculate_comprehensive_match(candidate_data, job_data, match_scores)
                     JobMatch.objects.get_or_create(
                         candidate=candidate,
                         job=job,